@@ -0,0 +1,12 @@
+"""
+Offline benchmarks for the API services against real MongoDB queries.
+
+A synthetic condominium dataset is seeded into a local mongod, then service
+entry points are timed and the results written as JSON, so that runs before
+and after a change can be compared:
+
+    docker run -d -p 27017:27017 mongo:7
+    python -m apps.api.benchmarks run --output baseline.json
+    python -m apps.api.benchmarks run --output current.json
+    python -m apps.api.benchmarks compare baseline.json current.json
+"""
@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from .compare import REGRESSION_THRESHOLD, compare, format_comparison
+from .dataset import DatasetConfig
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    # Imported here so that comparing results does not load the services
+    from ..database import db
+    from .suite import run
+
+    db.uri = args.uri
+    db.db_name = args.db_name
+    db.tls = args.tls
+    config = DatasetConfig(
+        organizations=args.organizations,
+        houses=args.houses,
+        members=args.members,
+        proposals=args.proposals,
+        comments=args.comments,
+        voting_sessions=args.sessions,
+        proposals_per_session=args.proposals_per_session,
+        seed=args.seed,
+    )
+    try:
+        return await run(config, args.iterations, args.warmup, args.cases)
+    finally:
+        await db.disconnect()
+
+
+def main() -> None:
+    defaults = DatasetConfig()
+    parser = argparse.ArgumentParser(description="Benchmark the API services.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="seed the dataset and time the services")
+    run.add_argument(
+        "--uri",
+        default=os.getenv("BENCHMARK_MONGODB_URI", "mongodb://localhost:27017"),
+        help="MongoDB to seed (BENCHMARK_MONGODB_URI)",
+    )
+    run.add_argument(
+        "--db-name",
+        default="condo_agora_bench",
+        help="database to drop and seed; its name must contain 'bench'",
+    )
+    run.add_argument("--tls", action="store_true", help="connect with TLS")
+    for name in ("organizations", "houses", "members", "proposals", "comments"):
+        run.add_argument(f"--{name}", type=int, default=getattr(defaults, name))
+    run.add_argument("--sessions", type=int, default=defaults.voting_sessions)
+    run.add_argument(
+        "--proposals-per-session", type=int, default=defaults.proposals_per_session
+    )
+    run.add_argument("--seed", type=int, default=defaults.seed)
+    run.add_argument("--iterations", type=int, default=10)
+    run.add_argument("--warmup", type=int, default=2)
+    run.add_argument("--case", dest="cases", action="append", help="only run this case")
+    run.add_argument("--output", help="write the results to this JSON file")
+
+    diff = commands.add_parser("compare", help="compare two result files")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+    diff.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        rows = compare(baseline, current, args.threshold)
+        print(format_comparison(rows))
+        sys.exit(1 if any(regressed for *_, regressed in rows) else 0)
+
+    results = asyncio.run(_run(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
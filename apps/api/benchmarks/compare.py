@@ -0,0 +1,34 @@
+"""Comparison of two benchmark result files."""
+
+from typing import List, Tuple
+
+# Median slowdown, as a fraction, reported as a regression
+REGRESSION_THRESHOLD = 0.2
+
+Row = Tuple[str, float, float, float, bool]
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float = REGRESSION_THRESHOLD
+) -> List[Row]:
+    """
+    Median latency per case in both runs, as (case, baseline_ms, current_ms,
+    change, regressed). Cases missing from either run are skipped.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        base, now = before["median_ms"], result["median_ms"]
+        change = (now - base) / base if base else 0.0
+        rows.append((name, base, now, change, change > threshold))
+    return rows
+
+
+def format_comparison(rows: List[Row]) -> str:
+    lines = [f"{'case':<28} {'baseline':>10} {'current':>10} {'change':>8}"]
+    for name, base, now, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        lines.append(f"{name:<28} {base:>8.1f}ms {now:>8.1f}ms {change:>+7.0%}{flag}")
+    return "\n".join(lines)
@@ -0,0 +1,288 @@
+"""
+Synthetic condominium data for the benchmarks.
+
+Documents are built in memory with the same fields the services write, from a
+seeded random generator, so the same config always produces the same data.
+"""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from bson import ObjectId
+
+PROPOSAL_STATUSES = [
+    "DRAFT",
+    "OPEN",
+    "VOTING",
+    "APPROVED",
+    "IN_PROGRESS",
+    "COMPLETED",
+    "REJECTED",
+]
+PROPOSAL_CATEGORIES = [
+    "SECURITY",
+    "INFRASTRUCTURE",
+    "COMMON_AREAS",
+    "MAINTENANCE",
+    "FINANCIAL",
+    "OTHER",
+]
+# Reference time, so that dates do not depend on when the data is built
+EPOCH = datetime(2026, 1, 1)
+
+
+@dataclass
+class DatasetConfig:
+    """Size of the synthetic data. Counts are per organization."""
+
+    organizations: int = 1
+    houses: int = 1000
+    members: int = 2000
+    proposals: int = 500
+    comments: int = 20000
+    voting_sessions: int = 50
+    proposals_per_session: int = 5
+    seed: int = 42
+
+
+@dataclass
+class Organization:
+    """Ids of one seeded organization that the benchmarks call services with."""
+
+    id: str
+    admin_user_id: str
+    session_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Dataset:
+    organizations: List[Organization] = field(default_factory=list)
+    # Collection name -> documents to insert
+    documents: Dict[str, List[dict]] = field(default_factory=dict)
+
+    def add(self, collection: str, docs: List[dict]) -> None:
+        self.documents.setdefault(collection, []).extend(docs)
+
+    def counts(self) -> Dict[str, int]:
+        return {name: len(docs) for name, docs in self.documents.items()}
+
+
+def _object_id(rng: random.Random) -> ObjectId:
+    return ObjectId(rng.getrandbits(96).to_bytes(12, "big"))
+
+
+def _timestamp(rng: random.Random, days: int = 540) -> datetime:
+    return EPOCH - timedelta(seconds=rng.randrange(days * 86400))
+
+
+def _user(rng: random.Random, index: int, created_at: datetime) -> dict:
+    return {
+        "_id": _object_id(rng),
+        "nextauth_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "email": f"resident{index}@bench.example.com",
+        "phone": f"+58412{index:07d}",
+        "auth_provider": "phone",
+        "first_name": f"Resident{index}",
+        "last_name": "Bench",
+        "avatar_url": None,
+        "requires_profile_completion": False,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def _build_organization(
+    config: DatasetConfig, rng: random.Random, number: int, dataset: Dataset
+) -> None:
+    now = _timestamp(rng)
+    org_id = _object_id(rng)
+    dataset.add(
+        "organizations",
+        [
+            {
+                "_id": org_id,
+                "name": f"Bench Condominium {number}",
+                "slug": f"bench-condominium-{number}",
+                "created_at": now,
+                "updated_at": now,
+            }
+        ],
+    )
+    org_key = str(org_id)
+    offset = number * (config.members + 1)
+
+    admin = _user(rng, offset, now)
+    users = [_user(rng, offset + i + 1, _timestamp(rng)) for i in range(config.members)]
+    dataset.add("users", [admin, *users])
+    organization = Organization(id=org_key, admin_user_id=str(admin["_id"]))
+    dataset.organizations.append(organization)
+
+    houses = [
+        {
+            "_id": _object_id(rng),
+            "name": f"House {i + 1}",
+            "organization_id": org_key,
+            "voter_user_id": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(config.houses)
+    ]
+    members = [
+        {
+            "_id": _object_id(rng),
+            "user_id": organization.admin_user_id,
+            "organization_id": org_key,
+            "role": "ADMIN",
+            "house_id": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+    ]
+    # Residents fill the houses in turn; each house's first resident votes
+    for i, user in enumerate(users):
+        house = houses[i % len(houses)] if houses else None
+        user_id = str(user["_id"])
+        if house is not None and house["voter_user_id"] is None:
+            house["voter_user_id"] = user_id
+        members.append(
+            {
+                "_id": _object_id(rng),
+                "user_id": user_id,
+                "organization_id": org_key,
+                "role": "RESIDENT",
+                "house_id": str(house["_id"]) if house else None,
+                "created_at": user["created_at"],
+                "updated_at": user["created_at"],
+            }
+        )
+    dataset.add("houses", houses)
+    dataset.add("organization_members", members)
+
+    author_ids = [str(user["_id"]) for user in users] or [organization.admin_user_id]
+    proposals = []
+    for i in range(config.proposals):
+        created_at = _timestamp(rng)
+        proposals.append(
+            {
+                "_id": _object_id(rng),
+                "title": f"Proposal {i + 1}",
+                "description": "Synthetic proposal for benchmarking.",
+                "category": rng.choice(PROPOSAL_CATEGORIES),
+                "status": rng.choice(PROPOSAL_STATUSES),
+                "author_id": rng.choice(author_ids),
+                "organization_id": org_key,
+                "responsible_house_id": None,
+                "rejection_reason": None,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+    dataset.add("proposals", proposals)
+
+    if proposals:
+        comments = []
+        for _ in range(config.comments):
+            proposal = rng.choice(proposals)
+            created_at = proposal["created_at"] + timedelta(
+                seconds=rng.randrange(30 * 86400)
+            )
+            comments.append(
+                {
+                    "_id": _object_id(rng),
+                    "proposal_id": str(proposal["_id"]),
+                    "author_id": rng.choice(author_ids),
+                    "content": "Synthetic comment.",
+                    "parent_id": None,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+            )
+        dataset.add("comments", comments)
+
+    _build_voting_sessions(config, rng, organization, houses, proposals, dataset)
+
+
+def _build_voting_sessions(
+    config: DatasetConfig,
+    rng: random.Random,
+    organization: Organization,
+    houses: List[dict],
+    proposals: List[dict],
+    dataset: Dataset,
+) -> None:
+    """Sessions with a full ballot from every house that has a voter."""
+    per_session = min(config.proposals_per_session, len(proposals))
+    if not per_session:
+        return
+    voting_houses = [house for house in houses if house["voter_user_id"]]
+    sessions, votes = [], []
+    for i in range(config.voting_sessions):
+        created_at = _timestamp(rng)
+        session_id = _object_id(rng)
+        proposal_ids = [str(p["_id"]) for p in rng.sample(proposals, per_session)]
+        sessions.append(
+            {
+                "_id": session_id,
+                "organization_id": organization.id,
+                "title": f"Voting Session {i + 1}",
+                # The newest session is still taking votes
+                "status": "OPEN" if i == config.voting_sessions - 1 else "CLOSED",
+                "proposal_ids": proposal_ids,
+                "start_date": created_at,
+                "end_date": created_at + timedelta(days=14),
+                "created_by": organization.admin_user_id,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+        organization.session_ids.append(str(session_id))
+        for house in voting_houses:
+            ranked = rng.sample(proposal_ids, len(proposal_ids))
+            votes.append(
+                {
+                    "_id": _object_id(rng),
+                    "voting_session_id": str(session_id),
+                    "house_id": str(house["_id"]),
+                    "voter_id": house["voter_user_id"],
+                    "rankings": [
+                        {"proposal_id": pid, "rank": rank}
+                        for rank, pid in enumerate(ranked, start=1)
+                    ],
+                    "submitted_at": created_at,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+            )
+    dataset.add("voting_sessions", sessions)
+    dataset.add("votes", votes)
+
+
+def build_dataset(config: DatasetConfig) -> Dataset:
+    """Build every document of the synthetic dataset, without touching MongoDB."""
+    rng = random.Random(config.seed)
+    dataset = Dataset()
+    for number in range(config.organizations):
+        _build_organization(config, rng, number, dataset)
+    return dataset
+
+
+def bulk_setup_rows(count: int, batch: int) -> List[dict]:
+    """Rows for bulk_setup_organization, with contacts unique to each batch."""
+    rows = []
+    for i in range(count):
+        index = batch * count + i
+        rows.append(
+            {
+                "row_id": str(i),
+                "property_name": f"Unit {i + 1}",
+                "first_name": f"Onboarded{index}",
+                "last_name": "Bench",
+                "phone": f"+58424{index:07d}",
+                "email": f"onboarded{index}@bench.example.com",
+            }
+        )
+    return rows
@@ -0,0 +1,181 @@
+"""
+Benchmark cases: service entry points timed against the seeded dataset.
+
+Each case is called a few times to warm caches and the connection pool, then
+timed over several iterations. Alongside latency, the MongoDB commands each
+call issues are counted from the query statistics the client collects.
+"""
+
+import platform
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import motor
+import pymongo
+
+from ..database import db
+from ..indexes import create_planned_indexes
+from ..src.analytics.service import get_community_analytics, get_participation_report
+from ..src.auth.service import get_organization_members
+from ..src.notification.service import notify_org_members
+from ..src.onboarding.service import MAX_ROWS, bulk_setup_organization
+from ..src.voting.service import get_voting_results, rebuild_vote_tally
+from .dataset import Dataset, DatasetConfig, build_dataset, bulk_setup_rows
+
+INSERT_BATCH_SIZE = 5000
+
+Case = Callable[[Dataset, int], Awaitable[object]]
+
+
+def _session_id(dataset: Dataset, iteration: int) -> str:
+    org = dataset.organizations[iteration % len(dataset.organizations)]
+    return org.session_ids[iteration % len(org.session_ids)]
+
+
+def _org_id(dataset: Dataset, iteration: int) -> str:
+    return dataset.organizations[iteration % len(dataset.organizations)].id
+
+
+async def _voting_results(dataset: Dataset, iteration: int):
+    return await get_voting_results(_session_id(dataset, iteration))
+
+
+async def _participation_report(dataset: Dataset, iteration: int):
+    return await get_participation_report(_session_id(dataset, iteration))
+
+
+async def _community_analytics(dataset: Dataset, iteration: int):
+    return await get_community_analytics(_org_id(dataset, iteration))
+
+
+async def _organization_members(dataset: Dataset, iteration: int):
+    return await get_organization_members(_org_id(dataset, iteration))
+
+
+async def _notify_org_members(dataset: Dataset, iteration: int):
+    org = dataset.organizations[iteration % len(dataset.organizations)]
+    return await notify_org_members(
+        org.id,
+        org.admin_user_id,
+        "PROPOSAL_CREATED",
+        "Benchmark",
+        "Synthetic notification",
+        org.session_ids[0] if org.session_ids else org.id,
+    )
+
+
+async def _bulk_setup_organization(dataset: Dataset, iteration: int):
+    org = dataset.organizations[0]
+    return await bulk_setup_organization(
+        f"Bench Onboarding {iteration}",
+        bulk_setup_rows(MAX_ROWS, iteration),
+        org.admin_user_id,
+    )
+
+
+CASES: Dict[str, Case] = {
+    "get_voting_results": _voting_results,
+    "get_participation_report": _participation_report,
+    "get_community_analytics": _community_analytics,
+    "get_organization_members": _organization_members,
+    "notify_org_members": _notify_org_members,
+    "bulk_setup_organization": _bulk_setup_organization,
+}
+
+
+async def seed(config: DatasetConfig) -> Dataset:
+    """
+    Replace the benchmark database with the synthetic dataset, create the
+    planned indexes and build the vote tallies.
+    """
+    if "bench" not in db.db_name:
+        raise Exception(
+            f"Refusing to seed {db.db_name}: the benchmark database is dropped "
+            "first, so its name must contain 'bench'"
+        )
+    await db.connect()
+    await db.client.drop_database(db.db_name)
+
+    dataset = build_dataset(config)
+    for collection, docs in dataset.documents.items():
+        for start in range(0, len(docs), INSERT_BATCH_SIZE):
+            end = start + INSERT_BATCH_SIZE
+            await db.db[collection].insert_many(docs[start:end], ordered=False)
+    await create_planned_indexes(db.db)
+
+    for session in dataset.documents.get("voting_sessions", []):
+        await rebuild_vote_tally(str(session["_id"]), session["proposal_ids"])
+    return dataset
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def _commands_issued() -> int:
+    return sum(row["count"] for row in db.query_stats.report())
+
+
+async def time_case(case: Case, dataset: Dataset, iterations: int, warmup: int) -> dict:
+    """Latency in milliseconds and MongoDB commands per call for one case."""
+    for i in range(warmup):
+        await case(dataset, i)
+
+    durations = []
+    commands_before = _commands_issued()
+    for i in range(warmup, warmup + iterations):
+        started = time.perf_counter()
+        await case(dataset, i)
+        durations.append((time.perf_counter() - started) * 1000)
+    commands = _commands_issued() - commands_before
+
+    ordered = sorted(durations)
+    return {
+        "iterations": iterations,
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(_percentile(ordered, 0.5), 3),
+        "p95_ms": round(_percentile(ordered, 0.95), 3),
+        "max_ms": round(ordered[-1], 3),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "db_commands_per_call": round(commands / iterations, 2),
+    }
+
+
+async def _environment() -> dict:
+    build = await db.client.admin.command("buildInfo")
+    return {
+        "python": platform.python_version(),
+        "motor": motor.version,
+        "pymongo": pymongo.version,
+        "mongodb": build.get("version"),
+    }
+
+
+async def run(
+    config: DatasetConfig,
+    iterations: int = 10,
+    warmup: int = 2,
+    cases: Optional[Sequence[str]] = None,
+) -> dict:
+    """Seed the dataset, time the selected cases and return the results."""
+    unknown = set(cases or ()) - set(CASES)
+    if unknown:
+        raise Exception(f"Unknown benchmark cases: {', '.join(sorted(unknown))}")
+
+    dataset = await seed(config)
+    results = {}
+    for name, case in CASES.items():
+        if cases and name not in cases:
+            continue
+        results[name] = await time_case(case, dataset, max(iterations, 1), warmup)
+
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "config": asdict(config),
+        "environment": await _environment(),
+        "dataset": dataset.counts(),
+        "results": results,
+    }
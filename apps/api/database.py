@@ -1,9 +1,23 @@
+import asyncio
+import importlib.util
+import json
+import logging
 import os
-from typing import Optional
+import threading
+from collections import deque
+from contextvars import ContextVar, copy_context
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import certifi
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from pymongo.read_preferences import (
+    Primary,
+    _ServerMode,
+    make_read_preference,
+    read_pref_mode_from_name,
+)
 
 # Load environment variables from the root directory
 env_path = os.path.join(
@@ -19,22 +33,394 @@ api_env_path = os.path.join(
 )
 load_dotenv(api_env_path)
 
+logger = logging.getLogger(__name__)
+
+# Wire compressors and the modules they need; unavailable ones are skipped
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def _available_compressors(names: str) -> List[str]:
+    compressors = []
+    for name in (n.strip() for n in names.split(",")):
+        module = COMPRESSOR_MODULES.get(name)
+        if module and importlib.util.find_spec(module) is not None:
+            compressors.append(name)
+    return compressors
+
+
+def client_options() -> dict:
+    """
+    Motor client options from the environment. Defaults suit serverless:
+    a small pool that fills gradually and drops idle sockets, and timeouts
+    that fail fast instead of piling up requests.
+    """
+    options = {
+        "maxPoolSize": int(os.getenv("MONGODB_MAX_POOL_SIZE", "10")),
+        "minPoolSize": int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")),
+        "maxConnecting": int(os.getenv("MONGODB_MAX_CONNECTING", "2")),
+        "maxIdleTimeMS": int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "60000")),
+        "waitQueueTimeoutMS": int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+        "serverSelectionTimeoutMS": int(
+            os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")
+        ),
+        "connectTimeoutMS": int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000")),
+        "socketTimeoutMS": int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "20000")),
+        "readPreference": os.getenv("MONGODB_READ_PREFERENCE", "primary"),
+        "retryWrites": True,
+    }
+    compressors = _available_compressors(
+        os.getenv("MONGODB_COMPRESSORS", "zstd,snappy,zlib")
+    )
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
+def reports_read_preference() -> _ServerMode:
+    """
+    Read preference for reporting queries (analytics, participation reports,
+    financial summaries). Defaults to secondaryPreferred so large scans stay
+    off the primary that takes vote writes, with reads from secondaries
+    lagging more than MONGODB_REPORTS_MAX_STALENESS_SECONDS (min 90) skipped.
+    """
+    mode = read_pref_mode_from_name(
+        os.getenv("MONGODB_REPORTS_READ_PREFERENCE", "secondaryPreferred")
+    )
+    if mode == Primary().mode:
+        return Primary()
+    # The server rejects staleness bounds under 90s; -1 means no bound
+    max_staleness = int(os.getenv("MONGODB_REPORTS_MAX_STALENESS_SECONDS", "90"))
+    if max_staleness != -1:
+        max_staleness = max(max_staleness, 90)
+    return make_read_preference(mode, None, max_staleness=max_staleness)
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Counts connection pool events. Events arrive on driver threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {
+            "open": 0,
+            "in_use": 0,
+            "waiting": 0,
+            "created_total": 0,
+            "check_out_failed_total": 0,
+            "cleared_total": 0,
+        }
+
+    def _add(self, **deltas: int) -> None:
+        with self._lock:
+            for key, delta in deltas.items():
+                self._counts[key] += delta
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def connection_created(self, event):
+        self._add(open=1, created_total=1)
+
+    def connection_closed(self, event):
+        self._add(open=-1)
+
+    def connection_check_out_started(self, event):
+        self._add(waiting=1)
+
+    def connection_checked_out(self, event):
+        self._add(waiting=-1, in_use=1)
+
+    def connection_check_out_failed(self, event):
+        self._add(waiting=-1, check_out_failed_total=1)
+
+    def connection_checked_in(self, event):
+        self._add(in_use=-1)
+
+    def pool_cleared(self, event):
+        self._add(cleared_total=1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+
+# Commands slower than this are logged with their shape and origin
+SLOW_QUERY_MS = float(os.getenv("MONGODB_SLOW_QUERY_MS", "100"))
+# Latest durations kept per query shape for the percentiles on /debug/queries
+QUERY_STATS_WINDOW = int(os.getenv("MONGODB_QUERY_STATS_WINDOW", "500"))
+# Distinct shapes tracked; further ones are folded into one per command
+QUERY_STATS_MAX_SHAPES = int(os.getenv("MONGODB_QUERY_STATS_MAX_SHAPES", "500"))
+
+# Commands that are connection housekeeping rather than application queries
+HOUSEKEEPING_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "endSessions"}
+
+# The task that issues a command. Motor copies it into the executor threads
+# that run PyMongo, so commands can be traced back to their caller
+_query_task: ContextVar[Optional[asyncio.Task]] = ContextVar("query_task", default=None)
+
+
+def _tracking_task_factory(loop, coro, *, context=None, **kwargs) -> asyncio.Task:
+    """
+    Task factory that records each new task in _query_task, so QueryStats can
+    attribute the commands it issues. Resolvers, DataLoader batches and
+    background jobs each run in a task of their own, so tracking them here
+    covers every caller without the services doing anything.
+    """
+    if context is not None:
+        # A caller-supplied context may be shared, so it is left untouched
+        return asyncio.Task(coro, loop=loop, context=context, **kwargs)
+    context = copy_context()
+    task = asyncio.Task(coro, loop=loop, context=context, **kwargs)
+    # The task's first step is scheduled, not run, so it sees the value
+    context.run(_query_task.set, task)
+    return task
+
+
+def _track_queries(loop: asyncio.AbstractEventLoop) -> None:
+    """Track the tasks of the loop the client is bound to (see connect)."""
+    if loop.get_task_factory() is None:
+        loop.set_task_factory(_tracking_task_factory)
+    # The connecting task predates the factory
+    _query_task.set(asyncio.current_task())
+
+
+def _normalize(value: Any) -> Any:
+    """Replace the values in a filter with placeholders, keeping its structure."""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and value:
+        if all(isinstance(item, dict) for item in value):
+            # $and/$or clauses; lists of values stay one placeholder
+            return [_normalize(item) for item in value]
+    return "?"
+
+
+def query_shape(command_name: str, command: dict) -> Tuple[Optional[dict], tuple]:
+    """
+    The normalized filter and the sort a command runs with. The filter is
+    None for commands that do not select documents (inserts, getMore).
+    """
+    sort: dict = {}
+    if command_name in ("find", "count", "distinct", "findAndModify"):
+        query = command.get("filter", command.get("query")) or {}
+        sort = command.get("sort") or {}
+    elif command_name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or [{}]
+        query = statements[0].get("q") or {}
+    elif command_name == "aggregate":
+        stages = command.get("pipeline") or []
+        first = stages[0] if stages else {}
+        query = first.get("$match", {})
+        following = stages[1:2] if "$match" in first else stages[:1]
+        if following and "$sort" in following[0]:
+            sort = following[0]["$sort"]
+    else:
+        return None, ()
+    return _normalize(query), tuple((key, int(d)) for key, d in dict(sort).items())
+
+
+def _is_multi(command: dict) -> bool:
+    """Whether an update or delete may touch many documents."""
+    if command.get("updates"):
+        return bool(command["updates"][0].get("multi"))
+    if command.get("deletes"):
+        return command["deletes"][0].get("limit") == 0
+    return False
+
+
+def _origin(task: Optional[asyncio.Task]) -> str:
+    """
+    The innermost API function in the task's await chain, e.g.
+    "auth.service.remove_member_from_organization". While a command runs, its
+    caller is suspended awaiting it, so the chain ends at the caller.
+    """
+    origin = "unknown"
+    coro = task.get_coro() if task is not None else None
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None)
+        if frame is None:
+            break
+        module = frame.f_globals.get("__name__", "")
+        _, found, name = f".{module}".partition(".src.")
+        if found:
+            origin = f"{name}.{frame.f_code.co_name}"
+        coro = getattr(coro, "cr_await", None)
+    return origin
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class _ShapeStats:
+    def __init__(self, collection: str, command: str, query, sort, window: int):
+        self.collection = collection
+        self.command = command
+        self.filter = query
+        self.sort = sort
+        self.count = 0
+        self.failures = 0
+        self.slow = 0
+        self.total_ms = 0.0
+        self.durations: Deque[float] = deque(maxlen=window)
+        self.origins: Dict[str, int] = {}
+
+
+class QueryStats(monitoring.CommandListener):
+    """
+    Latency per normalized query shape, and a log of commands slower than
+    MONGODB_SLOW_QUERY_MS. Events arrive on driver threads.
+    """
+
+    def __init__(
+        self,
+        slow_ms: float = SLOW_QUERY_MS,
+        window: int = QUERY_STATS_WINDOW,
+        max_shapes: int = QUERY_STATS_MAX_SHAPES,
+    ):
+        self.slow_ms = slow_ms
+        self.window = max(window, 1)
+        self.max_shapes = max_shapes
+        self._lock = threading.Lock()
+        # (connection, request_id) -> (shape key, origin) of in-flight commands
+        self._started: Dict[Tuple[object, int], Tuple[str, str]] = {}
+        self._shapes: Dict[str, _ShapeStats] = {}
+
+    def started(self, event):
+        name = event.command_name
+        target = event.command.get("collection" if name == "getMore" else name)
+        if name in HOUSEKEEPING_COMMANDS or not isinstance(target, str):
+            return
+        query, sort = query_shape(name, event.command)
+        document = {"filter": query, "sort": sort, "multi": _is_multi(event.command)}
+        key = f"{target}.{name} {json.dumps(document, sort_keys=True)}"
+        origin = _origin(_query_task.get())
+        with self._lock:
+            if key not in self._shapes:
+                if len(self._shapes) >= self.max_shapes:
+                    key, query, sort = f"{target}.{name} (other)", None, ()
+                if key not in self._shapes:
+                    self._shapes[key] = _ShapeStats(
+                        target, name, query, sort, self.window
+                    )
+            self._started[(event.connection_id, event.request_id)] = (key, origin)
+
+    def _finish(self, event, failed: bool) -> None:
+        with self._lock:
+            entry = self._started.pop((event.connection_id, event.request_id), None)
+            if entry is None:
+                return
+            key, origin = entry
+            stats = self._shapes[key]
+            elapsed_ms = event.duration_micros / 1000
+            slow = elapsed_ms >= self.slow_ms
+            stats.count += 1
+            stats.failures += int(failed)
+            stats.slow += int(slow)
+            stats.total_ms += elapsed_ms
+            stats.durations.append(elapsed_ms)
+            stats.origins[origin] = stats.origins.get(origin, 0) + 1
+        if slow:
+            logger.warning(
+                "Slow MongoDB command (%.1fms) from %s: %s",
+                elapsed_ms,
+                origin,
+                key,
+            )
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def report(self) -> List[dict]:
+        """Shapes by total time spent, with rolling p50/p95/p99 in milliseconds."""
+        with self._lock:
+            shapes = [
+                (key, stats, sorted(stats.durations), dict(stats.origins))
+                for key, stats in self._shapes.items()
+                if stats.count
+            ]
+        rows = []
+        for key, stats, ordered, origins in shapes:
+            rows.append(
+                {
+                    "shape": key,
+                    "collection": stats.collection,
+                    "command": stats.command,
+                    "filter": stats.filter,
+                    "sort": [list(pair) for pair in stats.sort],
+                    "count": stats.count,
+                    "failures": stats.failures,
+                    "slow": stats.slow,
+                    "total_ms": round(stats.total_ms, 3),
+                    "p50_ms": round(_percentile(ordered, 0.50), 3),
+                    "p95_ms": round(_percentile(ordered, 0.95), 3),
+                    "p99_ms": round(_percentile(ordered, 0.99), 3),
+                    "max_ms": round(ordered[-1], 3),
+                    "origins": origins,
+                }
+            )
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._started.clear()
+            self._shapes.clear()
+
 
 class MongoDB:
     """Async MongoDB client wrapper using Motor."""
 
     client: Optional[AsyncIOMotorClient] = None
     db: Optional[AsyncIOMotorDatabase] = None
+    # Same database routed by reports_read_preference(); shares the pool
+    reports: Optional[AsyncIOMotorDatabase] = None
     _connected: bool = False
 
     def __init__(self):
         self.uri = os.getenv("MONGODB_URI")
         self.db_name = os.getenv("MONGODB_DB_NAME", "condo_agora")
+        self.options = client_options()
+        # Atlas requires TLS; a local mongod (tests, benchmarks) usually has none
+        self.tls = os.getenv("MONGODB_TLS", "true").lower() != "false"
+        self.reports_read_preference = reports_read_preference()
+        self.pool_metrics = PoolMetrics()
+        self.query_stats = QueryStats()
+        # Listeners attached to the client on connect; append before connecting
+        self.event_listeners: List[object] = [self.pool_metrics, self.query_stats]
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _loop_changed(self) -> bool:
+        """Whether the running event loop differs from the client's."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return self._loop is not None and loop is not self._loop
 
     async def connect(self) -> None:
-        """Connect to MongoDB Atlas."""
+        """
+        Connect to MongoDB Atlas. Only opens the client; indexes are applied
+        separately with `python -m apps.api.indexes apply`.
+        """
         if self._connected:
-            return
+            if not self._loop_changed():
+                # Warm invocations reuse the open client and its pool
+                return
+            # A client is bound to the loop it was created on, so one left
+            # from a previous invocation's loop has to be replaced
+            await self.disconnect()
 
         if not self.uri:
             raise ValueError(
@@ -42,13 +428,21 @@ class MongoDB:
                 "Please set it to your MongoDB Atlas connection string."
             )
 
-        self.client = AsyncIOMotorClient(self.uri, tlsCAFile=certifi.where())
+        tls_options = {"tlsCAFile": certifi.where()} if self.tls else {}
+        self.client = AsyncIOMotorClient(
+            self.uri,
+            event_listeners=list(self.event_listeners),
+            **tls_options,
+            **self.options,
+        )
         self.db = self.client[self.db_name]
+        self.reports = self.client.get_database(
+            self.db_name, read_preference=self.reports_read_preference
+        )
+        self._loop = asyncio.get_running_loop()
+        _track_queries(self._loop)
         self._connected = True
 
-        # Create indexes for unique constraints
-        await self._create_indexes()
-
     async def disconnect(self) -> None:
         """Disconnect from MongoDB."""
         if self.client:
@@ -56,6 +450,8 @@ class MongoDB:
             self._connected = False
             self.client = None
             self.db = None
+            self.reports = None
+            self._loop = None
 
     async def health_check(self) -> bool:
         """Check if the database connection is healthy."""
@@ -68,102 +464,19 @@ class MongoDB:
             return False
 
     def is_connected(self) -> bool:
-        """Check if client is connected."""
-        return self._connected
-
-    async def _create_indexes(self) -> None:
-        """Create indexes for unique constraints and query optimization."""
-        if self.db is None:
-            return
-
-        # Users collection indexes
-        await self.db.users.create_index("nextauth_id", unique=True, sparse=True)
-        await self.db.users.create_index("email", unique=True, sparse=True)
-        await self.db.users.create_index("phone", unique=True, sparse=True)
-
-        # Organizations collection indexes
-        await self.db.organizations.create_index("slug", unique=True)
-
-        # Organization members collection indexes
-        await self.db.organization_members.create_index(
-            [("user_id", 1), ("organization_id", 1)], unique=True
-        )
-        await self.db.organization_members.create_index("user_id")
-        await self.db.organization_members.create_index("organization_id")
-        await self.db.organization_members.create_index("house_id")
-
-        # Invitations collection indexes
-        await self.db.invitations.create_index("token", unique=True)
-        await self.db.invitations.create_index("email")
-        await self.db.invitations.create_index("organization_id")
-
-        # Houses collection indexes
-        await self.db.houses.create_index("organization_id")
-
-        # Proposals collection indexes
-        await self.db.proposals.create_index("organization_id")
-        await self.db.proposals.create_index("author_id")
-        await self.db.proposals.create_index("status")
-        await self.db.proposals.create_index([("created_at", -1)])
-
-        # Comments collection indexes
-        await self.db.comments.create_index("proposal_id")
-        await self.db.comments.create_index("author_id")
-        await self.db.comments.create_index("parent_id")
-        await self.db.comments.create_index([("created_at", 1)])
-
-        # Announcements collection indexes
-        await self.db.announcements.create_index("organization_id")
-        await self.db.announcements.create_index(
-            [("is_pinned", -1), ("created_at", -1)]
-        )
-
-        # Notifications collection indexes
-        await self.db.notifications.create_index("user_id")
-        await self.db.notifications.create_index([("user_id", 1), ("is_read", 1)])
-        await self.db.notifications.create_index([("created_at", -1)])
-
-        # Voting sessions collection indexes
-        await self.db.voting_sessions.create_index("organization_id")
-        await self.db.voting_sessions.create_index(
-            [("organization_id", 1), ("status", 1)]
-        )
-        await self.db.voting_sessions.create_index([("created_at", -1)])
-
-        # Votes collection indexes
-        await self.db.votes.create_index(
-            [("voting_session_id", 1), ("house_id", 1)], unique=True
-        )
-        await self.db.votes.create_index("voting_session_id")
-
-        # Documents collection indexes
-        await self.db.documents.create_index("proposal_id")
-        await self.db.documents.create_index([("proposal_id", 1), ("type", 1)])
-        await self.db.documents.create_index([("created_at", -1)])
-
-        # Project milestones collection indexes
-        await self.db.project_milestones.create_index("proposal_id")
-        await self.db.project_milestones.create_index(
-            [("proposal_id", 1), ("status", 1)]
-        )
-        await self.db.project_milestones.create_index([("created_at", 1)])
-
-        # Budgets collection indexes
-        await self.db.budgets.create_index("proposal_id", unique=True)
-
-        # Proposal votes collection indexes
-        await self.db.proposal_votes.create_index(
-            [("proposal_id", 1), ("house_id", 1)], unique=True
-        )
-        await self.db.proposal_votes.create_index("proposal_id")
-
-        # OTP codes - auto-expire after 5 minutes
-        await self.db.otp_codes.create_index("created_at", expireAfterSeconds=300)
-        await self.db.otp_codes.create_index("identifier")
-
-        # Rate limits - auto-expire after 1 hour
-        await self.db.rate_limits.create_index("window_start", expireAfterSeconds=3600)
-        await self.db.rate_limits.create_index("key")
+        """Check if client is connected and usable from the running loop."""
+        return self._connected and not self._loop_changed()
+
+    def pool_stats(self) -> dict:
+        """Pool settings and live connection counts, for /health."""
+        return {
+            "max_pool_size": self.options["maxPoolSize"],
+            "min_pool_size": self.options["minPoolSize"],
+            "compressors": self.options.get("compressors", []),
+            "read_preference": self.options["readPreference"],
+            "reports_read_preference": self.reports_read_preference.document,
+            **self.pool_metrics.snapshot(),
+        }
 
 
 # Global database instance
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Optional
 
 import strawberry
@@ -38,6 +39,7 @@ class CommunityAnalytics:
     category_breakdown: List[CategoryStat]
     monthly_trends: List[MonthlyProposalStat]
     top_contributors: List[TopContributor]
+    computed_at: Optional[datetime] = None
 
 
 @strawberry.type
@@ -103,4 +103,7 @@ class Invitation:
     expires_at: datetime
     created_at: datetime
     accepted_at: Optional[datetime] = None
+    # PENDING when the invitation was just created or resent: the outbox
+    # worker sends it after the mutation returns
+    delivery_status: Optional[str] = None
     house: Optional[Annotated["House", strawberry.lazy(".house")]] = None
@@ -1,3 +1,4 @@
+from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
@@ -47,3 +48,31 @@ class BulkSetupResult:
     email_invitations_sent: int
     properties_without_contact: int
     rows: List[BulkSetupRowResult]
+
+
+@strawberry.enum
+class ImportStatus(Enum):
+    UPLOADING = "UPLOADING"
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+@strawberry.type
+class OnboardingImport:
+    id: str
+    organization_id: str
+    status: ImportStatus
+    total_rows: int
+    processed_rows: int
+    error_rows: int
+    total_properties: int
+    total_residents: int
+    whatsapp_invitations_sent: int
+    email_invitations_sent: int
+    properties_without_contact: int
+    created_at: datetime
+    updated_at: datetime
+    error: Optional[str] = None
+    completed_at: Optional[datetime] = None
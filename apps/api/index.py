@@ -1,30 +1,70 @@
 import os
 
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from starlette.background import BackgroundTask
 from strawberry.fastapi import GraphQLRouter
 
 from .database import db
+from .indexes import QueryShape, apply_index_plan, unserved_reason, verify_indexes
 from .schema import schema
-from .src.auth.dependencies import get_current_user_optional
+from .src.analytics.snapshots import start_snapshot_refresher, stop_snapshot_refresher
+from .src.auth.channels import close_chasqui_client, open_chasqui_client
+from .src.auth.dependencies import get_current_user_optional, require_internal_secret
 from .src.auth.invite_router import invite_router
 from .src.auth.otp_router import router as otp_router
+from .src.auth.rate_limit import RateLimitExceeded, check_rate_limit
+from .src.dataloaders.loaders import Loaders
+from .src.metrics.service import registry
+from .src.metrics.tracing import command_metrics
+from .src.outbox.service import track_enqueued
+from .src.outbox.worker import drain_outbox, start_outbox_worker, stop_outbox_worker
 
 root_path = "/api" if os.getenv("VERCEL") else ""
+APPLY_INDEXES_ON_STARTUP = os.getenv("APPLY_INDEXES_ON_STARTUP", "0") == "1"
+VERIFY_INDEXES_ON_STARTUP = os.getenv("VERIFY_INDEXES_ON_STARTUP", "1") == "1"
+# Per-user GraphQL requests per minute (0 disables throttling)
+GRAPHQL_RATE_LIMIT_PER_MINUTE = int(os.getenv("GRAPHQL_RATE_LIMIT_PER_MINUTE", "0"))
+# Serverless has no long-lived worker: drain the jobs a request queued once its
+# response is sent
+OUTBOX_DRAIN_AFTER_RESPONSE = (
+    os.getenv("OUTBOX_DRAIN_AFTER_RESPONSE", "1" if os.getenv("VERCEL") else "0") == "1"
+)
 app = FastAPI(root_path=root_path)
+db.event_listeners.append(command_metrics)
 
 
 async def get_context(user=Depends(get_current_user_optional)):
-    return {"user": user}
+    if user and GRAPHQL_RATE_LIMIT_PER_MINUTE:
+        if not db.is_connected():
+            await db.connect()
+        try:
+            await check_rate_limit(
+                db.db, f"graphql:user:{user['id']}", GRAPHQL_RATE_LIMIT_PER_MINUTE, 60
+            )
+        except RateLimitExceeded as exc:
+            raise HTTPException(status_code=429, detail=str(exc))
+    return {"user": user, "loaders": Loaders()}
 
 
 @app.on_event("startup")
 async def startup():
     await db.connect()
+    if APPLY_INDEXES_ON_STARTUP:
+        await apply_index_plan(db.db)
+    elif VERIFY_INDEXES_ON_STARTUP:
+        await verify_indexes(db.db)
+    await open_chasqui_client()
+    start_snapshot_refresher()
+    start_outbox_worker()
 
 
 @app.on_event("shutdown")
 async def shutdown():
+    await stop_snapshot_refresher()
+    await stop_outbox_worker()
+    await close_chasqui_client()
     if db.is_connected():
         await db.disconnect()
 
@@ -37,6 +77,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def drain_outbox_after_response(request: Request, call_next):
+    if not OUTBOX_DRAIN_AFTER_RESPONSE:
+        return await call_next(request)
+    queued = track_enqueued()
+    response = await call_next(request)
+    if queued and response.background is None:
+        response.background = BackgroundTask(drain_outbox)
+    return response
+
+
 app.include_router(otp_router, prefix="/auth")
 app.include_router(invite_router)
 router = GraphQLRouter(schema, path="/graphql", context_getter=get_context)
@@ -46,7 +98,51 @@ app.include_router(router)
 @app.get("/health")
 async def health():
     is_healthy = await db.health_check()
-    return {"ok": is_healthy, "database": "mongodb"}
+    return {"ok": is_healthy, "database": "mongodb", "pool": db.pool_stats()}
+
+
+@app.get("/outbox/drain", dependencies=[Depends(require_internal_secret)])
+async def outbox_drain():
+    """Process due outbox jobs within the drain time budget. Called by Vercel Cron."""
+    return {"processed": await drain_outbox()}
+
+
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_internal_secret)],
+)
+async def metrics():
+    """
+    GraphQL and MongoDB metrics in the Prometheus text format. They name
+    operations and collections, so scraping requires the internal secret.
+    """
+    pool = db.pool_stats()
+    gauges = {
+        f'mongodb_pool_connections{{state="{state}"}}': pool.get(state, 0)
+        for state in ("open", "in_use", "waiting")
+    }
+    return PlainTextResponse(
+        registry.render(gauges), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/debug/queries", dependencies=[Depends(require_internal_secret)])
+async def debug_queries():
+    """
+    MongoDB query shapes seen by this process, by total time spent, each with
+    how the index plan serves it ("index", "in-memory sort", "collection scan").
+    Filters and origins reveal the schema and code paths, so it requires the
+    internal secret.
+    """
+    shapes = db.query_stats.report()
+    for row in shapes:
+        row["plan"] = None
+        if row["filter"] is not None:
+            sort = tuple((key, direction) for key, direction in row["sort"])
+            shape = QueryShape(row["shape"], row["collection"], row["filter"], sort)
+            row["plan"] = unserved_reason(shape) or "index"
+    return {"slow_query_ms": db.query_stats.slow_ms, "shapes": shapes}
 
 
 @app.get("/debug")
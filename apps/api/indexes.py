@@ -0,0 +1,541 @@
+"""
+Index plan: every index the API relies on, next to the query shapes that
+need them.
+
+Each service query that filters or sorts is declared as a QueryShape. The
+plan can then be checked statically (does some declared index serve each
+shape without an in-memory sort or a collection scan?) and against a live
+database (do the declared indexes exist?).
+
+Indexes are applied by an explicit migration step, never on connect:
+
+    python -m apps.api.indexes apply [--force]
+    python -m apps.api.indexes status
+    python -m apps.api.indexes report [--verify]
+
+Each apply records the plan's version (a hash of its contents) in a manifest
+document, so checking whether the current plan is applied is one lookup.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Keys = Tuple[Tuple[str, int], ...]
+
+MANIFEST_COLLECTION = "schema_migrations"
+MANIFEST_ID = "indexes"
+
+# Operators that pin a field to one value (or a set of values) for planning
+EQUALITY_OPERATORS = {"$eq", "$in"}
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    keys: Keys
+    unique: bool = False
+    sparse: bool = False
+    expire_after_seconds: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        """The name MongoDB gives this index by default."""
+        return "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+    def options(self) -> dict:
+        options: dict = {}
+        if self.unique:
+            options["unique"] = True
+        if self.sparse:
+            options["sparse"] = True
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        return options
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """A service query: a sample filter plus the sort it is read with."""
+
+    name: str
+    collection: str
+    filter: dict
+    sort: Keys = ()
+
+
+def _index(collection: str, *keys, **options) -> IndexSpec:
+    normalized = tuple((k, 1) if isinstance(k, str) else tuple(k) for k in keys)
+    return IndexSpec(collection, normalized, **options)
+
+
+NEWEST_FIRST: Keys = (("created_at", -1), ("_id", -1))
+
+INDEX_PLAN: List[IndexSpec] = [
+    # Users
+    _index("users", "nextauth_id", unique=True, sparse=True),
+    _index("users", "email", unique=True, sparse=True),
+    _index("users", "phone", unique=True, sparse=True),
+    # Organizations
+    _index("organizations", "slug", unique=True),
+    # Organization members
+    _index("organization_members", "user_id", "organization_id", unique=True),
+    _index("organization_members", "user_id"),
+    _index("organization_members", "organization_id"),
+    _index("organization_members", "house_id"),
+    # Invitations
+    _index("invitations", "token", unique=True),
+    _index("invitations", "email"),
+    _index("invitations", "organization_id", ("created_at", -1)),
+    # Houses
+    _index("houses", "organization_id", "created_at"),
+    # Proposals
+    _index("proposals", "author_id"),
+    _index("proposals", "status"),
+    _index("proposals", ("created_at", -1)),
+    _index("proposals", "organization_id", *NEWEST_FIRST),
+    _index("proposals", "organization_id", "status", ("updated_at", -1)),
+    # Comments
+    _index("comments", "proposal_id", "created_at"),
+    _index("comments", "author_id"),
+    _index("comments", "parent_id"),
+    # Announcements
+    _index("announcements", ("is_pinned", -1), ("created_at", -1)),
+    _index("announcements", "organization_id", ("is_pinned", -1), *NEWEST_FIRST),
+    _index("announcements", "organization_id", *NEWEST_FIRST),
+    # Notifications
+    _index("notifications", "user_id", "is_read"),
+    _index("notifications", ("created_at", -1)),
+    _index("notifications", "user_id", *NEWEST_FIRST),
+    # Notifications written by a retried outbox job (see create_notifications)
+    _index("notifications", "dedupe_key", unique=True, sparse=True),
+    # Voting sessions
+    _index("voting_sessions", "organization_id", "status"),
+    _index("voting_sessions", ("created_at", -1)),
+    _index("voting_sessions", "organization_id", *NEWEST_FIRST),
+    # Votes
+    _index("votes", "voting_session_id", "house_id", unique=True),
+    # Vote tallies (one materialized tally per session)
+    _index("vote_tallies", "voting_session_id", unique=True),
+    # Analytics snapshots
+    _index("analytics_snapshots", "organization_id", unique=True),
+    _index("analytics_snapshots", "dirty"),
+    # Documents
+    _index("documents", "proposal_id", "type"),
+    _index("documents", ("created_at", -1)),
+    _index("documents", "proposal_id", *NEWEST_FIRST),
+    # Project milestones
+    _index("project_milestones", "proposal_id", "status"),
+    _index("project_milestones", "proposal_id", "created_at"),
+    # Budgets
+    _index("budgets", "proposal_id", unique=True),
+    _index("budgets", "proposal_id", ("created_at", -1)),
+    # Proposal votes
+    _index("proposal_votes", "proposal_id", "house_id", unique=True),
+    # Onboarding imports
+    _index("import_job_rows", "job_id", "index", unique=True),
+    _index("import_job_rows", "job_id", "status"),
+    # Outbox
+    _index("outbox", "status", "next_attempt_at"),
+    # OTP codes - auto-expire after 5 minutes
+    _index("otp_codes", "created_at", expire_after_seconds=300),
+    _index("otp_codes", "identifier"),
+    # Rate limits - one counter per key and window, auto-expire after 1 hour
+    _index("rate_limits", "window_start", expire_after_seconds=3600),
+    _index("rate_limits", "key", "window_start", unique=True),
+]
+
+_NOW = datetime(2026, 1, 1)
+
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape(
+        "auth.get_pending_invitations",
+        "invitations",
+        {"organization_id": "o", "accepted_at": None, "expires_at": {"$gt": _NOW}},
+        (("created_at", -1),),
+    ),
+    QueryShape(
+        "auth.get_organization_members",
+        "organization_members",
+        {"organization_id": "o"},
+    ),
+    QueryShape("auth.count_admins", "organization_members", {"organization_id": "o"}),
+    QueryShape(
+        "auth.get_user_with_memberships",
+        "organization_members",
+        {"user_id": "u"},
+    ),
+    QueryShape(
+        "house.get_houses",
+        "houses",
+        {"organization_id": "o"},
+        (("created_at", 1),),
+    ),
+    QueryShape("house.residents", "organization_members", {"house_id": {"$in": []}}),
+    QueryShape(
+        "proposal.get_proposals",
+        "proposals",
+        {"organization_id": "o", "status": "OPEN"},
+        (("created_at", -1),),
+    ),
+    QueryShape(
+        "proposal.get_proposals_page",
+        "proposals",
+        {"organization_id": "o"},
+        NEWEST_FIRST,
+    ),
+    QueryShape(
+        "project_milestone.get_active_projects",
+        "proposals",
+        {"organization_id": "o", "status": "IN_PROGRESS"},
+        (("updated_at", -1),),
+    ),
+    QueryShape(
+        "comment.get_comments",
+        "comments",
+        {"proposal_id": "p"},
+        (("created_at", 1),),
+    ),
+    QueryShape("comment.get_comment_count", "comments", {"proposal_id": "p"}),
+    QueryShape(
+        "announcement.get_announcements",
+        "announcements",
+        {"organization_id": "o"},
+        (("is_pinned", -1), ("created_at", -1)),
+    ),
+    QueryShape(
+        "announcement.get_announcements_page",
+        "announcements",
+        {"organization_id": "o"},
+        (("is_pinned", -1), *NEWEST_FIRST),
+    ),
+    QueryShape(
+        "notification.get_notifications_page",
+        "notifications",
+        {"user_id": "u"},
+        NEWEST_FIRST,
+    ),
+    QueryShape(
+        "notification.get_unread_count",
+        "notifications",
+        {"user_id": "u", "is_read": False},
+    ),
+    QueryShape(
+        "notification.activity_feed.announcements",
+        "announcements",
+        {"organization_id": "o"},
+        NEWEST_FIRST,
+    ),
+    QueryShape(
+        "voting.get_voting_sessions_page",
+        "voting_sessions",
+        {"organization_id": "o"},
+        NEWEST_FIRST,
+    ),
+    QueryShape(
+        "analytics.last_closed_session",
+        "voting_sessions",
+        {"organization_id": "o", "status": "CLOSED"},
+        (("created_at", -1),),
+    ),
+    QueryShape("voting.votes", "votes", {"voting_session_id": "s"}),
+    QueryShape(
+        "document.get_documents_page",
+        "documents",
+        {"proposal_id": "p", "type": "QUOTE"},
+        NEWEST_FIRST,
+    ),
+    QueryShape(
+        "project_milestone.get_milestones",
+        "project_milestones",
+        {"proposal_id": "p"},
+        (("created_at", 1),),
+    ),
+    QueryShape(
+        "project_milestone.count_completed",
+        "project_milestones",
+        {"proposal_id": "p", "status": "COMPLETED"},
+    ),
+    QueryShape(
+        "budget.get_budgets_for_org",
+        "budgets",
+        {"proposal_id": {"$in": ["p"]}},
+        (("created_at", -1),),
+    ),
+    QueryShape(
+        "proposal_vote.count_yes",
+        "proposal_votes",
+        {"proposal_id": "p", "vote": "YES"},
+    ),
+    QueryShape(
+        "onboarding.process_import_chunk",
+        "import_job_rows",
+        {"job_id": "j", "status": None},
+        (("index", 1),),
+    ),
+    QueryShape(
+        "analytics.refresh_dirty_snapshots", "analytics_snapshots", {"dirty": True}
+    ),
+    QueryShape("otp.verify_otp", "otp_codes", {"identifier": "i"}),
+    QueryShape(
+        "rate_limit.check",
+        "rate_limits",
+        {"key": "k", "window_start": _NOW},
+    ),
+]
+
+
+def _split_filter(query: dict) -> Tuple[set, set]:
+    """Split a filter's fields into equality-matched and range-matched ones."""
+    equality, ranges = set(), set()
+    for key, value in query.items():
+        if key.startswith("$"):
+            continue
+        if isinstance(value, dict) and not set(value) <= EQUALITY_OPERATORS:
+            ranges.add(key)
+        else:
+            equality.add(key)
+    return equality, ranges
+
+
+def index_serves(index: IndexSpec, shape: QueryShape) -> bool:
+    """
+    Whether the index can answer the shape without a collection scan or an
+    in-memory sort: its leading keys are equality fields of the filter, and
+    the keys right after them follow the sort (or its exact reverse).
+    """
+    equality, ranges = _split_filter(shape.filter)
+    keys = list(index.keys)
+
+    prefix = 0
+    while prefix < len(keys) and keys[prefix][0] in equality:
+        prefix += 1
+
+    # Sorting on a field pinned by equality is free
+    sort = [(key, direction) for key, direction in shape.sort if key not in equality]
+    if not sort:
+        return prefix > 0 or (bool(keys) and keys[0][0] in ranges)
+
+    if prefix == 0 and equality:
+        return False
+    following = keys[prefix:][: len(sort)]
+    if [key for key, _ in following] != [key for key, _ in sort]:
+        return False
+    same = all(a == b for (_, a), (_, b) in zip(following, sort))
+    reverse = all(a == -b for (_, a), (_, b) in zip(following, sort))
+    return same or reverse
+
+
+def uncovered_queries(
+    plan: Sequence[IndexSpec] = INDEX_PLAN,
+    shapes: Sequence[QueryShape] = QUERY_SHAPES,
+) -> List[Tuple[QueryShape, str]]:
+    """Query shapes no planned index serves, with what MongoDB would do instead."""
+    uncovered = []
+    for shape in shapes:
+        reason = unserved_reason(shape, plan)
+        if reason:
+            uncovered.append((shape, reason))
+    return uncovered
+
+
+def unserved_reason(
+    shape: QueryShape, plan: Sequence[IndexSpec] = INDEX_PLAN
+) -> Optional[str]:
+    """
+    None if a planned index (or the implicit _id index) serves the shape,
+    otherwise what MongoDB does instead: "in-memory sort" or "collection scan".
+    """
+    indexes = [i for i in plan if i.collection == shape.collection]
+    indexes.append(_index(shape.collection, "_id"))
+    if any(index_serves(i, shape) for i in indexes):
+        return None
+    equality, ranges = _split_filter(shape.filter)
+    usable = any(i.keys[0][0] in equality | ranges for i in indexes)
+    return "in-memory sort" if usable else "collection scan"
+
+
+def plan_by_collection(
+    plan: Sequence[IndexSpec] = INDEX_PLAN,
+) -> Dict[str, List[IndexSpec]]:
+    collections: Dict[str, List[IndexSpec]] = {}
+    for index in plan:
+        collections.setdefault(index.collection, []).append(index)
+    return collections
+
+
+def plan_version(plan: Sequence[IndexSpec] = INDEX_PLAN) -> str:
+    """Content hash of the plan; it changes whenever an index is added or altered."""
+    entries = sorted(
+        json.dumps([i.collection, i.keys, i.options()], sort_keys=True) for i in plan
+    )
+    return hashlib.sha256("\n".join(entries).encode()).hexdigest()[:12]
+
+
+async def create_planned_indexes(database, plan: Sequence[IndexSpec] = INDEX_PLAN):
+    """
+    Create every planned index. Existing indexes are left as they are.
+    Collections are built concurrently, each one's indexes in turn.
+    """
+
+    async def create_for(indexes: List[IndexSpec]) -> None:
+        for index in indexes:
+            await database[index.collection].create_index(
+                list(index.keys), **index.options()
+            )
+
+    await asyncio.gather(*(create_for(i) for i in plan_by_collection(plan).values()))
+
+
+async def applied_version(database) -> Optional[str]:
+    """Version of the last index plan applied to the database, if any."""
+    manifest = await database[MANIFEST_COLLECTION].find_one({"_id": MANIFEST_ID})
+    return manifest.get("version") if manifest else None
+
+
+async def apply_index_plan(
+    database, force: bool = False, plan: Sequence[IndexSpec] = INDEX_PLAN
+) -> bool:
+    """
+    Create the planned indexes and record the plan version in the manifest.
+    Skipped when this version is already applied, unless forced. Returns
+    whether indexes were created.
+    """
+    version = plan_version(plan)
+    if not force and await applied_version(database) == version:
+        return False
+
+    await create_planned_indexes(database, plan)
+    await database[MANIFEST_COLLECTION].update_one(
+        {"_id": MANIFEST_ID},
+        {
+            "$set": {
+                "version": version,
+                "indexes": [f"{i.collection}.{i.name}" for i in plan],
+                "applied_at": datetime.utcnow(),
+            }
+        },
+        upsert=True,
+    )
+    return True
+
+
+async def missing_indexes(
+    database, plan: Sequence[IndexSpec] = INDEX_PLAN
+) -> List[IndexSpec]:
+    """Planned indexes that do not exist in the database."""
+    missing = []
+    for collection, indexes in plan_by_collection(plan).items():
+        existing = await database[collection].index_information()
+        existing_keys = {
+            tuple(tuple(k) for k in info["key"]) for info in existing.values()
+        }
+        missing.extend(i for i in indexes if i.keys not in existing_keys)
+    return missing
+
+
+async def verify_indexes(database) -> List[IndexSpec]:
+    """
+    Startup check. When the manifest shows the current plan is applied this
+    is a single lookup; otherwise the missing indexes are listed and logged.
+    Never raises, so a bad check cannot block startup.
+    """
+    for shape, reason in uncovered_queries():
+        logger.warning("Query %s would use a %s", shape.name, reason)
+    try:
+        version = await applied_version(database)
+        if version == plan_version():
+            return []
+        logger.warning(
+            "Index plan %s is not applied (database has %s); "
+            "run `python -m apps.api.indexes apply`",
+            plan_version(),
+            version,
+        )
+        missing = await missing_indexes(database)
+    except Exception:
+        logger.exception("Index verification failed")
+        return []
+    for index in missing:
+        logger.warning("Missing index %s.%s", index.collection, index.name)
+    return missing
+
+
+def format_report(
+    uncovered: Sequence[Tuple[QueryShape, str]],
+    missing: Optional[Sequence[IndexSpec]] = None,
+) -> str:
+    lines = [f"{len(QUERY_SHAPES)} query shapes, {len(INDEX_PLAN)} planned indexes"]
+    if uncovered:
+        lines.append("Queries not served by a planned index:")
+        lines.extend(f"  {shape.name}: {reason}" for shape, reason in uncovered)
+    else:
+        lines.append("Every query shape is served by a planned index.")
+    if missing is not None:
+        if missing:
+            lines.append("Planned indexes missing from the database:")
+            lines.extend(f"  {i.collection}.{i.name}" for i in missing)
+        else:
+            lines.append("All planned indexes exist.")
+    return "\n".join(lines)
+
+
+async def _run(command: str, verify: bool = False, force: bool = False) -> str:
+    if command == "report" and not verify:
+        return format_report(uncovered_queries())
+
+    from .database import db
+
+    await db.connect()
+    try:
+        if command == "apply":
+            applied = await apply_index_plan(db.db, force=force)
+            if not applied:
+                return f"Index plan {plan_version()} is already applied."
+            return f"Applied index plan {plan_version()}."
+        if command == "status":
+            version = await applied_version(db.db)
+            state = "up to date" if version == plan_version() else "pending"
+            return f"Planned {plan_version()}, applied {version}: {state}"
+        return format_report(uncovered_queries(), await missing_indexes(db.db))
+    finally:
+        await db.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the index plan.")
+    commands = parser.add_subparsers(dest="command")
+    apply = commands.add_parser("apply", help="create the planned indexes")
+    apply.add_argument(
+        "--force",
+        action="store_true",
+        help="create indexes even if this plan version is already applied",
+    )
+    commands.add_parser("status", help="compare the planned and applied versions")
+    report = commands.add_parser("report", help="report queries no index serves")
+    report.add_argument(
+        "--verify",
+        action="store_true",
+        help="also check the planned indexes exist in MONGODB_URI",
+    )
+    args = parser.parse_args()
+    print(
+        asyncio.run(
+            _run(
+                args.command or "report",
+                verify=getattr(args, "verify", False),
+                force=getattr(args, "force", False),
+            )
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,10 @@ from ..graphql_types.analytics import (
     ParticipationReport,
     TopContributor,
 )
-from ..src.analytics.service import get_community_analytics as service_analytics
 from ..src.analytics.service import get_participation_report as service_participation
+from ..src.analytics.snapshots import get_analytics_snapshot
 from ..src.auth.permissions import require_org_admin, require_org_member
+from ..src.dataloaders.loaders import get_loaders
 
 
 def _analytics_to_graphql(a: dict) -> CommunityAnalytics:
@@ -39,6 +40,7 @@ def _analytics_to_graphql(a: dict) -> CommunityAnalytics:
             )
             for t in a["top_contributors"]
         ],
+        computed_at=a.get("computed_at"),
     )
 
 
@@ -48,9 +50,9 @@ async def resolve_community_analytics(
 ) -> CommunityAnalytics:
     """Get community analytics. MEMBER only."""
     user = info.context.get("user")
-    await require_org_member(user, organization_id)
+    await require_org_member(user, organization_id, get_loaders(info))
 
-    analytics = await service_analytics(organization_id)
+    analytics = await get_analytics_snapshot(organization_id)
     return _analytics_to_graphql(analytics)
 
 
@@ -69,7 +71,7 @@ async def resolve_participation_report(
     session = await get_voting_session(session_id)
     if not session:
         raise Exception("Voting session not found")
-    await require_org_admin(user, session["organization_id"])
+    await require_org_admin(user, session["organization_id"], get_loaders(info))
 
     report = await service_participation(session_id)
 
@@ -3,25 +3,30 @@ from typing import List, Optional
 import strawberry
 
 from ..graphql_types.announcement import Announcement
+from ..graphql_types.pagination import Connection
 from ..src.announcement.service import create_announcement as service_create
 from ..src.announcement.service import delete_announcement as service_delete
 from ..src.announcement.service import get_announcement as service_get
 from ..src.announcement.service import get_announcements as service_list
+from ..src.announcement.service import get_announcements_page as service_page
 from ..src.announcement.service import update_announcement as service_update
 from ..src.auth.permissions import require_org_admin, require_org_member
-from ..src.notification.service import notify_org_members
+from ..src.dataloaders.loaders import get_loaders
+from ..src.outbox.service import enqueue
+from ..src.projection.service import projection_from_info
+from .pagination import NODE_PATH, page_to_connection
 
 
 def _mongo_announcement_to_graphql(a: dict) -> Announcement:
     return Announcement(
         id=str(a["_id"]),
-        title=a["title"],
-        content=a["content"],
-        organization_id=a["organization_id"],
-        author_id=a["author_id"],
+        title=a.get("title"),
+        content=a.get("content"),
+        organization_id=a.get("organization_id"),
+        author_id=a.get("author_id"),
         is_pinned=a.get("is_pinned", False),
-        created_at=a["created_at"],
-        updated_at=a["updated_at"],
+        created_at=a.get("created_at"),
+        updated_at=a.get("updated_at"),
     )
 
 
@@ -30,12 +35,28 @@ async def resolve_announcements(
 ) -> List[Announcement]:
     """Resolver for listing announcements. MEMBER only."""
     user = info.context.get("user")
-    await require_org_member(user, organization_id)
+    await require_org_member(user, organization_id, get_loaders(info))
 
-    announcements = await service_list(organization_id)
+    announcements = await service_list(organization_id, projection_from_info(info))
     return [_mongo_announcement_to_graphql(a) for a in announcements]
 
 
+async def resolve_announcements_connection(
+    info: strawberry.types.Info,
+    organization_id: str,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+) -> Connection[Announcement]:
+    """Resolver for paging through announcements. MEMBER only."""
+    user = info.context.get("user")
+    await require_org_member(user, organization_id, get_loaders(info))
+
+    page = await service_page(
+        organization_id, first, after, projection_from_info(info, path=NODE_PATH)
+    )
+    return page_to_connection(page, _mongo_announcement_to_graphql)
+
+
 async def resolve_announcement(
     info: strawberry.types.Info, id: str
 ) -> Optional[Announcement]:
@@ -48,7 +69,7 @@ async def resolve_announcement(
     if not announcement:
         return None
 
-    await require_org_member(user, announcement["organization_id"])
+    await require_org_member(user, announcement["organization_id"], get_loaders(info))
     return _mongo_announcement_to_graphql(announcement)
 
 
@@ -61,7 +82,7 @@ async def resolve_create_announcement(
 ) -> Announcement:
     """Resolver for creating an announcement. ADMIN only."""
     user = info.context.get("user")
-    await require_org_admin(user, organization_id)
+    await require_org_admin(user, organization_id, get_loaders(info))
 
     author_id = user.get("id") or str(user.get("_id"))
     announcement = await service_create(
@@ -69,13 +90,16 @@ async def resolve_create_announcement(
     )
 
     # Notify all org members about new announcement
-    await notify_org_members(
-        organization_id=organization_id,
-        exclude_user_id=author_id,
-        notification_type="NEW_ANNOUNCEMENT",
-        title=f"New announcement: {title}",
-        message=content[:100] + ("..." if len(content) > 100 else ""),
-        reference_id=str(announcement["_id"]),
+    await enqueue(
+        "notify_org_members",
+        {
+            "organization_id": organization_id,
+            "exclude_user_id": author_id,
+            "notification_type": "NEW_ANNOUNCEMENT",
+            "title": f"New announcement: {title}",
+            "message": content[:100] + ("..." if len(content) > 100 else ""),
+            "reference_id": str(announcement["_id"]),
+        },
     )
 
     return _mongo_announcement_to_graphql(announcement)
@@ -97,7 +121,7 @@ async def resolve_update_announcement(
     if not announcement:
         raise Exception("Announcement not found")
 
-    await require_org_admin(user, announcement["organization_id"])
+    await require_org_admin(user, announcement["organization_id"], get_loaders(info))
     updated = await service_update(id, title, content, is_pinned)
     return _mongo_announcement_to_graphql(updated)
 
@@ -112,5 +136,5 @@ async def resolve_delete_announcement(info: strawberry.types.Info, id: str) -> b
     if not announcement:
         raise Exception("Announcement not found")
 
-    await require_org_admin(user, announcement["organization_id"])
+    await require_org_admin(user, announcement["organization_id"], get_loaders(info))
     return await service_delete(id)
@@ -20,13 +20,12 @@ from ..src.auth.service import create_invitation as service_create_invitation
 from ..src.auth.service import create_organization as service_create_org
 from ..src.auth.service import get_organization_members as service_get_members
 from ..src.auth.service import get_pending_invitations as service_get_pending
-from ..src.auth.service import (
-    get_user_with_memberships,
-)
+from ..src.auth.service import get_user_with_memberships
 from ..src.auth.service import remove_member_from_organization as service_remove_member
 from ..src.auth.service import resend_invitation as service_resend_invitation
 from ..src.auth.service import revoke_invitation as service_revoke_invitation
 from ..src.auth.service import update_member_role as service_update_role
+from ..src.dataloaders.loaders import get_loaders
 
 
 def _mongo_house_to_graphql(h: dict) -> House:
@@ -54,6 +53,7 @@ def _mongo_invitation_to_graphql(inv: dict) -> Invitation:
         expires_at=inv["expires_at"],
         created_at=inv["created_at"],
         accepted_at=inv.get("accepted_at"),
+        delivery_status=inv.get("delivery_status"),
     )
 
 
@@ -117,7 +117,7 @@ async def resolve_create_invitation(
 ) -> Invitation:
     """Resolver for creating an invitation."""
     user = info.context.get("user")
-    await require_org_admin(user, organization_id)
+    await require_org_admin(user, organization_id, get_loaders(info))
 
     user_id = user.get("id") or str(user.get("_id"))
     invitation = await service_create_invitation(
@@ -135,7 +135,7 @@ async def resolve_pending_invitations(
 ) -> List[Invitation]:
     """Resolver for listing pending invitations. Admin only."""
     user = info.context.get("user")
-    await require_org_admin(user, organization_id)
+    await require_org_admin(user, organization_id, get_loaders(info))
 
     invitations = await service_get_pending(organization_id)
     return [_mongo_invitation_to_graphql(inv) for inv in invitations]
@@ -151,6 +151,7 @@ async def resolve_accept_invitation(
 
     user_id = user.get("id") or str(user.get("_id"))
     invitation = await service_accept_invitation(invitation_id, user_id)
+    get_loaders(info).memberships.clear_all()
     return _mongo_invitation_to_graphql(invitation)
 
 
@@ -174,7 +175,7 @@ async def resolve_revoke_invitation(
     if not inv:
         raise Exception("Invitation not found")
 
-    await require_org_admin(user, inv["organization_id"])
+    await require_org_admin(user, inv["organization_id"], get_loaders(info))
 
     await service_revoke_invitation(invitation_id)
     return True
@@ -200,7 +201,7 @@ async def resolve_resend_invitation(
     if not inv:
         raise Exception("Invitation not found")
 
-    await require_org_admin(user, inv["organization_id"])
+    await require_org_admin(user, inv["organization_id"], get_loaders(info))
 
     updated = await service_resend_invitation(invitation_id)
     return _mongo_invitation_to_graphql(updated)
@@ -233,7 +234,7 @@ async def resolve_organization_members(
     if not user:
         raise Exception("Authentication required")
 
-    await require_org_member(user, organization_id)
+    await require_org_member(user, organization_id, get_loaders(info))
     members = await service_get_members(organization_id)
     return [_mongo_member_to_member_with_user(m) for m in members]
 
@@ -258,10 +259,11 @@ async def resolve_update_member_role(
     if not member:
         raise Exception("Member not found")
 
-    await require_org_admin(user, member["organization_id"])
+    await require_org_admin(user, member["organization_id"], get_loaders(info))
 
     user_id = user.get("id") or str(user.get("_id"))
     updated = await service_update_role(member_id, role.value, user_id)
+    get_loaders(info).memberships.clear_all()
     return _mongo_member_to_member_with_user(updated)
 
 
@@ -282,10 +284,11 @@ async def resolve_remove_member(info: strawberry.types.Info, member_id: str) ->
     if not member:
         raise Exception("Member not found")
 
-    await require_org_admin(user, member["organization_id"])
+    await require_org_admin(user, member["organization_id"], get_loaders(info))
 
     user_id = user.get("id") or str(user.get("_id"))
     await service_remove_member(member_id, user_id)
+    get_loaders(info).memberships.clear_all()
     return True
 
 
@@ -299,6 +302,7 @@ async def resolve_create_organization(
 
     user_id = user.get("id") or str(user.get("_id"))
     org = await service_create_org(name, user_id)
+    get_loaders(info).memberships.clear_all()
 
     return Organization(
         id=str(org["_id"]),
@@ -8,6 +8,7 @@ from ..src.budget.service import create_or_update_budget as service_upsert
 from ..src.budget.service import get_budget as service_get
 from ..src.budget.service import get_financial_summary as service_summary
 from ..src.budget.service import update_spent_amount as service_update_spent
+from ..src.dataloaders.loaders import get_loaders
 
 
 def _budget_to_graphql(b: dict, total_houses: int = 0) -> Budget:
@@ -30,13 +31,11 @@ async def resolve_proposal_budget(
     proposal_id: str,
 ) -> Optional[Budget]:
     """Get budget for a proposal. MEMBER only."""
-    from ..src.proposal.service import get_proposal
-
     user = info.context.get("user")
-    proposal = await get_proposal(proposal_id)
+    proposal = await get_loaders(info).proposals.load(proposal_id)
     if not proposal:
         raise Exception("Proposal not found")
-    await require_org_member(user, proposal["organization_id"])
+    await require_org_member(user, proposal["organization_id"], get_loaders(info))
 
     from ..database import db
 
@@ -55,7 +54,7 @@ async def resolve_financial_summary(
 ) -> FinancialSummary:
     """Get financial summary for an organization. MEMBER only."""
     user = info.context.get("user")
-    await require_org_member(user, organization_id)
+    await require_org_member(user, organization_id, get_loaders(info))
 
     summary = await service_summary(organization_id)
     return FinancialSummary(
@@ -80,7 +79,7 @@ async def resolve_set_budget(
     proposal = await get_proposal(proposal_id)
     if not proposal:
         raise Exception("Proposal not found")
-    await require_org_admin(user, proposal["organization_id"])
+    await require_org_admin(user, proposal["organization_id"], get_loaders(info))
 
     created_by = user.get("id") or str(user.get("_id"))
 
@@ -105,7 +104,7 @@ async def resolve_update_spent_amount(
     proposal = await get_proposal(proposal_id)
     if not proposal:
         raise Exception("Proposal not found")
-    await require_org_admin(user, proposal["organization_id"])
+    await require_org_admin(user, proposal["organization_id"], get_loaders(info))
 
     from ..database import db
 
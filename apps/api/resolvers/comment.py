@@ -9,6 +9,7 @@ from ..src.comment.service import delete_comment as service_delete_comment
 from ..src.comment.service import get_comment as service_get_comment
 from ..src.comment.service import get_comments as service_get_comments
 from ..src.comment.service import update_comment as service_update_comment
+from ..src.dataloaders.loaders import get_loaders
 from ..src.notification.service import create_notification
 from ..src.proposal.service import get_proposal
 
@@ -35,11 +36,11 @@ async def resolve_comments(
     if not user:
         raise Exception("Authentication required")
 
-    proposal = await get_proposal(proposal_id)
+    proposal = await get_loaders(info).proposals.load(proposal_id)
     if not proposal:
         raise Exception("Proposal not found")
 
-    await require_org_member(user, proposal["organization_id"])
+    await require_org_member(user, proposal["organization_id"], get_loaders(info))
 
     comments = await service_get_comments(proposal_id)
     return [_mongo_comment_to_graphql(c) for c in comments]
@@ -60,7 +61,7 @@ async def resolve_create_comment(
     if not proposal:
         raise Exception("Proposal not found")
 
-    await require_org_member(user, proposal["organization_id"])
+    await require_org_member(user, proposal["organization_id"], get_loaders(info))
 
     author_id = user.get("id") or str(user.get("_id"))
     comment = await service_create_comment(proposal_id, author_id, content, parent_id)
@@ -116,7 +117,9 @@ async def resolve_delete_comment(info: strawberry.types.Info, id: str) -> bool:
         # Check if admin by getting proposal's org
         proposal = await get_proposal(comment["proposal_id"])
         if proposal:
-            await require_org_admin(user, proposal["organization_id"])
+            await require_org_admin(
+                user, proposal["organization_id"], get_loaders(info)
+            )
         else:
             raise Exception("Not authorized to delete this comment")
 
@@ -3,12 +3,16 @@ from typing import List, Optional
 import strawberry
 
 from ..graphql_types.document import Document
+from ..graphql_types.pagination import Connection
 from ..src.auth.permissions import require_org_admin, require_org_member
+from ..src.dataloaders.loaders import get_loaders
 from ..src.document.service import attach_document as service_attach
 from ..src.document.service import delete_document as service_delete
 from ..src.document.service import get_document as service_get
 from ..src.document.service import get_documents as service_list
+from ..src.document.service import get_documents_page as service_page
 from ..src.document.service import mark_quote_selected as service_select
+from .pagination import page_to_connection
 
 
 def _doc_to_graphql(d: dict) -> Document:
@@ -33,18 +37,34 @@ async def resolve_documents(
     type: Optional[str] = None,
 ) -> List[Document]:
     """List documents for a proposal. MEMBER only."""
-    from ..src.proposal.service import get_proposal
-
     user = info.context.get("user")
-    proposal = await get_proposal(proposal_id)
+    proposal = await get_loaders(info).proposals.load(proposal_id)
     if not proposal:
         raise Exception("Proposal not found")
-    await require_org_member(user, proposal["organization_id"])
+    await require_org_member(user, proposal["organization_id"], get_loaders(info))
 
     docs = await service_list(proposal_id, type)
     return [_doc_to_graphql(d) for d in docs]
 
 
+async def resolve_documents_connection(
+    info: strawberry.types.Info,
+    proposal_id: str,
+    type: Optional[str] = None,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+) -> Connection[Document]:
+    """Page through documents for a proposal. MEMBER only."""
+    user = info.context.get("user")
+    proposal = await get_loaders(info).proposals.load(proposal_id)
+    if not proposal:
+        raise Exception("Proposal not found")
+    await require_org_member(user, proposal["organization_id"], get_loaders(info))
+
+    page = await service_page(proposal_id, type, first, after)
+    return page_to_connection(page, _doc_to_graphql)
+
+
 async def resolve_attach_document(
     info: strawberry.types.Info,
     proposal_id: str,
@@ -64,7 +84,7 @@ async def resolve_attach_document(
     proposal = await get_proposal(proposal_id)
     if not proposal:
         raise Exception("Proposal not found")
-    await require_org_member(user, proposal["organization_id"])
+    await require_org_member(user, proposal["organization_id"], get_loaders(info))
 
     uploaded_by = user.get("id") or str(user.get("_id"))
     doc = await service_attach(
@@ -97,7 +117,9 @@ async def resolve_delete_document(
     # Check if user is uploader or admin
     from ..src.auth.permissions import get_user_role_in_org
 
-    role = await get_user_role_in_org(user_id, proposal["organization_id"])
+    role = await get_user_role_in_org(
+        user_id, proposal["organization_id"], get_loaders(info)
+    )
     if role != "ADMIN" and doc["uploaded_by"] != user_id:
         raise Exception("Permission denied")
 
@@ -120,6 +142,6 @@ async def resolve_mark_quote_selected(
     if not proposal:
         raise Exception("Proposal not found")
 
-    await require_org_admin(user, proposal["organization_id"])
+    await require_org_admin(user, proposal["organization_id"], get_loaders(info))
     updated = await service_select(id, doc["proposal_id"])
     return _doc_to_graphql(updated)
@@ -13,6 +13,7 @@ from ..src.auth.permissions import (
     require_org_admin,
     require_org_member,
 )
+from ..src.dataloaders.loaders import get_loaders
 from ..src.house.service import assign_resident_to_house as service_assign_resident
 from ..src.house.service import create_house as service_create_house
 from ..src.house.service import delete_house as service_delete_house
@@ -21,6 +22,7 @@ from ..src.house.service import get_houses as service_get_houses
 from ..src.house.service import remove_resident_from_house as service_remove_resident
 from ..src.house.service import set_house_voter as service_set_house_voter
 from ..src.house.service import update_house as service_update_house
+from ..src.projection.service import projection_from_info, selected_field_names
 
 
 def _mongo_member_to_graphql(m: dict) -> OrganizationMember:
@@ -94,11 +96,11 @@ def _mongo_house_to_graphql(h: dict) -> House:
 
     return House(
         id=str(h["_id"]),
-        name=h["name"],
-        organization_id=h["organization_id"],
+        name=h.get("name"),
+        organization_id=h.get("organization_id"),
         voter_user_id=h.get("voter_user_id"),
-        created_at=h["created_at"],
-        updated_at=h["updated_at"],
+        created_at=h.get("created_at"),
+        updated_at=h.get("updated_at"),
         residents=residents,
     )
 
@@ -109,9 +111,14 @@ async def resolve_houses(
     """Resolver for listing houses in an organization."""
     user = info.context.get("user")
     if user:
-        await require_org_member(user, organization_id)
+        await require_org_member(user, organization_id, get_loaders(info))
 
-    houses = await service_get_houses(organization_id)
+    selected = selected_field_names(info)
+    houses = await service_get_houses(
+        organization_id,
+        projection_from_info(info, depends={"residents": ()}),
+        include_residents=selected is None or "residents" in selected,
+    )
     return [_mongo_house_to_graphql(h) for h in houses]
 
 
@@ -125,7 +132,7 @@ async def resolve_house(info: strawberry.types.Info, id: str) -> Optional[House]
     if not house:
         return None
 
-    await require_org_member(user, house["organization_id"])
+    await require_org_member(user, house["organization_id"], get_loaders(info))
     return _mongo_house_to_graphql(house)
 
 
@@ -134,7 +141,7 @@ async def resolve_create_house(
 ) -> House:
     """Resolver for creating a new house. ADMIN only."""
     user = info.context.get("user")
-    await require_org_admin(user, organization_id)
+    await require_org_admin(user, organization_id, get_loaders(info))
 
     house = await service_create_house(organization_id, name)
     return _mongo_house_to_graphql(house)
@@ -148,10 +155,10 @@ async def resolve_update_house(
     if not user:
         raise Exception("Authentication required")
 
-    org_id = await get_org_id_for_house(id)
+    org_id = await get_org_id_for_house(id, get_loaders(info))
     if not org_id:
         raise Exception("House not found")
-    await require_org_admin(user, org_id)
+    await require_org_admin(user, org_id, get_loaders(info))
 
     house = await service_update_house(id, name)
     return _mongo_house_to_graphql(house)
@@ -163,10 +170,10 @@ async def resolve_delete_house(info: strawberry.types.Info, id: str) -> bool:
     if not user:
         raise Exception("Authentication required")
 
-    org_id = await get_org_id_for_house(id)
+    org_id = await get_org_id_for_house(id, get_loaders(info))
     if not org_id:
         raise Exception("House not found")
-    await require_org_admin(user, org_id)
+    await require_org_admin(user, org_id, get_loaders(info))
 
     return await service_delete_house(id)
 
@@ -179,10 +186,10 @@ async def resolve_assign_resident_to_house(
     if not user:
         raise Exception("Authentication required")
 
-    org_id = await get_org_id_for_house(house_id)
+    org_id = await get_org_id_for_house(house_id, get_loaders(info))
     if not org_id:
         raise Exception("House not found")
-    await require_org_admin(user, org_id)
+    await require_org_admin(user, org_id, get_loaders(info))
 
     member = await service_assign_resident(user_id, house_id)
     return _mongo_member_to_graphql(member)
@@ -193,7 +200,7 @@ async def resolve_remove_resident_from_house(
 ) -> OrganizationMember:
     """Resolver for removing a resident from a house. ADMIN only."""
     user = info.context.get("user")
-    await require_org_admin(user, organization_id)
+    await require_org_admin(user, organization_id, get_loaders(info))
 
     member = await service_remove_resident(user_id, organization_id)
     return _mongo_member_to_graphql(member)
@@ -207,12 +214,12 @@ async def resolve_set_house_voter(
     if not user:
         raise Exception("Authentication required")
 
-    org_id = await get_org_id_for_house(house_id)
+    org_id = await get_org_id_for_house(house_id, get_loaders(info))
     if not org_id:
         raise Exception("House not found")
 
     user_id = user.get("id") or str(user.get("_id"))
-    role = await require_org_member(user, org_id)
+    role = await require_org_member(user, org_id, get_loaders(info))
 
     # Allow if admin OR if caller is a resident of this house
     if role != "ADMIN":
@@ -1,18 +1,25 @@
-from typing import List
+from typing import List, Optional
 
 import strawberry
 
 from ..graphql_types.notification import ActivityItem, Notification
+from ..graphql_types.pagination import Connection
 from ..src.auth.permissions import require_org_member
+from ..src.dataloaders.loaders import get_loaders
 from ..src.notification.service import (
     get_activity_feed,
+    get_activity_feed_page,
 )
 from ..src.notification.service import get_notifications as service_get_notifications
+from ..src.notification.service import (
+    get_notifications_page as service_get_notifications_page,
+)
 from ..src.notification.service import get_unread_count as service_get_unread_count
 from ..src.notification.service import mark_all_read as service_mark_all_read
 from ..src.notification.service import (
     mark_notification_read as service_mark_notification_read,
 )
+from .pagination import page_to_connection
 
 
 def _mongo_notification_to_graphql(n: dict) -> Notification:
@@ -55,6 +62,21 @@ async def resolve_notifications(
     return [_mongo_notification_to_graphql(n) for n in notifications]
 
 
+async def resolve_notifications_connection(
+    info: strawberry.types.Info,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+) -> Connection[Notification]:
+    """Resolver for paging through notifications for current user."""
+    user = info.context.get("user")
+    if not user:
+        raise Exception("Authentication required")
+
+    user_id = user.get("id") or str(user.get("_id"))
+    page = await service_get_notifications_page(user_id, first, after)
+    return page_to_connection(page, _mongo_notification_to_graphql)
+
+
 async def resolve_unread_notification_count(info: strawberry.types.Info) -> int:
     """Resolver for unread notification count."""
     user = info.context.get("user")
@@ -102,7 +124,21 @@ async def resolve_activity_feed(
 ) -> List[ActivityItem]:
     """Resolver for activity feed. MEMBER only."""
     user = info.context.get("user")
-    await require_org_member(user, organization_id)
+    await require_org_member(user, organization_id, get_loaders(info))
 
     items = await get_activity_feed(organization_id, limit)
     return [_activity_to_graphql(item) for item in items]
+
+
+async def resolve_activity_feed_connection(
+    info: strawberry.types.Info,
+    organization_id: str,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+) -> Connection[ActivityItem]:
+    """Resolver for paging through the activity feed. MEMBER only."""
+    user = info.context.get("user")
+    await require_org_member(user, organization_id, get_loaders(info))
+
+    page = await get_activity_feed_page(organization_id, first, after)
+    return page_to_connection(page, _activity_to_graphql)
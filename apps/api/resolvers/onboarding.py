@@ -1,15 +1,65 @@
+from typing import List, Optional
+
 import strawberry
 
 from ..graphql_types.auth import Organization
 from ..graphql_types.onboarding import (
     BulkSetupInput,
     BulkSetupResult,
+    BulkSetupRow,
     BulkSetupRowResult,
+    ImportStatus,
+    OnboardingImport,
     RowStatus,
 )
+from ..src.auth.permissions import require_org_admin
+from ..src.dataloaders.loaders import get_loaders
+from ..src.onboarding.imports import append_import_rows, get_import_job
+from ..src.onboarding.imports import get_import_rows as service_get_import_rows
+from ..src.onboarding.imports import parse_csv_rows, start_import, submit_import
 from ..src.onboarding.service import bulk_setup_organization
 
 
+def _row_input_to_dict(row: BulkSetupRow) -> dict:
+    return {
+        "row_id": row.row_id,
+        "property_name": row.property_name,
+        "first_name": row.first_name,
+        "last_name": row.last_name,
+        "phone": row.phone,
+        "email": row.email,
+    }
+
+
+def _import_to_graphql(job: dict) -> OnboardingImport:
+    return OnboardingImport(
+        id=str(job["_id"]),
+        organization_id=job["organization_id"],
+        status=ImportStatus(job["status"]),
+        total_rows=job["total_rows"],
+        processed_rows=job["processed_rows"],
+        error_rows=job["error_rows"],
+        total_properties=job["total_properties"],
+        total_residents=job["total_residents"],
+        whatsapp_invitations_sent=job["whatsapp_invitations_sent"],
+        email_invitations_sent=job["email_invitations_sent"],
+        properties_without_contact=job["properties_without_contact"],
+        error=job.get("error"),
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        completed_at=job.get("completed_at"),
+    )
+
+
+async def _require_import_admin(info: strawberry.types.Info, job_id: str) -> dict:
+    user = info.context.get("user")
+    job = await get_import_job(job_id)
+    if not job:
+        raise Exception("Import job not found")
+    await require_org_admin(user, job["organization_id"], get_loaders(info))
+    return job
+
+
 async def resolve_bulk_setup_organization(
     info: strawberry.types.Info, input: BulkSetupInput
 ) -> BulkSetupResult:
@@ -20,17 +70,7 @@ async def resolve_bulk_setup_organization(
 
     user_id = user.get("id") or str(user.get("_id"))
 
-    rows_data = [
-        {
-            "row_id": row.row_id,
-            "property_name": row.property_name,
-            "first_name": row.first_name,
-            "last_name": row.last_name,
-            "phone": row.phone,
-            "email": row.email,
-        }
-        for row in input.rows
-    ]
+    rows_data = [_row_input_to_dict(row) for row in input.rows]
 
     result = await bulk_setup_organization(
         organization_name=input.organization_name,
@@ -63,3 +103,74 @@ async def resolve_bulk_setup_organization(
             for r in result["rows"]
         ],
     )
+
+
+async def resolve_start_onboarding_import(
+    info: strawberry.types.Info, organization_name: str
+) -> OnboardingImport:
+    """Create an organization and an import job to stream its rows into."""
+    user = info.context.get("user")
+    if not user:
+        raise Exception("Authentication required")
+
+    user_id = user.get("id") or str(user.get("_id"))
+    job = await start_import(organization_name, user_id)
+    return _import_to_graphql(job)
+
+
+async def resolve_append_onboarding_import_rows(
+    info: strawberry.types.Info,
+    import_id: str,
+    rows: Optional[List[BulkSetupRow]] = None,
+    csv: Optional[str] = None,
+) -> OnboardingImport:
+    """Append a batch of rows, given as inputs or CSV text. ADMIN only."""
+    await _require_import_admin(info, import_id)
+
+    rows_data = [_row_input_to_dict(row) for row in rows or []]
+    if csv:
+        rows_data.extend(parse_csv_rows(csv))
+
+    job = await append_import_rows(import_id, rows_data)
+    return _import_to_graphql(job)
+
+
+async def resolve_submit_onboarding_import(
+    info: strawberry.types.Info, import_id: str
+) -> OnboardingImport:
+    """Finish uploading and start processing the import. ADMIN only."""
+    await _require_import_admin(info, import_id)
+
+    job = await submit_import(import_id)
+    return _import_to_graphql(job)
+
+
+async def resolve_onboarding_import(
+    info: strawberry.types.Info, import_id: str
+) -> OnboardingImport:
+    """Get import progress. ADMIN only."""
+    job = await _require_import_admin(info, import_id)
+    return _import_to_graphql(job)
+
+
+async def resolve_onboarding_import_rows(
+    info: strawberry.types.Info,
+    import_id: str,
+    offset: int = 0,
+    limit: int = 100,
+) -> List[BulkSetupRowResult]:
+    """Get per-row results of an import. Rows not yet processed are omitted. ADMIN only."""
+    await _require_import_admin(info, import_id)
+
+    rows = await service_get_import_rows(import_id, offset, limit)
+    return [
+        BulkSetupRowResult(
+            row_id=r["row_id"],
+            status=RowStatus(r["status"]),
+            error=r.get("error"),
+            property_id=r.get("property_id"),
+            user_id=r.get("user_id"),
+        )
+        for r in rows
+        if r["status"] in ("SUCCESS", "ERROR")
+    ]
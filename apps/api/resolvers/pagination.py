@@ -0,0 +1,21 @@
+from typing import Callable, TypeVar
+
+from ..graphql_types.pagination import Connection, Edge, PageInfo
+
+T = TypeVar("T")
+
+# Fields a connection's node selection is read from
+NODE_PATH = ("edges", "node")
+
+
+def page_to_connection(page: dict, convert: Callable[[dict], T]) -> Connection[T]:
+    """Convert a service-layer page into a GraphQL connection."""
+    return Connection(
+        edges=[
+            Edge(node=convert(edge["node"]), cursor=edge["cursor"])
+            for edge in page["edges"]
+        ],
+        page_info=PageInfo(
+            has_next_page=page["has_next_page"], end_cursor=page["end_cursor"]
+        ),
+    )
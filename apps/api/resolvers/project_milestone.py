@@ -4,6 +4,7 @@ import strawberry
 
 from ..graphql_types.project_milestone import ProjectMilestone
 from ..src.auth.permissions import require_org_admin, require_org_member
+from ..src.dataloaders.loaders import get_loaders
 from ..src.project_milestone.service import create_milestone as service_create
 from ..src.project_milestone.service import delete_milestone as service_delete
 from ..src.project_milestone.service import get_milestone as service_get
@@ -33,13 +34,11 @@ async def resolve_project_milestones(
     proposal_id: str,
 ) -> List[ProjectMilestone]:
     """List milestones for a proposal. MEMBER only."""
-    from ..src.proposal.service import get_proposal
-
     user = info.context.get("user")
-    proposal = await get_proposal(proposal_id)
+    proposal = await get_loaders(info).proposals.load(proposal_id)
     if not proposal:
         raise Exception("Proposal not found")
-    await require_org_member(user, proposal["organization_id"])
+    await require_org_member(user, proposal["organization_id"], get_loaders(info))
 
     milestones = await service_list(proposal_id)
     return [_milestone_to_graphql(m) for m in milestones]
@@ -62,7 +61,7 @@ async def resolve_create_project_milestone(
     proposal = await get_proposal(proposal_id)
     if not proposal:
         raise Exception("Proposal not found")
-    await require_org_admin(user, proposal["organization_id"])
+    await require_org_admin(user, proposal["organization_id"], get_loaders(info))
 
     created_by = user.get("id") or str(user.get("_id"))
 
@@ -89,7 +88,7 @@ async def resolve_update_milestone_status(
     proposal = await get_proposal(milestone["proposal_id"])
     if not proposal:
         raise Exception("Proposal not found")
-    await require_org_admin(user, proposal["organization_id"])
+    await require_org_admin(user, proposal["organization_id"], get_loaders(info))
 
     updated = await service_update_status(id, status)
     return _milestone_to_graphql(updated)
@@ -110,6 +109,6 @@ async def resolve_delete_project_milestone(
     proposal = await get_proposal(milestone["proposal_id"])
     if not proposal:
         raise Exception("Proposal not found")
-    await require_org_admin(user, proposal["organization_id"])
+    await require_org_admin(user, proposal["organization_id"], get_loaders(info))
 
     return await service_delete(id)
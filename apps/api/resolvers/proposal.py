@@ -2,38 +2,46 @@ from typing import List, Optional
 
 import strawberry
 
+from ..graphql_types.pagination import Connection
 from ..graphql_types.proposal import Proposal
 from ..src.auth.permissions import require_org_admin, require_org_member
-from ..src.notification.service import notify_designated_voters
+from ..src.dataloaders.loaders import get_loaders
+from ..src.outbox.service import enqueue
+from ..src.projection.service import projection_from_info
 from ..src.proposal.service import assign_responsible_house as service_assign_house
 from ..src.proposal.service import create_proposal as service_create_proposal
 from ..src.proposal.service import delete_proposal as service_delete_proposal
 from ..src.proposal.service import get_proposal as service_get_proposal
 from ..src.proposal.service import get_proposals as service_get_proposals
+from ..src.proposal.service import get_proposals_page as service_get_proposals_page
 from ..src.proposal.service import update_proposal as service_update_proposal
 from ..src.proposal.service import (
     update_proposal_status as service_update_proposal_status,
 )
+from .pagination import NODE_PATH, page_to_connection
 
 
 def _mongo_proposal_to_graphql(p: dict) -> Proposal:
-    """Convert a MongoDB Proposal document to GraphQL type."""
+    """
+    Convert a MongoDB Proposal document to GraphQL type. Fields left out by a
+    projection are None; GraphQL never reads them.
+    """
     return Proposal(
         id=str(p["_id"]),
-        title=p["title"],
-        description=p["description"],
-        category=p["category"],
-        status=p["status"],
-        author_id=p["author_id"],
-        organization_id=p["organization_id"],
+        title=p.get("title"),
+        description=p.get("description"),
+        category=p.get("category"),
+        status=p.get("status"),
+        author_id=p.get("author_id"),
+        organization_id=p.get("organization_id"),
         responsible_house_id=p.get("responsible_house_id"),
         rejection_reason=p.get("rejection_reason"),
         vote_status=p.get("vote_status"),
         vote_threshold=p.get("vote_threshold"),
         vote_started_at=p.get("vote_started_at"),
         vote_ended_at=p.get("vote_ended_at"),
-        created_at=p["created_at"],
-        updated_at=p["updated_at"],
+        created_at=p.get("created_at"),
+        updated_at=p.get("updated_at"),
     )
 
 
@@ -45,23 +53,48 @@ async def resolve_proposals(
 ) -> List[Proposal]:
     """Resolver for listing proposals in an organization. MEMBER only."""
     user = info.context.get("user")
-    await require_org_member(user, organization_id)
+    await require_org_member(user, organization_id, get_loaders(info))
 
-    proposals = await service_get_proposals(organization_id, status, category)
+    proposals = await service_get_proposals(
+        organization_id, status, category, projection_from_info(info)
+    )
     return [_mongo_proposal_to_graphql(p) for p in proposals]
 
 
+async def resolve_proposals_connection(
+    info: strawberry.types.Info,
+    organization_id: str,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+) -> Connection[Proposal]:
+    """Resolver for paging through proposals in an organization. MEMBER only."""
+    user = info.context.get("user")
+    await require_org_member(user, organization_id, get_loaders(info))
+
+    page = await service_get_proposals_page(
+        organization_id,
+        status,
+        category,
+        first,
+        after,
+        projection_from_info(info, path=NODE_PATH),
+    )
+    return page_to_connection(page, _mongo_proposal_to_graphql)
+
+
 async def resolve_proposal(info: strawberry.types.Info, id: str) -> Optional[Proposal]:
     """Resolver for getting a single proposal by ID."""
     user = info.context.get("user")
     if not user:
         raise Exception("Authentication required")
 
-    proposal = await service_get_proposal(id)
+    proposal = await get_loaders(info).proposals.load(id)
     if not proposal:
         return None
 
-    await require_org_member(user, proposal["organization_id"])
+    await require_org_member(user, proposal["organization_id"], get_loaders(info))
     return _mongo_proposal_to_graphql(proposal)
 
 
@@ -75,7 +108,7 @@ async def resolve_create_proposal(
 ) -> Proposal:
     """Resolver for creating a proposal. Any org member can create."""
     user = info.context.get("user")
-    await require_org_member(user, organization_id)
+    await require_org_member(user, organization_id, get_loaders(info))
 
     author_id = user.get("id") or str(user.get("_id"))
     proposal = await service_create_proposal(
@@ -103,7 +136,7 @@ async def resolve_update_proposal(
     user_id = user.get("id") or str(user.get("_id"))
     if proposal["author_id"] != user_id:
         # Admins can also update
-        await require_org_admin(user, proposal["organization_id"])
+        await require_org_admin(user, proposal["organization_id"], get_loaders(info))
 
     if proposal["status"] != "DRAFT":
         raise Exception("Only proposals in DRAFT status can be edited")
@@ -135,20 +168,23 @@ async def resolve_update_proposal_status(
     if is_author and proposal["status"] == "DRAFT" and status == "OPEN":
         pass  # allowed
     else:
-        await require_org_admin(user, proposal["organization_id"])
+        await require_org_admin(user, proposal["organization_id"], get_loaders(info))
 
     updated = await service_update_proposal_status(
         id, status, rejection_reason, responsible_house_id
     )
 
     if status == "VOTING":
-        await notify_designated_voters(
-            organization_id=proposal["organization_id"],
-            notification_type="PROPOSAL_VOTING_STARTED",
-            title=f"Vote Now: {proposal['title']}",
-            message=proposal["description"][:100]
-            + ("..." if len(proposal["description"]) > 100 else ""),
-            reference_id=id,
+        await enqueue(
+            "notify_designated_voters",
+            {
+                "organization_id": proposal["organization_id"],
+                "notification_type": "PROPOSAL_VOTING_STARTED",
+                "title": f"Vote Now: {proposal['title']}",
+                "message": proposal["description"][:100]
+                + ("..." if len(proposal["description"]) > 100 else ""),
+                "reference_id": id,
+            },
         )
 
     return _mongo_proposal_to_graphql(updated)
@@ -168,7 +204,7 @@ async def resolve_assign_responsible_house(
     if not proposal:
         raise Exception("Proposal not found")
 
-    await require_org_admin(user, proposal["organization_id"])
+    await require_org_admin(user, proposal["organization_id"], get_loaders(info))
 
     updated = await service_assign_house(proposal_id, house_id)
     return _mongo_proposal_to_graphql(updated)
@@ -188,7 +224,7 @@ async def resolve_delete_proposal(info: strawberry.types.Info, id: str) -> bool:
     is_author = proposal["author_id"] == user_id
 
     if not is_author:
-        await require_org_admin(user, proposal["organization_id"])
+        await require_org_admin(user, proposal["organization_id"], get_loaders(info))
     elif proposal["status"] != "DRAFT":
         raise Exception("Authors can only delete proposals in DRAFT status")
 
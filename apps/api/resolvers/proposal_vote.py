@@ -6,7 +6,8 @@ from ..graphql_types.proposal import Proposal
 from ..graphql_types.proposal_vote import ProposalVote, ProposalVoteResults
 from ..resolvers.proposal import _mongo_proposal_to_graphql
 from ..src.auth.permissions import require_org_admin, require_org_member
-from ..src.notification.service import notify_designated_voters
+from ..src.dataloaders.loaders import get_loaders
+from ..src.outbox.service import enqueue
 from ..src.proposal.service import get_proposal as service_get_proposal
 from ..src.proposal_vote.service import cast_proposal_vote as service_cast_vote
 from ..src.proposal_vote.service import close_proposal_vote as service_close_vote
@@ -53,18 +54,21 @@ async def resolve_start_proposal_vote(
     if not proposal:
         raise Exception("Proposal not found")
 
-    await require_org_admin(user, proposal["organization_id"])
+    await require_org_admin(user, proposal["organization_id"], get_loaders(info))
     admin_id = user.get("id") or str(user.get("_id"))
 
     updated = await service_start_vote(proposal_id, threshold, admin_id)
 
-    await notify_designated_voters(
-        organization_id=proposal["organization_id"],
-        notification_type="PROPOSAL_VOTING_STARTED",
-        title=f"Vote Now: {proposal['title']}",
-        message=proposal["description"][:100]
-        + ("..." if len(proposal["description"]) > 100 else ""),
-        reference_id=proposal_id,
+    await enqueue(
+        "notify_designated_voters",
+        {
+            "organization_id": proposal["organization_id"],
+            "notification_type": "PROPOSAL_VOTING_STARTED",
+            "title": f"Vote Now: {proposal['title']}",
+            "message": proposal["description"][:100]
+            + ("..." if len(proposal["description"]) > 100 else ""),
+            "reference_id": proposal_id,
+        },
     )
 
     return _mongo_proposal_to_graphql(updated)
@@ -81,14 +85,11 @@ async def resolve_cast_proposal_vote(
     if not user:
         raise Exception("Authentication required")
 
-    proposal = await service_get_proposal(proposal_id)
-    if not proposal:
-        raise Exception("Proposal not found")
-
-    await require_org_member(user, proposal["organization_id"])
     voter_id = user.get("id") or str(user.get("_id"))
-
-    vote_doc = await service_cast_vote(proposal_id, house_id, voter_id, vote)
+    # The service checks membership against the proposal it already reads
+    vote_doc = await service_cast_vote(
+        proposal_id, house_id, voter_id, vote, get_loaders(info)
+    )
     return _vote_to_graphql(vote_doc)
 
 
@@ -105,7 +106,7 @@ async def resolve_close_proposal_vote(
     if not proposal:
         raise Exception("Proposal not found")
 
-    await require_org_admin(user, proposal["organization_id"])
+    await require_org_admin(user, proposal["organization_id"], get_loaders(info))
     admin_id = user.get("id") or str(user.get("_id"))
 
     updated = await service_close_vote(proposal_id, admin_id)
@@ -121,11 +122,11 @@ async def resolve_proposal_vote_results(
     if not user:
         raise Exception("Authentication required")
 
-    proposal = await service_get_proposal(proposal_id)
+    proposal = await get_loaders(info).proposals.load(proposal_id)
     if not proposal:
         raise Exception("Proposal not found")
 
-    await require_org_member(user, proposal["organization_id"])
+    await require_org_member(user, proposal["organization_id"], get_loaders(info))
     results = await service_get_results(proposal_id)
     return _results_to_graphql(results)
 
@@ -140,11 +141,11 @@ async def resolve_my_proposal_vote(
     if not user:
         raise Exception("Authentication required")
 
-    proposal = await service_get_proposal(proposal_id)
+    proposal = await get_loaders(info).proposals.load(proposal_id)
     if not proposal:
         return None
 
-    await require_org_member(user, proposal["organization_id"])
+    await require_org_member(user, proposal["organization_id"], get_loaders(info))
     vote = await service_get_my_vote(proposal_id, house_id)
     if not vote:
         return None
@@ -2,6 +2,7 @@ from typing import List, Optional
 
 import strawberry
 
+from ..graphql_types.pagination import Connection
 from ..graphql_types.voting import (
     ProposalScore,
     RankingEntry,
@@ -11,6 +12,7 @@ from ..graphql_types.voting import (
     VotingSession,
 )
 from ..src.auth.permissions import require_org_admin, require_org_member
+from ..src.dataloaders.loaders import get_loaders
 from ..src.voting.service import cast_vote as service_cast_vote
 from ..src.voting.service import close_voting_session as service_close
 from ..src.voting.service import create_voting_session as service_create
@@ -18,10 +20,12 @@ from ..src.voting.service import get_vote_for_house as service_get_vote
 from ..src.voting.service import get_voting_results as service_get_results
 from ..src.voting.service import get_voting_session as service_get_session
 from ..src.voting.service import get_voting_sessions as service_list_sessions
+from ..src.voting.service import get_voting_sessions_page as service_page_sessions
 from ..src.voting.service import open_voting_session as service_open
 from ..src.voting.service import (
     update_voting_session_proposals as service_update_proposals,
 )
+from .pagination import page_to_connection
 
 
 def _ranking_to_graphql(r: dict) -> RankingEntry:
@@ -86,11 +90,24 @@ async def resolve_voting_sessions(
 ) -> List[VotingSession]:
     """List all voting sessions for an organization. MEMBER only."""
     user = info.context.get("user")
-    await require_org_member(user, organization_id)
+    await require_org_member(user, organization_id, get_loaders(info))
     sessions = await service_list_sessions(organization_id)
     return [_session_to_graphql(s) for s in sessions]
 
 
+async def resolve_voting_sessions_connection(
+    info: strawberry.types.Info,
+    organization_id: str,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+) -> Connection[VotingSession]:
+    """Page through voting sessions for an organization. MEMBER only."""
+    user = info.context.get("user")
+    await require_org_member(user, organization_id, get_loaders(info))
+    page = await service_page_sessions(organization_id, first, after)
+    return page_to_connection(page, _session_to_graphql)
+
+
 async def resolve_voting_session(
     info: strawberry.types.Info,
     id: str,
@@ -100,7 +117,7 @@ async def resolve_voting_session(
     session = await service_get_session(id)
     if not session:
         return None
-    await require_org_member(user, session["organization_id"])
+    await require_org_member(user, session["organization_id"], get_loaders(info))
     return _session_to_graphql(session)
 
 
@@ -113,7 +130,7 @@ async def resolve_voting_results(
     session = await service_get_session(session_id)
     if not session:
         raise Exception("Voting session not found")
-    await require_org_member(user, session["organization_id"])
+    await require_org_member(user, session["organization_id"], get_loaders(info))
     results = await service_get_results(session_id)
     return _results_to_graphql(results)
 
@@ -130,7 +147,7 @@ async def resolve_my_vote(
     session = await service_get_session(session_id)
     if not session:
         return None
-    await require_org_member(user, session["organization_id"])
+    await require_org_member(user, session["organization_id"], get_loaders(info))
     vote = await service_get_vote(session_id, house_id)
     if not vote:
         return None
@@ -147,7 +164,7 @@ async def resolve_create_voting_session(
 ) -> VotingSession:
     """Create a voting session. ADMIN only."""
     user = info.context.get("user")
-    await require_org_admin(user, organization_id)
+    await require_org_admin(user, organization_id, get_loaders(info))
     created_by = user.get("id") or str(user.get("_id"))
 
     from datetime import datetime
@@ -171,7 +188,7 @@ async def resolve_update_voting_session_proposals(
     session = await service_get_session(session_id)
     if not session:
         raise Exception("Voting session not found")
-    await require_org_admin(user, session["organization_id"])
+    await require_org_admin(user, session["organization_id"], get_loaders(info))
     updated = await service_update_proposals(session_id, proposal_ids)
     return _session_to_graphql(updated)
 
@@ -185,7 +202,7 @@ async def resolve_open_voting_session(
     session = await service_get_session(session_id)
     if not session:
         raise Exception("Voting session not found")
-    await require_org_admin(user, session["organization_id"])
+    await require_org_admin(user, session["organization_id"], get_loaders(info))
     updated = await service_open(session_id)
     return _session_to_graphql(updated)
 
@@ -199,7 +216,7 @@ async def resolve_close_voting_session(
     session = await service_get_session(session_id)
     if not session:
         raise Exception("Voting session not found")
-    await require_org_admin(user, session["organization_id"])
+    await require_org_admin(user, session["organization_id"], get_loaders(info))
     updated = await service_close(session_id)
     return _session_to_graphql(updated)
 
@@ -215,12 +232,10 @@ async def resolve_cast_vote(
     if not user:
         raise Exception("Authentication required")
 
-    session = await service_get_session(session_id)
-    if not session:
-        raise Exception("Voting session not found")
-    await require_org_member(user, session["organization_id"])
-
     voter_id = user.get("id") or str(user.get("_id"))
     rankings_dicts = [{"proposal_id": r.proposal_id, "rank": r.rank} for r in rankings]
-    vote = await service_cast_vote(session_id, house_id, voter_id, rankings_dicts)
+    # The service checks membership against the session it already reads
+    vote = await service_cast_vote(
+        session_id, house_id, voter_id, rankings_dicts, get_loaders(info)
+    )
     return _vote_to_graphql(vote)
@@ -13,7 +13,7 @@ from .schemas.document import DocumentMutations, DocumentQueries
 from .schemas.health import HealthQueries
 from .schemas.house import HouseMutations, HouseQueries
 from .schemas.notification import NotificationMutations, NotificationQueries
-from .schemas.onboarding import OnboardingMutations
+from .schemas.onboarding import OnboardingMutations, OnboardingQueries
 from .schemas.project_milestone import (
     ProjectMilestoneMutations,
     ProjectMilestoneQueries,
@@ -21,6 +21,7 @@ from .schemas.project_milestone import (
 from .schemas.proposal import ProposalMutations, ProposalQueries
 from .schemas.proposal_vote import ProposalVoteMutations, ProposalVoteQueries
 from .schemas.voting import VotingMutations, VotingQueries
+from .src.metrics.tracing import TracingExtension
 
 
 @strawberry.type
@@ -38,6 +39,7 @@ class Query(
     ProjectMilestoneQueries,
     BudgetQueries,
     AnalyticsQueries,
+    OnboardingQueries,
 ):
     pass
 
@@ -60,7 +62,7 @@ class Mutation(
     pass
 
 
-_extensions = []
+_extensions = [TracingExtension]
 if os.environ.get("VERCEL_ENV") == "production":
     _extensions.append(AddValidationRules([NoSchemaIntrospectionCustomRule]))
 
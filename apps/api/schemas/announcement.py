@@ -3,9 +3,11 @@ from typing import List, Optional
 import strawberry
 
 from ..graphql_types.announcement import Announcement
+from ..graphql_types.pagination import Connection
 from ..resolvers.announcement import (
     resolve_announcement,
     resolve_announcements,
+    resolve_announcements_connection,
     resolve_create_announcement,
     resolve_delete_announcement,
     resolve_update_announcement,
@@ -15,6 +17,9 @@ from ..resolvers.announcement import (
 @strawberry.type
 class AnnouncementQueries:
     announcements: List[Announcement] = strawberry.field(resolver=resolve_announcements)
+    announcements_connection: Connection[Announcement] = strawberry.field(
+        resolver=resolve_announcements_connection
+    )
     announcement: Optional[Announcement] = strawberry.field(
         resolver=resolve_announcement
     )
@@ -3,10 +3,12 @@ from typing import List
 import strawberry
 
 from ..graphql_types.document import Document
+from ..graphql_types.pagination import Connection
 from ..resolvers.document import (
     resolve_attach_document,
     resolve_delete_document,
     resolve_documents,
+    resolve_documents_connection,
     resolve_mark_quote_selected,
 )
 
@@ -14,6 +16,9 @@ from ..resolvers.document import (
 @strawberry.type
 class DocumentQueries:
     documents: List[Document] = strawberry.field(resolver=resolve_documents)
+    documents_connection: Connection[Document] = strawberry.field(
+        resolver=resolve_documents_connection
+    )
 
 
 @strawberry.type
@@ -3,11 +3,14 @@ from typing import List
 import strawberry
 
 from ..graphql_types.notification import ActivityItem, Notification
+from ..graphql_types.pagination import Connection
 from ..resolvers.notification import (
     resolve_activity_feed,
+    resolve_activity_feed_connection,
     resolve_mark_all_notifications_read,
     resolve_mark_notification_read,
     resolve_notifications,
+    resolve_notifications_connection,
     resolve_unread_notification_count,
 )
 
@@ -15,10 +18,16 @@ from ..resolvers.notification import (
 @strawberry.type
 class NotificationQueries:
     notifications: List[Notification] = strawberry.field(resolver=resolve_notifications)
+    notifications_connection: Connection[Notification] = strawberry.field(
+        resolver=resolve_notifications_connection
+    )
     unread_notification_count: int = strawberry.field(
         resolver=resolve_unread_notification_count
     )
     activity_feed: List[ActivityItem] = strawberry.field(resolver=resolve_activity_feed)
+    activity_feed_connection: Connection[ActivityItem] = strawberry.field(
+        resolver=resolve_activity_feed_connection
+    )
 
 
 @strawberry.type
@@ -1,7 +1,30 @@
+from typing import List
+
 import strawberry
 
-from ..graphql_types.onboarding import BulkSetupResult
-from ..resolvers.onboarding import resolve_bulk_setup_organization
+from ..graphql_types.onboarding import (
+    BulkSetupResult,
+    BulkSetupRowResult,
+    OnboardingImport,
+)
+from ..resolvers.onboarding import (
+    resolve_append_onboarding_import_rows,
+    resolve_bulk_setup_organization,
+    resolve_onboarding_import,
+    resolve_onboarding_import_rows,
+    resolve_start_onboarding_import,
+    resolve_submit_onboarding_import,
+)
+
+
+@strawberry.type
+class OnboardingQueries:
+    onboarding_import: OnboardingImport = strawberry.field(
+        resolver=resolve_onboarding_import
+    )
+    onboarding_import_rows: List[BulkSetupRowResult] = strawberry.field(
+        resolver=resolve_onboarding_import_rows
+    )
 
 
 @strawberry.type
@@ -9,3 +32,12 @@ class OnboardingMutations:
     bulk_setup_organization: BulkSetupResult = strawberry.mutation(
         resolver=resolve_bulk_setup_organization
     )
+    start_onboarding_import: OnboardingImport = strawberry.mutation(
+        resolver=resolve_start_onboarding_import
+    )
+    append_onboarding_import_rows: OnboardingImport = strawberry.mutation(
+        resolver=resolve_append_onboarding_import_rows
+    )
+    submit_onboarding_import: OnboardingImport = strawberry.mutation(
+        resolver=resolve_submit_onboarding_import
+    )
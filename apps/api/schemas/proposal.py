@@ -2,6 +2,7 @@ from typing import List, Optional
 
 import strawberry
 
+from ..graphql_types.pagination import Connection
 from ..graphql_types.proposal import Proposal
 from ..resolvers.proposal import (
     resolve_assign_responsible_house,
@@ -9,6 +10,7 @@ from ..resolvers.proposal import (
     resolve_delete_proposal,
     resolve_proposal,
     resolve_proposals,
+    resolve_proposals_connection,
     resolve_update_proposal,
     resolve_update_proposal_status,
 )
@@ -17,6 +19,9 @@ from ..resolvers.proposal import (
 @strawberry.type
 class ProposalQueries:
     proposals: List[Proposal] = strawberry.field(resolver=resolve_proposals)
+    proposals_connection: Connection[Proposal] = strawberry.field(
+        resolver=resolve_proposals_connection
+    )
     proposal: Optional[Proposal] = strawberry.field(resolver=resolve_proposal)
 
 
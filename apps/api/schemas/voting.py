@@ -2,6 +2,7 @@ from typing import List, Optional
 
 import strawberry
 
+from ..graphql_types.pagination import Connection
 from ..graphql_types.voting import Vote, VotingResults, VotingSession
 from ..resolvers.voting import (
     resolve_cast_vote,
@@ -13,6 +14,7 @@ from ..resolvers.voting import (
     resolve_voting_results,
     resolve_voting_session,
     resolve_voting_sessions,
+    resolve_voting_sessions_connection,
 )
 
 
@@ -21,6 +23,9 @@ class VotingQueries:
     voting_sessions: List[VotingSession] = strawberry.field(
         resolver=resolve_voting_sessions
     )
+    voting_sessions_connection: Connection[VotingSession] = strawberry.field(
+        resolver=resolve_voting_sessions_connection
+    )
     voting_session: Optional[VotingSession] = strawberry.field(
         resolver=resolve_voting_session
     )
@@ -1,5 +1,3 @@
-from collections import defaultdict
-
 from ...database import db
 
 
@@ -8,23 +6,136 @@ async def _ensure_connected():
         await db.connect()
 
 
+def _community_analytics_pipeline(organization_id: str) -> list:
+    """
+    Build the proposals aggregation behind get_community_analytics.
+    A single $facet computes status, category and monthly counts, and the
+    top contributors (proposals weigh 2, comments 1) joined to their users.
+    The joins are plain localField/foreignField lookups, which use the
+    comments.proposal_id and users.nextauth_id indexes on every server
+    version; the stages after them keep only the fields that are needed.
+    """
+    return [
+        {"$match": {"organization_id": organization_id}},
+        {
+            "$facet": {
+                "status_counts": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+                "category_counts": [
+                    {
+                        "$group": {
+                            "_id": {"$ifNull": ["$category", "OTHER"]},
+                            "count": {"$sum": 1},
+                        }
+                    },
+                    {"$sort": {"count": -1, "_id": 1}},
+                ],
+                "monthly_counts": [
+                    {"$match": {"created_at": {"$type": "date"}}},
+                    {
+                        "$group": {
+                            "_id": {
+                                "$dateToString": {
+                                    "format": "%Y-%m",
+                                    "date": "$created_at",
+                                }
+                            },
+                            "count": {"$sum": 1},
+                        }
+                    },
+                    {"$sort": {"_id": -1}},
+                    {"$limit": 12},
+                ],
+                "top_contributors": [
+                    {
+                        "$project": {
+                            "author_id": 1,
+                            "proposal_id": {"$toString": "$_id"},
+                        }
+                    },
+                    {
+                        "$lookup": {
+                            "from": "comments",
+                            "localField": "proposal_id",
+                            "foreignField": "proposal_id",
+                            "as": "comments",
+                        }
+                    },
+                    {
+                        "$project": {
+                            "entries": {
+                                "$concatArrays": [
+                                    [{"user_id": "$author_id", "p": 1, "c": 0}],
+                                    {
+                                        "$map": {
+                                            "input": "$comments",
+                                            "in": {
+                                                "user_id": "$$this.author_id",
+                                                "p": 0,
+                                                "c": 1,
+                                            },
+                                        }
+                                    },
+                                ]
+                            }
+                        }
+                    },
+                    {"$unwind": "$entries"},
+                    {"$match": {"entries.user_id": {"$nin": ["", None]}}},
+                    {
+                        "$group": {
+                            "_id": "$entries.user_id",
+                            "proposals_count": {"$sum": "$entries.p"},
+                            "comments_count": {"$sum": "$entries.c"},
+                        }
+                    },
+                    {
+                        "$addFields": {
+                            "total_score": {
+                                "$add": [
+                                    {"$multiply": ["$proposals_count", 2]},
+                                    "$comments_count",
+                                ]
+                            }
+                        }
+                    },
+                    {"$sort": {"total_score": -1, "_id": 1}},
+                    {"$limit": 5},
+                    {
+                        "$lookup": {
+                            "from": "users",
+                            "localField": "_id",
+                            "foreignField": "nextauth_id",
+                            "as": "user",
+                        }
+                    },
+                    {
+                        "$project": {
+                            "proposals_count": 1,
+                            "comments_count": 1,
+                            "total_score": 1,
+                            "user.first_name": 1,
+                            "user.last_name": 1,
+                        }
+                    },
+                ],
+            }
+        },
+    ]
+
+
 async def get_community_analytics(organization_id: str) -> dict:
     """Compute community analytics for an organization."""
     await _ensure_connected()
 
-    # Proposal counts by status
-    status_counts: dict = defaultdict(int)
-    category_counts: dict = defaultdict(int)
-    monthly_counts: dict = defaultdict(int)
-
-    async for proposal in db.db.proposals.find({"organization_id": organization_id}):
-        status_counts[proposal["status"]] += 1
-        category_counts[proposal.get("category", "OTHER")] += 1
-        created_at = proposal.get("created_at")
-        if created_at:
-            month_key = created_at.strftime("%Y-%m")
-            monthly_counts[month_key] += 1
+    facets: dict = {}
+    async for result in db.reports.proposals.aggregate(
+        _community_analytics_pipeline(organization_id)
+    ):
+        facets = result
 
+    status_counts = {
+        row["_id"]: row["count"] for row in facets.get("status_counts", [])
+    }
     total = sum(status_counts.values())
     approved = (
         status_counts.get("APPROVED", 0)
@@ -36,89 +147,45 @@ async def get_community_analytics(organization_id: str) -> dict:
     # Last voting session participation rate
     last_session_participation = 0.0
     async for session in (
-        db.db.voting_sessions.find(
+        db.reports.voting_sessions.find(
             {"organization_id": organization_id, "status": "CLOSED"}
         )
         .sort("created_at", -1)
         .limit(1)
     ):
-        total_houses = await db.db.houses.count_documents(
+        total_houses = await db.reports.houses.count_documents(
             {"organization_id": organization_id}
         )
-        votes_cast = await db.db.votes.count_documents(
+        votes_cast = await db.reports.votes.count_documents(
             {"voting_session_id": str(session["_id"])}
         )
         if total_houses > 0:
             last_session_participation = votes_cast / total_houses * 100
 
-    # Top contributors (proposals + comments)
-    user_scores: dict = defaultdict(lambda: {"proposals": 0, "comments": 0})
-
-    async for proposal in db.db.proposals.find({"organization_id": organization_id}):
-        uid = proposal.get("author_id", "")
-        if uid:
-            user_scores[uid]["proposals"] += 1
-
-    # Get proposal IDs for comments lookup
-    proposal_ids = []
-    async for p in db.db.proposals.find(
-        {"organization_id": organization_id}, {"_id": 1}
-    ):
-        proposal_ids.append(str(p["_id"]))
-
-    if proposal_ids:
-        async for comment in db.db.comments.find(
-            {"proposal_id": {"$in": proposal_ids}}
-        ):
-            uid = comment.get("author_id", "")
-            if uid:
-                user_scores[uid]["comments"] += 1
-
-    top_contributors_raw = sorted(
-        [
+    top_contributors = []
+    for row in facets.get("top_contributors", []):
+        user = row["user"][0] if row.get("user") else {}
+        top_contributors.append(
             {
-                "user_id": uid,
-                "proposals_count": scores["proposals"],
-                "comments_count": scores["comments"],
-                "total_score": scores["proposals"] * 2 + scores["comments"],
+                "user_id": row["_id"],
+                "proposals_count": row["proposals_count"],
+                "comments_count": row["comments_count"],
+                "total_score": row["total_score"],
+                "first_name": user.get("first_name"),
+                "last_name": user.get("last_name"),
             }
-            for uid, scores in user_scores.items()
-        ],
-        key=lambda x: x["total_score"],
-        reverse=True,
-    )[:5]
-
-    # Resolve user names from user_id
-    top_user_ids = [c["user_id"] for c in top_contributors_raw]
-    user_names: dict = {}
-    async for user in db.db.users.find(
-        {"nextauth_id": {"$in": top_user_ids}},
-        {"nextauth_id": 1, "first_name": 1, "last_name": 1},
-    ):
-        user_names[user["nextauth_id"]] = {
-            "first_name": user.get("first_name"),
-            "last_name": user.get("last_name"),
-        }
+        )
 
-    top_contributors = [
-        {
-            **c,
-            "first_name": user_names.get(c["user_id"], {}).get("first_name"),
-            "last_name": user_names.get(c["user_id"], {}).get("last_name"),
-        }
-        for c in top_contributors_raw
+    # Monthly trends (last 12 months, oldest first)
+    monthly_trends = [
+        {"month": row["_id"], "count": row["count"]}
+        for row in reversed(facets.get("monthly_counts", []))
     ]
 
-    # Monthly trends (last 12 months, sorted)
-    sorted_months = sorted(monthly_counts.items())[-12:]
-    monthly_trends = [{"month": m, "count": c} for m, c in sorted_months]
-
     # Category breakdown
     category_breakdown = [
-        {"category": cat, "count": count}
-        for cat, count in sorted(
-            category_counts.items(), key=lambda x: x[1], reverse=True
-        )
+        {"category": row["_id"], "count": row["count"]}
+        for row in facets.get("category_counts", [])
     ]
 
     return {
@@ -143,7 +210,9 @@ async def get_participation_report(session_id: str) -> dict:
     from bson import ObjectId
 
     try:
-        session = await db.db.voting_sessions.find_one({"_id": ObjectId(session_id)})
+        session = await db.reports.voting_sessions.find_one(
+            {"_id": ObjectId(session_id)}
+        )
     except Exception:
         raise Exception("Voting session not found")
 
@@ -154,12 +223,12 @@ async def get_participation_report(session_id: str) -> dict:
 
     # Get all houses in org
     all_house_ids = []
-    async for house in db.db.houses.find({"organization_id": organization_id}):
+    async for house in db.reports.houses.find({"organization_id": organization_id}):
         all_house_ids.append(str(house["_id"]))
 
     # Get houses that voted
     voted_house_ids = []
-    async for vote in db.db.votes.find({"voting_session_id": session_id}):
+    async for vote in db.reports.votes.find({"voting_session_id": session_id}):
         voted_house_ids.append(vote["house_id"])
 
     voted_set = set(voted_house_ids)
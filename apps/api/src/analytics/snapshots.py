@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+
+from ...database import db
+from .service import get_community_analytics
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background refresh passes (0 disables the refresher, in which
+# case dirty snapshots are recomputed on read). Off by default on serverless,
+# where an instance is frozen between requests and its refresher with it.
+ANALYTICS_REFRESH_INTERVAL_SECONDS = float(
+    os.getenv(
+        "ANALYTICS_REFRESH_INTERVAL_SECONDS", "0" if os.getenv("VERCEL") else "30"
+    )
+)
+ANALYTICS_REFRESH_BATCH_SIZE = int(os.getenv("ANALYTICS_REFRESH_BATCH_SIZE", "50"))
+# How long a refresher holds a dirty snapshot it claimed before another may
+ANALYTICS_REFRESH_LEASE_SECONDS = int(
+    os.getenv("ANALYTICS_REFRESH_LEASE_SECONDS", "120")
+)
+
+_refresher_task: Optional[asyncio.Task] = None
+_refresher_interval = 0.0
+# time.monotonic() of the refresher's last completed pass
+_last_pass_at: Optional[float] = None
+
+
+async def _ensure_connected():
+    if not db.is_connected():
+        await db.connect()
+
+
+async def mark_analytics_dirty(organization_id: str) -> None:
+    """Flag an organization's snapshot as stale. Never fails the calling write."""
+    try:
+        await _ensure_connected()
+        await db.db.analytics_snapshots.update_one(
+            {"organization_id": organization_id},
+            {"$set": {"dirty": True}, "$inc": {"version": 1}},
+            upsert=True,
+        )
+    except Exception:
+        logger.warning("Could not mark analytics dirty for %s", organization_id)
+
+
+async def mark_analytics_dirty_for_proposal(proposal_id: str) -> None:
+    """Flag the snapshot of the organization that owns a proposal as stale."""
+    try:
+        await _ensure_connected()
+        proposal = await db.db.proposals.find_one(
+            {"_id": ObjectId(proposal_id)}, {"organization_id": 1}
+        )
+    except Exception:
+        return
+    if proposal:
+        await mark_analytics_dirty(proposal["organization_id"])
+
+
+async def refresh_analytics_snapshot(organization_id: str) -> dict:
+    """Recompute and store an organization's analytics snapshot."""
+    await _ensure_connected()
+
+    existing = await db.db.analytics_snapshots.find_one(
+        {"organization_id": organization_id}, {"version": 1}
+    )
+    version = existing.get("version", 0) if existing else 0
+
+    computed_at = datetime.utcnow()
+    analytics = await get_community_analytics(organization_id)
+
+    await db.db.analytics_snapshots.update_one(
+        {"organization_id": organization_id},
+        {
+            "$set": {"analytics": analytics, "computed_at": computed_at},
+            "$unset": {"refreshing_until": ""},
+        },
+        upsert=True,
+    )
+    # Only clear the flag if no write dirtied the organization while computing
+    await db.db.analytics_snapshots.update_one(
+        {"organization_id": organization_id, "version": version},
+        {"$set": {"dirty": False}},
+    )
+
+    return {**analytics, "computed_at": computed_at}
+
+
+async def get_analytics_snapshot(organization_id: str) -> dict:
+    """
+    Return the stored analytics snapshot with its computed_at timestamp.
+    Computes it on first access, and on dirty reads unless a refresher in this
+    process has completed a pass recently enough to pick it up soon.
+    """
+    await _ensure_connected()
+
+    snapshot = await db.db.analytics_snapshots.find_one(
+        {"organization_id": organization_id}
+    )
+    if not snapshot or "analytics" not in snapshot:
+        return await refresh_analytics_snapshot(organization_id)
+    if snapshot.get("dirty") and not is_refresher_current():
+        return await refresh_analytics_snapshot(organization_id)
+
+    return {**snapshot["analytics"], "computed_at": snapshot["computed_at"]}
+
+
+async def _claim_dirty_snapshot() -> Optional[str]:
+    """
+    Lease one dirty snapshot so that other instances skip it while it is
+    being refreshed. Returns its organization ID, or None if none is left.
+    """
+    now = datetime.utcnow()
+    snapshot = await db.db.analytics_snapshots.find_one_and_update(
+        {
+            "dirty": True,
+            "$or": [
+                {"refreshing_until": {"$exists": False}},
+                {"refreshing_until": {"$lte": now}},
+            ],
+        },
+        {
+            "$set": {
+                "refreshing_until": now
+                + timedelta(seconds=ANALYTICS_REFRESH_LEASE_SECONDS)
+            }
+        },
+        projection={"organization_id": 1},
+    )
+    return snapshot["organization_id"] if snapshot else None
+
+
+async def refresh_dirty_snapshots(limit: int = ANALYTICS_REFRESH_BATCH_SIZE) -> int:
+    """Refresh up to `limit` dirty snapshots. Returns how many were refreshed."""
+    await _ensure_connected()
+
+    refreshed = 0
+    for _ in range(limit):
+        organization_id = await _claim_dirty_snapshot()
+        if organization_id is None:
+            break
+        try:
+            await refresh_analytics_snapshot(organization_id)
+            refreshed += 1
+        except Exception:
+            logger.exception("Analytics refresh failed for %s", organization_id)
+    return refreshed
+
+
+async def _refresh_loop(interval: float) -> None:
+    global _last_pass_at
+    while True:
+        try:
+            await refresh_dirty_snapshots()
+            _last_pass_at = time.monotonic()
+        except Exception:
+            logger.exception("Analytics refresh pass failed")
+        await asyncio.sleep(interval)
+
+
+def is_refresher_running() -> bool:
+    return _refresher_task is not None and not _refresher_task.done()
+
+
+def is_refresher_current() -> bool:
+    """
+    Whether the refresher completed a pass within two intervals. A task that
+    exists but has not run (a frozen serverless instance, a stuck pass) does
+    not count, so stale snapshots are never served without bound.
+    """
+    return (
+        is_refresher_running()
+        and _last_pass_at is not None
+        and time.monotonic() - _last_pass_at <= 2 * _refresher_interval
+    )
+
+
+def start_snapshot_refresher(
+    interval: float = ANALYTICS_REFRESH_INTERVAL_SECONDS,
+) -> Optional[asyncio.Task]:
+    """Start the background refresher on the running event loop."""
+    global _refresher_task, _refresher_interval
+    if interval <= 0 or is_refresher_running():
+        return _refresher_task
+    _refresher_interval = interval
+    _refresher_task = asyncio.create_task(_refresh_loop(interval))
+    return _refresher_task
+
+
+async def stop_snapshot_refresher() -> None:
+    global _refresher_task, _last_pass_at
+    _last_pass_at = None
+    if _refresher_task is None:
+        return
+    _refresher_task.cancel()
+    try:
+        await _refresher_task
+    except asyncio.CancelledError:
+        pass
+    _refresher_task = None
@@ -4,6 +4,10 @@ from typing import List, Optional
 from bson import ObjectId
 
 from ...database import db
+from ..pagination.service import NEWEST_FIRST, paginate
+
+# Pinned first, then newest first
+ANNOUNCEMENT_ORDER = (("is_pinned", -1), *NEWEST_FIRST)
 
 
 async def _ensure_connected():
@@ -11,19 +15,42 @@ async def _ensure_connected():
         await db.connect()
 
 
-async def get_announcements(organization_id: str) -> List[dict]:
-    """Get all announcements for an organization (pinned first, then by date)."""
+async def get_announcements(
+    organization_id: str, projection: Optional[dict] = None
+) -> List[dict]:
+    """
+    Get all announcements for an organization (pinned first, then by date).
+    Pass a projection to fetch only some fields.
+    """
     await _ensure_connected()
 
     announcements = []
-    cursor = db.db.announcements.find({"organization_id": organization_id}).sort(
-        [("is_pinned", -1), ("created_at", -1)]
-    )
+    cursor = db.db.announcements.find(
+        {"organization_id": organization_id}, projection
+    ).sort([("is_pinned", -1), ("created_at", -1)])
     async for announcement in cursor:
         announcements.append(announcement)
     return announcements
 
 
+async def get_announcements_page(
+    organization_id: str,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+    projection: Optional[dict] = None,
+) -> dict:
+    """Get one page of an organization's announcements (pinned first)."""
+    await _ensure_connected()
+    return await paginate(
+        db.db.announcements,
+        {"organization_id": organization_id},
+        first,
+        after,
+        sort=ANNOUNCEMENT_ORDER,
+        projection=projection,
+    )
+
+
 async def get_announcement(announcement_id: str) -> Optional[dict]:
     """Get a single announcement by ID."""
     await _ensure_connected()
@@ -1,5 +1,7 @@
 import asyncio
+import importlib.util
 import os
+from typing import Optional
 
 import httpx
 import resend
@@ -11,23 +13,71 @@ RESEND_FROM_EMAIL = os.getenv(
     "RESEND_FROM_EMAIL", "Condo Agora <noreply@condoagora.site>"
 )
 
+CHASQUI_MAX_CONNECTIONS = int(os.getenv("CHASQUI_MAX_CONNECTIONS", "20"))
+CHASQUI_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("CHASQUI_MAX_KEEPALIVE_CONNECTIONS", "10")
+)
+CHASQUI_TIMEOUT_SECONDS = float(os.getenv("CHASQUI_TIMEOUT_SECONDS", "10"))
+CHASQUI_CONNECT_TIMEOUT_SECONDS = float(
+    os.getenv("CHASQUI_CONNECT_TIMEOUT_SECONDS", "5")
+)
+
 resend.api_key = RESEND_API_KEY
 
+# Shared Chasqui client, opened on app startup so messages reuse pooled
+# keep-alive connections instead of paying a TCP+TLS handshake each
+_chasqui_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_chasqui_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=CHASQUI_API_URL,
+        headers={"Authorization": f"Bearer {CHASQUI_API_TOKEN}"},
+        # HTTP/2 needs the optional h2 package (httpx[http2])
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=CHASQUI_MAX_CONNECTIONS,
+            max_keepalive_connections=CHASQUI_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(
+            CHASQUI_TIMEOUT_SECONDS, connect=CHASQUI_CONNECT_TIMEOUT_SECONDS
+        ),
+    )
+
+
+async def open_chasqui_client() -> httpx.AsyncClient:
+    """Open the shared Chasqui client. Called from the app startup hook."""
+    global _chasqui_client
+    if _chasqui_client is None or _chasqui_client.is_closed:
+        _chasqui_client = _build_chasqui_client()
+    return _chasqui_client
+
+
+async def close_chasqui_client() -> None:
+    """Close the shared Chasqui client. Called from the app shutdown hook."""
+    global _chasqui_client
+    if _chasqui_client is not None:
+        await _chasqui_client.aclose()
+        _chasqui_client = None
+
+
+async def get_chasqui_client() -> httpx.AsyncClient:
+    """Return the shared client, opening it lazily outside the app lifecycle."""
+    return await open_chasqui_client()
+
 
 async def send_whatsapp_otp(to: str, code: str) -> None:
     """Send OTP code via WhatsApp using Chasqui text API."""
     to = to.lstrip("+")
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{CHASQUI_API_URL}/messages/send/text",
-            json={
-                "to": to,
-                "body": f"Tu código de verificación de Condo Agora es: {code}. Expira en 5 minutos.",
-            },
-            headers={"Authorization": f"Bearer {CHASQUI_API_TOKEN}"},
-            timeout=10.0,
-        )
-        response.raise_for_status()
+    client = await get_chasqui_client()
+    response = await client.post(
+        "/messages/send/text",
+        json={
+            "to": to,
+            "body": f"Tu código de verificación de Condo Agora es: {code}. Expira en 5 minutos.",
+        },
+    )
+    response.raise_for_status()
 
 
 async def send_email_otp(to: str, code: str) -> None:
@@ -55,27 +105,25 @@ async def send_email_otp(to: str, code: str) -> None:
 async def send_whatsapp_invitation(to: str, org_name: str, invite_url: str) -> None:
     """Send invitation via WhatsApp using Chasqui template API."""
     to = to.lstrip("+")
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{CHASQUI_API_URL}/messages/send/template",
-            json={
-                "to": to,
-                "template_name": "org_invitation",
-                "language_code": "es",
-                "components": [
-                    {
-                        "type": "body",
-                        "parameters": [
-                            {"type": "text", "text": org_name},
-                            {"type": "text", "text": invite_url},
-                        ],
-                    }
-                ],
-            },
-            headers={"Authorization": f"Bearer {CHASQUI_API_TOKEN}"},
-            timeout=10.0,
-        )
-        response.raise_for_status()
+    client = await get_chasqui_client()
+    response = await client.post(
+        "/messages/send/template",
+        json={
+            "to": to,
+            "template_name": "org_invitation",
+            "language_code": "es",
+            "components": [
+                {
+                    "type": "body",
+                    "parameters": [
+                        {"type": "text", "text": org_name},
+                        {"type": "text", "text": invite_url},
+                    ],
+                }
+            ],
+        },
+    )
+    response.raise_for_status()
 
 
 async def send_email_invitation(to: str, org_name: str, invite_url: str) -> None:
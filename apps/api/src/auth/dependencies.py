@@ -1,9 +1,12 @@
 import logging
+import os
+import secrets
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, Header, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from ...database import db
+from .principal_cache import principal_cache
 from .utils import verify_token
 
 logger = logging.getLogger(__name__)
@@ -11,13 +14,26 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 security_optional = HTTPBearer(auto_error=False)
 
+INTERNAL_API_SECRET = os.getenv("INTERNAL_API_SECRET", "")
+# Vercel Cron sends this as a bearer token on scheduled requests
+CRON_SECRET = os.getenv("CRON_SECRET", "")
+
+
+def _matches(value: str, secret: str) -> bool:
+    return bool(secret) and secrets.compare_digest(value, secret)
+
 
 async def get_current_user(
     credential: HTTPAuthorizationCredentials = Depends(security),
 ) -> dict:
     """Extract and verify JWT from Authorization header. Returns user dict."""
+    token = credential.credentials
+    user = principal_cache.get_by_token(token)
+    if user is not None:
+        return user
+
     try:
-        payload = await verify_token(credential.credentials)
+        payload = await verify_token(token)
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -25,15 +41,18 @@ async def get_current_user(
     if not nextauth_id:
         raise HTTPException(status_code=401, detail="Token missing subject")
 
-    if not db.is_connected():
-        await db.connect()
+    user = principal_cache.get_by_subject(nextauth_id)
+    if user is None:
+        if not db.is_connected():
+            await db.connect()
 
-    user = await db.db.users.find_one({"nextauth_id": nextauth_id})
+        user = await db.db.users.find_one({"nextauth_id": nextauth_id})
 
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
     user["id"] = str(user["_id"])
+    principal_cache.set(token, user, payload.get("exp"))
     return user
 
 
@@ -49,3 +68,22 @@ async def get_current_user_optional(
     except HTTPException as e:
         logger.warning("Auth failed for GraphQL request: %s", e.detail)
         return None
+
+
+async def require_internal_secret(
+    x_internal_secret: str = Header(default="", alias="X-Internal-Secret"),
+    credential: HTTPAuthorizationCredentials | None = Depends(security_optional),
+) -> None:
+    """
+    Guard for internal endpoints: requires INTERNAL_API_SECRET in the
+    X-Internal-Secret header or as a bearer token (e.g. from a Prometheus
+    scraper), or the CRON_SECRET bearer token that Vercel Cron sends.
+    """
+    token = credential.credentials if credential else ""
+    if (
+        _matches(x_internal_secret, INTERNAL_API_SECRET)
+        or _matches(token, INTERNAL_API_SECRET)
+        or _matches(token, CRON_SECRET)
+    ):
+        return
+    raise HTTPException(status_code=403, detail="Forbidden")
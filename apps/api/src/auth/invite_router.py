@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from ...database import db
 from .dependencies import get_current_user
+from .user_cache import invalidate_user
 
 invite_router = APIRouter(prefix="/invite", tags=["invitations"])
 
@@ -69,6 +70,7 @@ async def accept_invitation(
             "updated_at": now,
         }
     )
+    invalidate_user(str(user["_id"]))
 
     # Mark invitation as accepted
     await db.db.invitations.update_one(
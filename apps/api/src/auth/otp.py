@@ -27,6 +27,8 @@ async def request_otp(db, identifier: str, channel: str, ip_address: str) -> Non
     - 10 requests per IP per hour
     """
     # Rate limit checks
+    # Sequential, so a request the identifier limit rejects is not charged
+    # against the IP window
     await check_rate_limit(
         db, key=f"otp_request:id:{identifier}", max_count=3, window_seconds=3600
     )
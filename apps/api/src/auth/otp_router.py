@@ -9,7 +9,9 @@ from pydantic import BaseModel
 
 from ...database import db
 from .otp import OTPVerificationError, request_otp, verify_otp
+from .principal_cache import invalidate_principal
 from .rate_limit import RateLimitExceeded
+from .user_cache import invalidate_user
 
 router = APIRouter(prefix="/otp")
 
@@ -113,6 +115,8 @@ async def handle_google_link(body: GoogleLinkBody, request: Request):
             updates["avatar_url"] = body.image
         if updates:
             await db.db.users.update_one({"_id": user["_id"]}, {"$set": updates})
+            invalidate_user(str(user["_id"]))
+            invalidate_principal(str(user["_id"]))
             user.update(updates)
     else:
         now = datetime.now(timezone.utc)
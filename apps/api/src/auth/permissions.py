@@ -1,25 +1,45 @@
+from typing import Optional
+
 from bson import ObjectId
 
 from ...database import db
+from ..dataloaders.loaders import Loaders
+from .role_cache import role_cache
 
 
-async def get_user_role_in_org(user_id: str, organization_id: str) -> str | None:
+async def get_user_role_in_org(
+    user_id: str, organization_id: str, loaders: Optional[Loaders] = None
+) -> str | None:
     """
     Get the user's role in a specific organization.
     Returns the role string ('ADMIN', 'RESIDENT', 'MEMBER') or None if not a member.
+    Checks the process-wide role cache first; when request loaders are given,
+    the lookup is then batched and memoized for the rest of the request.
     """
-    if not db.is_connected():
-        await db.connect()
+    cached = role_cache.get((user_id, organization_id))
+    if cached is not None:
+        return cached
+
+    if loaders is not None:
+        member = await loaders.memberships.load((user_id, organization_id))
+    else:
+        if not db.is_connected():
+            await db.connect()
+
+        member = await db.db.organization_members.find_one(
+            {"user_id": user_id, "organization_id": organization_id}
+        )
 
-    member = await db.db.organization_members.find_one(
-        {"user_id": user_id, "organization_id": organization_id}
-    )
     if not member:
         return None
-    return member.get("role")
+    role = member.get("role")
+    role_cache.set((user_id, organization_id), role)
+    return role
 
 
-async def require_org_admin(user: dict, organization_id: str) -> None:
+async def require_org_admin(
+    user: dict, organization_id: str, loaders: Optional[Loaders] = None
+) -> None:
     """
     Verify that the user is an ADMIN in the given organization.
     Raises Exception if not authenticated, not a member, or not an admin.
@@ -28,7 +48,7 @@ async def require_org_admin(user: dict, organization_id: str) -> None:
         raise Exception("Authentication required")
 
     user_id = user.get("id") or str(user.get("_id"))
-    role = await get_user_role_in_org(user_id, organization_id)
+    role = await get_user_role_in_org(user_id, organization_id, loaders)
 
     if role is None:
         raise Exception("You are not a member of this organization")
@@ -36,7 +56,9 @@ async def require_org_admin(user: dict, organization_id: str) -> None:
         raise Exception("Only administrators can perform this action")
 
 
-async def require_org_member(user: dict, organization_id: str) -> str:
+async def require_org_member(
+    user: dict, organization_id: str, loaders: Optional[Loaders] = None
+) -> str:
     """
     Verify that the user is a member of the given organization.
     Returns the user's role. Raises Exception if not a member.
@@ -45,18 +67,24 @@ async def require_org_member(user: dict, organization_id: str) -> str:
         raise Exception("Authentication required")
 
     user_id = user.get("id") or str(user.get("_id"))
-    role = await get_user_role_in_org(user_id, organization_id)
+    role = await get_user_role_in_org(user_id, organization_id, loaders)
 
     if role is None:
         raise Exception("You are not a member of this organization")
     return role
 
 
-async def get_org_id_for_house(house_id: str) -> str | None:
+async def get_org_id_for_house(
+    house_id: str, loaders: Optional[Loaders] = None
+) -> str | None:
     """
     Look up the organization_id for a given house.
     Returns None if the house doesn't exist.
     """
+    if loaders is not None:
+        house = await loaders.houses.load(house_id)
+        return house.get("organization_id") if house else None
+
     if not db.is_connected():
         await db.connect()
 
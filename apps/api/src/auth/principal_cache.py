@@ -0,0 +1,70 @@
+import hashlib
+import os
+import time
+from typing import Optional
+
+from ..cache import TTLCache
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "0"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PrincipalCache:
+    """Cache of the user documents get_current_user resolves.
+
+    Users are keyed on their ``nextauth_id``; verified tokens are keyed on
+    their SHA-256 digest and point at a user entry, so a repeated token skips
+    both JWT verification and the users lookup, and a new token for a cached
+    user skips the lookup. No token entry outlives the token's ``exp``.
+    """
+
+    def __init__(
+        self, ttl_seconds: float, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES
+    ):
+        self._users = TTLCache(ttl_seconds, max_entries, copy_values=True)
+        self._tokens = TTLCache(ttl_seconds, max_entries)
+
+    def get_by_token(self, token: str) -> Optional[dict]:
+        nextauth_id = self._tokens.get(token_digest(token))
+        if nextauth_id is None:
+            return None
+        return self._users.get(nextauth_id)
+
+    def get_by_subject(self, nextauth_id: str) -> Optional[dict]:
+        return self._users.get(nextauth_id)
+
+    def set(self, token: str, user: dict, exp: Optional[float] = None) -> None:
+        """Cache a user resolved from a verified token with expiry ``exp``."""
+        if user is None:
+            return
+        # The user entry gets the full TTL, so it outlives every token entry
+        self._users.set(user["nextauth_id"], user)
+        self._tokens.set(
+            token_digest(token),
+            user["nextauth_id"],
+            ttl_seconds=exp - time.time() if exp is not None else None,
+        )
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop one user (and so every token for it), or everything."""
+        if user_id is None:
+            self.clear()
+            return
+        self._users.invalidate_where(lambda _, user: str(user["_id"]) == user_id)
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._tokens.clear()
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_principal(user_id: Optional[str] = None) -> None:
+    """Invalidation hook for services that change or delete user documents."""
+    principal_cache.invalidate(user_id)
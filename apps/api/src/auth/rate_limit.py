@@ -1,4 +1,25 @@
-from datetime import datetime, timedelta, timezone
+"""
+Two-tier fixed-window rate limiting.
+
+Each key is counted in windows aligned to ``window_seconds``. The shared tier
+is one MongoDB document per (key, window_start), incremented with an upsert.
+In front of it, every process keeps a local counter per key and window: hits
+are admitted locally and synchronized to MongoDB in batches, and once the
+shared count is known to be over the limit further hits are rejected without
+a round trip. Near the limit every hit is synchronized, so with N instances a
+key can exceed its limit by at most N * (sync_every - 1) hits.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+RATE_LIMIT_SYNC_EVERY = int(os.getenv("RATE_LIMIT_SYNC_EVERY", "10"))
+RATE_LIMIT_SYNC_INTERVAL_SECONDS = float(
+    os.getenv("RATE_LIMIT_SYNC_INTERVAL_SECONDS", "1")
+)
 
 
 class RateLimitExceeded(Exception):
@@ -13,24 +34,93 @@ class RateLimitExceeded(Exception):
         )
 
 
+@dataclass
+class _LocalWindow:
+    window_end: float
+    # Shared count as of the last sync, and hits admitted here since then
+    synced: int = 0
+    pending: int = 0
+    synced_at: float = 0.0
+
+
+class TieredRateLimiter:
+    """Local counters per (key, window) in front of the rate_limits collection."""
+
+    def __init__(
+        self,
+        sync_every: int = RATE_LIMIT_SYNC_EVERY,
+        sync_interval_seconds: float = RATE_LIMIT_SYNC_INTERVAL_SECONDS,
+    ):
+        self.sync_every = max(sync_every, 1)
+        self.sync_interval_seconds = sync_interval_seconds
+        self._windows: Dict[Tuple[str, int], _LocalWindow] = {}
+        self.round_trips = 0
+
+    def _window(self, key: str, window_seconds: int) -> Tuple[int, _LocalWindow]:
+        now = time.time()
+        window_start = int(now // window_seconds) * window_seconds
+        state = self._windows.get((key, window_start))
+        if state is None:
+            self._prune(now)
+            state = _LocalWindow(window_end=window_start + window_seconds)
+            self._windows[(key, window_start)] = state
+        return window_start, state
+
+    def _prune(self, now: float) -> None:
+        """Drop windows that have ended; their unsynced hits no longer matter."""
+        for window_key, state in list(self._windows.items()):
+            if state.window_end <= now:
+                del self._windows[window_key]
+
+    def _needs_sync(self, state: _LocalWindow, max_count: int) -> bool:
+        return (
+            state.pending >= self.sync_every
+            or state.synced + state.pending + self.sync_every > max_count
+            or time.monotonic() - state.synced_at >= self.sync_interval_seconds
+        )
+
+    async def hit(self, db, key: str, max_count: int, window_seconds: int) -> None:
+        """Count one hit for key. Raise RateLimitExceeded if over max_count."""
+        window_start, state = self._window(key, window_seconds)
+        if state.synced + state.pending >= max_count:
+            # Already known to be over the limit across all instances
+            raise RateLimitExceeded(key, max_count, window_seconds)
+
+        state.pending += 1
+        if not self._needs_sync(state, max_count):
+            return
+
+        delta, state.pending = state.pending, 0
+        state.synced_at = time.monotonic()
+        self.round_trips += 1
+        result = await db.rate_limits.find_one_and_update(
+            {
+                "key": key,
+                "window_start": datetime.fromtimestamp(window_start, timezone.utc),
+            },
+            {"$inc": {"count": delta}},
+            upsert=True,
+            return_document=True,
+        )
+        count = result.get("count", 0) if result else 0
+        state.synced = max(state.synced, count)
+
+        if count > max_count:
+            raise RateLimitExceeded(key, max_count, window_seconds)
+
+    def clear(self) -> None:
+        self._windows.clear()
+        self.round_trips = 0
+
+
+# Global rate limiter instance
+rate_limiter = TieredRateLimiter()
+
+
 async def check_rate_limit(db, key: str, max_count: int, window_seconds: int) -> None:
     """Increment counter for key. Raise RateLimitExceeded if over max_count.
 
-    Uses MongoDB upsert with TTL. Each key gets a counter doc that auto-expires.
+    Shared counts live in rate_limits, one document per key and window, which
+    the TTL index on window_start expires; windows are at most an hour long.
     """
-    now = datetime.now(timezone.utc)
-    window_start = now - timedelta(seconds=window_seconds)
-
-    # Atomically increment counter, create if not exists
-    result = await db.rate_limits.find_one_and_update(
-        {"key": key, "window_start": {"$gte": window_start}},
-        {
-            "$inc": {"count": 1},
-            "$setOnInsert": {"key": key, "window_start": now},
-        },
-        upsert=True,
-        return_document=True,
-    )
-
-    if result and result.get("count", 0) > max_count:
-        raise RateLimitExceeded(key, max_count, window_seconds)
+    await rate_limiter.hit(db, key, max_count, window_seconds)
@@ -0,0 +1,24 @@
+import os
+from typing import Optional
+
+from ..cache import TTLCache
+
+ROLE_CACHE_TTL_SECONDS = float(os.getenv("ROLE_CACHE_TTL_SECONDS", "0"))
+ROLE_CACHE_MAX_ENTRIES = int(os.getenv("ROLE_CACHE_MAX_ENTRIES", "10000"))
+
+# Organization roles keyed on (user_id, organization_id). Only positive lookups
+# are cached, so a user who just joined is never denied by a stale entry.
+role_cache = TTLCache(ROLE_CACHE_TTL_SECONDS, ROLE_CACHE_MAX_ENTRIES)
+
+
+def invalidate_role(
+    user_id: Optional[str] = None, organization_id: Optional[str] = None
+) -> None:
+    """Invalidation hook for services that change organization memberships."""
+    if user_id is None and organization_id is None:
+        role_cache.clear()
+        return
+    role_cache.invalidate_where(
+        lambda key, _: (user_id is None or key[0] == user_id)
+        and (organization_id is None or key[1] == organization_id)
+    )
@@ -6,12 +6,21 @@ from datetime import datetime, timedelta
 from bson import ObjectId
 
 from ...database import db
-from .channels import send_email_invitation, send_whatsapp_invitation
+from ..outbox.service import PENDING, enqueue_invitation
+from ..voting.vote_cache import HOUSE, invalidate_vote_context
+from .principal_cache import invalidate_principal
+from .role_cache import invalidate_role
+from .user_cache import invalidate_user, user_cache
 
 EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 PHONE_REGEX = re.compile(r"^\+?[1-9]\d{6,14}$")
 
 
+async def _ensure_connected():
+    if not db.is_connected():
+        await db.connect()
+
+
 def _get_app_url() -> str:
     """Resolve the app base URL from environment variables."""
     return os.getenv("NEXT_PUBLIC_APP_URL") or (
@@ -42,8 +51,7 @@ async def create_organization(name: str, creator_user_id: str):
     Create a new organization and make the creator an ADMIN.
     Returns the created organization document.
     """
-    if not db.is_connected():
-        await db.connect()
+    await _ensure_connected()
 
     slug = _slugify(name)
 
@@ -75,6 +83,8 @@ async def create_organization(name: str, creator_user_id: str):
         "updated_at": now,
     }
     await db.db.organization_members.insert_one(member_data)
+    invalidate_role(creator_user_id, str(result.inserted_id))
+    invalidate_user(creator_user_id)
 
     return org_data
 
@@ -90,8 +100,7 @@ async def complete_user_profile(
     Marks a user's profile as complete and optionally updates name, email, avatar fields.
     Clears the requires_profile_completion flag.
     """
-    if not db.is_connected():
-        await db.connect()
+    await _ensure_connected()
 
     from bson import ObjectId as _ObjectId
 
@@ -118,6 +127,8 @@ async def complete_user_profile(
         {"_id": _ObjectId(user_id)},
         {"$set": update_fields},
     )
+    invalidate_user(user_id)
+    invalidate_principal(user_id)
 
     return await db.db.users.find_one({"_id": _ObjectId(user_id)})
 
@@ -131,13 +142,11 @@ async def create_invitation(
 ):
     """
     Creates a new invitation for a user to join an organization.
-    Validates identifier (email or phone), prevents duplicates, and sends
-    an invitation via the specified channel (email or whatsapp).
+    Validates identifier (email or phone), prevents duplicates, and queues
+    an invitation for delivery via the specified channel (email or whatsapp).
+    The result reports the delivery as PENDING until the worker sends it.
     """
-    from ..notification.service import create_notification
-
-    if not db.is_connected():
-        await db.connect()
+    await _ensure_connected()
 
     # Validate identifier format based on channel
     if channel == "whatsapp":
@@ -185,35 +194,18 @@ async def create_invitation(
 
     invite_url = f"{_get_app_url()}/invite/{token}"
 
-    try:
-        if channel == "whatsapp":
-            await send_whatsapp_invitation(
-                to=identifier, org_name=org_name, invite_url=invite_url
-            )
-        else:
-            await send_email_invitation(
-                to=identifier, org_name=org_name, invite_url=invite_url
-            )
-        print(f"Invitation sent to {identifier} via {channel}")
-    except Exception as e:
-        # If the user already exists locally, fall back to in-app notification
-        existing_user = await db.db.users.find_one({"email": identifier})
-        if existing_user:
-            print(
-                f"Failed to send {channel} invitation to {identifier}, "
-                "sending in-app notification instead."
-            )
-            await create_notification(
-                user_id=str(existing_user["_id"]),
-                organization_id=organization_id,
-                notification_type="INVITATION",
-                title="New Invitation",
-                message=f"You have been invited to join {org_name}",
-                reference_id=str(invitation_data["_id"]),
-            )
-        else:
-            print(f"Failed to send invitation: {e}")
-            raise e
+    # Retries happen in the outbox worker; if delivery finally fails, an
+    # existing user gets an in-app notification instead
+    await enqueue_invitation(
+        channel,
+        identifier,
+        org_name,
+        invite_url,
+        organization_id=organization_id,
+        invitation_id=invitation_data["_id"],
+        notify_on_failure=True,
+    )
+    invitation_data["delivery_status"] = PENDING
 
     print(f"Invitation created for {identifier} to join org {organization_id}")
 
@@ -225,8 +217,7 @@ async def accept_invitation_by_id(invitation_id: str, user_id: str):
     Accepts an invitation by ID, adding the user to the organization.
     Used when existing users click on invitation notifications.
     """
-    if not db.is_connected():
-        await db.connect()
+    await _ensure_connected()
 
     invitation = await db.db.invitations.find_one({"_id": ObjectId(invitation_id)})
 
@@ -274,6 +265,8 @@ async def accept_invitation_by_id(invitation_id: str, user_id: str):
         "updated_at": now,
     }
     await db.db.organization_members.insert_one(member_data)
+    invalidate_role(user_id, invitation["organization_id"])
+    invalidate_user(user_id)
 
     # Mark invitation as accepted
     updated_invitation = await db.db.invitations.find_one_and_update(
@@ -287,8 +280,7 @@ async def accept_invitation_by_id(invitation_id: str, user_id: str):
 
 async def get_pending_invitations(organization_id: str):
     """Get all pending (not accepted, not expired) invitations for an org."""
-    if not db.is_connected():
-        await db.connect()
+    await _ensure_connected()
 
     now = datetime.utcnow()
     invitations = []
@@ -306,8 +298,7 @@ async def get_pending_invitations(organization_id: str):
 
 async def revoke_invitation(invitation_id: str):
     """Delete a pending invitation."""
-    if not db.is_connected():
-        await db.connect()
+    await _ensure_connected()
 
     invitation = await db.db.invitations.find_one({"_id": ObjectId(invitation_id)})
     if not invitation:
@@ -322,8 +313,7 @@ async def revoke_invitation(invitation_id: str):
 
 async def resend_invitation(invitation_id: str):
     """Resend a pending invitation via the original channel."""
-    if not db.is_connected():
-        await db.connect()
+    await _ensure_connected()
 
     invitation = await db.db.invitations.find_one({"_id": ObjectId(invitation_id)})
     if not invitation:
@@ -342,18 +332,14 @@ async def resend_invitation(invitation_id: str):
     channel = invitation.get("channel", "email")
     invite_url = f"{_get_app_url()}/invite/{invitation['token']}"
 
-    try:
-        if channel == "whatsapp":
-            await send_whatsapp_invitation(
-                to=identifier, org_name=org_name, invite_url=invite_url
-            )
-        else:
-            await send_email_invitation(
-                to=identifier, org_name=org_name, invite_url=invite_url
-            )
-    except Exception as e:
-        print(f"Failed to resend invitation to {identifier} via {channel}: {e}")
-        raise e
+    await enqueue_invitation(
+        channel,
+        identifier,
+        org_name,
+        invite_url,
+        organization_id=invitation["organization_id"],
+        invitation_id=invitation_id,
+    )
 
     # Update timestamp
     now = datetime.utcnow()
@@ -362,41 +348,60 @@ async def resend_invitation(invitation_id: str):
         {"$set": {"updated_at": now}},
         return_document=True,
     )
+    if updated:
+        updated["delivery_status"] = PENDING
     return updated
 
 
+def _object_ids(ids) -> list:
+    """Convert string IDs to ObjectIds, skipping any that are malformed."""
+    object_ids = []
+    for id_ in ids:
+        try:
+            object_ids.append(ObjectId(id_))
+        except Exception:
+            pass
+    return object_ids
+
+
+async def _find_by_ids(collection, ids) -> dict:
+    """Fetch documents by ID with a single $in query, keyed by string ID."""
+    object_ids = _object_ids(set(ids))
+    if not object_ids:
+        return {}
+    docs = {}
+    async for doc in collection.find({"_id": {"$in": object_ids}}):
+        docs[str(doc["_id"])] = doc
+    return docs
+
+
 async def get_organization_members(organization_id: str):
     """
     Get all members of an organization with their user details.
+    Users and houses are joined with one $in query each, and the
+    organization is fetched once.
     """
-    if not db.is_connected():
-        await db.connect()
+    await _ensure_connected()
 
     members = []
     cursor = db.db.organization_members.find({"organization_id": organization_id})
     async for member in cursor:
-        # Fetch user info
-        user = await db.db.users.find_one({"_id": ObjectId(member["user_id"])})
-        member["user"] = user
-
-        # Fetch house if assigned
-        house = None
-        if member.get("house_id"):
-            try:
-                house = await db.db.houses.find_one(
-                    {"_id": ObjectId(member["house_id"])}
-                )
-            except Exception:
-                pass
-        member["house"] = house
-
-        # Fetch org
-        org = await db.db.organizations.find_one(
-            {"_id": ObjectId(member["organization_id"])}
-        )
-        member["organization"] = org
-
         members.append(member)
+    if not members:
+        return members
+
+    users = await _find_by_ids(db.db.users, (m["user_id"] for m in members))
+    houses = await _find_by_ids(
+        db.db.houses, (m["house_id"] for m in members if m.get("house_id"))
+    )
+    org = None
+    if _object_ids([organization_id]):
+        org = await db.db.organizations.find_one({"_id": ObjectId(organization_id)})
+
+    for member in members:
+        member["user"] = users.get(member["user_id"])
+        member["house"] = houses.get(member.get("house_id") or "")
+        member["organization"] = org
 
     return members
 
@@ -405,8 +410,7 @@ async def update_member_role(member_id: str, new_role: str, admin_user_id: str):
     """
     Update a member's role. Prevents removing the last admin.
     """
-    if not db.is_connected():
-        await db.connect()
+    await _ensure_connected()
 
     member = await db.db.organization_members.find_one({"_id": ObjectId(member_id)})
     if not member:
@@ -437,6 +441,8 @@ async def update_member_role(member_id: str, new_role: str, admin_user_id: str):
         {"$set": {"role": new_role, "updated_at": now}},
         return_document=True,
     )
+    invalidate_role(member["user_id"], org_id)
+    invalidate_user(member["user_id"])
 
     # Fetch related data
     user = await db.db.users.find_one({"_id": ObjectId(updated["user_id"])})
@@ -461,10 +467,13 @@ async def update_member_role(member_id: str, new_role: str, admin_user_id: str):
 async def get_user_with_memberships(user_id: str):
     """
     Fetches a user by ID, including their organization memberships.
-    Uses aggregation to join related collections.
+    Organizations and houses are joined with one batched lookup each.
     """
-    if not db.is_connected():
-        await db.connect()
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    await _ensure_connected()
 
     try:
         user = await db.db.users.find_one({"_id": ObjectId(user_id)})
@@ -474,27 +483,24 @@ async def get_user_with_memberships(user_id: str):
     if not user:
         return None
 
-    # Fetch memberships for this user
     memberships = []
-    cursor = db.db.organization_members.find({"user_id": str(user["_id"])})
-    async for membership in cursor:
-        # Fetch organization for this membership
-        org = await db.db.organizations.find_one(
-            {"_id": ObjectId(membership["organization_id"])}
-        )
-
-        # Fetch house if assigned
-        house = None
-        if membership.get("house_id"):
-            house = await db.db.houses.find_one(
-                {"_id": ObjectId(membership["house_id"])}
-            )
-
-        membership["organization"] = org
-        membership["house"] = house
+    async for membership in db.db.organization_members.find(
+        {"user_id": str(user["_id"])}
+    ):
         memberships.append(membership)
 
+    orgs = await _find_by_ids(
+        db.db.organizations, [m["organization_id"] for m in memberships]
+    )
+    houses = await _find_by_ids(
+        db.db.houses, [m["house_id"] for m in memberships if m.get("house_id")]
+    )
+    for membership in memberships:
+        membership["organization"] = orgs.get(membership["organization_id"])
+        membership["house"] = houses.get(membership.get("house_id") or "")
+
     user["memberships"] = memberships
+    user_cache.set(user_id, user)
     return user
 
 
@@ -503,8 +509,7 @@ async def remove_member_from_organization(member_id: str, admin_user_id: str):
     Removes a member from the organization and all related data.
     Admin only. Cannot remove yourself or the last admin.
     """
-    if not db.is_connected():
-        await db.connect()
+    await _ensure_connected()
 
     member = await db.db.organization_members.find_one({"_id": ObjectId(member_id)})
     if not member:
@@ -534,9 +539,12 @@ async def remove_member_from_organization(member_id: str, admin_user_id: str):
             {"voter_user_id": target_user_id},
             {"$set": {"voter_user_id": None}},
         )
+        invalidate_vote_context(HOUSE, member["house_id"])
 
     # 2. Delete organization membership
     await db.db.organization_members.delete_one({"_id": ObjectId(member_id)})
+    invalidate_role(target_user_id, org_id)
+    invalidate_user(target_user_id)
 
     # 3. Delete notifications for this user in this org
     await db.db.notifications.delete_many(
@@ -551,6 +559,7 @@ async def remove_member_from_organization(member_id: str, admin_user_id: str):
     if other_memberships == 0:
         # No other org memberships — remove user entirely
         await db.db.users.delete_one({"_id": ObjectId(target_user_id)})
+        invalidate_principal(target_user_id)
 
         # Delete any remaining notifications
         await db.db.notifications.delete_many({"user_id": target_user_id})
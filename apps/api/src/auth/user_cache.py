@@ -0,0 +1,22 @@
+import os
+from typing import Optional
+
+from ..cache import TTLCache
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "0"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+# get_user_with_memberships results keyed on user id. Copied in and out, as
+# callers add to the returned documents.
+user_cache = TTLCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES, copy_values=True)
+
+
+def invalidate_user(user_id: Optional[str] = None) -> None:
+    """
+    Invalidation hook for profile and membership changes. Changes that touch
+    data embedded for many users (e.g. a house rename) invalidate everything.
+    """
+    if user_id is None:
+        user_cache.clear()
+    else:
+        user_cache.invalidate(user_id)
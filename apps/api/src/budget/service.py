@@ -15,21 +15,25 @@ async def get_budget(proposal_id: str) -> Optional[dict]:
     return await db.db.budgets.find_one({"proposal_id": proposal_id})
 
 
-async def get_budgets(organization_id: str) -> List[dict]:
-    """Get all budgets for proposals in an organization."""
+async def get_budgets(organization_id: str, reports: bool = False) -> List[dict]:
+    """
+    Get all budgets for proposals in an organization. With ``reports`` the
+    reads are routed like other reporting queries (see db.reports).
+    """
     await _ensure_connected()
+    database = db.reports if reports else db.db
 
     # Find all proposals in org
     proposal_ids = []
-    async for proposal in db.db.proposals.find(
+    async for proposal in database.proposals.find(
         {"organization_id": organization_id}, {"_id": 1}
     ):
         proposal_ids.append(str(proposal["_id"]))
 
     budgets = []
-    async for budget in db.db.budgets.find({"proposal_id": {"$in": proposal_ids}}).sort(
-        "created_at", -1
-    ):
+    async for budget in database.budgets.find(
+        {"proposal_id": {"$in": proposal_ids}}
+    ).sort("created_at", -1):
         budgets.append(budget)
     return budgets
 
@@ -102,8 +106,8 @@ async def get_financial_summary(organization_id: str) -> dict:
     """Get financial summary for all budgets in an org."""
     await _ensure_connected()
 
-    budgets = await get_budgets(organization_id)
-    total_houses = await db.db.houses.count_documents(
+    budgets = await get_budgets(organization_id, reports=True)
+    total_houses = await db.reports.houses.count_documents(
         {"organization_id": organization_id}
     )
 
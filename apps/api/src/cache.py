@@ -0,0 +1,73 @@
+import copy
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Bounded, process-wide TTL cache that the per-domain caches configure.
+
+    Disabled when ``ttl_seconds`` is 0. Other serverless instances do not see
+    this process's invalidations, so each domain cache picks a default TTL for
+    the staleness it can tolerate. Reads refresh an entry, and once
+    ``max_entries`` is reached the least recently used one is dropped. None is
+    never cached. With ``copy_values`` documents are copied in and out so
+    callers never mutate a cached one.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, copy_values: bool = False):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.copy_values = copy_values
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _copy(self, value: Any) -> Any:
+        return copy.deepcopy(value) if self.copy_values else value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            return None
+        # Re-inserting moves the entry to the end of the eviction order
+        self._entries[key] = entry
+        return self._copy(value)
+
+    def set(
+        self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None
+    ) -> None:
+        """Cache a value, for less than the configured TTL if ``ttl_seconds`` is given."""
+        if not self.enabled or value is None:
+            return
+        ttl = self.ttl_seconds
+        if ttl_seconds is not None:
+            ttl = min(ttl, ttl_seconds)
+        if ttl <= 0:
+            return
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order, so this drops the least recently used
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (self._copy(value), time.monotonic() + ttl)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """Drop every entry whose key and value match ``predicate``."""
+        for key, (value, _) in list(self._entries.items()):
+            if predicate(key, value):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
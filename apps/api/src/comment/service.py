@@ -4,6 +4,7 @@ from typing import List, Optional
 from bson import ObjectId
 
 from ...database import db
+from ..analytics.snapshots import mark_analytics_dirty_for_proposal
 
 
 async def _ensure_connected():
@@ -75,6 +76,7 @@ async def create_comment(
     result = await db.db.comments.insert_one(comment_data)
     comment = await db.db.comments.find_one({"_id": result.inserted_id})
     comment["replies"] = []
+    await mark_analytics_dirty_for_proposal(proposal_id)
     return comment
 
 
@@ -97,14 +99,20 @@ async def delete_comment(comment_id: str) -> bool:
     """Delete a comment and its replies."""
     await _ensure_connected()
     try:
+        comment = await db.db.comments.find_one(
+            {"_id": ObjectId(comment_id)}, {"proposal_id": 1}
+        )
         # Delete the comment
         result = await db.db.comments.delete_one({"_id": ObjectId(comment_id)})
         # Also delete any replies to this comment
         await db.db.comments.delete_many({"parent_id": comment_id})
-        return result.deleted_count > 0
     except Exception:
         return False
 
+    if result.deleted_count > 0 and comment:
+        await mark_analytics_dirty_for_proposal(comment["proposal_id"])
+    return result.deleted_count > 0
+
 
 async def get_comment_count(proposal_id: str) -> int:
     """Get total comment count for a proposal."""
@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from strawberry.dataloader import DataLoader
+
+from ...database import db
+
+
+async def _ensure_connected():
+    if not db.is_connected():
+        await db.connect()
+
+
+def _to_object_id(value: str) -> Optional[ObjectId]:
+    try:
+        return ObjectId(value)
+    except Exception:
+        return None
+
+
+def _by_id_loader(collection_name: str) -> DataLoader:
+    """Build a loader that batches ``_id`` lookups into a single ``$in`` query."""
+
+    async def load(ids: List[str]) -> List[Optional[dict]]:
+        await _ensure_connected()
+
+        object_ids = [oid for oid in (_to_object_id(i) for i in ids) if oid]
+        docs: Dict[str, dict] = {}
+        if object_ids:
+            cursor = db.db[collection_name].find({"_id": {"$in": object_ids}})
+            async for doc in cursor:
+                docs[str(doc["_id"])] = doc
+
+        return [docs.get(i) for i in ids]
+
+    return DataLoader(load_fn=load)
+
+
+async def _load_memberships(
+    keys: List[Tuple[str, str]],
+) -> List[Optional[dict]]:
+    """Batch (user_id, organization_id) membership lookups into one query."""
+    await _ensure_connected()
+
+    user_ids = list({user_id for user_id, _ in keys})
+    org_ids = list({org_id for _, org_id in keys})
+
+    members: Dict[Tuple[str, str], dict] = {}
+    cursor = db.db.organization_members.find(
+        {"user_id": {"$in": user_ids}, "organization_id": {"$in": org_ids}}
+    )
+    async for member in cursor:
+        members[(member["user_id"], member["organization_id"])] = member
+
+    return [members.get(key) for key in keys]
+
+
+class Loaders:
+    """
+    Per-request registry of batching loaders.
+    All lookups for an entity type issued in the same event-loop tick are
+    coalesced into one query, and results are cached for the request.
+    """
+
+    def __init__(self):
+        self.proposals = _by_id_loader("proposals")
+        self.houses = _by_id_loader("houses")
+        self.users = _by_id_loader("users")
+        self.organizations = _by_id_loader("organizations")
+        self.memberships = DataLoader(load_fn=_load_memberships)
+
+
+def get_loaders(info) -> Loaders:
+    """Return the loaders attached to the request context, creating them if absent."""
+    loaders = info.context.get("loaders")
+    if loaders is None:
+        loaders = Loaders()
+        info.context["loaders"] = loaders
+    return loaders
@@ -4,6 +4,7 @@ from typing import List, Optional
 from bson import ObjectId
 
 from ...database import db
+from ..pagination.service import paginate
 
 ALLOWED_TYPES = {"QUOTE", "DESIGN", "WARRANTY", "RECEIPT", "OTHER"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
@@ -28,6 +29,20 @@ async def get_documents(proposal_id: str, doc_type: Optional[str] = None) -> Lis
     return docs
 
 
+async def get_documents_page(
+    proposal_id: str,
+    doc_type: Optional[str] = None,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+) -> dict:
+    """Get one page of a proposal's documents, newest first."""
+    await _ensure_connected()
+    query: dict = {"proposal_id": proposal_id}
+    if doc_type:
+        query["type"] = doc_type
+    return await paginate(db.db.documents, query, first, after)
+
+
 async def get_document(document_id: str) -> Optional[dict]:
     """Get a single document by ID."""
     await _ensure_connected()
@@ -0,0 +1,19 @@
+import os
+
+from ..cache import TTLCache
+
+HOUSE_COUNT_CACHE_TTL_SECONDS = float(os.getenv("HOUSE_COUNT_CACHE_TTL_SECONDS", "60"))
+HOUSE_COUNT_CACHE_MAX_ENTRIES = int(os.getenv("HOUSE_COUNT_CACHE_MAX_ENTRIES", "10000"))
+
+# Houses per organization, the denominator of vote thresholds. Unlike the
+# other caches this one is on by default: another instance's house changes
+# only shift a threshold check by at most the TTL, and nothing is authorized
+# from it.
+house_count_cache = TTLCache(
+    HOUSE_COUNT_CACHE_TTL_SECONDS, HOUSE_COUNT_CACHE_MAX_ENTRIES
+)
+
+
+def invalidate_house_count(organization_id: str) -> None:
+    """Invalidation hook for services that create or delete houses."""
+    house_count_cache.invalidate(organization_id)
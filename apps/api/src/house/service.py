@@ -1,9 +1,12 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from bson import ObjectId
 
 from ...database import db
+from ..auth.user_cache import invalidate_user
+from ..voting.vote_cache import HOUSE, invalidate_vote_context
+from .count_cache import house_count_cache, invalidate_house_count
 
 
 async def _ensure_connected():
@@ -11,18 +14,25 @@ async def _ensure_connected():
         await db.connect()
 
 
-async def get_houses(organization_id: str) -> List:
-    """Get all houses for an organization."""
+async def get_houses(
+    organization_id: str,
+    projection: Optional[dict] = None,
+    include_residents: bool = True,
+) -> List:
+    """
+    Get all houses for an organization. Pass a projection to fetch only some
+    fields, and include_residents=False to skip the residents lookup.
+    """
     await _ensure_connected()
 
     houses = []
-    cursor = db.db.houses.find({"organization_id": organization_id}).sort(
+    cursor = db.db.houses.find({"organization_id": organization_id}, projection).sort(
         "created_at", 1
     )
     async for house in cursor:
         houses.append(house)
 
-    if not houses:
+    if not houses or not include_residents:
         return houses
 
     # Batch-fetch all residents for this organization's houses in one query
@@ -76,6 +86,7 @@ async def create_house(organization_id: str, name: str):
     }
 
     result = await db.db.houses.insert_one(house_data)
+    invalidate_house_count(organization_id)
     house = await db.db.houses.find_one({"_id": result.inserted_id})
     house["residents"] = []
 
@@ -92,6 +103,8 @@ async def update_house(house_id: str, name: str):
         {"$set": {"name": name, "updated_at": now}},
         return_document=True,
     )
+    # The house is embedded in every resident's membership
+    invalidate_user()
 
     if house:
         # Fetch residents
@@ -121,6 +134,8 @@ async def delete_house(house_id: str) -> bool:
         )
 
     result = await db.db.houses.delete_one({"_id": ObjectId(house_id)})
+    invalidate_vote_context(HOUSE, house_id)
+    invalidate_house_count(house["organization_id"])
     return result.deleted_count > 0
 
 
@@ -162,12 +177,16 @@ async def assign_resident_to_house(user_id: str, house_id: str):
         return_document=True,
     )
 
+    invalidate_user(user_id)
+
     # Auto-assign as voter if house has no voter yet
     if not house.get("voter_user_id"):
         await db.db.houses.update_one(
             {"_id": ObjectId(house_id)},
             {"$set": {"voter_user_id": user_id, "updated_at": now}},
         )
+        invalidate_user()
+        invalidate_vote_context(HOUSE, house_id)
 
     # Fetch organization
     org = await db.db.organizations.find_one(
@@ -208,6 +227,8 @@ async def remove_resident_from_house(user_id: str, organization_id: str):
             {"_id": house["_id"]},
             {"$set": {"voter_user_id": None, "updated_at": datetime.utcnow()}},
         )
+        invalidate_user()
+        invalidate_vote_context(HOUSE, str(house["_id"]))
 
     now = datetime.utcnow()
     updated_member = await db.db.organization_members.find_one_and_update(
@@ -215,6 +236,7 @@ async def remove_resident_from_house(user_id: str, organization_id: str):
         {"$set": {"house_id": None, "updated_at": now}},
         return_document=True,
     )
+    invalidate_user(user_id)
 
     # Fetch organization
     org = await db.db.organizations.find_one(
@@ -256,11 +278,18 @@ async def set_house_voter(house_id: str, target_user_id: str):
         {"_id": ObjectId(house_id)},
         {"$set": {"voter_user_id": target_user_id, "updated_at": now}},
     )
+    invalidate_user()
+    invalidate_vote_context(HOUSE, house_id)
 
     return await get_house(house_id)
 
 
 async def get_houses_count(organization_id: str) -> int:
-    """Get the count of houses in an organization."""
+    """Get the count of houses in an organization (see house_count_cache)."""
+    cached = house_count_cache.get(organization_id)
+    if cached is not None:
+        return cached
     await _ensure_connected()
-    return await db.db.houses.count_documents({"organization_id": organization_id})
+    count = await db.db.houses.count_documents({"organization_id": organization_id})
+    house_count_cache.set(organization_id, count)
+    return count
@@ -0,0 +1,185 @@
+"""
+In-process metrics exported in the Prometheus text format on /metrics.
+
+Metrics are per process, so on serverless each instance reports its own
+counts since it started; the scraper aggregates across instances.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Distinct label sets kept per metric; further ones are folded into "other"
+MAX_LABEL_SETS = int(os.getenv("METRICS_MAX_LABEL_SETS", "500"))
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, values: Dict[str, str], existing: dict) -> Labels:
+        labels = tuple((name, str(values.get(name, ""))) for name in self.label_names)
+        if labels not in existing and len(existing) >= MAX_LABEL_SETS:
+            labels = tuple((name, "other") for name in self.label_names)
+        return labels
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        with self._lock:
+            key = self._key(labels, self._values)
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels, self._values), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = self._header()
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(labels)} {value:g}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(buckets)
+        # Per label set: count per bucket, then total count and sum
+        self._values: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        with self._lock:
+            key = self._key(labels, self._values)
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._values.get(self._key(labels, self._values))
+            return int(series[-2]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = {labels: list(series) for labels, series in self._values.items()}
+        lines = self._header()
+        for labels, series in sorted(values.items()):
+            for bound, cumulative in zip(self.buckets, series):
+                le = ("le", f"{bound:g}")
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(labels, le)} {cumulative:g}"
+                )
+            inf = ("le", "+Inf")
+            lines.append(
+                f"{self.name}_bucket{_format_labels(labels, inf)} {series[-2]:g}"
+            )
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {series[-1]:g}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series[-2]:g}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """The metrics this process exports, rendered in registration order."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        return self._register(Counter(name, help_text, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def _register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise Exception(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """
+        Render every metric, plus point-in-time ``gauges`` given as
+        {"name": value} or {'name{label="x"}': value}.
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        typed = set()
+        for name, value in (gauges or {}).items():
+            family = name.split("{", 1)[0]
+            if family not in typed:
+                typed.add(family)
+                lines.append(f"# TYPE {family} gauge")
+            lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+# Global metrics registry
+registry = MetricsRegistry()
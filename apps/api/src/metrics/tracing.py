@@ -0,0 +1,180 @@
+"""
+GraphQL and MongoDB instrumentation feeding the metrics registry.
+
+TracingExtension times each operation and each resolver that does work (root
+fields and async resolvers; plain attribute reads are skipped). While an
+operation runs, its RequestStats sit in a context variable, which Motor copies
+into the executor threads that run PyMongo, so CommandMetrics can attribute
+every MongoDB command to the operation that issued it.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from inspect import isawaitable
+from typing import Dict, Optional, Tuple
+
+from pymongo import monitoring
+from strawberry.extensions import SchemaExtension
+
+from .service import COUNT_BUCKETS, registry
+
+ROOT_TYPES = ("Query", "Mutation", "Subscription")
+
+# Commands that are connection housekeeping rather than application queries
+IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "endSessions"}
+
+operation_duration = registry.histogram(
+    "graphql_operation_duration_seconds",
+    "GraphQL operation latency",
+    ("operation", "type"),
+)
+field_duration = registry.histogram(
+    "graphql_field_duration_seconds",
+    "GraphQL resolver latency",
+    ("field",),
+)
+operation_db_commands = registry.histogram(
+    "graphql_operation_db_commands",
+    "MongoDB commands issued per GraphQL operation",
+    ("operation",),
+    buckets=COUNT_BUCKETS,
+)
+operation_db_duration = registry.histogram(
+    "graphql_operation_db_duration_seconds",
+    "Total MongoDB command time per GraphQL operation",
+    ("operation",),
+)
+db_commands = registry.counter(
+    "mongodb_commands_total",
+    "MongoDB commands by command, collection and GraphQL operation",
+    ("command", "collection", "operation", "outcome"),
+)
+db_command_duration = registry.counter(
+    "mongodb_command_duration_seconds_total",
+    "Time spent in MongoDB commands",
+    ("command", "collection", "operation"),
+)
+
+
+class RequestStats:
+    """Database work attributed to one GraphQL operation."""
+
+    def __init__(self, operation: str = "anonymous"):
+        self.operation = operation
+        self.db_commands = 0
+        self.db_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add_command(self, seconds: float) -> None:
+        # Commands of one operation can complete on several executor threads
+        with self._lock:
+            self.db_commands += 1
+            self.db_seconds += seconds
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request", default=None
+)
+
+
+def _operation_type(execution_context) -> str:
+    try:
+        return execution_context.operation_type.value
+    except Exception:
+        return "unknown"
+
+
+class TracingExtension(SchemaExtension):
+    """Records per-operation and per-resolver latency and database usage."""
+
+    def on_operation(self):
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            try:
+                current_request.reset(token)
+            except ValueError:
+                current_request.set(None)
+            name = self.execution_context.operation_name or "anonymous"
+            stats.operation = name
+            operation_duration.observe(
+                elapsed, operation=name, type=_operation_type(self.execution_context)
+            )
+            operation_db_commands.observe(stats.db_commands, operation=name)
+            operation_db_duration.observe(stats.db_seconds, operation=name)
+
+    def on_execute(self):
+        # The operation name is known once the document has been parsed
+        stats = current_request.get()
+        if stats is not None:
+            stats.operation = self.execution_context.operation_name or "anonymous"
+        yield
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        started = time.perf_counter()
+        result = _next(root, info, *args, **kwargs)
+        field = f"{info.parent_type.name}.{info.field_name}"
+        if isawaitable(result):
+            return self._timed(result, field, started)
+        if info.parent_type.name in ROOT_TYPES:
+            field_duration.observe(time.perf_counter() - started, field=field)
+        return result
+
+    async def _timed(self, result, field: str, started: float):
+        try:
+            return await result
+        finally:
+            field_duration.observe(time.perf_counter() - started, field=field)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Counts MongoDB commands and their durations. Events arrive on driver threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (connection, request_id) -> (collection, stats) of in-flight commands
+        self._started: Dict[Tuple[object, int], Tuple[str, Optional[RequestStats]]] = {}
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else ""
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = (
+                collection,
+                current_request.get(),
+            )
+
+    def _finish(self, event, outcome: str) -> None:
+        with self._lock:
+            entry = self._started.pop((event.connection_id, event.request_id), None)
+        if entry is None:
+            return
+        collection, stats = entry
+        seconds = event.duration_micros / 1_000_000
+        operation = stats.operation if stats else "none"
+        labels = {
+            "command": event.command_name,
+            "collection": collection,
+            "operation": operation,
+        }
+        db_commands.inc(outcome=outcome, **labels)
+        db_command_duration.inc(seconds, **labels)
+        if stats is not None:
+            stats.add_command(seconds)
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+
+# Global command listener, registered on the Motor client by index.py
+command_metrics = CommandMetrics()
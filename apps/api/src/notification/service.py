@@ -2,8 +2,16 @@ from datetime import datetime
 from typing import List, Optional
 
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
 
 from ...database import db
+from ..pagination.service import (
+    NEWEST_FIRST,
+    build_page,
+    page_query,
+    page_size,
+    paginate,
+)
 
 
 async def _ensure_connected():
@@ -26,6 +34,14 @@ async def get_notifications(user_id: str, limit: int = 50) -> List[dict]:
     return notifications
 
 
+async def get_notifications_page(
+    user_id: str, first: Optional[int] = None, after: Optional[str] = None
+) -> dict:
+    """Get one page of a user's notifications, newest first."""
+    await _ensure_connected()
+    return await paginate(db.db.notifications, {"user_id": user_id}, first, after)
+
+
 async def get_unread_count(user_id: str) -> int:
     """Get count of unread notifications for a user."""
     await _ensure_connected()
@@ -34,7 +50,7 @@ async def get_unread_count(user_id: str) -> int:
     )
 
 
-async def create_notification(
+def _build_notification(
     user_id: str,
     organization_id: str,
     notification_type: str,
@@ -42,11 +58,8 @@ async def create_notification(
     message: str,
     reference_id: str,
 ) -> dict:
-    """Create a new notification."""
-    await _ensure_connected()
-
     now = datetime.utcnow()
-    data = {
+    return {
         "user_id": user_id,
         "organization_id": organization_id,
         "type": notification_type,
@@ -58,10 +71,64 @@ async def create_notification(
         "updated_at": now,
     }
 
+
+async def create_notification(
+    user_id: str,
+    organization_id: str,
+    notification_type: str,
+    title: str,
+    message: str,
+    reference_id: str,
+) -> dict:
+    """Create a new notification."""
+    await _ensure_connected()
+
+    data = _build_notification(
+        user_id, organization_id, notification_type, title, message, reference_id
+    )
     result = await db.db.notifications.insert_one(data)
     return await db.db.notifications.find_one({"_id": result.inserted_id})
 
 
+async def create_notifications(
+    user_ids: List[str],
+    organization_id: str,
+    notification_type: str,
+    title: str,
+    message: str,
+    reference_id: str,
+    batch_key: Optional[str] = None,
+) -> int:
+    """
+    Create the same notification for many users in a single bulk write.
+    Returns the number of notifications inserted.
+
+    With a batch_key (e.g. an outbox job ID), each user's notification gets a
+    dedupe_key derived from it, which a unique index guards, so repeating the
+    call skips the notifications already written instead of duplicating them.
+    """
+    await _ensure_connected()
+
+    documents = [
+        _build_notification(
+            user_id, organization_id, notification_type, title, message, reference_id
+        )
+        for user_id in user_ids
+    ]
+    if not documents:
+        return 0
+    if batch_key is not None:
+        for document in documents:
+            document["dedupe_key"] = f"{batch_key}:{document['user_id']}"
+
+    try:
+        result = await db.db.notifications.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        # Unordered writes keep going past failures; report what made it in
+        return e.details.get("nInserted", 0)
+    return len(result.inserted_ids)
+
+
 async def mark_notification_read(notification_id: str) -> Optional[dict]:
     """Mark a single notification as read."""
     await _ensure_connected()
@@ -91,24 +158,29 @@ async def notify_org_members(
     title: str,
     message: str,
     reference_id: str,
-) -> None:
-    """Send a notification to all org members except one user."""
+    batch_key: Optional[str] = None,
+) -> int:
+    """Send a notification to all org members except one user. Returns the count sent."""
     await _ensure_connected()
 
     members_cursor = db.db.organization_members.find(
-        {"organization_id": organization_id}
+        {"organization_id": organization_id}, {"user_id": 1}
     )
+    user_ids: dict = {}
     async for member in members_cursor:
         user_id = member.get("user_id")
         if user_id and user_id != exclude_user_id:
-            await create_notification(
-                user_id,
-                organization_id,
-                notification_type,
-                title,
-                message,
-                reference_id,
-            )
+            user_ids[user_id] = None
+
+    return await create_notifications(
+        list(user_ids),
+        organization_id,
+        notification_type,
+        title,
+        message,
+        reference_id,
+        batch_key=batch_key,
+    )
 
 
 async def notify_designated_voters(
@@ -117,28 +189,54 @@ async def notify_designated_voters(
     title: str,
     message: str,
     reference_id: str,
-) -> None:
-    """Send a notification to all designated voters in an organization."""
+    batch_key: Optional[str] = None,
+) -> int:
+    """Send a notification to all designated voters in an organization. Returns the count sent."""
     await _ensure_connected()
 
     cursor = db.db.houses.find(
-        {"organization_id": organization_id, "voter_user_id": {"$ne": None}}
+        {"organization_id": organization_id, "voter_user_id": {"$ne": None}},
+        {"voter_user_id": 1},
     )
-    voter_ids: set = set()
+    voter_ids: dict = {}
     async for house in cursor:
         vid = house.get("voter_user_id")
         if vid:
-            voter_ids.add(vid)
-
-    for voter_id in voter_ids:
-        await create_notification(
-            voter_id,
-            organization_id,
-            notification_type,
-            title,
-            message,
-            reference_id,
-        )
+            voter_ids[vid] = None
+
+    return await create_notifications(
+        list(voter_ids),
+        organization_id,
+        notification_type,
+        title,
+        message,
+        reference_id,
+        batch_key=batch_key,
+    )
+
+
+def _proposal_activity(p: dict, organization_id: str) -> dict:
+    return {
+        "_id": p["_id"],
+        "type": "PROPOSAL",
+        "title": p["title"],
+        "description": f"New proposal: {p['title']}",
+        "reference_id": str(p["_id"]),
+        "organization_id": organization_id,
+        "created_at": p["created_at"],
+    }
+
+
+def _announcement_activity(a: dict, organization_id: str) -> dict:
+    return {
+        "_id": a["_id"],
+        "type": "ANNOUNCEMENT",
+        "title": a["title"],
+        "description": f"New announcement: {a['title']}",
+        "reference_id": str(a["_id"]),
+        "organization_id": organization_id,
+        "created_at": a["created_at"],
+    }
 
 
 async def get_activity_feed(organization_id: str, limit: int = 20) -> List[dict]:
@@ -154,17 +252,7 @@ async def get_activity_feed(organization_id: str, limit: int = 20) -> List[dict]
         .limit(limit)
     )
     async for p in proposal_cursor:
-        items.append(
-            {
-                "_id": p["_id"],
-                "type": "PROPOSAL",
-                "title": p["title"],
-                "description": f"New proposal: {p['title']}",
-                "reference_id": str(p["_id"]),
-                "organization_id": organization_id,
-                "created_at": p["created_at"],
-            }
-        )
+        items.append(_proposal_activity(p, organization_id))
 
     # Recent announcements
     announcement_cursor = (
@@ -173,18 +261,37 @@ async def get_activity_feed(organization_id: str, limit: int = 20) -> List[dict]
         .limit(limit)
     )
     async for a in announcement_cursor:
-        items.append(
-            {
-                "_id": a["_id"],
-                "type": "ANNOUNCEMENT",
-                "title": a["title"],
-                "description": f"New announcement: {a['title']}",
-                "reference_id": str(a["_id"]),
-                "organization_id": organization_id,
-                "created_at": a["created_at"],
-            }
-        )
+        items.append(_announcement_activity(a, organization_id))
 
     # Sort combined by date and limit
     items.sort(key=lambda x: x["created_at"], reverse=True)
     return items[:limit]
+
+
+async def get_activity_feed_page(
+    organization_id: str, first: Optional[int] = None, after: Optional[str] = None
+) -> dict:
+    """
+    Get one page of an organization's activity feed, newest first. Each
+    source is read from the cursor on, and the merged result is trimmed.
+    """
+    await _ensure_connected()
+
+    size = page_size(first)
+    query = page_query({"organization_id": organization_id}, after, NEWEST_FIRST)
+    projection = {"title": 1, "created_at": 1}
+    sources = (
+        (db.db.proposals, _proposal_activity),
+        (db.db.announcements, _announcement_activity),
+    )
+
+    items = []
+    for collection, to_activity in sources:
+        cursor = (
+            collection.find(query, projection).sort(list(NEWEST_FIRST)).limit(size + 1)
+        )
+        async for doc in cursor:
+            items.append(to_activity(doc, organization_id))
+
+    items.sort(key=lambda x: (x["created_at"], x["_id"]), reverse=True)
+    return build_page(items[: size + 1], size)
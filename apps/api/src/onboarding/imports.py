@@ -0,0 +1,292 @@
+"""
+Chunked, resumable onboarding imports.
+
+A client starts an import (which creates the organization), appends rows in
+batches, then submits it. Processing runs in the outbox worker one chunk at a
+time (on serverless, drained after the request and by the outbox cron); each
+chunk checkpoints its per-row results and progress counters before the next
+chunk is queued, so an interrupted import resumes where it stopped.
+"""
+
+import csv
+import io
+import os
+from datetime import datetime
+from typing import List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from ...database import db
+from ..auth.service import create_organization
+from ..outbox.service import enqueue
+from .service import _empty_counts, _validate_rows, _write_rows
+
+MAX_IMPORT_ROWS = int(os.getenv("ONBOARDING_MAX_IMPORT_ROWS", "10000"))
+MAX_APPEND_ROWS = 500
+IMPORT_CHUNK_SIZE = int(os.getenv("ONBOARDING_IMPORT_CHUNK_SIZE", "100"))
+
+# Import job states
+UPLOADING = "UPLOADING"
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+
+ROW_FIELDS = ("property_name", "first_name", "last_name", "phone", "email")
+
+
+async def _ensure_connected():
+    if not db.is_connected():
+        await db.connect()
+
+
+def parse_csv_rows(text: str) -> List[dict]:
+    """
+    Parse CSV text with a header row. Recognized columns are row_id,
+    property_name, first_name, last_name, phone and email.
+    """
+    rows = []
+    for record in csv.DictReader(io.StringIO(text.strip())):
+        record = {
+            (k or "").strip().lower(): (v or "").strip() for k, v in record.items()
+        }
+        if not record.get("property_name"):
+            raise Exception("Every CSV row needs a property_name")
+        row = {field: record.get(field) or None for field in ROW_FIELDS}
+        row["row_id"] = record.get("row_id") or None
+        rows.append(row)
+    return rows
+
+
+async def start_import(
+    organization_name: str,
+    creator_user_id: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> dict:
+    """Create the organization and an empty import job for it."""
+    await _ensure_connected()
+
+    org = await create_organization(organization_name, creator_user_id)
+    now = datetime.utcnow()
+    job = {
+        "organization_id": str(org["_id"]),
+        "organization_name": org["name"],
+        "creator_user_id": creator_user_id,
+        "status": UPLOADING,
+        "chunk_size": chunk_size,
+        "total_rows": 0,
+        "processed_rows": 0,
+        "error_rows": 0,
+        **_empty_counts(),
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+        "completed_at": None,
+    }
+    result = await db.db.import_jobs.insert_one(job)
+    job["_id"] = result.inserted_id
+    return job
+
+
+async def get_import_job(job_id: str) -> Optional[dict]:
+    """Get an import job by ID."""
+    await _ensure_connected()
+    try:
+        return await db.db.import_jobs.find_one({"_id": ObjectId(job_id)})
+    except Exception:
+        return None
+
+
+async def append_import_rows(job_id: str, rows: List[dict]) -> dict:
+    """Append a batch of rows to an import that is still uploading."""
+    await _ensure_connected()
+
+    if len(rows) > MAX_APPEND_ROWS:
+        raise Exception(f"Maximum {MAX_APPEND_ROWS} rows per append")
+    if not rows:
+        raise Exception("No rows to append")
+
+    # Reserve a contiguous index range atomically so concurrent appends
+    # never collide
+    job = await db.db.import_jobs.find_one_and_update(
+        {
+            "_id": ObjectId(job_id),
+            "status": UPLOADING,
+            "total_rows": {"$lte": MAX_IMPORT_ROWS - len(rows)},
+        },
+        {"$inc": {"total_rows": len(rows)}, "$set": {"updated_at": datetime.utcnow()}},
+        return_document=True,
+    )
+    if not job:
+        existing = await get_import_job(job_id)
+        if not existing:
+            raise Exception("Import job not found")
+        if existing["status"] != UPLOADING:
+            raise Exception("Rows can only be appended before the import is submitted")
+        raise Exception(f"Maximum {MAX_IMPORT_ROWS} rows per import")
+
+    first_index = job["total_rows"] - len(rows)
+    await db.db.import_job_rows.insert_many(
+        [
+            {
+                "job_id": job_id,
+                "index": first_index + offset,
+                "row_id": row.get("row_id") or str(first_index + offset + 1),
+                "row": {field: row.get(field) for field in ROW_FIELDS},
+                "status": None,
+                "error": None,
+                "property_id": None,
+                "user_id": None,
+            }
+            for offset, row in enumerate(rows)
+        ]
+    )
+    return job
+
+
+async def submit_import(job_id: str) -> dict:
+    """Close the upload and queue the first chunk for processing."""
+    await _ensure_connected()
+
+    job = await db.db.import_jobs.find_one_and_update(
+        {"_id": ObjectId(job_id), "status": UPLOADING},
+        {"$set": {"status": PENDING, "updated_at": datetime.utcnow()}},
+        return_document=True,
+    )
+    if not job:
+        raise Exception("Only uploading imports can be submitted")
+
+    await enqueue("onboarding_import", {"job_id": job_id})
+    return job
+
+
+async def _next_chunk(job_id: str, status: Optional[str], size: int) -> List[dict]:
+    chunk = []
+    cursor = (
+        db.db.import_job_rows.find({"job_id": job_id, "status": status})
+        .sort("index", 1)
+        .limit(size)
+    )
+    async for doc in cursor:
+        chunk.append(doc)
+    return chunk
+
+
+async def process_import_chunk(job_id: str) -> bool:
+    """
+    Process the next chunk of an import. Returns True if rows remain.
+
+    Rows are flagged PROCESSING before any writes. If a run dies mid-chunk,
+    the retry writes those rows again first: each row's house, membership and
+    invitations are keyed by the row, so what the interrupted run wrote is
+    found instead of duplicated.
+    """
+    await _ensure_connected()
+
+    job = await db.db.import_jobs.find_one_and_update(
+        {"_id": ObjectId(job_id), "status": {"$in": [PENDING, RUNNING]}},
+        {"$set": {"status": RUNNING, "updated_at": datetime.utcnow()}},
+        return_document=True,
+    )
+    if not job:
+        return False
+
+    chunk = await _next_chunk(job_id, "PROCESSING", job["chunk_size"])
+    if not chunk:
+        chunk = await _next_chunk(job_id, None, job["chunk_size"])
+
+    if not chunk:
+        await db.db.import_jobs.update_one(
+            {"_id": job["_id"]},
+            {
+                "$set": {
+                    "status": COMPLETED,
+                    "completed_at": datetime.utcnow(),
+                    "updated_at": datetime.utcnow(),
+                }
+            },
+        )
+        return False
+
+    chunk_ids = [doc["_id"] for doc in chunk]
+    await db.db.import_job_rows.update_many(
+        {"_id": {"$in": chunk_ids}}, {"$set": {"status": "PROCESSING"}}
+    )
+
+    results, valid = _validate_rows(
+        [
+            {"row_id": doc["row_id"], "import_row_id": doc["_id"], **doc["row"]}
+            for doc in chunk
+        ]
+    )
+    counts = await _write_rows(
+        valid,
+        job["organization_id"],
+        job["organization_name"],
+        job["creator_user_id"],
+        datetime.utcnow(),
+    )
+
+    # Checkpoint: per-row results and progress counters for this chunk
+    await db.db.import_job_rows.bulk_write(
+        [
+            UpdateOne(
+                {"_id": doc["_id"]},
+                {
+                    "$set": {
+                        "status": result["status"],
+                        "error": result["error"],
+                        "property_id": result.get("property_id"),
+                        "user_id": result.get("user_id"),
+                    }
+                },
+            )
+            for doc, result in zip(chunk, results)
+        ],
+        ordered=False,
+    )
+    error_rows = sum(1 for result in results if result["status"] == "ERROR")
+    await db.db.import_jobs.update_one(
+        {"_id": job["_id"]},
+        {
+            "$inc": {
+                "processed_rows": len(chunk),
+                "error_rows": error_rows,
+                **counts,
+            },
+            "$set": {"updated_at": datetime.utcnow()},
+        },
+    )
+    return True
+
+
+async def fail_import(job_id: str, error: str) -> None:
+    """Mark an import as failed after its processing retries are exhausted."""
+    await _ensure_connected()
+    await db.db.import_jobs.update_one(
+        {"_id": ObjectId(job_id)},
+        {
+            "$set": {
+                "status": FAILED,
+                "error": error,
+                "updated_at": datetime.utcnow(),
+            }
+        },
+    )
+
+
+async def get_import_rows(job_id: str, offset: int = 0, limit: int = 100) -> List[dict]:
+    """Get per-row results of an import in input order."""
+    await _ensure_connected()
+
+    rows = []
+    cursor = (
+        db.db.import_job_rows.find({"job_id": job_id})
+        .sort("index", 1)
+        .skip(offset)
+        .limit(min(limit, MAX_APPEND_ROWS))
+    )
+    async for row in cursor:
+        rows.append(row)
+    return rows
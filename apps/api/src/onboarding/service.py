@@ -1,236 +1,431 @@
+import hashlib
 import logging
 import re
 import uuid
 from datetime import datetime, timedelta
 
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
 from ...database import db
-from ..auth.channels import send_email_invitation, send_whatsapp_invitation
 from ..auth.service import _get_app_url, create_organization
+from ..auth.user_cache import invalidate_user
+from ..house.count_cache import invalidate_house_count
+from ..outbox.service import enqueue_many, invitation_payload
 
 logger = logging.getLogger(__name__)
 
 E164_REGEX = re.compile(r"^\+[1-9]\d{6,14}$")
 EMAIL_REGEX = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
 MAX_ROWS = 200
+DUPLICATE_KEY_ERROR = 11000
 
 
-async def bulk_setup_organization(
-    organization_name: str,
-    rows: list,
-    creator_user_id: str,
-) -> dict:
-    if len(rows) > MAX_ROWS:
-        raise Exception(f"Maximum {MAX_ROWS} rows per batch")
+def _validate_rows(rows: list) -> tuple:
+    """
+    Normalize and validate contact fields before creating anything.
+    Returns (results, valid) where results holds one entry per row in input
+    order and valid holds the normalized rows that passed.
+    """
+    results = []
+    valid = []
+    for row in rows:
+        row_result = {"row_id": row["row_id"], "status": "SUCCESS", "error": None}
+        results.append(row_result)
 
-    if not db.is_connected():
-        await db.connect()
+        phone = row.get("phone")
+        email = row.get("email")
+        if phone:
+            phone = re.sub(r"\s+", "", phone.strip())
+            if not E164_REGEX.match(phone):
+                row_result["status"] = "ERROR"
+                row_result["error"] = (
+                    f"Invalid phone format: {phone}. "
+                    "Expected E.164 format (e.g., +584121234567)"
+                )
+                continue
+        if email:
+            email = email.strip()
+            if not re.match(EMAIL_REGEX, email):
+                row_result["status"] = "ERROR"
+                row_result["error"] = f"Invalid email format: {email}"
+                continue
 
-    org = await create_organization(organization_name, creator_user_id)
-    org_id = str(org["_id"])
-    org_name = org["name"]
+        valid.append(
+            {
+                "result": row_result,
+                "property_name": row["property_name"],
+                "first_name": row.get("first_name"),
+                "last_name": row.get("last_name"),
+                "phone": phone or None,
+                "email": email or None,
+                "import_row_id": row.get("import_row_id"),
+            }
+        )
+    return results, valid
 
-    now = datetime.utcnow()
-    results = []
-    total_properties = 0
-    total_residents = 0
-    whatsapp_sent = 0
-    email_sent = 0
-    no_contact_count = 0
 
+async def _resolve_users(rows: list, now: datetime) -> None:
+    """
+    Set row["user_id"] for every row with contact info. Phone rows match
+    existing users by phone, email-only rows by email; existing users are
+    found with one $in query and missing ones are created with one insert_many.
+    """
+    phones = {r["phone"] for r in rows if r["phone"]}
+    emails = {r["email"] for r in rows if r["email"] and not r["phone"]}
+    if not phones and not emails:
+        return
+
+    clauses = []
+    if phones:
+        clauses.append({"phone": {"$in": list(phones)}})
+    if emails:
+        clauses.append({"email": {"$in": list(emails)}})
+
+    by_phone: dict = {}
+    by_email: dict = {}
+    async for user in db.db.users.find({"$or": clauses}, {"phone": 1, "email": 1}):
+        if user.get("phone") in phones:
+            by_phone.setdefault(user["phone"], str(user["_id"]))
+        if user.get("email") in emails:
+            by_email.setdefault(user["email"], str(user["_id"]))
+
+    # Rows sharing a phone/email with an earlier row reuse the same new user
+    new_users = []
+    pending: dict = {}
     for row in rows:
-        row_id = row["row_id"]
-        property_name = row["property_name"]
-        first_name = row.get("first_name")
-        last_name = row.get("last_name")
-        phone = row.get("phone")
-        email = row.get("email")
+        if row["phone"]:
+            key, known = ("phone", row["phone"]), by_phone.get(row["phone"])
+        elif row["email"]:
+            key, known = ("email", row["email"]), by_email.get(row["email"])
+        else:
+            continue
+        if known:
+            row["user_id"] = known
+            continue
+        if key not in pending:
+            # Create a local user record; the user will complete
+            # authentication via OTP when they first log in.
+            pending[key] = len(new_users)
+            new_users.append(
+                {
+                    "nextauth_id": None,
+                    "email": row["email"],
+                    "phone": row["phone"],
+                    "auth_provider": "phone" if row["phone"] else "email",
+                    "first_name": row["first_name"],
+                    "last_name": row["last_name"],
+                    "avatar_url": None,
+                    "requires_profile_completion": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            if row["phone"] and row["email"]:
+                # A later email-only row with this address finds this user
+                pending.setdefault(("email", row["email"]), pending[key])
+        row["new_user_index"] = pending[key]
 
-        row_result = {"row_id": row_id, "status": "SUCCESS", "error": None}
+    if new_users:
+        inserted = await db.db.users.insert_many(new_users)
+        for row in rows:
+            if "new_user_index" in row:
+                row["user_id"] = str(inserted.inserted_ids[row.pop("new_user_index")])
 
-        try:
-            # Normalize and validate contact fields before creating anything
-            if phone:
-                phone = re.sub(r"\s+", "", phone.strip())
-                if not E164_REGEX.match(phone):
-                    row_result["status"] = "ERROR"
-                    row_result["error"] = (
-                        f"Invalid phone format: {phone}. "
-                        "Expected E.164 format (e.g., +584121234567)"
-                    )
-                    results.append(row_result)
-                    continue
-
-            if email:
-                email = email.strip()
-                if not re.match(EMAIL_REGEX, email):
-                    row_result["status"] = "ERROR"
-                    row_result["error"] = f"Invalid email format: {email}"
-                    results.append(row_result)
-                    continue
-
-            house_data = {
-                "name": property_name,
-                "organization_id": org_id,
-                "voter_user_id": None,
-                "created_at": now,
-                "updated_at": now,
-            }
-            house_insert = await db.db.houses.insert_one(house_data)
-            house_id = str(house_insert.inserted_id)
-            row_result["property_id"] = house_id
-            total_properties += 1
-
-            user_id = None
-
-            if phone:
-                existing_user = await db.db.users.find_one({"phone": phone})
-
-                if existing_user:
-                    user_id = str(existing_user["_id"])
-                else:
-                    # Create a local user record; the user will complete
-                    # authentication via OTP when they first log in.
-                    user_doc = {
-                        "nextauth_id": None,
-                        "email": email,
-                        "phone": phone,
-                        "auth_provider": "phone",
-                        "first_name": first_name,
-                        "last_name": last_name,
-                        "avatar_url": None,
-                        "requires_profile_completion": True,
-                        "created_at": now,
-                        "updated_at": now,
-                    }
-                    insert_result = await db.db.users.insert_one(user_doc)
-                    user_id = str(insert_result.inserted_id)
-
-            elif email:
-                existing_user = await db.db.users.find_one({"email": email})
-
-                if existing_user:
-                    user_id = str(existing_user["_id"])
-                else:
-                    user_doc = {
-                        "nextauth_id": None,
-                        "email": email,
-                        "phone": None,
-                        "auth_provider": "email",
-                        "first_name": first_name,
-                        "last_name": last_name,
-                        "avatar_url": None,
-                        "requires_profile_completion": True,
-                        "created_at": now,
-                        "updated_at": now,
-                    }
-                    insert_result = await db.db.users.insert_one(user_doc)
-                    user_id = str(insert_result.inserted_id)
-
-            if user_id:
-                member_data = {
-                    "user_id": user_id,
+
+def _empty_counts() -> dict:
+    return {
+        "total_properties": 0,
+        "total_residents": 0,
+        "whatsapp_invitations_sent": 0,
+        "email_invitations_sent": 0,
+        "properties_without_contact": 0,
+    }
+
+
+def _derived_id(*parts) -> ObjectId:
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).digest()
+    return ObjectId(digest[:12])
+
+
+async def _insert_once(collection, docs: list) -> tuple:
+    """
+    Unordered insert_many that skips documents an interrupted earlier run
+    already wrote under the same _id. Returns the IDs of all the documents
+    and the indexes of those inserted now.
+    """
+    try:
+        result = await collection.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+            raise
+        skipped = {error["index"] for error in errors}
+        fresh = [i for i in range(len(docs)) if i not in skipped]
+        return [doc["_id"] for doc in docs], fresh
+    return list(result.inserted_ids), list(range(len(docs)))
+
+
+async def _add_memberships(residents: list, org_id: str, now: datetime) -> dict:
+    """
+    Add one RESIDENT membership per resident user not yet in the organization,
+    as the unique (user_id, organization_id) index requires. Rows whose user
+    is already a member (the creator, or an earlier row with the same contact)
+    keep that membership. Sets row["joined"] on the rows whose membership is
+    for their own house and returns an error message per user whose
+    membership could not be written.
+    """
+    user_ids = list({row["user_id"] for row in residents})
+    members = {}
+    async for member in db.db.organization_members.find(
+        {"organization_id": org_id, "user_id": {"$in": user_ids}},
+        {"user_id": 1, "house_id": 1},
+    ):
+        members[member["user_id"]] = member.get("house_id")
+
+    joining = []
+    for row in residents:
+        if row["user_id"] in members:
+            # Written by an interrupted run of this same import row
+            row["joined"] = members[row["user_id"]] == row["house_id"]
+            continue
+        members[row["user_id"]] = row["house_id"]
+        row["joined"] = True
+        joining.append(row)
+    if not joining:
+        return {}
+
+    failed = {}
+    try:
+        await db.db.organization_members.insert_many(
+            [
+                {
+                    "user_id": row["user_id"],
                     "organization_id": org_id,
-                    "house_id": house_id,
+                    "house_id": row["house_id"],
                     "role": "RESIDENT",
                     "created_at": now,
                     "updated_at": now,
                 }
-                await db.db.organization_members.insert_one(member_data)
+                for row in joining
+            ],
+            ordered=False,
+        )
+    except BulkWriteError as e:
+        # Unordered, so every other membership was still written
+        for error in e.details.get("writeErrors", []):
+            row = joining[error["index"]]
+            row["joined"] = False
+            if error.get("code") != DUPLICATE_KEY_ERROR:
+                failed[row["user_id"]] = error.get("errmsg", "Membership failed")
+    for row in joining:
+        if row["joined"]:
+            invalidate_user(row["user_id"])
+    return failed
 
-                await db.db.houses.update_one(
-                    {"_id": house_insert.inserted_id},
-                    {"$set": {"voter_user_id": user_id}},
-                )
 
-                row_result["user_id"] = user_id
-                total_residents += 1
-
-                # Create invitation(s) and send via available channels
-                base_url = _get_app_url()
-                expires_at = now + timedelta(days=7)
-
-                # Create one invitation per channel so each can be
-                # independently accepted via the invite router which
-                # matches identifier + channel.
-                if phone:
-                    phone_token = str(uuid.uuid4())
-                    await db.db.invitations.insert_one(
-                        {
-                            "token": phone_token,
-                            "identifier": phone,
-                            "channel": "whatsapp",
-                            "organization_id": org_id,
-                            "house_id": house_id,
-                            "inviter_id": creator_user_id,
-                            "role": "RESIDENT",
-                            "status": "pending",
-                            "expires_at": expires_at,
-                            "accepted_at": None,
-                            "created_at": now,
-                            "updated_at": now,
-                        }
-                    )
-
-                if email:
-                    email_token = str(uuid.uuid4())
-                    await db.db.invitations.insert_one(
-                        {
-                            "token": email_token,
-                            "identifier": email,
-                            "channel": "email",
-                            "organization_id": org_id,
-                            "house_id": house_id,
-                            "inviter_id": creator_user_id,
-                            "role": "RESIDENT",
-                            "status": "pending",
-                            "expires_at": expires_at,
-                            "accepted_at": None,
-                            "created_at": now,
-                            "updated_at": now,
-                        }
-                    )
-
-                if phone:
-                    try:
-                        await send_whatsapp_invitation(
-                            phone, org_name, f"{base_url}/invite/{phone_token}"
-                        )
-                        whatsapp_sent += 1
-                    except Exception as e:
-                        logger.warning(
-                            "Failed to send WhatsApp invitation to %s: %s",
-                            phone,
-                            e,
-                        )
-
-                if email:
-                    try:
-                        await send_email_invitation(
-                            email, org_name, f"{base_url}/invite/{email_token}"
-                        )
-                        email_sent += 1
-                    except Exception as e:
-                        logger.warning(
-                            "Failed to send email invitation to %s: %s",
-                            email,
-                            e,
-                        )
-            else:
-                # No phone and no email — property without contact
-                no_contact_count += 1
+async def _write_rows(
+    rows: list, org_id: str, org_name: str, creator_user_id: str, now: datetime
+) -> dict:
+    """
+    Create users, houses, memberships and invitations for validated rows.
+
+    Rows from an import carry import_row_id, which becomes their house's _id
+    and keys their invitations, so writing a row again after an interrupted
+    run finds what it already wrote instead of duplicating it.
+    """
+    counts = _empty_counts()
+    if not rows:
+        return counts
+
+    await _resolve_users(rows, now)
+
+    houses = []
+    for row in rows:
+        house = {
+            "name": row["property_name"],
+            "organization_id": org_id,
+            "voter_user_id": row.get("user_id"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        if row.get("import_row_id"):
+            house["_id"] = row["import_row_id"]
+        houses.append(house)
+    try:
+        house_ids, _ = await _insert_once(db.db.houses, houses)
+    except BulkWriteError as e:
+        # Unordered, so every house without a (non-duplicate) error was
+        # written; record those for the caller before giving up
+        failed = {
+            error["index"]
+            for error in e.details.get("writeErrors", [])
+            if error.get("code") != DUPLICATE_KEY_ERROR
+        }
+        for index, (row, house) in enumerate(zip(rows, houses)):
+            if index not in failed and "_id" in house:
+                row["house_id"] = str(house["_id"])
+                row["result"]["property_id"] = row["house_id"]
+        raise
+    finally:
+        invalidate_house_count(org_id)
+    for row, house_id in zip(rows, house_ids):
+        row["house_id"] = str(house_id)
+        row["result"]["property_id"] = row["house_id"]
+    counts["total_properties"] = len(rows)
+
+    residents = [row for row in rows if row.get("user_id")]
+    counts["properties_without_contact"] = len(rows) - len(residents)
+    if not residents:
+        return counts
+
+    failed = await _add_memberships(residents, org_id, now)
+    if failed:
+        # The property stays, but without a voter that is not a member
+        await db.db.houses.update_many(
+            {
+                "_id": {
+                    "$in": [
+                        house_id
+                        for row, house_id in zip(rows, house_ids)
+                        if row.get("user_id") in failed
+                    ]
+                }
+            },
+            {"$set": {"voter_user_id": None}},
+        )
+    for row in residents:
+        if row["user_id"] in failed:
+            row["result"]["status"] = "ERROR"
+            row["result"]["error"] = failed[row["user_id"]]
+        else:
+            row["result"]["user_id"] = row["user_id"]
+    residents = [row for row in residents if row["user_id"] not in failed]
+    counts["total_residents"] = len({row["user_id"] for row in residents})
+
+    # Create one invitation per channel so each can be independently
+    # accepted via the invite router which matches identifier + channel.
+    base_url = _get_app_url()
+    expires_at = now + timedelta(days=7)
+    invitations = []
+    # Only users who just joined are invited; existing members already are
+    for row in residents:
+        if not row["joined"]:
+            continue
+        for channel, identifier in (
+            ("whatsapp", row["phone"]),
+            ("email", row["email"]),
+        ):
+            if not identifier:
+                continue
+            invitation = {
+                "token": str(uuid.uuid4()),
+                "identifier": identifier,
+                "channel": channel,
+                "organization_id": org_id,
+                "house_id": row["house_id"],
+                "inviter_id": creator_user_id,
+                "role": "RESIDENT",
+                "status": "pending",
+                "expires_at": expires_at,
+                "accepted_at": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            if row.get("import_row_id"):
+                invitation["_id"] = _derived_id(row["import_row_id"], channel)
+            invitations.append(invitation)
+    if not invitations:
+        return counts
+
+    # Only invitations written now are queued. Ones an interrupted run wrote
+    # were queued by it, unless it died in between; resendInvitation covers that
+    _, fresh = await _insert_once(db.db.invitations, invitations)
+
+    # Delivery is rate-limited per provider by the outbox worker
+    await enqueue_many(
+        "invitation",
+        [
+            invitation_payload(
+                inv["channel"],
+                inv["identifier"],
+                org_name,
+                f"{base_url}/invite/{inv['token']}",
+                organization_id=org_id,
+            )
+            for inv in (invitations[i] for i in fresh)
+        ],
+    )
+    for inv in invitations:
+        counts[f"{inv['channel']}_invitations_sent"] += 1
+    return counts
+
+
+async def _report_partial_write(rows: list, error: Exception) -> dict:
+    """
+    Mark the outcome of each row after _write_rows raised partway, and count
+    what it did write. Rows without a property fail. A property whose
+    resident was not added yet stays, without that voter, and its row fails
+    with the property ID so the admin can finish it by hand. Invitations are
+    counted only when the whole write completes.
+    """
+    counts = _empty_counts()
+    residents = set()
+    orphaned = []
+    for row in rows:
+        result = row["result"]
+        if not result.get("property_id"):
+            result["status"] = "ERROR"
+            result["error"] = str(error)
+            continue
+        counts["total_properties"] += 1
+        if not row.get("user_id"):
+            counts["properties_without_contact"] += 1
+        elif result.get("user_id"):
+            residents.add(result["user_id"])
+        elif result["status"] != "ERROR":
+            result["status"] = "ERROR"
+            result["error"] = (
+                f"Property created, but its resident was not added: {error}"
+            )
+            orphaned.append(row["house_id"])
+    counts["total_residents"] = len(residents)
 
+    if orphaned:
+        # Like a failed membership, the property keeps no voter that is not a member
+        try:
+            await db.db.houses.update_many(
+                {"_id": {"$in": [ObjectId(house_id) for house_id in orphaned]}},
+                {"$set": {"voter_user_id": None}},
+            )
         except Exception as e:
-            row_result["status"] = "ERROR"
-            row_result["error"] = str(e)
+            logger.warning("Could not clear voters of %s: %s", orphaned, e)
+    return counts
 
-        results.append(row_result)
 
-    return {
-        "organization": org,
-        "total_properties": total_properties,
-        "total_residents": total_residents,
-        "whatsapp_invitations_sent": whatsapp_sent,
-        "email_invitations_sent": email_sent,
-        "properties_without_contact": no_contact_count,
-        "rows": results,
-    }
+async def bulk_setup_organization(
+    organization_name: str,
+    rows: list,
+    creator_user_id: str,
+) -> dict:
+    if len(rows) > MAX_ROWS:
+        raise Exception(f"Maximum {MAX_ROWS} rows per batch")
+
+    if not db.is_connected():
+        await db.connect()
+
+    org = await create_organization(organization_name, creator_user_id)
+    org_id = str(org["_id"])
+
+    # Validation happens before any writes, so bad rows leave no orphaned houses
+    results, valid = _validate_rows(rows)
+
+    try:
+        counts = await _write_rows(
+            valid, org_id, org["name"], creator_user_id, datetime.utcnow()
+        )
+    except Exception as e:
+        logger.warning("Bulk setup failed for organization %s: %s", org_id, e)
+        counts = await _report_partial_write(valid, e)
+
+    return {"organization": org, **counts, "rows": results}
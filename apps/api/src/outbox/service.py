@@ -0,0 +1,234 @@
+import asyncio
+import os
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from bson import ObjectId
+
+from ...database import db
+
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "60"))
+
+# Delivery states
+PENDING = "PENDING"
+PROCESSING = "PROCESSING"
+DELIVERED = "DELIVERED"
+DEAD = "DEAD"
+
+# Set by an in-process worker so enqueued jobs are picked up without waiting
+# for the next poll
+_wakeup: Optional[asyncio.Event] = None
+
+# Set per request where no worker runs in-process (serverless), so the request
+# knows to drain the jobs it queued once its response is sent
+_queued_in_request: ContextVar[Optional[List[str]]] = ContextVar(
+    "outbox_queued_in_request", default=None
+)
+
+
+async def _ensure_connected():
+    if not db.is_connected():
+        await db.connect()
+
+
+def set_wakeup_event(event: Optional[asyncio.Event]) -> None:
+    global _wakeup
+    _wakeup = event
+
+
+def track_enqueued() -> List[str]:
+    """
+    Record the kinds of jobs enqueued from the current context (a request)
+    while no in-process worker is running. Returns the list being filled.
+    """
+    queued: List[str] = []
+    _queued_in_request.set(queued)
+    return queued
+
+
+def _enqueued(kind: str) -> None:
+    if _wakeup is not None:
+        _wakeup.set()
+        return
+    queued = _queued_in_request.get()
+    if queued is not None:
+        queued.append(kind)
+
+
+def _build_job(kind: str, payload: dict, max_attempts: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "kind": kind,
+        "payload": payload,
+        "status": PENDING,
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "next_attempt_at": now,
+        "locked_until": None,
+        "last_error": None,
+        "delivered_at": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+async def enqueue(
+    kind: str, payload: dict, max_attempts: int = OUTBOX_MAX_ATTEMPTS
+) -> str:
+    """Add a job to the outbox. Returns the job ID."""
+    await _ensure_connected()
+
+    result = await db.db.outbox.insert_one(_build_job(kind, payload, max_attempts))
+
+    _enqueued(kind)
+    return str(result.inserted_id)
+
+
+async def enqueue_many(
+    kind: str, payloads: List[dict], max_attempts: int = OUTBOX_MAX_ATTEMPTS
+) -> int:
+    """Add many jobs of one kind in a single write. Returns the number queued."""
+    if not payloads:
+        return 0
+    await _ensure_connected()
+
+    result = await db.db.outbox.insert_many(
+        [_build_job(kind, payload, max_attempts) for payload in payloads]
+    )
+
+    _enqueued(kind)
+    return len(result.inserted_ids)
+
+
+def invitation_payload(
+    channel: str,
+    to: str,
+    org_name: str,
+    invite_url: str,
+    organization_id: Optional[str] = None,
+    invitation_id: Optional[str] = None,
+    notify_on_failure: bool = False,
+) -> dict:
+    return {
+        "channel": channel,
+        "to": to,
+        "org_name": org_name,
+        "invite_url": invite_url,
+        "organization_id": organization_id,
+        "invitation_id": invitation_id,
+        "notify_on_failure": notify_on_failure,
+    }
+
+
+async def enqueue_invitation(
+    channel: str,
+    to: str,
+    org_name: str,
+    invite_url: str,
+    organization_id: Optional[str] = None,
+    invitation_id: Optional[str] = None,
+    notify_on_failure: bool = False,
+) -> str:
+    """
+    Queue an invitation message on the given channel. With notify_on_failure,
+    an existing user gets an in-app notification if delivery finally fails.
+    """
+    return await enqueue(
+        "invitation",
+        invitation_payload(
+            channel,
+            to,
+            org_name,
+            invite_url,
+            organization_id=organization_id,
+            invitation_id=invitation_id,
+            notify_on_failure=notify_on_failure,
+        ),
+    )
+
+
+def _lease(now: datetime) -> dict:
+    return {
+        "$set": {
+            "status": PROCESSING,
+            "locked_until": now + timedelta(seconds=OUTBOX_LEASE_SECONDS),
+            "updated_at": now,
+        },
+        "$inc": {"attempts": 1},
+    }
+
+
+async def claim_jobs(limit: int) -> List[dict]:
+    """
+    Atomically lease up to `limit` due jobs for processing.
+    Jobs whose lease expired (e.g. a crashed worker) are claimed again.
+    """
+    await _ensure_connected()
+
+    jobs = []
+    for _ in range(limit):
+        now = datetime.utcnow()
+        job = await db.db.outbox.find_one_and_update(
+            {
+                "$or": [
+                    {"status": PENDING, "next_attempt_at": {"$lte": now}},
+                    {"status": PROCESSING, "locked_until": {"$lte": now}},
+                ]
+            },
+            _lease(now),
+            sort=[("next_attempt_at", 1)],
+            return_document=True,
+        )
+        if not job:
+            break
+        jobs.append(job)
+    return jobs
+
+
+async def mark_delivered(job_id: ObjectId) -> None:
+    await _ensure_connected()
+    now = datetime.utcnow()
+    await db.db.outbox.update_one(
+        {"_id": job_id},
+        {
+            "$set": {
+                "status": DELIVERED,
+                "locked_until": None,
+                "last_error": None,
+                "delivered_at": now,
+                "updated_at": now,
+            }
+        },
+    )
+
+
+async def mark_failed(job: dict, error: str, retry_delay: float) -> str:
+    """Schedule a retry after `retry_delay` seconds, or give up. Returns the new status."""
+    await _ensure_connected()
+
+    now = datetime.utcnow()
+    status = DEAD if job["attempts"] >= job["max_attempts"] else PENDING
+    await db.db.outbox.update_one(
+        {"_id": job["_id"]},
+        {
+            "$set": {
+                "status": status,
+                "locked_until": None,
+                "last_error": error,
+                "next_attempt_at": now + timedelta(seconds=retry_delay),
+                "updated_at": now,
+            }
+        },
+    )
+    return status
+
+
+async def get_job(job_id: str) -> Optional[dict]:
+    """Get an outbox job by ID."""
+    await _ensure_connected()
+    try:
+        return await db.db.outbox.find_one({"_id": ObjectId(job_id)})
+    except Exception:
+        return None
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+from ..auth.channels import send_email_invitation, send_whatsapp_invitation
+
+# Per-provider send rates (messages per second, 0 for unlimited)
+PROVIDER_RATES = {
+    "whatsapp": float(os.getenv("OUTBOX_WHATSAPP_RATE_PER_SECOND", "10")),
+    "email": float(os.getenv("OUTBOX_EMAIL_RATE_PER_SECOND", "2")),
+}
+
+
+class RateLimiter:
+    """Spaces out calls so that at most `rate` start per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        # Reserving the slot does not await, so concurrent callers on the loop
+        # cannot interleave here; without a lock, one limiter serves any loop
+        now = time.monotonic()
+        delay = self._next_slot - now
+        self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ChannelTransport:
+    """Delivers outbound messages through Chasqui (WhatsApp) and Resend (email)."""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        self.limiters = {
+            channel: RateLimiter(rate)
+            for channel, rate in (rates or PROVIDER_RATES).items()
+        }
+
+    async def send_invitation(
+        self, channel: str, to: str, org_name: str, invite_url: str
+    ) -> None:
+        provider = "whatsapp" if channel == "whatsapp" else "email"
+        if provider in self.limiters:
+            await self.limiters[provider].wait()
+        if channel == "whatsapp":
+            await send_whatsapp_invitation(
+                to=to, org_name=org_name, invite_url=invite_url
+            )
+        else:
+            await send_email_invitation(to=to, org_name=org_name, invite_url=invite_url)
+
+
+class MemoryTransport:
+    """Records messages in memory instead of sending them. For local runs and tests.
+
+    The first ``fail_times`` sends raise, to exercise the worker's retries.
+    """
+
+    def __init__(self, fail_times: int = 0):
+        self.fail_times = fail_times
+        self.sent: List[dict] = []
+
+    async def send_invitation(
+        self, channel: str, to: str, org_name: str, invite_url: str
+    ) -> None:
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise Exception("Transport unavailable")
+        self.sent.append(
+            {
+                "channel": channel,
+                "to": to,
+                "org_name": org_name,
+                "invite_url": invite_url,
+            }
+        )
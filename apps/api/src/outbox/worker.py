@@ -0,0 +1,235 @@
+"""
+Outbox worker: drains queued jobs with bounded concurrency and retries.
+
+Runs in-process (started from the FastAPI startup hook) or standalone:
+    cd apps/api/.. && python -m apps.api.src.outbox.worker
+
+On serverless deployments there is no long-lived process: requests drain the
+jobs they queue after responding, and a cron calls GET /outbox/drain for
+retries and anything left over (see drain_outbox).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from ...database import db
+from ..auth.channels import close_chasqui_client, open_chasqui_client
+from ..notification.service import (
+    create_notification,
+    notify_designated_voters,
+    notify_org_members,
+)
+from ..onboarding.imports import fail_import, process_import_chunk
+from . import service
+from .transports import ChannelTransport
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", "8"))
+# Seconds between polls of the in-process worker (0 disables it)
+OUTBOX_POLL_INTERVAL_SECONDS = float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", "1"))
+OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "5"))
+OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "600"))
+# Time budget of one drain_outbox call, kept under the serverless function limit
+OUTBOX_DRAIN_SECONDS = float(os.getenv("OUTBOX_DRAIN_SECONDS", "8"))
+
+# Handlers get the leased job and the transport
+Handler = Callable[[dict, object], Awaitable[None]]
+
+
+async def _deliver_invitation(job: dict, transport) -> None:
+    payload = job["payload"]
+    await transport.send_invitation(
+        payload["channel"], payload["to"], payload["org_name"], payload["invite_url"]
+    )
+
+
+async def _invitation_failed(payload: dict) -> None:
+    """If the user already exists locally, fall back to an in-app notification."""
+    if not payload.get("notify_on_failure"):
+        return
+    existing_user = await db.db.users.find_one({"email": payload["to"]})
+    if existing_user:
+        await create_notification(
+            user_id=str(existing_user["_id"]),
+            organization_id=payload["organization_id"],
+            notification_type="INVITATION",
+            title="New Invitation",
+            message=f"You have been invited to join {payload['org_name']}",
+            reference_id=str(payload["invitation_id"]),
+        )
+
+
+# Keyed by the job, so a retry after a partial fan-out skips users already notified
+async def _notify_org_members(job: dict, transport) -> None:
+    await notify_org_members(**job["payload"], batch_key=str(job["_id"]))
+
+
+async def _notify_designated_voters(job: dict, transport) -> None:
+    await notify_designated_voters(**job["payload"], batch_key=str(job["_id"]))
+
+
+async def _process_onboarding_import(job: dict, transport) -> None:
+    # One chunk per job, so each chunk is checkpointed and retried on its own
+    if await process_import_chunk(job["payload"]["job_id"]):
+        await service.enqueue("onboarding_import", job["payload"])
+
+
+async def _onboarding_import_failed(payload: dict) -> None:
+    await fail_import(payload["job_id"], "Import processing failed repeatedly")
+
+
+HANDLERS: Dict[str, Handler] = {
+    "invitation": _deliver_invitation,
+    "notify_org_members": _notify_org_members,
+    "notify_designated_voters": _notify_designated_voters,
+    "onboarding_import": _process_onboarding_import,
+}
+
+# Called once when a job of this kind exhausts its attempts
+DEAD_LETTER_HANDLERS: Dict[str, Callable[[dict], Awaitable[None]]] = {
+    "invitation": _invitation_failed,
+    "onboarding_import": _onboarding_import_failed,
+}
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff: base, 2*base, 4*base, ... capped at the max."""
+    return min(
+        OUTBOX_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)),
+        OUTBOX_RETRY_MAX_SECONDS,
+    )
+
+
+_transport: Optional[ChannelTransport] = None
+
+
+def get_transport() -> ChannelTransport:
+    """
+    The process-wide transport. Workers and drains share it, so its
+    per-provider rate limiters hold across all of them.
+    """
+    global _transport
+    if _transport is None:
+        _transport = ChannelTransport()
+    return _transport
+
+
+class OutboxWorker:
+    def __init__(self, transport=None, concurrency: int = OUTBOX_CONCURRENCY):
+        self.transport = transport or get_transport()
+        self.concurrency = concurrency
+        self.wakeup = asyncio.Event()
+
+    async def _process(self, job: dict) -> None:
+        handler = HANDLERS.get(job["kind"])
+        try:
+            if handler is None:
+                raise Exception(f"Unknown outbox job kind: {job['kind']}")
+            await handler(job, self.transport)
+        except Exception as e:
+            status = await service.mark_failed(
+                job, str(e), retry_delay(job["attempts"])
+            )
+            logger.warning(
+                "Outbox job %s (%s) failed on attempt %s: %s",
+                job["_id"],
+                job["kind"],
+                job["attempts"],
+                e,
+            )
+            if status == service.DEAD and job["kind"] in DEAD_LETTER_HANDLERS:
+                try:
+                    await DEAD_LETTER_HANDLERS[job["kind"]](job["payload"])
+                except Exception:
+                    logger.exception("Dead-letter handler failed for %s", job["_id"])
+            return
+        await service.mark_delivered(job["_id"])
+
+    async def run_once(self) -> int:
+        """Claim and process one batch of due jobs. Returns the batch size."""
+        jobs = await service.claim_jobs(self.concurrency)
+        if jobs:
+            await asyncio.gather(*(self._process(job) for job in jobs))
+        return len(jobs)
+
+    async def run_forever(self, poll_interval: float) -> None:
+        while True:
+            self.wakeup.clear()
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Outbox worker pass failed")
+                processed = 0
+            # A full batch means more work is probably waiting
+            if processed >= self.concurrency:
+                continue
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def drain_outbox(
+    budget_seconds: float = OUTBOX_DRAIN_SECONDS, transport=None
+) -> int:
+    """
+    Process due jobs until none are left or the time budget runs out, for
+    deployments without a long-lived worker. Returns the number processed.
+    """
+    worker = OutboxWorker(transport)
+    deadline = time.monotonic() + budget_seconds
+    total = 0
+    while time.monotonic() < deadline:
+        processed = await worker.run_once()
+        total += processed
+        if not processed:
+            break
+    return total
+
+
+_worker_task: Optional[asyncio.Task] = None
+
+
+def start_outbox_worker(
+    poll_interval: float = OUTBOX_POLL_INTERVAL_SECONDS, transport=None
+) -> Optional[asyncio.Task]:
+    """Start the in-process worker on the running event loop."""
+    global _worker_task
+    if poll_interval <= 0 or (_worker_task is not None and not _worker_task.done()):
+        return _worker_task
+    worker = OutboxWorker(transport)
+    service.set_wakeup_event(worker.wakeup)
+    _worker_task = asyncio.create_task(worker.run_forever(poll_interval))
+    return _worker_task
+
+
+async def stop_outbox_worker() -> None:
+    global _worker_task
+    service.set_wakeup_event(None)
+    if _worker_task is None:
+        return
+    _worker_task.cancel()
+    try:
+        await _worker_task
+    except asyncio.CancelledError:
+        pass
+    _worker_task = None
+
+
+async def main() -> None:
+    await db.connect()
+    await open_chasqui_client()
+    try:
+        await OutboxWorker().run_forever(OUTBOX_POLL_INTERVAL_SECONDS or 1)
+    finally:
+        await close_chasqui_client()
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+Keyset (cursor) pagination over MongoDB collections.
+
+Pages are ordered by a fixed sort that always ends in ``_id`` so it is total.
+A cursor encodes the sort values of the last document on a page; the next
+page starts strictly after them, so the cost of a page does not grow with
+how far into the history a client has paged.
+"""
+
+import base64
+import binascii
+from typing import Any, List, Optional, Sequence, Tuple
+
+from bson import json_util
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Newest first, the order of every paginated list
+NEWEST_FIRST: Sequence[Tuple[str, int]] = (("created_at", -1), ("_id", -1))
+
+
+def encode_cursor(doc: dict, sort: Sequence[Tuple[str, int]] = NEWEST_FIRST) -> str:
+    """Encode the sort values of a document as an opaque cursor."""
+    values = [doc.get(field) for field, _ in sort]
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode()
+
+
+def decode_cursor(
+    cursor: str, sort: Sequence[Tuple[str, int]] = NEWEST_FIRST
+) -> List[Any]:
+    """Decode a cursor back into sort values."""
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise Exception("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise Exception("Invalid cursor")
+    return values
+
+
+def _after_value(value: Any, direction: int) -> Optional[dict]:
+    """
+    Match the values of one field that sort strictly after ``value``, or None
+    when none do. A missing field sorts like null, below every other value,
+    and ``$lt``/``$gt`` never match it. Descending booleans are flags older
+    documents may lack, so past ``true`` they match anything but ``true``
+    and past ``false`` only null; other descending fields are always set.
+    """
+    if direction > 0:
+        return {"$gt": value} if value is not None else {"$ne": None}
+    if value is None:
+        return None
+    if value is True:
+        return {"$ne": True}
+    if value is False:
+        return {"$eq": None}
+    return {"$lt": value}
+
+
+def after_filter(values: List[Any], sort: Sequence[Tuple[str, int]]) -> dict:
+    """Match documents that sort strictly after the given sort values."""
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        after = _after_value(values[i], direction)
+        if after is None:
+            continue
+        clause = {prev: values[j] for j, (prev, _) in enumerate(sort[:i])}
+        clause[field] = after
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+def page_size(first: Optional[int]) -> int:
+    """Clamp a requested page size to [1, MAX_PAGE_SIZE]."""
+    if first is None:
+        return DEFAULT_PAGE_SIZE
+    if first < 1:
+        raise Exception("first must be at least 1")
+    return min(first, MAX_PAGE_SIZE)
+
+
+def page_query(
+    query: dict, after: Optional[str], sort: Sequence[Tuple[str, int]]
+) -> dict:
+    """Combine a base query with the keyset filter for ``after``."""
+    if not after:
+        return query
+    return {"$and": [query, after_filter(decode_cursor(after, sort), sort)]}
+
+
+def page_projection(
+    projection: Optional[dict], sort: Sequence[Tuple[str, int]]
+) -> Optional[dict]:
+    """Make sure a projection keeps the fields cursors are built from."""
+    if projection is None:
+        return None
+    return {**projection, **{field: 1 for field, _ in sort}}
+
+
+def build_page(
+    docs: List[dict], size: int, sort: Sequence[Tuple[str, int]] = NEWEST_FIRST
+) -> dict:
+    """Trim a ``size + 1`` fetch to a page with its cursors."""
+    has_next_page = len(docs) > size
+    docs = docs[:size]
+    return {
+        "edges": [{"node": doc, "cursor": encode_cursor(doc, sort)} for doc in docs],
+        "has_next_page": has_next_page,
+        "end_cursor": encode_cursor(docs[-1], sort) if docs else None,
+    }
+
+
+async def paginate(
+    collection,
+    query: dict,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+    sort: Sequence[Tuple[str, int]] = NEWEST_FIRST,
+    projection: Optional[dict] = None,
+) -> dict:
+    """
+    Fetch one page of a collection. Returns a dict with ``edges`` (each a
+    ``node`` document and its ``cursor``), ``has_next_page`` and ``end_cursor``.
+    """
+    size = page_size(first)
+    cursor = (
+        collection.find(
+            page_query(query, after, sort), page_projection(projection, sort)
+        )
+        .sort(list(sort))
+        .limit(size + 1)
+    )
+    docs = []
+    async for doc in cursor:
+        docs.append(doc)
+    return build_page(docs, size, sort)
@@ -0,0 +1,89 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import strawberry
+
+_CAMEL_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+
+# GraphQL fields stored under a different document key
+DEFAULT_DEPENDS: Dict[str, Sequence[str]] = {"id": ("_id",)}
+
+
+def _is_fragment(selection) -> bool:
+    # Fragment spreads are named too, but only their children are fields
+    return (
+        getattr(selection, "name", None) is None
+        or getattr(selection, "type_condition", None) is not None
+    )
+
+
+def _collect_names(selections: Iterable, names: Set[str]) -> None:
+    for selection in selections:
+        if _is_fragment(selection):
+            _collect_names(selection.selections, names)
+        elif not selection.name.startswith("__"):
+            names.add(_CAMEL_BOUNDARY.sub("_", selection.name).lower())
+
+
+def _children(selections: Iterable, name: str) -> List:
+    """Selections nested under every occurrence of the named field."""
+    children: List = []
+    for selection in selections:
+        if _is_fragment(selection):
+            children.extend(_children(selection.selections, name))
+        elif selection.name == name:
+            children.extend(selection.selections)
+    return children
+
+
+def selected_field_names(
+    info: strawberry.types.Info, path: Sequence[str] = ()
+) -> Optional[Set[str]]:
+    """
+    Snake-case names of the fields selected on the current GraphQL field,
+    including those reached through fragments. ``path`` descends into nested
+    fields first, e.g. ``("edges", "node")`` for a connection. None if
+    unavailable.
+    """
+    try:
+        selected = info.selected_fields
+    except Exception:
+        return None
+    if not isinstance(selected, list) or not selected:
+        return None
+    if not isinstance(getattr(selected[0], "selections", None), list):
+        return None
+
+    selections = selected[0].selections
+    for name in path:
+        selections = _children(selections, name)
+
+    names: Set[str] = set()
+    _collect_names(selections, names)
+    return names
+
+
+def projection_from_info(
+    info: strawberry.types.Info,
+    required: Sequence[str] = (),
+    depends: Optional[Dict[str, Sequence[str]]] = None,
+    path: Sequence[str] = (),
+) -> Optional[dict]:
+    """
+    Build a MongoDB projection covering only the fields the client selected.
+
+    ``required`` lists document fields the resolver itself needs, and
+    ``depends`` maps GraphQL fields to the document fields they are built from
+    (an empty tuple for fields that are not stored on the document). ``path``
+    is passed to selected_field_names. Returns
+    None, meaning "fetch whole documents", when the selection is unknown.
+    """
+    names = selected_field_names(info, path)
+    if names is None:
+        return None
+
+    depends = {**DEFAULT_DEPENDS, **(depends or {})}
+    fields: List[str] = ["_id", *required]
+    for name in names:
+        fields.extend(depends.get(name, (name,)))
+    return {field: 1 for field in fields}
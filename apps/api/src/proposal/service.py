@@ -4,6 +4,8 @@ from typing import List, Optional
 from bson import ObjectId
 
 from ...database import db
+from ..analytics.snapshots import mark_analytics_dirty
+from ..pagination.service import paginate
 
 # Valid status transitions
 VALID_TRANSITIONS = {
@@ -26,8 +28,12 @@ async def get_proposals(
     organization_id: str,
     status: Optional[str] = None,
     category: Optional[str] = None,
+    projection: Optional[dict] = None,
 ) -> List[dict]:
-    """Get all proposals for an organization with optional filters."""
+    """
+    Get all proposals for an organization with optional filters.
+    Pass a projection to fetch only some fields.
+    """
     await _ensure_connected()
 
     query: dict = {"organization_id": organization_id}
@@ -37,13 +43,33 @@ async def get_proposals(
         query["category"] = category
 
     proposals = []
-    cursor = db.db.proposals.find(query).sort("created_at", -1)
+    cursor = db.db.proposals.find(query, projection).sort("created_at", -1)
     async for proposal in cursor:
         proposals.append(proposal)
 
     return proposals
 
 
+async def get_proposals_page(
+    organization_id: str,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+    projection: Optional[dict] = None,
+) -> dict:
+    """Get one page of an organization's proposals, newest first."""
+    await _ensure_connected()
+
+    query: dict = {"organization_id": organization_id}
+    if status:
+        query["status"] = status
+    if category:
+        query["category"] = category
+
+    return await paginate(db.db.proposals, query, first, after, projection=projection)
+
+
 async def get_proposal(proposal_id: str) -> Optional[dict]:
     """Get a single proposal by ID."""
     await _ensure_connected()
@@ -83,6 +109,7 @@ async def create_proposal(
 
     result = await db.db.proposals.insert_one(proposal_data)
     proposal = await db.db.proposals.find_one({"_id": result.inserted_id})
+    await mark_analytics_dirty(organization_id)
     return proposal
 
 
@@ -108,6 +135,8 @@ async def update_proposal(
         },
         return_document=True,
     )
+    if proposal:
+        await mark_analytics_dirty(proposal["organization_id"])
     return proposal
 
 
@@ -145,6 +174,7 @@ async def update_proposal_status(
         {"$set": update_fields},
         return_document=True,
     )
+    await mark_analytics_dirty(proposal["organization_id"])
     return updated
 
 
@@ -171,7 +201,13 @@ async def delete_proposal(proposal_id: str) -> bool:
     await _ensure_connected()
 
     try:
+        proposal = await db.db.proposals.find_one(
+            {"_id": ObjectId(proposal_id)}, {"organization_id": 1}
+        )
         result = await db.db.proposals.delete_one({"_id": ObjectId(proposal_id)})
-        return result.deleted_count > 0
     except Exception:
         return False
+
+    if result.deleted_count > 0 and proposal:
+        await mark_analytics_dirty(proposal["organization_id"])
+    return result.deleted_count > 0
@@ -4,6 +4,12 @@ from typing import Optional
 from bson import ObjectId
 
 from ...database import db
+from ..analytics.snapshots import mark_analytics_dirty
+from ..auth.permissions import require_org_member
+from ..dataloaders.loaders import Loaders
+from ..house.service import get_houses_count
+from ..voting.service import get_voting_house
+from ..voting.vote_cache import PROPOSAL, invalidate_vote_context, vote_cache
 
 
 async def _ensure_connected():
@@ -30,6 +36,8 @@ async def start_proposal_vote(
         {"_id": ObjectId(proposal_id)},
         {
             "$set": {
+                # Counted once here; cast_proposal_vote keeps them current
+                "vote_counts": await _count_proposal_votes(proposal_id),
                 "vote_status": "ACTIVE",
                 "vote_threshold": threshold,
                 "vote_started_at": now,
@@ -43,93 +51,126 @@ async def start_proposal_vote(
 
 
 async def cast_proposal_vote(
-    proposal_id: str, house_id: str, voter_id: str, vote: str
+    proposal_id: str,
+    house_id: str,
+    voter_id: str,
+    vote: str,
+    loaders: Optional[Loaders] = None,
 ) -> dict:
-    """Cast or update a yes/no vote for a house on a proposal."""
+    """
+    Cast or update a yes/no vote for a house on a proposal. The voter must be a
+    member of the proposal's organization, checked against the proposal read
+    here so the caller does not load it first.
+    """
     await _ensure_connected()
 
     if vote not in ("YES", "NO"):
         raise Exception("Vote must be YES or NO")
 
-    proposal = await db.db.proposals.find_one({"_id": ObjectId(proposal_id)})
-    if not proposal:
-        raise Exception("Proposal not found")
-    if proposal.get("vote_status") != "ACTIVE":
-        raise Exception("No active vote on this proposal")
+    proposal = vote_cache.get((PROPOSAL, proposal_id))
+    if proposal is None:
+        proposal = await db.db.proposals.find_one({"_id": ObjectId(proposal_id)})
+        if not proposal:
+            raise Exception("Proposal not found")
+        if proposal.get("vote_status") != "ACTIVE":
+            raise Exception("No active vote on this proposal")
+        vote_cache.set((PROPOSAL, proposal_id), proposal)
 
-    # Verify caller is the designated voter for this house
-    house = await db.db.houses.find_one({"_id": ObjectId(house_id)})
-    if not house:
-        raise Exception("House not found")
-    if not house.get("voter_user_id"):
-        raise Exception("No designated voter assigned to this house")
-    if house["voter_user_id"] != voter_id:
-        raise Exception("Only the designated voter can cast votes for this house")
+    await require_org_member({"id": voter_id}, proposal["organization_id"], loaders)
+    await get_voting_house(house_id, voter_id)
 
+    # One upsert on the (proposal_id, house_id) unique index. It returns the
+    # pre-update document so the counters move only when the vote changes.
     now = datetime.utcnow()
-    existing = await db.db.proposal_votes.find_one(
-        {"proposal_id": proposal_id, "house_id": house_id}
+    update_fields = {"voter_id": voter_id, "vote": vote, "updated_at": now}
+    inserted = {
+        "_id": ObjectId(),
+        "proposal_id": proposal_id,
+        "house_id": house_id,
+        "created_at": now,
+    }
+    previous = await db.db.proposal_votes.find_one_and_update(
+        {"proposal_id": proposal_id, "house_id": house_id},
+        {
+            "$set": update_fields,
+            "$setOnInsert": {"_id": inserted["_id"], "created_at": now},
+        },
+        upsert=True,
+        return_document=False,
     )
+    vote_doc = {**(previous or inserted), **update_fields}
 
-    if existing:
-        vote_doc = await db.db.proposal_votes.find_one_and_update(
-            {"_id": existing["_id"]},
-            {
-                "$set": {
-                    "voter_id": voter_id,
-                    "vote": vote,
-                    "updated_at": now,
-                }
-            },
-            return_document=True,
-        )
-    else:
-        vote_data = {
-            "proposal_id": proposal_id,
-            "house_id": house_id,
-            "voter_id": voter_id,
-            "vote": vote,
-            "created_at": now,
-            "updated_at": now,
-        }
-        result = await db.db.proposal_votes.insert_one(vote_data)
-        vote_doc = await db.db.proposal_votes.find_one({"_id": result.inserted_id})
-
-    # Check auto-approval after each vote
-    await _check_auto_approval(proposal_id)
+    previous_vote = previous.get("vote") if previous else None
+    if previous_vote != vote:
+        counted = await _apply_vote_count_delta(proposal_id, vote, previous_vote)
+        # Check auto-approval after each vote that changes the counts
+        await _check_auto_approval(counted)
 
     return vote_doc
 
 
-async def _check_auto_approval(proposal_id: str) -> None:
-    """Check if YES votes meet the threshold and auto-approve the proposal."""
+async def _count_proposal_votes(proposal_id: str) -> dict:
+    """Count a proposal's YES and NO votes by scanning proposal_votes."""
+    return {
+        choice: await db.db.proposal_votes.count_documents(
+            {"proposal_id": proposal_id, "vote": choice}
+        )
+        for choice in ("YES", "NO")
+    }
+
+
+async def rebuild_vote_counts(proposal_id: str) -> Optional[dict]:
+    """Recount a proposal's votes into its counters and return the proposal."""
     await _ensure_connected()
+    return await db.db.proposals.find_one_and_update(
+        {"_id": ObjectId(proposal_id)},
+        {"$set": {"vote_counts": await _count_proposal_votes(proposal_id)}},
+        return_document=True,
+    )
 
-    proposal = await db.db.proposals.find_one({"_id": ObjectId(proposal_id)})
+
+async def _apply_vote_count_delta(
+    proposal_id: str, vote: str, previous_vote: Optional[str]
+) -> Optional[dict]:
+    """Move a house's vote between the counters with $inc; returns the proposal."""
+    inc = {f"vote_counts.{vote}": 1}
+    if previous_vote:
+        inc[f"vote_counts.{previous_vote}"] = -1
+
+    proposal = await db.db.proposals.find_one_and_update(
+        {"_id": ObjectId(proposal_id), "vote_counts": {"$exists": True}},
+        {"$inc": inc},
+        return_document=True,
+    )
+    if proposal is None:
+        # Vote started before counters existed: recount, which already
+        # includes the vote written above.
+        proposal = await rebuild_vote_counts(proposal_id)
+    return proposal
+
+
+async def _check_auto_approval(proposal: Optional[dict]) -> None:
+    """Check if YES votes meet the threshold and auto-approve the proposal."""
     if not proposal or proposal.get("vote_status") != "ACTIVE":
         return
 
     threshold = proposal.get("vote_threshold", 66)
     organization_id = proposal["organization_id"]
 
-    total_houses = await db.db.houses.count_documents(
-        {"organization_id": organization_id}
-    )
+    total_houses = await get_houses_count(organization_id)
     if total_houses == 0:
         return
 
-    yes_count = await db.db.proposal_votes.count_documents(
-        {"proposal_id": proposal_id, "vote": "YES"}
-    )
-
+    yes_count = proposal.get("vote_counts", {}).get("YES", 0)
     yes_percentage = (yes_count / total_houses) * 100
 
     if yes_percentage >= threshold:
         now = datetime.utcnow()
         await db.db.proposals.update_one(
-            {"_id": ObjectId(proposal_id), "status": "VOTING"},
+            {"_id": proposal["_id"], "status": "VOTING"},
             {"$set": {"status": "APPROVED", "updated_at": now}},
         )
+        await mark_analytics_dirty(organization_id)
 
 
 async def close_proposal_vote(proposal_id: str, admin_user_id: str) -> dict:
@@ -158,6 +199,8 @@ async def close_proposal_vote(proposal_id: str, admin_user_id: str) -> dict:
         {"$set": update_fields},
         return_document=True,
     )
+    invalidate_vote_context(PROPOSAL, proposal_id)
+    await mark_analytics_dirty(proposal["organization_id"])
     return updated
 
 
@@ -169,17 +212,11 @@ async def get_proposal_vote_results(proposal_id: str) -> dict:
     if not proposal:
         raise Exception("Proposal not found")
 
-    organization_id = proposal["organization_id"]
-    total_houses = await db.db.houses.count_documents(
-        {"organization_id": organization_id}
-    )
-
-    yes_count = await db.db.proposal_votes.count_documents(
-        {"proposal_id": proposal_id, "vote": "YES"}
-    )
-    no_count = await db.db.proposal_votes.count_documents(
-        {"proposal_id": proposal_id, "vote": "NO"}
-    )
+    if "vote_counts" not in proposal:
+        proposal = await rebuild_vote_counts(proposal_id)
+    total_houses = await get_houses_count(proposal["organization_id"])
+    yes_count = proposal["vote_counts"].get("YES", 0)
+    no_count = proposal["vote_counts"].get("NO", 0)
 
     yes_percentage = (yes_count / total_houses * 100) if total_houses > 0 else 0.0
     threshold = proposal.get("vote_threshold") or 66
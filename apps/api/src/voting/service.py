@@ -1,9 +1,14 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from bson import ObjectId
 
 from ...database import db
+from ..analytics.snapshots import mark_analytics_dirty
+from ..auth.permissions import require_org_member
+from ..dataloaders.loaders import Loaders
+from ..pagination.service import paginate
+from .vote_cache import HOUSE, SESSION, invalidate_vote_context, vote_cache
 
 
 async def _ensure_connected():
@@ -28,6 +33,18 @@ async def get_voting_sessions(organization_id: str) -> List[dict]:
     return sessions
 
 
+async def get_voting_sessions_page(
+    organization_id: str,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+) -> dict:
+    """Get one page of an organization's voting sessions, newest first."""
+    await _ensure_connected()
+    return await paginate(
+        db.db.voting_sessions, {"organization_id": organization_id}, first, after
+    )
+
+
 async def get_voting_session(session_id: str) -> Optional[dict]:
     """Get a single voting session by ID."""
     await _ensure_connected()
@@ -102,6 +119,10 @@ async def open_voting_session(session_id: str) -> dict:
         {"$set": {"status": "OPEN", "updated_at": now}},
         return_document=True,
     )
+
+    # Start an empty tally so cast_vote only has to apply deltas
+    await rebuild_vote_tally(session_id, session.get("proposal_ids", []))
+
     return updated
 
 
@@ -120,9 +141,11 @@ async def close_voting_session(session_id: str) -> dict:
         {"$set": {"status": "CLOSED", "updated_at": now}},
         return_document=True,
     )
+    invalidate_vote_context(SESSION, session_id)
 
     # Calculate approval threshold and update proposal statuses
     await _apply_approval_threshold(session_id, session["organization_id"])
+    await mark_analytics_dirty(session["organization_id"])
 
     return updated
 
@@ -140,28 +163,53 @@ async def get_vote_for_house(session_id: str, house_id: str) -> Optional[dict]:
     )
 
 
+async def _get_open_session(session_id: str) -> dict:
+    """Get a session that accepts votes, from the vote cache when possible."""
+    session = vote_cache.get((SESSION, session_id))
+    if session is None:
+        session = await get_voting_session(session_id)
+        if not session:
+            raise Exception("Voting session not found")
+        if session["status"] != "OPEN":
+            raise Exception("Voting session is not open")
+        vote_cache.set((SESSION, session_id), session)
+    return session
+
+
+async def get_voting_house(house_id: str, voter_id: str) -> dict:
+    """
+    Get a house and verify the caller is its designated voter. Houses with a
+    voter are served from the vote cache when possible.
+    """
+    house = vote_cache.get((HOUSE, house_id))
+    if house is None:
+        house = await db.db.houses.find_one({"_id": ObjectId(house_id)})
+        if not house:
+            raise Exception("House not found")
+        if not house.get("voter_user_id"):
+            raise Exception("No designated voter assigned to this house")
+        vote_cache.set((HOUSE, house_id), house)
+    if house["voter_user_id"] != voter_id:
+        raise Exception("Only the designated voter can cast votes for this house")
+    return house
+
+
 async def cast_vote(
     session_id: str,
     house_id: str,
     voter_id: str,
     rankings: List[dict],
+    loaders: Optional[Loaders] = None,
 ) -> dict:
-    """Cast or update a vote for a house in a voting session."""
+    """
+    Cast or update a vote for a house in a voting session. The voter must be a
+    member of the session's organization, checked against the session read
+    here so the caller does not load it first.
+    """
     await _ensure_connected()
-    session = await get_voting_session(session_id)
-    if not session:
-        raise Exception("Voting session not found")
-    if session["status"] != "OPEN":
-        raise Exception("Voting session is not open")
-
-    # Verify caller is the designated voter for this house
-    house = await db.db.houses.find_one({"_id": ObjectId(house_id)})
-    if not house:
-        raise Exception("House not found")
-    if not house.get("voter_user_id"):
-        raise Exception("No designated voter assigned to this house")
-    if house["voter_user_id"] != voter_id:
-        raise Exception("Only the designated voter can cast votes for this house")
+    session = await _get_open_session(session_id)
+    await require_org_member({"id": voter_id}, session["organization_id"], loaders)
+    await get_voting_house(house_id, voter_id)
 
     # Validate ranking completeness
     proposal_ids = set(session.get("proposal_ids", []))
@@ -170,37 +218,170 @@ async def cast_vote(
         raise Exception("Rankings must include all proposals in the session")
 
     now = datetime.utcnow()
-    existing = await get_vote_for_house(session_id, house_id)
+    update_fields = {
+        "voter_id": voter_id,
+        "rankings": rankings,
+        "submitted_at": now,
+        "updated_at": now,
+    }
+    inserted = {
+        "_id": ObjectId(),
+        "voting_session_id": session_id,
+        "house_id": house_id,
+        "created_at": now,
+    }
+    # One upsert on the (voting_session_id, house_id) unique index. It returns
+    # the pre-update document so the tally delta is computed against the
+    # ranking this write actually replaced (None when the ballot is new).
+    previous = await db.db.votes.find_one_and_update(
+        {"voting_session_id": session_id, "house_id": house_id},
+        {
+            "$set": update_fields,
+            "$setOnInsert": {"_id": inserted["_id"], "created_at": now},
+        },
+        upsert=True,
+        return_document=False,
+    )
+    vote = {**(previous or inserted), **update_fields}
 
-    if existing:
-        vote = await db.db.votes.find_one_and_update(
-            {"_id": existing["_id"]},
-            {
-                "$set": {
-                    "voter_id": voter_id,
-                    "rankings": rankings,
-                    "submitted_at": now,
-                    "updated_at": now,
-                }
-            },
-            return_document=True,
-        )
-    else:
-        vote_data = {
-            "voting_session_id": session_id,
-            "house_id": house_id,
-            "voter_id": voter_id,
-            "rankings": rankings,
-            "submitted_at": now,
-            "created_at": now,
-            "updated_at": now,
-        }
-        result = await db.db.votes.insert_one(vote_data)
-        vote = await db.db.votes.find_one({"_id": result.inserted_id})
+    await _apply_tally_delta(
+        session_id,
+        session.get("proposal_ids", []),
+        rankings,
+        previous.get("rankings", []) if previous else None,
+    )
 
     return vote
 
 
+# ---------------------------------------------------------------------------
+# Tally
+# ---------------------------------------------------------------------------
+
+
+def _borda_contribution(
+    rankings: List[dict], proposal_ids: List[str]
+) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Borda points and top-half hits contributed by a single ballot.
+    Score = N - rank + 1; top half is rank <= ceil(N/2).
+    """
+    n_proposals = len(proposal_ids)
+    top_half_cutoff = n_proposals // 2 + (n_proposals % 2)
+    valid_ids = set(proposal_ids)
+
+    scores: Dict[str, int] = {}
+    top_half: Dict[str, int] = {}
+    for entry in rankings:
+        pid = entry["proposal_id"]
+        rank = entry["rank"]
+        if pid not in valid_ids:
+            continue
+        scores[pid] = scores.get(pid, 0) + n_proposals - rank + 1
+        if rank <= top_half_cutoff:
+            top_half[pid] = top_half.get(pid, 0) + 1
+    return scores, top_half
+
+
+async def _apply_tally_delta(
+    session_id: str,
+    proposal_ids: List[str],
+    rankings: List[dict],
+    previous_rankings: Optional[List[dict]],
+) -> None:
+    """Apply the difference between a ballot and the one it replaced with $inc."""
+    new_scores, new_top = _borda_contribution(rankings, proposal_ids)
+    old_scores, old_top = _borda_contribution(previous_rankings or [], proposal_ids)
+
+    inc: dict = {}
+    for pid in proposal_ids:
+        score_delta = new_scores.get(pid, 0) - old_scores.get(pid, 0)
+        if score_delta:
+            inc[f"scores.{pid}"] = score_delta
+        top_delta = new_top.get(pid, 0) - old_top.get(pid, 0)
+        if top_delta:
+            inc[f"top_half_counts.{pid}"] = top_delta
+    if previous_rankings is None:
+        inc["votes_cast"] = 1
+
+    if not inc:
+        return
+
+    result = await db.db.vote_tallies.update_one(
+        {"voting_session_id": session_id},
+        {"$inc": inc, "$set": {"updated_at": datetime.utcnow()}},
+    )
+    if result.matched_count == 0:
+        # Session opened before tallies existed: rebuild from votes, which
+        # already include the ballot written above.
+        await rebuild_vote_tally(session_id, proposal_ids)
+
+
+async def _tally_from_votes(session_id: str, proposal_ids: List[str]) -> dict:
+    """Compute a session's tally by scanning every vote."""
+    scores: Dict[str, int] = {pid: 0 for pid in proposal_ids}
+    top_half_counts: Dict[str, int] = {pid: 0 for pid in proposal_ids}
+    votes_cast = 0
+
+    async for vote in db.db.votes.find({"voting_session_id": session_id}):
+        votes_cast += 1
+        vote_scores, vote_top = _borda_contribution(
+            vote.get("rankings", []), proposal_ids
+        )
+        for pid, points in vote_scores.items():
+            scores[pid] += points
+        for pid, hits in vote_top.items():
+            top_half_counts[pid] += hits
+
+    return {
+        "voting_session_id": session_id,
+        "votes_cast": votes_cast,
+        "scores": scores,
+        "top_half_counts": top_half_counts,
+    }
+
+
+async def rebuild_vote_tally(session_id: str, proposal_ids: List[str]) -> dict:
+    """Recompute a session's tally from the votes collection and store it."""
+    await _ensure_connected()
+
+    tally = await _tally_from_votes(session_id, proposal_ids)
+    tally["updated_at"] = datetime.utcnow()
+    await db.db.vote_tallies.replace_one(
+        {"voting_session_id": session_id}, tally, upsert=True
+    )
+    return tally
+
+
+async def check_vote_tally(session_id: str, repair: bool = False) -> bool:
+    """
+    Compare the stored tally against one rebuilt from votes.
+    Returns True when consistent; with repair=True a drifted tally is replaced.
+    """
+    await _ensure_connected()
+    session = await get_voting_session(session_id)
+    if not session:
+        raise Exception("Voting session not found")
+    proposal_ids = session.get("proposal_ids", [])
+
+    stored = await db.db.vote_tallies.find_one({"voting_session_id": session_id})
+    expected = await _tally_from_votes(session_id, proposal_ids)
+
+    consistent = stored is not None and (
+        stored.get("votes_cast", 0) == expected["votes_cast"]
+        and all(
+            stored.get(field, {}).get(pid, 0) == expected[field][pid]
+            for field in ("scores", "top_half_counts")
+            for pid in proposal_ids
+        )
+    )
+
+    if not consistent and repair:
+        await rebuild_vote_tally(session_id, proposal_ids)
+
+    return consistent
+
+
 # ---------------------------------------------------------------------------
 # Results
 # ---------------------------------------------------------------------------
@@ -211,6 +392,7 @@ async def get_voting_results(session_id: str) -> dict:
     Calculate voting results using Borda count.
     Score = sum of (N - rank + 1) for each vote, where N = number of proposals.
     Approval: proposal ranked in top half by >= 66% of ALL houses.
+    Scores are read from the session's tally rather than recomputed from votes.
     """
     await _ensure_connected()
     session = await get_voting_session(session_id)
@@ -219,35 +401,24 @@ async def get_voting_results(session_id: str) -> dict:
 
     organization_id = session["organization_id"]
     proposal_ids = session.get("proposal_ids", [])
-    n_proposals = len(proposal_ids)
 
     # Count total houses in the org
     total_houses = await db.db.houses.count_documents(
         {"organization_id": organization_id}
     )
 
-    # Get all votes
-    votes = []
-    async for vote in db.db.votes.find({"voting_session_id": session_id}):
-        votes.append(vote)
+    # Read the materialized tally maintained by cast_vote
+    tally = await db.db.vote_tallies.find_one({"voting_session_id": session_id})
+    if not tally:
+        tally = await rebuild_vote_tally(session_id, proposal_ids)
 
-    votes_cast = len(votes)
+    votes_cast = tally.get("votes_cast", 0)
     participation_rate = (votes_cast / total_houses * 100) if total_houses > 0 else 0.0
 
-    # Borda count scores
-    scores: dict = {pid: 0 for pid in proposal_ids}
-    top_half_counts: dict = {pid: 0 for pid in proposal_ids}
-    top_half_cutoff = n_proposals // 2 + (n_proposals % 2)  # top ceil(N/2)
-
-    for vote in votes:
-        for entry in vote.get("rankings", []):
-            pid = entry["proposal_id"]
-            rank = entry["rank"]
-            if pid in scores:
-                borda_score = n_proposals - rank + 1
-                scores[pid] = scores.get(pid, 0) + borda_score
-                if rank <= top_half_cutoff:
-                    top_half_counts[pid] = top_half_counts.get(pid, 0) + 1
+    stored_scores = tally.get("scores", {})
+    stored_top_half = tally.get("top_half_counts", {})
+    scores: dict = {pid: stored_scores.get(pid, 0) for pid in proposal_ids}
+    top_half_counts: dict = {pid: stored_top_half.get(pid, 0) for pid in proposal_ids}
 
     # Fetch proposal titles
     proposal_titles: dict = {}
@@ -0,0 +1,22 @@
+import os
+
+from ..cache import TTLCache
+
+VOTE_CACHE_TTL_SECONDS = float(os.getenv("VOTE_CACHE_TTL_SECONDS", "0"))
+VOTE_CACHE_MAX_ENTRIES = int(os.getenv("VOTE_CACHE_MAX_ENTRIES", "10000"))
+
+# Kinds of documents validated before a vote is written
+SESSION = "session"
+PROPOSAL = "proposal"
+HOUSE = "house"
+
+# Documents checked before casting a vote, keyed on (kind, id). Callers only
+# cache documents that pass validation (an OPEN session, an ACTIVE proposal
+# vote, a house with a designated voter), so a rejected vote always re-reads
+# the database.
+vote_cache = TTLCache(VOTE_CACHE_TTL_SECONDS, VOTE_CACHE_MAX_ENTRIES, copy_values=True)
+
+
+def invalidate_vote_context(kind: str, key: str) -> None:
+    """Invalidation hook for services that close votes or change house voters."""
+    vote_cache.invalidate((kind, key))
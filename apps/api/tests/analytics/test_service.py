@@ -1,10 +1,10 @@
-from datetime import datetime, timezone
 from unittest.mock import MagicMock
 
 import pytest
 from bson import ObjectId
 
 from apps.api.src.analytics.service import (
+    _community_analytics_pipeline,
     get_community_analytics,
     get_participation_report,
 )
@@ -38,38 +38,38 @@ class TestGetCommunityAnalytics:
 
     @pytest.mark.asyncio
     async def test_returns_analytics_with_proposals(self):
-        proposals = [
-            {
-                "_id": ObjectId(),
-                "status": "APPROVED",
-                "category": "SECURITY",
-                "author_id": "user-1",
-                "organization_id": "org-1",
-                "created_at": datetime(2024, 1, 15, tzinfo=timezone.utc),
-            },
-            {
-                "_id": ObjectId(),
-                "status": "REJECTED",
-                "category": "INFRASTRUCTURE",
-                "author_id": "user-2",
-                "organization_id": "org-1",
-                "created_at": datetime(2024, 2, 10, tzinfo=timezone.utc),
-            },
-        ]
-        # First call: status/category/monthly counts
-        # Second call: top contributors proposals
-        # Third call: proposal IDs for comments
-        mock_proposals_collection.find.side_effect = [
-            create_async_cursor_mock(proposals),
-            create_async_cursor_mock(proposals),
-            create_async_cursor_mock(proposals),
-        ]
-        mock_comments_collection.find.return_value = create_async_cursor_mock([])
-
-        mock_users_collection.find.return_value = create_async_cursor_mock(
+        mock_proposals_collection.aggregate.return_value = create_async_cursor_mock(
             [
-                {"nextauth_id": "user-1", "first_name": "Alice", "last_name": "Smith"},
-                {"nextauth_id": "user-2", "first_name": "Bob", "last_name": "Jones"},
+                {
+                    "status_counts": [
+                        {"_id": "APPROVED", "count": 1},
+                        {"_id": "REJECTED", "count": 1},
+                    ],
+                    "category_counts": [
+                        {"_id": "INFRASTRUCTURE", "count": 1},
+                        {"_id": "SECURITY", "count": 1},
+                    ],
+                    "monthly_counts": [
+                        {"_id": "2024-02", "count": 1},
+                        {"_id": "2024-01", "count": 1},
+                    ],
+                    "top_contributors": [
+                        {
+                            "_id": "user-1",
+                            "proposals_count": 1,
+                            "comments_count": 1,
+                            "total_score": 3,
+                            "user": [{"first_name": "Alice", "last_name": "Smith"}],
+                        },
+                        {
+                            "_id": "user-2",
+                            "proposals_count": 1,
+                            "comments_count": 0,
+                            "total_score": 2,
+                            "user": [{"first_name": "Bob", "last_name": "Jones"}],
+                        },
+                    ],
+                }
             ]
         )
 
@@ -83,6 +83,7 @@ class TestGetCommunityAnalytics:
         assert result["approved_proposals"] == 1
         assert result["rejected_proposals"] == 1
         assert len(result["category_breakdown"]) == 2
+        assert [m["month"] for m in result["monthly_trends"]] == ["2024-01", "2024-02"]
 
         # Verify user names are resolved
         contributors = result["top_contributors"]
@@ -91,6 +92,25 @@ class TestGetCommunityAnalytics:
         assert names["user-1"] == "Alice"
         assert names["user-2"] == "Bob"
 
+        # Everything comes from one aggregation; no per-document scans
+        mock_proposals_collection.aggregate.assert_called_once()
+        mock_proposals_collection.find.assert_not_called()
+        mock_comments_collection.find.assert_not_called()
+        mock_users_collection.find.assert_not_called()
+
+    def test_pipeline_scopes_to_organization_and_joins_users(self):
+        pipeline = _community_analytics_pipeline("org-1")
+        assert pipeline[0] == {"$match": {"organization_id": "org-1"}}
+        facets = pipeline[1]["$facet"]
+        assert set(facets) == {
+            "status_counts",
+            "category_counts",
+            "monthly_counts",
+            "top_contributors",
+        }
+        lookups = [s["$lookup"] for s in facets["top_contributors"] if "$lookup" in s]
+        assert [lookup["from"] for lookup in lookups] == ["comments", "users"]
+
 
 class TestGetParticipationReport:
     @pytest.mark.asyncio
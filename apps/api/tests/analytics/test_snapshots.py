@@ -0,0 +1,155 @@
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from apps.api.src.analytics import snapshots
+from apps.api.src.analytics.snapshots import (
+    get_analytics_snapshot,
+    mark_analytics_dirty,
+    refresh_analytics_snapshot,
+    refresh_dirty_snapshots,
+)
+from apps.api.src.proposal.service import create_proposal
+
+from ..conftest import (
+    mock_analytics_snapshots_collection,
+    mock_proposals_collection,
+)
+
+
+def _stored_snapshot(**overrides):
+    snapshot = {
+        "organization_id": "org-1",
+        "analytics": {"organization_id": "org-1", "total_proposals": 7},
+        "computed_at": datetime(2024, 3, 1, 12, 0),
+        "dirty": False,
+        "version": 3,
+    }
+    snapshot.update(overrides)
+    return snapshot
+
+
+class TestGetAnalyticsSnapshot:
+    @pytest.mark.asyncio
+    async def test_serves_stored_snapshot_without_recomputing(self):
+        mock_analytics_snapshots_collection.find_one.return_value = _stored_snapshot()
+
+        result = await get_analytics_snapshot("org-1")
+
+        assert result["total_proposals"] == 7
+        assert result["computed_at"] == datetime(2024, 3, 1, 12, 0)
+        mock_proposals_collection.aggregate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_computes_snapshot_on_first_access(self):
+        result = await get_analytics_snapshot("org-1")
+
+        assert result["total_proposals"] == 0
+        assert isinstance(result["computed_at"], datetime)
+        mock_proposals_collection.aggregate.assert_called_once()
+        stored = mock_analytics_snapshots_collection.update_one.call_args_list[0]
+        assert stored.kwargs["upsert"] is True
+
+    @pytest.mark.asyncio
+    async def test_recomputes_dirty_snapshot_when_refresher_is_off(self):
+        mock_analytics_snapshots_collection.find_one.return_value = _stored_snapshot(
+            dirty=True
+        )
+
+        result = await get_analytics_snapshot("org-1")
+
+        assert result["total_proposals"] == 0
+        mock_proposals_collection.aggregate.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_serves_dirty_snapshot_while_the_refresher_keeps_up(self):
+        mock_analytics_snapshots_collection.find_one.return_value = _stored_snapshot(
+            dirty=True
+        )
+
+        with (
+            patch.object(snapshots, "is_refresher_running", return_value=True),
+            patch.object(snapshots, "_refresher_interval", 30.0),
+            patch.object(snapshots, "_last_pass_at", time.monotonic() - 10),
+        ):
+            result = await get_analytics_snapshot("org-1")
+
+        assert result["total_proposals"] == 7
+        mock_proposals_collection.aggregate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_recomputes_dirty_snapshot_when_the_refresher_stalled(self):
+        # A frozen instance still has a live task, but no recent pass
+        mock_analytics_snapshots_collection.find_one.return_value = _stored_snapshot(
+            dirty=True
+        )
+
+        with (
+            patch.object(snapshots, "is_refresher_running", return_value=True),
+            patch.object(snapshots, "_refresher_interval", 30.0),
+            patch.object(snapshots, "_last_pass_at", time.monotonic() - 600),
+        ):
+            result = await get_analytics_snapshot("org-1")
+
+        assert result["total_proposals"] == 0
+        mock_proposals_collection.aggregate.assert_called_once()
+
+
+class TestRefresh:
+    @pytest.mark.asyncio
+    async def test_clears_dirty_flag_only_for_the_version_it_computed(self):
+        mock_analytics_snapshots_collection.find_one.return_value = {"version": 3}
+
+        await refresh_analytics_snapshot("org-1")
+
+        clear = mock_analytics_snapshots_collection.update_one.call_args_list[-1]
+        assert clear.args[0] == {"organization_id": "org-1", "version": 3}
+        assert clear.args[1] == {"$set": {"dirty": False}}
+
+    @pytest.mark.asyncio
+    async def test_refreshes_the_dirty_organizations_it_claims(self):
+        mock_analytics_snapshots_collection.find_one_and_update = AsyncMock(
+            side_effect=[
+                {"organization_id": "org-1"},
+                {"organization_id": "org-2"},
+                None,
+            ]
+        )
+
+        assert await refresh_dirty_snapshots() == 2
+        assert mock_proposals_collection.aggregate.call_count == 2
+        claim = mock_analytics_snapshots_collection.find_one_and_update.call_args
+        # Snapshots leased by another instance are skipped
+        assert claim.args[0]["dirty"] is True
+        assert {"refreshing_until": {"$exists": False}} in claim.args[0]["$or"]
+
+
+class TestMarkDirty:
+    @pytest.mark.asyncio
+    async def test_bumps_version_and_flags_snapshot(self):
+        await mark_analytics_dirty("org-1")
+
+        mock_analytics_snapshots_collection.update_one.assert_called_once_with(
+            {"organization_id": "org-1"},
+            {"$set": {"dirty": True}, "$inc": {"version": 1}},
+            upsert=True,
+        )
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_propagate(self):
+        mock_analytics_snapshots_collection.update_one = AsyncMock(
+            side_effect=Exception("write failed")
+        )
+
+        await mark_analytics_dirty("org-1")
+
+    @pytest.mark.asyncio
+    async def test_creating_a_proposal_marks_its_organization_dirty(self):
+        mock_proposals_collection.find_one.return_value = {"_id": "p1"}
+
+        await create_proposal("org-1", "Title", "Description", "SECURITY", "user-1")
+
+        query = mock_analytics_snapshots_collection.update_one.call_args.args[0]
+        assert query == {"organization_id": "org-1"}
@@ -2,19 +2,24 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from apps.api.src.auth.channels import send_email_otp, send_whatsapp_otp
+from apps.api.src.auth.channels import (
+    close_chasqui_client,
+    get_chasqui_client,
+    open_chasqui_client,
+    send_email_otp,
+    send_whatsapp_invitation,
+    send_whatsapp_otp,
+)
 
 
 @pytest.mark.asyncio
-@patch("apps.api.src.auth.channels.httpx.AsyncClient")
-async def test_send_whatsapp_otp_calls_chasqui(mock_client_class):
+@patch("apps.api.src.auth.channels.get_chasqui_client")
+async def test_send_whatsapp_otp_calls_chasqui(mock_get_client):
     mock_client = AsyncMock()
     mock_client.post = AsyncMock(
-        return_value=AsyncMock(status_code=200, json=lambda: {"success": True})
+        return_value=MagicMock(status_code=200, json=lambda: {"success": True})
     )
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=False)
-    mock_client_class.return_value = mock_client
+    mock_get_client.return_value = mock_client
 
     await send_whatsapp_otp(to="+56912345678", code="123456")
 
@@ -25,6 +30,34 @@ async def test_send_whatsapp_otp_calls_chasqui(mock_client_class):
     assert "123456" in call_args[1]["json"]["body"]
 
 
+@pytest.mark.asyncio
+@patch("apps.api.src.auth.channels.get_chasqui_client")
+async def test_whatsapp_sends_share_one_client(mock_get_client):
+    mock_client = AsyncMock()
+    mock_client.post = AsyncMock(return_value=MagicMock(status_code=200))
+    mock_get_client.return_value = mock_client
+
+    await send_whatsapp_otp(to="+56912345678", code="123456")
+    await send_whatsapp_invitation("+56912345678", "Org", "https://app/invite/t")
+
+    assert mock_client.post.call_count == 2
+    mock_client.aclose.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_chasqui_client_lifecycle():
+    client = await open_chasqui_client()
+    try:
+        assert await get_chasqui_client() is client
+        assert client.headers["Authorization"].startswith("Bearer ")
+    finally:
+        await close_chasqui_client()
+    assert client.is_closed
+    reopened = await open_chasqui_client()
+    assert reopened is not client
+    await close_chasqui_client()
+
+
 @pytest.mark.asyncio
 @patch("apps.api.src.auth.channels.asyncio.to_thread")
 @patch("apps.api.src.auth.channels.resend")
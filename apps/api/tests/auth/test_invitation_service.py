@@ -14,7 +14,6 @@ from apps.api.src.auth.service import (
 from apps.api.tests.conftest import (
     create_async_cursor_mock,
     mock_invitations_collection,
-    mock_notifications_collection,
     mock_organization_members_collection,
     mock_organizations_collection,
     mock_users_collection,
@@ -23,8 +22,8 @@ from apps.api.tests.conftest import (
 
 class TestCreateInvitation:
     @pytest.mark.asyncio
-    @patch("apps.api.src.auth.service.send_email_invitation", new_callable=AsyncMock)
-    async def test_creates_invitation_successfully(self, mock_send_email):
+    @patch("apps.api.src.auth.service.enqueue_invitation", new_callable=AsyncMock)
+    async def test_creates_invitation_successfully(self, mock_enqueue):
         inv_id = ObjectId()
         org_id = ObjectId()
         mock_invitations_collection.find_one.return_value = None
@@ -43,8 +42,10 @@ class TestCreateInvitation:
         assert result["identifier"] == "user@example.com"
         assert result["role"] == "MEMBER"
         assert result["channel"] == "email"
+        # Sending is left to the outbox worker
+        assert result["delivery_status"] == "PENDING"
         mock_invitations_collection.insert_one.assert_called_once()
-        mock_send_email.assert_called_once()
+        mock_enqueue.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_rejects_invalid_email(self):
@@ -65,8 +66,8 @@ class TestCreateInvitation:
             )
 
     @pytest.mark.asyncio
-    @patch("apps.api.src.auth.service.send_whatsapp_invitation", new_callable=AsyncMock)
-    async def test_creates_whatsapp_invitation(self, mock_send_whatsapp):
+    @patch("apps.api.src.auth.service.enqueue_invitation", new_callable=AsyncMock)
+    async def test_creates_whatsapp_invitation(self, mock_enqueue):
         inv_id = ObjectId()
         org_id = ObjectId()
         mock_invitations_collection.find_one.return_value = None
@@ -84,11 +85,12 @@ class TestCreateInvitation:
 
         assert result["identifier"] == "+12125551234"
         assert result["channel"] == "whatsapp"
-        mock_send_whatsapp.assert_called_once()
+        mock_enqueue.assert_called_once()
+        assert mock_enqueue.call_args.args[:2] == ("whatsapp", "+12125551234")
 
     @pytest.mark.asyncio
-    @patch("apps.api.src.auth.service.send_email_invitation", new_callable=AsyncMock)
-    async def test_resends_duplicate_pending_invitation(self, mock_send_email):
+    @patch("apps.api.src.auth.service.enqueue_invitation", new_callable=AsyncMock)
+    async def test_resends_duplicate_pending_invitation(self, mock_enqueue):
         org_id = ObjectId()
         existing = {
             "_id": ObjectId(),
@@ -112,43 +114,30 @@ class TestCreateInvitation:
 
         assert result["identifier"] == "user@example.com"
         mock_invitations_collection.delete_one.assert_called_once()
-        mock_send_email.assert_called_once()
+        mock_enqueue.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch("apps.api.src.auth.service.send_email_invitation", new_callable=AsyncMock)
-    async def test_notifies_existing_user_when_send_fails(self, mock_send_email):
-        mock_send_email.side_effect = Exception("Send failed")
+    @patch("apps.api.src.auth.service.enqueue_invitation", new_callable=AsyncMock)
+    async def test_queues_invitation_with_in_app_fallback(self, mock_enqueue):
+        inv_id = ObjectId()
+        org_id = ObjectId()
         mock_invitations_collection.find_one.return_value = None
         mock_invitations_collection.insert_one.return_value = MagicMock(
-            inserted_id=ObjectId()
+            inserted_id=inv_id
         )
-
-        user_id = ObjectId()
-        mock_users_collection.find_one.return_value = {
-            "_id": user_id,
-            "email": "existing@example.com",
-        }
-        org_id = ObjectId()
         mock_organizations_collection.find_one.return_value = {
             "_id": org_id,
             "name": "Test Org",
         }
-        mock_notifications_collection.insert_one.return_value = MagicMock(
-            inserted_id=ObjectId()
-        )
-        mock_notifications_collection.find_one.return_value = {
-            "_id": ObjectId(),
-            "user_id": str(user_id),
-            "type": "INVITATION",
-        }
 
-        result = await create_invitation(
+        await create_invitation(
             "existing@example.com", str(org_id), "inviter-1", "MEMBER"
         )
 
-        assert result["identifier"] == "existing@example.com"
-        # Notification should have been created
-        mock_notifications_collection.insert_one.assert_called_once()
+        kwargs = mock_enqueue.call_args.kwargs
+        assert kwargs["notify_on_failure"] is True
+        assert kwargs["invitation_id"] == str(inv_id)
+        assert kwargs["organization_id"] == str(org_id)
 
 
 class TestAcceptInvitationById:
@@ -313,8 +302,8 @@ class TestRevokeInvitation:
 
 class TestResendInvitation:
     @pytest.mark.asyncio
-    @patch("apps.api.src.auth.service.send_email_invitation", new_callable=AsyncMock)
-    async def test_resends_invitation(self, mock_send_email):
+    @patch("apps.api.src.auth.service.enqueue_invitation", new_callable=AsyncMock)
+    async def test_resends_invitation(self, mock_enqueue):
         inv_id = ObjectId()
         org_id = ObjectId()
         invitation = {
@@ -339,13 +328,13 @@ class TestResendInvitation:
         result = await resend_invitation(str(inv_id))
 
         assert result is not None
-        mock_send_email.assert_called_once()
-        call_kwargs = mock_send_email.call_args
-        assert call_kwargs.kwargs.get("org_name") == "Test Org"
+        mock_enqueue.assert_called_once()
+        call_args = mock_enqueue.call_args
+        assert call_args.args[2] == "Test Org"
 
     @pytest.mark.asyncio
-    @patch("apps.api.src.auth.service.send_whatsapp_invitation", new_callable=AsyncMock)
-    async def test_resends_whatsapp_invitation(self, mock_send_whatsapp):
+    @patch("apps.api.src.auth.service.enqueue_invitation", new_callable=AsyncMock)
+    async def test_resends_whatsapp_invitation(self, mock_enqueue):
         inv_id = ObjectId()
         org_id = ObjectId()
         invitation = {
@@ -370,7 +359,8 @@ class TestResendInvitation:
         result = await resend_invitation(str(inv_id))
 
         assert result is not None
-        mock_send_whatsapp.assert_called_once()
+        mock_enqueue.assert_called_once()
+        assert mock_enqueue.call_args.args[0] == "whatsapp"
 
     @pytest.mark.asyncio
     async def test_raises_when_not_found(self):
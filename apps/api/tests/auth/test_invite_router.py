@@ -64,7 +64,10 @@ def test_accept_invitation_success():
     """Happy path: valid token, email matches, no existing membership."""
     invitation = _pending_invitation()
 
-    with patch("apps.api.src.auth.invite_router.db") as mock_db:
+    with (
+        patch("apps.api.src.auth.invite_router.db") as mock_db,
+        patch("apps.api.src.auth.invite_router.invalidate_user") as invalidate,
+    ):
         mock_db.is_connected.return_value = True
         mock_db.db.invitations.find_one = AsyncMock(return_value=invitation)
         mock_db.db.organization_members.find_one = AsyncMock(return_value=None)
@@ -83,6 +86,8 @@ def test_accept_invitation_success():
     assert data["organization_id"] == str(ORG_ID)
     mock_db.db.organization_members.insert_one.assert_called_once()
     mock_db.db.invitations.update_one.assert_called_once()
+    # The new membership shows up in the user's cached profile
+    invalidate.assert_called_once_with(str(USER_ID))
 
 
 def test_accept_invitation_already_member():
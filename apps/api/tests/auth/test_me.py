@@ -56,7 +56,9 @@ async def test_resolve_me_authenticated():
     mock_organization_members_collection.find.return_value = create_async_cursor_mock(
         [mock_membership_doc]
     )
-    mock_organizations_collection.find_one.return_value = mock_org_doc
+    mock_organizations_collection.find.return_value = create_async_cursor_mock(
+        [mock_org_doc]
+    )
 
     # Mock Info context
     mock_info = MagicMock()
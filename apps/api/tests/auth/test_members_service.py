@@ -0,0 +1,58 @@
+import pytest
+from bson import ObjectId
+
+from apps.api.src.auth.service import get_organization_members
+from apps.api.tests.conftest import (
+    create_async_cursor_mock,
+    mock_houses_collection,
+    mock_organization_members_collection,
+    mock_organizations_collection,
+    mock_users_collection,
+)
+
+
+class TestGetOrganizationMembers:
+    @pytest.mark.asyncio
+    async def test_joins_users_houses_and_org_in_batches(self):
+        org_id = ObjectId()
+        users = [{"_id": ObjectId(), "first_name": f"U{i}"} for i in range(3)]
+        house = {"_id": ObjectId(), "name": "Apto 101"}
+        members = [
+            {
+                "_id": ObjectId(),
+                "user_id": str(u["_id"]),
+                "organization_id": str(org_id),
+                "house_id": str(house["_id"]) if i == 0 else None,
+                "role": "RESIDENT",
+            }
+            for i, u in enumerate(users)
+        ]
+        mock_organization_members_collection.find.return_value = (
+            create_async_cursor_mock(members)
+        )
+        mock_users_collection.find.return_value = create_async_cursor_mock(users)
+        mock_houses_collection.find.return_value = create_async_cursor_mock([house])
+        mock_organizations_collection.find_one.return_value = {
+            "_id": org_id,
+            "name": "Test Org",
+        }
+
+        result = await get_organization_members(str(org_id))
+
+        assert [m["user"]["first_name"] for m in result] == ["U0", "U1", "U2"]
+        assert result[0]["house"]["name"] == "Apto 101"
+        assert result[1]["house"] is None
+        assert all(m["organization"]["name"] == "Test Org" for m in result)
+        mock_users_collection.find.assert_called_once()
+        mock_users_collection.find_one.assert_not_called()
+        mock_houses_collection.find.assert_called_once()
+        mock_houses_collection.find_one.assert_not_called()
+        mock_organizations_collection.find_one.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_empty_organization_skips_joins(self):
+        result = await get_organization_members(str(ObjectId()))
+
+        assert result == []
+        mock_users_collection.find.assert_not_called()
+        mock_organizations_collection.find_one.assert_not_called()
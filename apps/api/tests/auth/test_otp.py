@@ -10,6 +10,7 @@ from apps.api.src.auth.otp import (
     request_otp,
     verify_otp,
 )
+from apps.api.src.auth.rate_limit import RateLimitExceeded
 
 
 @pytest.fixture
@@ -65,6 +66,22 @@ async def test_request_otp_stores_code_and_sends_email(mock_db):
         mock_send.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_identifier_limit_is_checked_before_charging_the_ip(mock_db):
+    mock_db.rate_limits.find_one_and_update = AsyncMock(return_value={"count": 4})
+
+    with pytest.raises(RateLimitExceeded):
+        await request_otp(
+            mock_db,
+            identifier="+584121234567",
+            channel="whatsapp",
+            ip_address="127.0.0.1",
+        )
+
+    (call,) = mock_db.rate_limits.find_one_and_update.call_args_list
+    assert call.args[0]["key"] == "otp_request:id:+584121234567"
+
+
 @pytest.mark.asyncio
 async def test_verify_otp_success(mock_db):
     mock_db.otp_codes.find_one = AsyncMock(
@@ -0,0 +1,96 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bson import ObjectId
+
+from apps.api.src.auth.dependencies import get_current_user
+from apps.api.src.auth.principal_cache import PrincipalCache
+from apps.api.src.auth.service import complete_user_profile
+from apps.api.tests.conftest import mock_users_collection
+
+
+def _user(nextauth_id="uuid-1"):
+    return {"_id": ObjectId(), "nextauth_id": nextauth_id, "first_name": "Test"}
+
+
+def _credential(token):
+    credential = MagicMock()
+    credential.credentials = token
+    return credential
+
+
+def test_disabled_cache_stores_nothing():
+    cache = PrincipalCache(ttl_seconds=0)
+    cache.set("token", _user())
+    assert cache.get_by_token("token") is None
+    assert cache.get_by_subject("uuid-1") is None
+
+
+def test_entries_never_outlive_the_token():
+    cache = PrincipalCache(ttl_seconds=300)
+    cache.set("token", _user(), exp=time.time() + 5)
+
+    with patch(
+        "apps.api.src.cache.time.monotonic",
+        return_value=time.monotonic() + 6,
+    ):
+        assert cache.get_by_token("token") is None
+
+
+def test_lru_evicts_least_recently_used_user():
+    cache = PrincipalCache(ttl_seconds=300, max_entries=2)
+    cache.set("token-1", _user("uuid-1"))
+    cache.set("token-2", _user("uuid-2"))
+    cache.get_by_token("token-1")
+    cache.set("token-3", _user("uuid-3"))
+
+    assert cache.get_by_subject("uuid-1") is not None
+    assert cache.get_by_subject("uuid-2") is None
+
+
+def test_invalidating_a_user_drops_all_of_its_tokens():
+    cache = PrincipalCache(ttl_seconds=300)
+    user = _user()
+    cache.set("token-1", user)
+    cache.set("token-2", user)
+
+    cache.invalidate(str(user["_id"]))
+
+    assert cache.get_by_token("token-1") is None
+    assert cache.get_by_token("token-2") is None
+    assert cache.get_by_subject("uuid-1") is None
+
+
+@pytest.mark.asyncio
+async def test_repeated_requests_skip_verification_and_lookup():
+    user = _user()
+    mock_users_collection.find_one = AsyncMock(return_value=user)
+    cache = PrincipalCache(ttl_seconds=300)
+    verify = AsyncMock(return_value={"sub": "uuid-1", "exp": time.time() + 60})
+
+    with (
+        patch("apps.api.src.auth.dependencies.principal_cache", cache),
+        patch("apps.api.src.auth.dependencies.verify_token", verify),
+    ):
+        first = await get_current_user(credential=_credential("token-1"))
+        again = await get_current_user(credential=_credential("token-1"))
+        # A new token for the same user is verified but not looked up
+        rotated = await get_current_user(credential=_credential("token-2"))
+
+    assert first["id"] == again["id"] == rotated["id"] == str(user["_id"])
+    assert verify.call_count == 2
+    mock_users_collection.find_one.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_profile_completion_invalidates_cached_principal():
+    user = _user()
+    cache = PrincipalCache(ttl_seconds=300)
+    cache.set("token", user)
+    mock_users_collection.find_one = AsyncMock(return_value=user)
+
+    with patch("apps.api.src.auth.principal_cache.principal_cache", cache):
+        await complete_user_profile(str(user["_id"]), first_name="New")
+
+    assert cache.get_by_token("token") is None
@@ -1,9 +1,13 @@
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from apps.api.src.auth.rate_limit import RateLimitExceeded, check_rate_limit
+from apps.api.src.auth.rate_limit import (
+    RateLimitExceeded,
+    TieredRateLimiter,
+    check_rate_limit,
+)
 
 
 @pytest.fixture
@@ -41,3 +45,74 @@ async def test_check_rate_limit_blocks_when_exceeded(mock_db):
         await check_rate_limit(
             mock_db, key="otp_request:127.0.0.1", max_count=10, window_seconds=3600
         )
+
+
+def _shared_counter(mock_db):
+    """Back rate_limits.find_one_and_update with an in-memory counter."""
+    counts = {}
+
+    async def find_one_and_update(query, update, **kwargs):
+        window = (query["key"], query["window_start"])
+        counts[window] = counts.get(window, 0) + update["$inc"]["count"]
+        return {"count": counts[window]}
+
+    mock_db.rate_limits.find_one_and_update = AsyncMock(side_effect=find_one_and_update)
+    return counts
+
+
+@pytest.mark.asyncio
+async def test_windows_are_keyed_on_key_and_aligned_start(mock_db):
+    _shared_counter(mock_db)
+
+    await check_rate_limit(mock_db, key="k", max_count=10, window_seconds=60)
+
+    query = mock_db.rate_limits.find_one_and_update.call_args.args[0]
+    assert query["key"] == "k"
+    assert query["window_start"].timestamp() % 60 == 0
+
+
+@pytest.mark.asyncio
+async def test_hits_far_from_the_limit_are_synced_in_batches(mock_db):
+    counts = _shared_counter(mock_db)
+    limiter = TieredRateLimiter(sync_every=10, sync_interval_seconds=60)
+
+    for _ in range(50):
+        await limiter.hit(mock_db, "graphql:user:1", 1000, 60)
+
+    # The first hit of a window always syncs, then one sync per 10 hits
+    assert limiter.round_trips == 5
+    assert sum(counts.values()) == 41
+
+
+@pytest.mark.asyncio
+async def test_otp_burst_is_rejected_locally_once_over_the_limit(mock_db):
+    counts = _shared_counter(mock_db)
+    limiter = TieredRateLimiter(sync_every=10, sync_interval_seconds=60)
+    allowed = rejected = 0
+
+    with patch("apps.api.src.auth.rate_limit.rate_limiter", limiter):
+        for _ in range(200):
+            try:
+                await check_rate_limit(mock_db, "otp_request:id:+584121234567", 3, 3600)
+                allowed += 1
+            except RateLimitExceeded:
+                rejected += 1
+
+    assert (allowed, rejected) == (3, 197)
+    # Every hit near the limit is synced; the rest never reach MongoDB
+    assert limiter.round_trips == 3
+    assert sum(counts.values()) == 3
+
+
+@pytest.mark.asyncio
+async def test_other_instances_hits_are_seen_at_sync(mock_db):
+    counts = _shared_counter(mock_db)
+    limiter = TieredRateLimiter(sync_every=10, sync_interval_seconds=60)
+    await limiter.hit(mock_db, "k", 5, 3600)
+
+    # Another instance has used up the rest of the window
+    window = next(iter(counts))
+    counts[window] += 4
+
+    with pytest.raises(RateLimitExceeded):
+        await limiter.hit(mock_db, "k", 5, 3600)
@@ -0,0 +1,61 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bson import ObjectId
+
+from apps.api.src.auth.permissions import get_user_role_in_org
+from apps.api.src.auth.role_cache import invalidate_role
+from apps.api.src.auth.service import update_member_role
+from apps.api.src.cache import TTLCache
+from apps.api.tests.conftest import mock_organization_members_collection
+
+
+def test_invalidate_by_user_or_organization():
+    cache = TTLCache(ttl_seconds=30, max_entries=100)
+    cache.set(("user-1", "org-1"), "ADMIN")
+    cache.set(("user-1", "org-2"), "RESIDENT")
+    cache.set(("user-2", "org-1"), "MEMBER")
+
+    with patch("apps.api.src.auth.role_cache.role_cache", cache):
+        invalidate_role(organization_id="org-1")
+        assert cache.get(("user-1", "org-1")) is None
+        assert cache.get(("user-2", "org-1")) is None
+        assert cache.get(("user-1", "org-2")) == "RESIDENT"
+
+        invalidate_role(user_id="user-1")
+        assert cache.get(("user-1", "org-2")) is None
+
+
+@pytest.mark.asyncio
+async def test_role_lookup_served_from_process_cache():
+    cache = TTLCache(ttl_seconds=30, max_entries=100)
+    mock_organization_members_collection.find_one = AsyncMock(
+        return_value={"user_id": "user-1", "organization_id": "org-1", "role": "ADMIN"}
+    )
+
+    with patch("apps.api.src.auth.permissions.role_cache", cache):
+        assert await get_user_role_in_org("user-1", "org-1") == "ADMIN"
+        assert await get_user_role_in_org("user-1", "org-1") == "ADMIN"
+
+    mock_organization_members_collection.find_one.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_update_member_role_invalidates_cache():
+    member_id = ObjectId()
+    org_id = str(ObjectId())
+    member = {
+        "_id": member_id,
+        "user_id": "user-2",
+        "organization_id": org_id,
+        "role": "RESIDENT",
+    }
+    mock_organization_members_collection.find_one = AsyncMock(return_value=member)
+    mock_organization_members_collection.find_one_and_update = AsyncMock(
+        return_value={**member, "role": "ADMIN", "user_id": str(ObjectId())}
+    )
+
+    with patch("apps.api.src.auth.service.invalidate_role") as invalidate:
+        await update_member_role(str(member_id), "ADMIN", "admin-1")
+
+    invalidate.assert_called_once_with("user-2", org_id)
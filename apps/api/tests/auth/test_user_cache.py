@@ -0,0 +1,111 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bson import ObjectId
+
+from apps.api.src.auth.service import get_user_with_memberships
+from apps.api.src.auth.user_cache import invalidate_user
+from apps.api.src.cache import TTLCache
+from apps.api.src.house.service import remove_resident_from_house
+from apps.api.tests.conftest import (
+    create_async_cursor_mock,
+    mock_houses_collection,
+    mock_organization_members_collection,
+    mock_organizations_collection,
+    mock_users_collection,
+)
+
+
+def _mock_user_with_memberships(count=3):
+    user = {"_id": ObjectId(), "first_name": "Test"}
+    orgs = [{"_id": ObjectId(), "name": f"Org {i}"} for i in range(count)]
+    house = {"_id": ObjectId(), "name": "Apto 101"}
+    memberships = [
+        {
+            "_id": ObjectId(),
+            "user_id": str(user["_id"]),
+            "organization_id": str(org["_id"]),
+            "house_id": str(house["_id"]) if i == 0 else None,
+            "role": "RESIDENT",
+        }
+        for i, org in enumerate(orgs)
+    ]
+    mock_users_collection.find_one.return_value = user
+    mock_organization_members_collection.find.return_value = create_async_cursor_mock(
+        memberships
+    )
+    mock_organizations_collection.find.return_value = create_async_cursor_mock(orgs)
+    mock_houses_collection.find.return_value = create_async_cursor_mock([house])
+    return user
+
+
+def test_invalidate_one_user_or_all():
+    cache = TTLCache(ttl_seconds=5, max_entries=100, copy_values=True)
+    cache.set("user-1", {"_id": "user-1"})
+    cache.set("user-2", {"_id": "user-2"})
+
+    with patch("apps.api.src.auth.user_cache.user_cache", cache):
+        invalidate_user("user-1")
+        assert cache.get("user-1") is None
+        assert cache.get("user-2") is not None
+
+        invalidate_user()
+        assert cache.get("user-2") is None
+
+
+@pytest.mark.asyncio
+async def test_memberships_are_hydrated_in_batches():
+    user = _mock_user_with_memberships(count=3)
+
+    result = await get_user_with_memberships(str(user["_id"]))
+
+    memberships = result["memberships"]
+    assert [m["organization"]["name"] for m in memberships] == [
+        "Org 0",
+        "Org 1",
+        "Org 2",
+    ]
+    assert memberships[0]["house"]["name"] == "Apto 101"
+    assert memberships[1]["house"] is None
+    mock_organizations_collection.find.assert_called_once()
+    mock_organizations_collection.find_one.assert_not_called()
+    mock_houses_collection.find.assert_called_once()
+    mock_houses_collection.find_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_user_served_from_cache_until_invalidated():
+    user = _mock_user_with_memberships(count=1)
+    user_id = str(user["_id"])
+    cache = TTLCache(ttl_seconds=5, max_entries=100, copy_values=True)
+
+    with patch("apps.api.src.auth.service.user_cache", cache):
+        await get_user_with_memberships(user_id)
+        await get_user_with_memberships(user_id)
+        mock_users_collection.find_one.assert_called_once()
+
+        cache.invalidate(user_id)
+        _mock_user_with_memberships(count=1)
+        await get_user_with_memberships(user_id)
+
+    assert mock_users_collection.find_one.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_leaving_a_house_invalidates_cached_users():
+    house_id = ObjectId()
+    mock_organization_members_collection.find_one = AsyncMock(
+        return_value={"_id": ObjectId(), "house_id": str(house_id)}
+    )
+    mock_houses_collection.find_one = AsyncMock(
+        return_value={"_id": house_id, "voter_user_id": "user-1"}
+    )
+    mock_organization_members_collection.find_one_and_update = AsyncMock(
+        return_value={"_id": ObjectId(), "organization_id": str(ObjectId())}
+    )
+
+    with patch("apps.api.src.house.service.invalidate_user") as invalidate:
+        await remove_resident_from_house("user-1", "org-1")
+
+    # Voter cleared on the shared house, then the resident's own membership
+    assert [c.args for c in invalidate.call_args_list] == [(), ("user-1",)]
@@ -162,6 +162,33 @@ mock_votes_collection.insert_one = AsyncMock(
 mock_votes_collection.find_one_and_update = AsyncMock(return_value=None)
 mock_votes_collection.create_index = AsyncMock()
 
+mock_vote_tallies_collection = MagicMock()
+mock_vote_tallies_collection.find_one = AsyncMock(return_value=None)
+mock_vote_tallies_collection.update_one = AsyncMock()
+mock_vote_tallies_collection.replace_one = AsyncMock()
+mock_vote_tallies_collection.create_index = AsyncMock()
+
+# Create mock outbox collection
+mock_outbox_collection = MagicMock()
+mock_outbox_collection.insert_one = AsyncMock(
+    return_value=MagicMock(inserted_id="mock_id")
+)
+mock_outbox_collection.find_one_and_update = AsyncMock(return_value=None)
+mock_outbox_collection.update_one = AsyncMock()
+mock_outbox_collection.create_index = AsyncMock()
+
+# Create mock onboarding import collections
+mock_import_jobs_collection = MagicMock()
+mock_import_jobs_collection.create_index = AsyncMock()
+mock_import_job_rows_collection = MagicMock()
+mock_import_job_rows_collection.create_index = AsyncMock()
+
+# Create mock analytics_snapshots collection
+mock_analytics_snapshots_collection = MagicMock()
+mock_analytics_snapshots_collection.find_one = AsyncMock(return_value=None)
+mock_analytics_snapshots_collection.update_one = AsyncMock()
+mock_analytics_snapshots_collection.create_index = AsyncMock()
+
 mock_documents_collection = MagicMock()
 mock_documents_collection.find = MagicMock(return_value=create_async_cursor_mock([]))
 mock_documents_collection.find_one = AsyncMock(return_value=None)
@@ -227,6 +254,11 @@ mock_motor_db.announcements = mock_announcements_collection
 mock_motor_db.notifications = mock_notifications_collection
 mock_motor_db.voting_sessions = mock_voting_sessions_collection
 mock_motor_db.votes = mock_votes_collection
+mock_motor_db.vote_tallies = mock_vote_tallies_collection
+mock_motor_db.analytics_snapshots = mock_analytics_snapshots_collection
+mock_motor_db.outbox = mock_outbox_collection
+mock_motor_db.import_jobs = mock_import_jobs_collection
+mock_motor_db.import_job_rows = mock_import_job_rows_collection
 mock_motor_db.documents = mock_documents_collection
 mock_motor_db.budgets = mock_budgets_collection
 mock_motor_db.project_milestones = mock_project_milestones_collection
@@ -244,7 +276,12 @@ mock_db.is_connected = MagicMock(return_value=True)
 mock_db.connect = AsyncMock()
 mock_db.disconnect = AsyncMock()
 mock_db.health_check = AsyncMock(return_value=True)
+mock_db.pool_stats = MagicMock(return_value={"max_pool_size": 10, "in_use": 0})
+mock_db.query_stats.report = MagicMock(return_value=[])
+mock_db.query_stats.slow_ms = 100.0
 mock_db.db = mock_motor_db
+# Reporting reads go to the same mocked database
+mock_db.reports = mock_motor_db
 mock_db.client = mock_client
 mock_db._connected = True
 
@@ -271,6 +308,11 @@ def _reset_mocks():
         mock_notifications_collection,
         mock_voting_sessions_collection,
         mock_votes_collection,
+        mock_vote_tallies_collection,
+        mock_analytics_snapshots_collection,
+        mock_outbox_collection,
+        mock_import_jobs_collection,
+        mock_import_job_rows_collection,
         mock_documents_collection,
         mock_project_milestones_collection,
         mock_budgets_collection,
@@ -280,15 +322,27 @@ def _reset_mocks():
         m.reset_mock(side_effect=True, return_value=True)
         # Restore default behaviors
         m.find = MagicMock(return_value=create_async_cursor_mock([]))
+        m.aggregate = MagicMock(return_value=create_async_cursor_mock([]))
         m.find_one = AsyncMock(return_value=None)
         m.insert_one = AsyncMock(return_value=MagicMock(inserted_id="mock_id"))
+        m.insert_many = AsyncMock(return_value=MagicMock(inserted_ids=[]))
         m.find_one_and_update = AsyncMock(return_value=None)
         m.delete_one = AsyncMock(return_value=MagicMock(deleted_count=1))
         m.delete_many = AsyncMock(return_value=MagicMock(deleted_count=0))
         m.update_one = AsyncMock()
         m.update_many = AsyncMock(return_value=MagicMock(modified_count=0))
+        m.replace_one = AsyncMock()
+        m.bulk_write = AsyncMock()
         m.count_documents = AsyncMock(return_value=0)
         m.create_index = AsyncMock()
+    # Start every test with cold process caches
+    from apps.api.src.auth.principal_cache import principal_cache
+    from apps.api.src.auth.rate_limit import rate_limiter
+    from apps.api.src.house.count_cache import house_count_cache
+
+    house_count_cache.clear()
+    principal_cache.clear()
+    rate_limiter.clear()
     yield
 
 
@@ -370,6 +424,36 @@ def votes_collection_mock():
     return mock_votes_collection
 
 
+@pytest.fixture
+def vote_tallies_collection_mock():
+    """Return the mock vote_tallies collection for tests"""
+    return mock_vote_tallies_collection
+
+
+@pytest.fixture
+def analytics_snapshots_collection_mock():
+    """Return the mock analytics_snapshots collection for tests"""
+    return mock_analytics_snapshots_collection
+
+
+@pytest.fixture
+def outbox_collection_mock():
+    """Return the mock outbox collection for tests"""
+    return mock_outbox_collection
+
+
+@pytest.fixture
+def import_jobs_collection_mock():
+    """Return the mock import_jobs collection for tests"""
+    return mock_import_jobs_collection
+
+
+@pytest.fixture
+def import_job_rows_collection_mock():
+    """Return the mock import_job_rows collection for tests"""
+    return mock_import_job_rows_collection
+
+
 @pytest.fixture
 def documents_collection_mock():
     """Return the mock documents collection for tests that need to configure it"""
@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from bson import ObjectId
+
+from apps.api.src.auth.permissions import require_org_member
+from apps.api.src.dataloaders.loaders import Loaders, get_loaders
+
+from ..conftest import (
+    create_async_cursor_mock,
+    mock_organization_members_collection,
+    mock_proposals_collection,
+)
+
+
+class TestByIdLoaders:
+    @pytest.mark.asyncio
+    async def test_coalesces_lookups_into_one_query(self):
+        p1, p2 = ObjectId(), ObjectId()
+        mock_proposals_collection.find.return_value = create_async_cursor_mock(
+            [{"_id": p1, "title": "A"}, {"_id": p2, "title": "B"}]
+        )
+
+        loaders = Loaders()
+        first, second, missing = await asyncio.gather(
+            loaders.proposals.load(str(p1)),
+            loaders.proposals.load(str(p2)),
+            loaders.proposals.load("not-an-id"),
+        )
+
+        assert first["title"] == "A"
+        assert second["title"] == "B"
+        assert missing is None
+        mock_proposals_collection.find.assert_called_once()
+        query = mock_proposals_collection.find.call_args[0][0]
+        assert set(query["_id"]["$in"]) == {p1, p2}
+
+    @pytest.mark.asyncio
+    async def test_caches_within_request(self):
+        p1 = ObjectId()
+        mock_proposals_collection.find.return_value = create_async_cursor_mock(
+            [{"_id": p1, "title": "A"}]
+        )
+
+        loaders = Loaders()
+        await loaders.proposals.load(str(p1))
+        await loaders.proposals.load(str(p1))
+
+        mock_proposals_collection.find.assert_called_once()
+
+
+class TestMembershipLoader:
+    @pytest.mark.asyncio
+    async def test_repeated_permission_checks_share_one_query(self):
+        mock_organization_members_collection.find.return_value = (
+            create_async_cursor_mock(
+                [{"user_id": "user-1", "organization_id": "org-1", "role": "ADMIN"}]
+            )
+        )
+        user = {"id": "user-1"}
+        loaders = Loaders()
+
+        roles = await asyncio.gather(
+            require_org_member(user, "org-1", loaders),
+            require_org_member(user, "org-1", loaders),
+        )
+
+        assert roles == ["ADMIN", "ADMIN"]
+        mock_organization_members_collection.find.assert_called_once()
+        mock_organization_members_collection.find_one.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_non_member_raises(self):
+        with pytest.raises(Exception, match="not a member"):
+            await require_org_member({"id": "user-1"}, "org-2", Loaders())
+
+
+class TestGetLoaders:
+    def test_attaches_loaders_to_context(self):
+        info = MagicMock()
+        info.context = {"user": None}
+
+        loaders = get_loaders(info)
+
+        assert isinstance(loaders, Loaders)
+        assert get_loaders(info) is loaders
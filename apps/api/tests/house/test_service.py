@@ -106,6 +106,20 @@ class TestGetHouses:
         assert result[0]["name"] == "Unit 101"
         assert result[1]["name"] == "Unit 202"
 
+    @pytest.mark.asyncio
+    async def test_projection_without_residents_skips_lookup(self):
+        houses = [_make_mock_house_doc(name="Unit 101")]
+        cursor_mock = create_async_cursor_mock(houses)
+        cursor_mock.sort = MagicMock(return_value=create_async_cursor_mock(houses))
+        mock_houses_collection.find.return_value = cursor_mock
+
+        await get_houses(
+            "org-1", projection={"_id": 1, "name": 1}, include_residents=False
+        )
+
+        assert mock_houses_collection.find.call_args[0][1] == {"_id": 1, "name": 1}
+        mock_organization_members_collection.find.assert_not_called()
+
 
 class TestGetHouse:
     @pytest.mark.asyncio
@@ -0,0 +1,124 @@
+import asyncio
+import contextvars
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+import strawberry
+
+from apps.api.src.metrics.service import MetricsRegistry
+from apps.api.src.metrics.tracing import (
+    TracingExtension,
+    command_metrics,
+    current_request,
+    db_commands,
+    field_duration,
+    operation_db_commands,
+    operation_duration,
+)
+
+
+def _command_event(name, request_id, collection="proposals", duration_micros=2000):
+    return SimpleNamespace(
+        command_name=name,
+        command={name: collection},
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+        duration_micros=duration_micros,
+    )
+
+
+def _run_command(name, request_id, collection="proposals"):
+    """Simulate the events PyMongo emits for one command."""
+    event = _command_event(name, request_id, collection)
+    command_metrics.started(event)
+    command_metrics.succeeded(event)
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def proposals(self) -> List[str]:
+        # Like Motor, run the command in an executor thread with a copy of
+        # the request's context
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, context.run, _run_command, "find", 1)
+        _run_command("aggregate", 2, "comments")
+        return ["a"]
+
+    @strawberry.field
+    def version(self) -> str:
+        return "1"
+
+
+schema = strawberry.Schema(query=Query, extensions=[TracingExtension])
+
+
+@pytest.mark.asyncio
+async def test_operation_and_fields_are_timed_with_db_usage():
+    before = operation_duration.count(operation="ListProposals", type="query")
+
+    result = await schema.execute("query ListProposals { proposals version }")
+
+    assert result.errors is None
+    assert operation_duration.count(operation="ListProposals", type="query") == (
+        before + 1
+    )
+    assert field_duration.count(field="Query.proposals") >= 1
+    assert field_duration.count(field="Query.version") >= 1
+    assert operation_db_commands.count(operation="ListProposals") >= 1
+    assert (
+        db_commands.value(
+            command="find",
+            collection="proposals",
+            operation="ListProposals",
+            outcome="success",
+        )
+        >= 1
+    )
+    assert current_request.get() is None
+
+
+def test_commands_outside_an_operation_are_labelled_none():
+    before = db_commands.value(
+        command="update", collection="outbox", operation="none", outcome="success"
+    )
+
+    _run_command("update", 3, "outbox")
+    command_metrics.started(_command_event("ping", 4, 1))
+
+    assert (
+        db_commands.value(
+            command="update", collection="outbox", operation="none", outcome="success"
+        )
+        == before + 1
+    )
+    assert (
+        db_commands.value(
+            command="ping", collection="", operation="none", outcome="success"
+        )
+        == 0
+    )
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    latency = registry.histogram(
+        "op_seconds", "Latency", ("operation",), buckets=(0.1, 1.0)
+    )
+    calls = registry.counter("calls_total", "Calls", ("name",))
+
+    latency.observe(0.05, operation='say "hi"')
+    latency.observe(0.5, operation='say "hi"')
+    calls.inc(name="a")
+
+    text = registry.render({'pool{state="open"}': 2})
+
+    assert "# TYPE op_seconds histogram" in text
+    assert 'op_seconds_bucket{operation="say \\"hi\\"",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{operation="say \\"hi\\"",le="+Inf"} 2' in text
+    assert 'op_seconds_count{operation="say \\"hi\\""} 2' in text
+    assert 'calls_total{name="a"} 1' in text
+    assert "# TYPE pool gauge" in text
+    assert 'pool{state="open"} 2' in text
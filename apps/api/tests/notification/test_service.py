@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from apps.api.src.notification.service import (
+    create_notifications,
+    get_activity_feed_page,
+    notify_designated_voters,
+    notify_org_members,
+)
+
+from ..conftest import (
+    create_async_cursor_mock,
+    mock_announcements_collection,
+    mock_houses_collection,
+    mock_notifications_collection,
+    mock_organization_members_collection,
+    mock_proposals_collection,
+)
+
+
+class TestNotifyOrgMembers:
+    @pytest.mark.asyncio
+    async def test_writes_all_members_in_one_bulk_insert(self):
+        mock_organization_members_collection.find.return_value = (
+            create_async_cursor_mock(
+                [{"user_id": "author"}, {"user_id": "user-1"}, {"user_id": "user-2"}]
+            )
+        )
+        mock_notifications_collection.insert_many.return_value = MagicMock(
+            inserted_ids=["n1", "n2"]
+        )
+
+        count = await notify_org_members(
+            "org-1", "author", "ANNOUNCEMENT", "Title", "Message", "ref-1"
+        )
+
+        assert count == 2
+        mock_notifications_collection.insert_many.assert_called_once()
+        mock_notifications_collection.insert_one.assert_not_called()
+        mock_notifications_collection.find_one.assert_not_called()
+        documents = mock_notifications_collection.insert_many.call_args.args[0]
+        assert [d["user_id"] for d in documents] == ["user-1", "user-2"]
+        assert mock_notifications_collection.insert_many.call_args.kwargs == {
+            "ordered": False
+        }
+
+    @pytest.mark.asyncio
+    async def test_skips_write_when_nobody_to_notify(self):
+        count = await notify_org_members(
+            "org-1", "author", "ANNOUNCEMENT", "Title", "Message", "ref-1"
+        )
+
+        assert count == 0
+        mock_notifications_collection.insert_many.assert_not_called()
+
+
+class TestNotifyDesignatedVoters:
+    @pytest.mark.asyncio
+    async def test_notifies_each_voter_once(self):
+        mock_houses_collection.find.return_value = create_async_cursor_mock(
+            [{"voter_user_id": "voter-1"}, {"voter_user_id": "voter-1"}]
+        )
+        mock_notifications_collection.insert_many.return_value = MagicMock(
+            inserted_ids=["n1"]
+        )
+
+        count = await notify_designated_voters(
+            "org-1", "VOTE_STARTED", "Title", "Message", "ref-1"
+        )
+
+        assert count == 1
+        documents = mock_notifications_collection.insert_many.call_args.args[0]
+        assert [d["user_id"] for d in documents] == ["voter-1"]
+
+
+class TestCreateNotifications:
+    @pytest.mark.asyncio
+    async def test_partial_failure_reports_inserted_count(self):
+        mock_notifications_collection.insert_many = AsyncMock(
+            side_effect=BulkWriteError({"nInserted": 2, "writeErrors": [{}]})
+        )
+
+        count = await create_notifications(
+            ["u1", "u2", "u3"], "org-1", "TYPE", "Title", "Message", "ref-1"
+        )
+
+        assert count == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_key_gives_each_user_a_stable_dedupe_key(self):
+        mock_notifications_collection.insert_many.return_value = MagicMock(
+            inserted_ids=["n1", "n2"]
+        )
+
+        for _ in range(2):
+            await create_notifications(
+                ["u1", "u2"],
+                "org-1",
+                "TYPE",
+                "Title",
+                "Message",
+                "ref-1",
+                batch_key="job-1",
+            )
+
+        first, retry = [
+            [d["dedupe_key"] for d in call.args[0]]
+            for call in mock_notifications_collection.insert_many.call_args_list
+        ]
+        assert first == retry
+        assert len(set(first)) == 2
+        # The driver assigns ordinary ObjectIds, so their timestamps are real
+        calls = mock_notifications_collection.insert_many.call_args_list
+        assert all("_id" not in d for call in calls for d in call.args[0])
+
+
+class TestActivityFeedPage:
+    @pytest.mark.asyncio
+    async def test_merges_sources_into_one_page(self):
+        start = datetime(2026, 1, 1)
+
+        def docs(offsets):
+            return [
+                {
+                    "_id": ObjectId(),
+                    "title": f"T{o}",
+                    "created_at": start - timedelta(o),
+                }
+                for o in offsets
+            ]
+
+        for collection, offsets in (
+            (mock_proposals_collection, [0, 2, 4]),
+            (mock_announcements_collection, [1, 3, 5]),
+        ):
+            cursor = collection.find.return_value
+            cursor.sort.return_value.limit.return_value = create_async_cursor_mock(
+                docs(offsets)
+            )
+
+        page = await get_activity_feed_page("org-1", first=3)
+
+        nodes = [edge["node"] for edge in page["edges"]]
+        assert [n["title"] for n in nodes] == ["T0", "T1", "T2"]
+        assert [n["type"] for n in nodes] == ["PROPOSAL", "ANNOUNCEMENT", "PROPOSAL"]
+        assert page["has_next_page"] is True
@@ -0,0 +1,193 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bson import ObjectId
+
+from apps.api.src.outbox.service import (
+    DEAD,
+    DELIVERED,
+    PENDING,
+    enqueue,
+    enqueue_invitation,
+    track_enqueued,
+)
+from apps.api.src.outbox.transports import MemoryTransport, RateLimiter
+from apps.api.src.outbox.worker import (
+    OutboxWorker,
+    drain_outbox,
+    retry_delay,
+)
+
+from ..conftest import (
+    create_async_cursor_mock,
+    mock_notifications_collection,
+    mock_organization_members_collection,
+    mock_outbox_collection,
+    mock_users_collection,
+)
+
+
+def _job(kind="invitation", attempts=1, max_attempts=5, **payload):
+    return {
+        "_id": ObjectId(),
+        "kind": kind,
+        "payload": {
+            "channel": "email",
+            "to": "user@example.com",
+            "org_name": "Test Org",
+            "invite_url": "https://app/invite/tok",
+            "organization_id": "org-1",
+            "invitation_id": "inv-1",
+            "notify_on_failure": False,
+            **payload,
+        },
+        "attempts": attempts,
+        "max_attempts": max_attempts,
+    }
+
+
+def _queue(*jobs):
+    mock_outbox_collection.find_one_and_update = AsyncMock(side_effect=[*jobs, None])
+
+
+def _status_update():
+    return mock_outbox_collection.update_one.call_args.args[1]["$set"]
+
+
+class TestEnqueue:
+    @pytest.mark.asyncio
+    async def test_enqueue_only_writes_a_pending_job(self):
+        await enqueue_invitation("email", "user@example.com", "Org", "https://x")
+
+        job = mock_outbox_collection.insert_one.call_args.args[0]
+        assert job["kind"] == "invitation"
+        assert job["status"] == PENDING
+        assert job["attempts"] == 0
+        assert job["payload"]["to"] == "user@example.com"
+
+    @pytest.mark.asyncio
+    async def test_request_records_jobs_it_queued(self):
+        queued = track_enqueued()
+
+        await enqueue("notify_org_members", {"organization_id": "org-1"})
+
+        assert queued == ["notify_org_members"]
+
+
+class TestOutboxWorker:
+    @pytest.mark.asyncio
+    async def test_delivers_job_through_transport(self):
+        _queue(_job())
+        transport = MemoryTransport()
+
+        processed = await OutboxWorker(transport).run_once()
+
+        assert processed == 1
+        assert transport.sent[0]["to"] == "user@example.com"
+        assert _status_update()["status"] == DELIVERED
+
+    @pytest.mark.asyncio
+    async def test_failed_job_is_rescheduled_with_backoff(self):
+        _queue(_job(attempts=2))
+
+        await OutboxWorker(MemoryTransport(fail_times=1)).run_once()
+
+        update = _status_update()
+        assert update["status"] == PENDING
+        assert update["last_error"] == "Transport unavailable"
+        assert (update["next_attempt_at"] - update["updated_at"]).total_seconds() == (
+            retry_delay(2)
+        )
+
+    @pytest.mark.asyncio
+    async def test_exhausted_invitation_falls_back_to_notification(self):
+        _queue(_job(attempts=5, notify_on_failure=True))
+        mock_users_collection.find_one.return_value = {"_id": ObjectId()}
+
+        await OutboxWorker(MemoryTransport(fail_times=1)).run_once()
+
+        assert _status_update()["status"] == DEAD
+        mock_notifications_collection.insert_one.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_processing_is_bounded_by_concurrency(self):
+        _queue(*[_job() for _ in range(3)])
+        in_flight = 0
+        peak = 0
+
+        class SlowTransport(MemoryTransport):
+            async def send_invitation(self, *args):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0)
+                in_flight -= 1
+
+        assert await OutboxWorker(SlowTransport(), concurrency=2).run_once() == 2
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_retried_fan_out_reuses_dedupe_keys(self):
+        job = dict(
+            _job(kind="notify_org_members"),
+            payload={
+                "organization_id": "org-1",
+                "exclude_user_id": "author",
+                "notification_type": "ANNOUNCEMENT",
+                "title": "Title",
+                "message": "Message",
+                "reference_id": "ref-1",
+            },
+        )
+        mock_organization_members_collection.find.side_effect = lambda *a: (
+            create_async_cursor_mock([{"user_id": "user-1"}, {"user_id": "user-2"}])
+        )
+        _queue(job, job)
+
+        await OutboxWorker(MemoryTransport(), concurrency=1).run_once()
+        await OutboxWorker(MemoryTransport(), concurrency=1).run_once()
+
+        first, retry = [
+            [d["dedupe_key"] for d in call.args[0]]
+            for call in mock_notifications_collection.insert_many.call_args_list
+        ]
+        assert first == retry
+
+    @pytest.mark.asyncio
+    async def test_drain_processes_until_queue_is_empty(self):
+        mock_outbox_collection.find_one_and_update = AsyncMock(
+            side_effect=[_job(), _job(), None, _job(), None, None]
+        )
+        transport = MemoryTransport()
+
+        processed = await drain_outbox(budget_seconds=5, transport=transport)
+
+        assert processed == 3
+        assert len(transport.sent) == 3
+
+    def test_workers_share_one_transport(self):
+        assert OutboxWorker().transport is OutboxWorker().transport
+
+    def test_retry_delay_grows_and_is_capped(self):
+        assert retry_delay(1) < retry_delay(2) < retry_delay(3)
+        assert retry_delay(50) == retry_delay(60)
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_spaces_sends_to_configured_rate(self):
+        limiter = RateLimiter(rate=2)
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        with (
+            patch("apps.api.src.outbox.transports.time.monotonic", return_value=10.0),
+            patch("apps.api.src.outbox.transports.asyncio.sleep", fake_sleep),
+        ):
+            for _ in range(3):
+                await limiter.wait()
+
+        assert sleeps == [0.5, 1.0]
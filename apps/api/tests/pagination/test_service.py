@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from bson import ObjectId
+
+from apps.api.src.pagination.service import (
+    MAX_PAGE_SIZE,
+    after_filter,
+    decode_cursor,
+    encode_cursor,
+    page_size,
+    paginate,
+)
+from apps.api.tests.conftest import create_async_cursor_mock
+
+ORDER = (("is_pinned", -1), ("created_at", -1), ("_id", -1))
+
+
+def _docs(count):
+    start = datetime(2026, 1, 1)
+    return [
+        {"_id": ObjectId(), "created_at": start - timedelta(days=i), "title": f"D{i}"}
+        for i in range(count)
+    ]
+
+
+def _collection(docs):
+    collection = MagicMock()
+    cursor = collection.find.return_value
+    cursor.sort.return_value.limit.return_value = create_async_cursor_mock(docs)
+    return collection
+
+
+def test_cursor_round_trips_sort_values():
+    doc = _docs(1)[0]
+    values = decode_cursor(encode_cursor(doc))
+    assert values == [doc["created_at"], doc["_id"]]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor({}, ORDER)])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(Exception, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_after_filter_is_a_keyset_comparison():
+    ts, oid = datetime(2026, 1, 1), ObjectId()
+    assert after_filter([True, ts, oid], ORDER) == {
+        "$or": [
+            {"is_pinned": {"$ne": True}},
+            {"is_pinned": True, "created_at": {"$lt": ts}},
+            {"is_pinned": True, "created_at": ts, "_id": {"$lt": oid}},
+        ]
+    }
+
+
+def _matches(doc, query):
+    """Evaluate an after_filter query the way MongoDB would, nulls included."""
+    if "$or" in query:
+        return any(_matches(doc, clause) for clause in query["$or"])
+    for field, condition in query.items():
+        value = doc.get(field)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, operand in condition.items():
+            if op == "$eq" and value != operand:
+                return False
+            if op == "$ne" and value == operand:
+                return False
+            # Comparisons only match values of the operand's type
+            if op == "$lt" and not (type(value) is type(operand) and value < operand):
+                return False
+    return True
+
+
+def test_pages_keep_documents_without_is_pinned():
+    docs = _docs(5)
+    docs[0]["is_pinned"] = True
+    docs[1]["is_pinned"] = False
+    docs[3]["is_pinned"] = True
+    # docs[2] and docs[4] predate the field, so they sort after unpinned ones
+    ordered = [docs[i] for i in (0, 3, 1, 2, 4)]
+
+    seen, after = [], None
+    while len(seen) < len(ordered):
+        query = after_filter(after, ORDER) if after else {}
+        remaining = [doc for doc in ordered if _matches(doc, query)]
+        if not remaining:
+            break
+        seen.append(remaining[0]["title"])
+        after = decode_cursor(encode_cursor(remaining[0], ORDER), ORDER)
+
+    assert seen == ["D0", "D3", "D1", "D2", "D4"]
+
+
+def test_page_size_is_clamped():
+    assert page_size(None) == 20
+    assert page_size(500) == MAX_PAGE_SIZE
+    with pytest.raises(Exception, match="first must be at least 1"):
+        page_size(0)
+
+
+@pytest.mark.asyncio
+async def test_paginate_fetches_one_extra_to_detect_next_page():
+    docs = _docs(3)
+    collection = _collection(docs)
+
+    page = await paginate(collection, {"organization_id": "org-1"}, first=2)
+
+    assert [edge["node"]["title"] for edge in page["edges"]] == ["D0", "D1"]
+    assert page["has_next_page"] is True
+    assert page["end_cursor"] == page["edges"][-1]["cursor"]
+    collection.find.return_value.sort.return_value.limit.assert_called_once_with(3)
+
+
+@pytest.mark.asyncio
+async def test_paginate_resumes_after_cursor():
+    docs = _docs(2)
+    collection = _collection(docs[1:])
+    after = encode_cursor(docs[0])
+
+    page = await paginate(collection, {"organization_id": "org-1"}, 2, after)
+
+    query = collection.find.call_args[0][0]
+    assert query["$and"][0] == {"organization_id": "org-1"}
+    assert query["$and"][1] == after_filter(
+        [docs[0]["created_at"], docs[0]["_id"]], (("created_at", -1), ("_id", -1))
+    )
+    assert page["has_next_page"] is False
+
+
+@pytest.mark.asyncio
+async def test_projection_keeps_cursor_fields():
+    collection = _collection([])
+
+    page = await paginate(collection, {}, projection={"_id": 1, "title": 1})
+
+    assert collection.find.call_args[0][1] == {"_id": 1, "title": 1, "created_at": 1}
+    assert page == {"edges": [], "has_next_page": False, "end_cursor": None}
@@ -0,0 +1,92 @@
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+import strawberry
+
+from apps.api.src.projection.service import (
+    projection_from_info,
+    selected_field_names,
+)
+
+
+@strawberry.type
+class Item:
+    id: str
+    title: str
+    description: str
+    vote_status: str
+    residents: List[str]
+
+
+def _capture(query: str, **kwargs):
+    """Run a query and return the projection its resolver would build."""
+    captured = {}
+
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        def items(self, info: strawberry.types.Info) -> List[Item]:
+            captured["projection"] = projection_from_info(info, **kwargs)
+            captured["names"] = selected_field_names(info)
+            return []
+
+    result = strawberry.Schema(Query).execute_sync(query)
+    assert result.errors is None
+    return captured
+
+
+def test_projection_covers_only_selected_fields():
+    captured = _capture("{ items { id title } }")
+    assert captured["projection"] == {"_id": 1, "title": 1}
+
+
+def test_fragments_and_camel_case_fields_are_included():
+    captured = _capture(
+        "fragment F on Item { voteStatus } "
+        "{ items { __typename ...F ... on Item { title } } }"
+    )
+    assert captured["names"] == {"vote_status", "title"}
+    assert captured["projection"] == {"_id": 1, "vote_status": 1, "title": 1}
+
+
+def test_required_and_dependent_fields():
+    captured = _capture(
+        "{ items { title residents } }",
+        required=("organization_id",),
+        depends={"residents": ()},
+    )
+    assert captured["projection"] == {"_id": 1, "organization_id": 1, "title": 1}
+
+
+@pytest.mark.parametrize("info", [MagicMock(), object()])
+def test_unknown_selection_fetches_whole_documents(info):
+    assert selected_field_names(info) is None
+    assert projection_from_info(info) is None
+
+
+def test_path_descends_into_connection_nodes():
+    @strawberry.type
+    class Edge:
+        node: Item
+        cursor: str
+
+    @strawberry.type
+    class Connection:
+        edges: List[Edge]
+
+    captured = {}
+
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        def items(self, info: strawberry.types.Info) -> Connection:
+            captured["projection"] = projection_from_info(info, path=("edges", "node"))
+            return Connection(edges=[])
+
+    result = strawberry.Schema(Query).execute_sync(
+        "{ items { edges { cursor node { title } } } }"
+    )
+
+    assert result.errors is None
+    assert captured["projection"] == {"_id": 1, "title": 1}
@@ -5,6 +5,7 @@ import pytest
 from bson import ObjectId
 
 # Import after conftest has patched the database module
+from apps.api.resolvers.proposal_vote import resolve_cast_proposal_vote
 from apps.api.src.proposal_vote.service import (
     _check_auto_approval,
     cast_proposal_vote,
@@ -15,7 +16,9 @@ from apps.api.src.proposal_vote.service import (
 )
 
 from ..conftest import (
+    create_async_cursor_mock,
     mock_houses_collection,
+    mock_organization_members_collection,
     mock_proposal_votes_collection,
     mock_proposals_collection,
 )
@@ -79,6 +82,8 @@ class TestStartProposalVote:
         result = await start_proposal_vote(PROPOSAL_ID, 66, ADMIN_ID)
         assert result["vote_status"] == "ACTIVE"
         assert result["vote_threshold"] == 66
+        update = mock_proposals_collection.find_one_and_update.call_args.args[1]
+        assert update["$set"]["vote_counts"] == {"YES": 0, "NO": 0}
 
     @pytest.mark.asyncio
     async def test_start_vote_fails_if_not_voting_status(self):
@@ -98,64 +103,85 @@ class TestStartProposalVote:
 
 
 class TestCastProposalVote:
-    @pytest.mark.asyncio
-    async def test_cast_yes_vote(self):
+    def _setup(self, previous_vote=None, yes_count=1, no_count=0):
         proposal = _make_proposal(vote_status="ACTIVE", vote_threshold=66)
-        house = _make_house(HOUSE_ID_1, voter_user_id=VOTER_ID)
-        vote_doc = _make_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "YES")
-
+        counted = {**proposal, "vote_counts": {"YES": yes_count, "NO": no_count}}
         mock_proposals_collection.find_one = AsyncMock(return_value=proposal)
-        mock_houses_collection.find_one = AsyncMock(return_value=house)
-        mock_proposal_votes_collection.find_one = AsyncMock(
-            side_effect=[None, vote_doc]
-        )
-        mock_proposal_votes_collection.insert_one = AsyncMock(
-            return_value=MagicMock(inserted_id=vote_doc["_id"])
+        mock_proposals_collection.find_one_and_update = AsyncMock(return_value=counted)
+        mock_houses_collection.find_one = AsyncMock(
+            return_value=_make_house(HOUSE_ID_1, voter_user_id=VOTER_ID)
         )
         mock_houses_collection.count_documents = AsyncMock(return_value=3)
-        mock_proposal_votes_collection.count_documents = AsyncMock(return_value=1)
+        mock_organization_members_collection.find_one.return_value = {
+            "role": "RESIDENT"
+        }
+        # The upsert returns the vote it replaced, None for a first vote
+        mock_proposal_votes_collection.find_one_and_update = AsyncMock(
+            return_value=previous_vote
+        )
+        return counted
+
+    def _counter_inc(self):
+        return mock_proposals_collection.find_one_and_update.call_args.args[1]["$inc"]
+
+    @pytest.mark.asyncio
+    async def test_cast_yes_vote(self):
+        self._setup()
 
         result = await cast_proposal_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "YES")
+
         assert result["vote"] == "YES"
+        assert result["proposal_id"] == PROPOSAL_ID
+        assert self._counter_inc() == {"vote_counts.YES": 1}
+        # The threshold check reads counters, not the votes collection
+        mock_proposal_votes_collection.count_documents.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_cast_no_vote(self):
-        proposal = _make_proposal(vote_status="ACTIVE", vote_threshold=66)
-        house = _make_house(HOUSE_ID_1, voter_user_id=VOTER_ID)
-        vote_doc = _make_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "NO")
-
-        mock_proposals_collection.find_one = AsyncMock(return_value=proposal)
-        mock_houses_collection.find_one = AsyncMock(return_value=house)
-        mock_proposal_votes_collection.find_one = AsyncMock(
-            side_effect=[None, vote_doc]
-        )
-        mock_proposal_votes_collection.insert_one = AsyncMock(
-            return_value=MagicMock(inserted_id=vote_doc["_id"])
-        )
-        mock_houses_collection.count_documents = AsyncMock(return_value=3)
-        mock_proposal_votes_collection.count_documents = AsyncMock(return_value=0)
+        self._setup(yes_count=0, no_count=1)
 
         result = await cast_proposal_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "NO")
+
         assert result["vote"] == "NO"
+        assert self._counter_inc() == {"vote_counts.NO": 1}
 
     @pytest.mark.asyncio
     async def test_change_vote_upsert(self):
-        proposal = _make_proposal(vote_status="ACTIVE", vote_threshold=66)
-        house = _make_house(HOUSE_ID_1, voter_user_id=VOTER_ID)
         existing_vote = _make_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "NO")
-        updated_vote = {**existing_vote, "vote": "YES"}
-
-        mock_proposals_collection.find_one = AsyncMock(return_value=proposal)
-        mock_houses_collection.find_one = AsyncMock(return_value=house)
-        mock_proposal_votes_collection.find_one = AsyncMock(return_value=existing_vote)
-        mock_proposal_votes_collection.find_one_and_update = AsyncMock(
-            return_value=updated_vote
-        )
-        mock_houses_collection.count_documents = AsyncMock(return_value=3)
-        mock_proposal_votes_collection.count_documents = AsyncMock(return_value=1)
+        self._setup(previous_vote=existing_vote)
 
         result = await cast_proposal_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "YES")
+
         assert result["vote"] == "YES"
+        assert result["_id"] == existing_vote["_id"]
+        # Insert and update are the same upsert on (proposal_id, house_id)
+        call = mock_proposal_votes_collection.find_one_and_update.call_args
+        assert call.args[0] == {"proposal_id": PROPOSAL_ID, "house_id": HOUSE_ID_1}
+        assert call.kwargs["upsert"] is True
+        assert self._counter_inc() == {"vote_counts.YES": 1, "vote_counts.NO": -1}
+
+    @pytest.mark.asyncio
+    async def test_repeated_vote_leaves_counters_alone(self):
+        existing_vote = _make_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "YES")
+        self._setup(previous_vote=existing_vote)
+
+        await cast_proposal_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "YES")
+
+        mock_proposals_collection.find_one_and_update.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_counters_are_rebuilt(self):
+        counted = self._setup()
+        # The $inc matches nothing on a proposal without counters
+        mock_proposals_collection.find_one_and_update = AsyncMock(
+            side_effect=[None, counted]
+        )
+        mock_proposal_votes_collection.count_documents = AsyncMock(side_effect=[1, 0])
+
+        await cast_proposal_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "YES")
+
+        rebuild = mock_proposals_collection.find_one_and_update.call_args.args[1]
+        assert rebuild == {"$set": {"vote_counts": {"YES": 1, "NO": 0}}}
 
     @pytest.mark.asyncio
     async def test_fails_for_non_designated_voter(self):
@@ -164,10 +190,42 @@ class TestCastProposalVote:
 
         mock_proposals_collection.find_one = AsyncMock(return_value=proposal)
         mock_houses_collection.find_one = AsyncMock(return_value=house)
+        mock_organization_members_collection.find_one.return_value = {
+            "role": "RESIDENT"
+        }
 
         with pytest.raises(Exception, match="designated voter"):
             await cast_proposal_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "YES")
 
+    @pytest.mark.asyncio
+    async def test_fails_for_non_member(self):
+        self._setup()
+        mock_organization_members_collection.find_one.return_value = None
+
+        with pytest.raises(Exception, match="not a member"):
+            await cast_proposal_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "YES")
+
+        mock_proposal_votes_collection.find_one_and_update.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resolver_reads_the_proposal_once(self):
+        self._setup(previous_vote=_make_vote(PROPOSAL_ID, HOUSE_ID_1, VOTER_ID, "YES"))
+        mock_organization_members_collection.find.return_value = (
+            create_async_cursor_mock(
+                [{"user_id": VOTER_ID, "organization_id": ORG_ID, "role": "RESIDENT"}]
+            )
+        )
+        info = MagicMock()
+        info.context = {"user": {"id": VOTER_ID}}
+
+        await resolve_cast_proposal_vote(info, PROPOSAL_ID, HOUSE_ID_1, "YES")
+
+        assert mock_proposals_collection.find_one.call_count == 1
+        assert mock_houses_collection.find_one.call_count == 1
+        assert mock_organization_members_collection.find.call_count == 1
+        mock_organization_members_collection.find_one.assert_not_called()
+        assert mock_proposal_votes_collection.find_one_and_update.call_count == 1
+
     @pytest.mark.asyncio
     async def test_fails_if_vote_not_active(self):
         proposal = _make_proposal(vote_status=None)
@@ -189,25 +247,34 @@ class TestCheckAutoApproval:
     @pytest.mark.asyncio
     async def test_auto_approve_when_threshold_met(self):
         proposal = _make_proposal(vote_status="ACTIVE", vote_threshold=66)
-        mock_proposals_collection.find_one = AsyncMock(return_value=proposal)
-        mock_houses_collection.count_documents = AsyncMock(return_value=3)
         # 2 out of 3 = 66.7% >= 66%
-        mock_proposal_votes_collection.count_documents = AsyncMock(return_value=2)
+        proposal["vote_counts"] = {"YES": 2, "NO": 0}
+        mock_houses_collection.count_documents = AsyncMock(return_value=3)
 
-        await _check_auto_approval(PROPOSAL_ID)
+        await _check_auto_approval(proposal)
         mock_proposals_collection.update_one.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_no_approval_below_threshold(self):
         proposal = _make_proposal(vote_status="ACTIVE", vote_threshold=66)
-        mock_proposals_collection.find_one = AsyncMock(return_value=proposal)
-        mock_houses_collection.count_documents = AsyncMock(return_value=3)
         # 1 out of 3 = 33.3% < 66%
-        mock_proposal_votes_collection.count_documents = AsyncMock(return_value=1)
+        proposal["vote_counts"] = {"YES": 1, "NO": 2}
+        mock_houses_collection.count_documents = AsyncMock(return_value=3)
 
-        await _check_auto_approval(PROPOSAL_ID)
+        await _check_auto_approval(proposal)
         mock_proposals_collection.update_one.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_house_count_is_cached_per_organization(self):
+        proposal = _make_proposal(vote_status="ACTIVE", vote_threshold=66)
+        proposal["vote_counts"] = {"YES": 1, "NO": 0}
+        mock_houses_collection.count_documents = AsyncMock(return_value=3)
+
+        await _check_auto_approval(proposal)
+        await _check_auto_approval(proposal)
+
+        mock_houses_collection.count_documents.assert_called_once()
+
 
 class TestCloseProposalVote:
     @pytest.mark.asyncio
@@ -254,12 +321,12 @@ class TestGetProposalVoteResults:
         proposal = _make_proposal(
             status="VOTING", vote_status="ACTIVE", vote_threshold=66
         )
+        proposal["vote_counts"] = {"YES": 2, "NO": 1}
         mock_proposals_collection.find_one = AsyncMock(return_value=proposal)
         mock_houses_collection.count_documents = AsyncMock(return_value=3)
-        # yes_count=2, no_count=1
-        mock_proposal_votes_collection.count_documents = AsyncMock(side_effect=[2, 1])
 
         result = await get_proposal_vote_results(PROPOSAL_ID)
+        mock_proposal_votes_collection.count_documents.assert_not_called()
         assert result["yes_count"] == 2
         assert result["no_count"] == 1
         assert result["total_houses"] == 3
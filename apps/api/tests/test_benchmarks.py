@@ -0,0 +1,65 @@
+from apps.api.benchmarks.compare import compare
+from apps.api.benchmarks.dataset import DatasetConfig, build_dataset
+
+SMALL = DatasetConfig(
+    organizations=2,
+    houses=10,
+    members=15,
+    proposals=8,
+    comments=40,
+    voting_sessions=3,
+    proposals_per_session=4,
+)
+
+
+def test_dataset_is_deterministic_and_sized_by_config():
+    dataset = build_dataset(SMALL)
+
+    assert dataset.counts() == {
+        "organizations": 2,
+        "users": 2 * 16,
+        "houses": 2 * 10,
+        "organization_members": 2 * 16,
+        "proposals": 2 * 8,
+        "comments": 2 * 40,
+        "voting_sessions": 2 * 3,
+        # Every house has a voter and casts a full ballot in every session
+        "votes": 2 * 3 * 10,
+    }
+    again = build_dataset(SMALL)
+    assert again.documents["votes"] == dataset.documents["votes"]
+
+
+def test_dataset_references_are_consistent():
+    dataset = build_dataset(SMALL)
+    docs = dataset.documents
+    user_ids = {str(u["_id"]) for u in docs["users"]}
+    house_ids = {str(h["_id"]) for h in docs["houses"]}
+    proposal_ids = {str(p["_id"]) for p in docs["proposals"]}
+
+    assert {m["user_id"] for m in docs["organization_members"]} <= user_ids
+    assert {h["voter_user_id"] for h in docs["houses"]} <= user_ids
+    assert {c["proposal_id"] for c in docs["comments"]} <= proposal_ids
+    for vote in docs["votes"]:
+        assert vote["house_id"] in house_ids
+        assert sorted(r["rank"] for r in vote["rankings"]) == [1, 2, 3, 4]
+    org = dataset.organizations[0]
+    assert len(org.session_ids) == 3
+
+
+def test_compare_flags_median_regressions():
+    baseline = {"results": {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}}}
+    current = {
+        "results": {
+            "a": {"median_ms": 11.0},
+            "b": {"median_ms": 15.0},
+            "new": {"median_ms": 1.0},
+        }
+    }
+
+    rows = compare(baseline, current, threshold=0.2)
+
+    assert [(name, regressed) for name, *_, regressed in rows] == [
+        ("a", False),
+        ("b", True),
+    ]
@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+from apps.api.src.cache import TTLCache
+from apps.api.src.house.count_cache import house_count_cache
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TTLCache(ttl_seconds=0, max_entries=100)
+    cache.set("key", "value")
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(ttl_seconds=30, max_entries=100)
+    with patch("apps.api.src.cache.time.monotonic", return_value=100.0):
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+    with patch("apps.api.src.cache.time.monotonic", return_value=131.0):
+        assert cache.get("key") is None
+
+
+def test_shorter_ttl_per_entry():
+    cache = TTLCache(ttl_seconds=30, max_entries=100)
+    with patch("apps.api.src.cache.time.monotonic", return_value=100.0):
+        cache.set("key", "value", ttl_seconds=5)
+        cache.set("expired", "value", ttl_seconds=-1)
+    with patch("apps.api.src.cache.time.monotonic", return_value=106.0):
+        assert cache.get("key") is None
+    assert cache.get("expired") is None
+
+
+def test_none_is_not_cached():
+    cache = TTLCache(ttl_seconds=30, max_entries=100)
+    cache.set("key", None)
+    assert len(cache) == 0
+
+
+def test_copied_values_cannot_be_mutated():
+    cache = TTLCache(ttl_seconds=30, max_entries=100, copy_values=True)
+    doc = {"memberships": []}
+    cache.set("key", doc)
+    doc["memberships"].append("stale")
+    cache.get("key")["memberships"].append("stale")
+    assert cache.get("key")["memberships"] == []
+
+
+def test_evicts_least_recently_used_entry_when_full():
+    cache = TTLCache(ttl_seconds=30, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_invalidate_where_matches_keys_and_values():
+    cache = TTLCache(ttl_seconds=30, max_entries=100)
+    cache.set(("user-1", "org-1"), "ADMIN")
+    cache.set(("user-2", "org-1"), "MEMBER")
+    cache.set(("user-2", "org-2"), "ADMIN")
+
+    cache.invalidate_where(lambda key, role: key[1] == "org-1" and role == "ADMIN")
+
+    assert cache.get(("user-1", "org-1")) is None
+    assert cache.get(("user-2", "org-1")) == "MEMBER"
+    assert cache.get(("user-2", "org-2")) == "ADMIN"
+
+
+def test_house_count_cache_is_bounded():
+    assert house_count_cache.max_entries > 0
@@ -0,0 +1,202 @@
+import asyncio
+import contextvars
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# conftest replaces apps.api.database with a mock, so load the real module
+_spec = importlib.util.spec_from_file_location(
+    "database_under_test", Path(__file__).parents[1] / "database.py"
+)
+database = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(database)
+
+MongoDB = database.MongoDB
+PoolMetrics = database.PoolMetrics
+QueryStats = database.QueryStats
+client_options = database.client_options
+reports_read_preference = database.reports_read_preference
+
+
+def test_client_options_come_from_environment(monkeypatch):
+    monkeypatch.setenv("MONGODB_MAX_POOL_SIZE", "25")
+    monkeypatch.setenv("MONGODB_MAX_IDLE_TIME_MS", "1000")
+    monkeypatch.setenv("MONGODB_READ_PREFERENCE", "secondaryPreferred")
+    monkeypatch.setenv("MONGODB_COMPRESSORS", "brotli,zlib")
+
+    options = client_options()
+
+    assert options["maxPoolSize"] == 25
+    assert options["maxIdleTimeMS"] == 1000
+    assert options["readPreference"] == "secondaryPreferred"
+    # Unknown or uninstalled compressors are skipped
+    assert options["compressors"] == ["zlib"]
+
+
+def test_pool_metrics_track_connections():
+    metrics = PoolMetrics()
+    event = MagicMock()
+
+    metrics.connection_created(event)
+    metrics.connection_check_out_started(event)
+    metrics.connection_checked_out(event)
+    metrics.connection_check_out_started(event)
+
+    assert metrics.snapshot()["open"] == 1
+    assert metrics.snapshot()["in_use"] == 1
+    assert metrics.snapshot()["waiting"] == 1
+
+    metrics.connection_check_out_failed(event)
+    metrics.connection_checked_in(event)
+
+    snapshot = metrics.snapshot()
+    assert (snapshot["in_use"], snapshot["waiting"]) == (0, 0)
+    assert snapshot["check_out_failed_total"] == 1
+
+
+def test_client_is_reused_on_the_same_loop_and_replaced_on_a_new_one():
+    mongo = MongoDB()
+    mongo.uri = "mongodb://localhost:27017"
+
+    async def connect_twice():
+        await mongo.connect()
+        first = mongo.client
+        await mongo.connect()
+        assert mongo.client is first
+        return first
+
+    with patch.object(
+        database, "AsyncIOMotorClient", side_effect=lambda *a, **k: MagicMock()
+    ):
+        first = asyncio.run(connect_twice())
+
+        async def check_new_loop():
+            assert not mongo.is_connected()
+            await mongo.connect()
+            return mongo.client
+
+        second = asyncio.run(check_new_loop())
+
+    assert second is not first
+    first.close.assert_called_once()
+    assert mongo.pool_stats()["max_pool_size"] == mongo.options["maxPoolSize"]
+
+
+def test_reports_read_preference_bounds_staleness(monkeypatch):
+    monkeypatch.setenv("MONGODB_REPORTS_MAX_STALENESS_SECONDS", "30")
+
+    preference = reports_read_preference()
+
+    assert preference.mongos_mode == "secondaryPreferred"
+    # Raised to the server's 90s minimum
+    assert preference.max_staleness == 90
+
+    monkeypatch.setenv("MONGODB_REPORTS_READ_PREFERENCE", "primary")
+    assert reports_read_preference().mongos_mode == "primary"
+
+
+def test_reports_database_is_routed_separately():
+    mongo = MongoDB()
+    mongo.uri = "mongodb://localhost:27017"
+
+    with patch.object(
+        database, "AsyncIOMotorClient", side_effect=lambda *a, **k: MagicMock()
+    ):
+        asyncio.run(mongo.connect())
+
+    mongo.client.get_database.assert_called_once_with(
+        mongo.db_name, read_preference=mongo.reports_read_preference
+    )
+    assert mongo.reports is not mongo.db
+
+
+def _run_command(stats, command, request_id, duration_micros=1000):
+    """Simulate the events PyMongo emits for one command."""
+    event = SimpleNamespace(
+        command_name=next(iter(command)),
+        command=command,
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+        duration_micros=duration_micros,
+    )
+    stats.started(event)
+    stats.succeeded(event)
+
+
+def test_query_stats_group_commands_by_shape():
+    stats = QueryStats(slow_ms=100)
+    for i, duration_ms in enumerate([1, 2, 3, 4, 200]):
+        _run_command(
+            stats,
+            {"find": "houses", "filter": {"organization_id": i}, "sort": {"_id": 1}},
+            i,
+            duration_micros=duration_ms * 1000,
+        )
+    _run_command(
+        stats,
+        {"update": "houses", "updates": [{"q": {"voter_user_id": 1}, "multi": True}]},
+        10,
+    )
+    _run_command(stats, {"ping": 1}, 11)
+
+    report = stats.report()
+
+    assert [row["command"] for row in report] == ["find", "update"]
+    find, update = report
+    assert find["filter"] == {"organization_id": "?"}
+    assert find["sort"] == [["_id", 1]]
+    assert (find["count"], find["slow"]) == (5, 1)
+    assert (find["p50_ms"], find["p99_ms"]) == (3.0, 200.0)
+    assert update["filter"] == {"voter_user_id": "?"}
+    assert '"multi": true' in update["shape"]
+
+
+def test_query_stats_attribute_commands_to_the_calling_function():
+    mongo = MongoDB()
+    mongo.uri = "mongodb://localhost:27017"
+    namespace = {"__name__": "apps.api.src.house.service"}
+    exec("async def clear_voter(run):\n    await run()\n", namespace)
+
+    async def run():
+        # Like Motor, run the command in an executor thread with a copy of
+        # the caller's context
+        context = contextvars.copy_context()
+        command = {"delete": "houses", "deletes": [{"q": {"_id": 1}, "limit": 1}]}
+        await asyncio.get_running_loop().run_in_executor(
+            None, context.run, _run_command, mongo.query_stats, command, 1
+        )
+
+    async def main():
+        with patch.object(database, "AsyncIOMotorClient"):
+            await mongo.connect()
+        # Resolvers and DataLoader batches run in tasks of their own
+        await asyncio.gather(namespace["clear_voter"](run))
+
+    asyncio.run(main())
+
+    (row,) = mongo.query_stats.report()
+    assert row["origins"] == {"house.service.clear_voter": 1}
+    assert mongo.query_stats in mongo.event_listeners
+
+
+def test_tasks_are_not_tracked_before_connecting():
+    async def query_task():
+        return database._query_task.get()
+
+    async def check():
+        MongoDB().is_connected()
+        return await asyncio.create_task(query_task())
+
+    assert asyncio.run(check()) is None
+
+
+def test_tls_can_be_disabled_for_a_local_mongod(monkeypatch):
+    monkeypatch.setenv("MONGODB_TLS", "false")
+    mongo = MongoDB()
+    mongo.uri = "mongodb://localhost:27017"
+
+    with patch.object(database, "AsyncIOMotorClient") as client:
+        asyncio.run(mongo.connect())
+
+    assert "tlsCAFile" not in client.call_args.kwargs
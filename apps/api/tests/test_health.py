@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 
 from apps.api.i18n import TranslationKeys
@@ -20,6 +22,7 @@ class TestHealthEndpoint:
         data = response.json()
         assert data["ok"] is True
         assert data["database"] == "mongodb"
+        assert data["pool"]["max_pool_size"] == 10
 
     def test_health_endpoint_content_type(self):
         """Test that the health endpoint returns JSON content type"""
@@ -151,3 +154,74 @@ class TestGraphQLHealthQuery:
         # Reset mock for other tests
         mock_db.health_check.side_effect = None
         mock_db.health_check.return_value = True
+
+
+class TestOutboxDrainEndpoint:
+    def test_requires_a_secret(self):
+        with patch("apps.api.src.auth.dependencies.CRON_SECRET", "cron-secret"):
+            response = client.get("/outbox/drain")
+
+        assert response.status_code == 403
+
+    def test_cron_bearer_token_drains_the_outbox(self):
+        with (
+            patch("apps.api.src.auth.dependencies.CRON_SECRET", "cron-secret"),
+            patch("apps.api.index.drain_outbox", return_value=3) as drain,
+        ):
+            response = client.get(
+                "/outbox/drain", headers={"Authorization": "Bearer cron-secret"}
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {"processed": 3}
+        drain.assert_awaited_once()
+
+
+class TestMetricsEndpoint:
+    def test_metrics_require_the_internal_secret(self):
+        with patch("apps.api.src.auth.dependencies.INTERNAL_API_SECRET", "secret"):
+            assert client.get("/metrics").status_code == 403
+            response = client.get("/metrics", headers={"X-Internal-Secret": "wrong"})
+            assert response.status_code == 403
+
+    @patch("apps.api.src.auth.dependencies.INTERNAL_API_SECRET", "secret")
+    def test_metrics_are_exported_in_prometheus_format(self):
+        client.post("/graphql", json={"query": "query Probe { health { status } }"})
+
+        response = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE graphql_operation_duration_seconds histogram" in response.text
+        assert 'operation="Probe"' in response.text
+        assert 'mongodb_pool_connections{state="in_use"} 0' in response.text
+
+
+class TestDebugQueriesEndpoint:
+    def test_requires_the_internal_secret(self):
+        with patch("apps.api.src.auth.dependencies.INTERNAL_API_SECRET", "secret"):
+            response = client.get("/debug/queries")
+
+        assert response.status_code == 403
+
+    def test_unindexed_shapes_are_flagged(self):
+        row = {
+            "shape": 'houses.update {"filter": {"voter_user_id": "?"}}',
+            "collection": "houses",
+            "command": "update",
+            "filter": {"voter_user_id": "?"},
+            "sort": [],
+        }
+        scoped = dict(row, filter={"organization_id": "?", "voter_user_id": "?"})
+
+        with (
+            patch.object(mock_db.query_stats, "report", return_value=[row, scoped]),
+            patch("apps.api.src.auth.dependencies.INTERNAL_API_SECRET", "secret"),
+        ):
+            response = client.get(
+                "/debug/queries", headers={"X-Internal-Secret": "secret"}
+            )
+
+        assert response.status_code == 200
+        shapes = response.json()["shapes"]
+        assert [shape["plan"] for shape in shapes] == ["collection scan", "index"]
@@ -0,0 +1,170 @@
+"""
+Index plan checks. The explain() tests run against a local mongod when
+MONGODB_TEST_URI is set (e.g. mongodb://localhost:27017) and are skipped
+otherwise.
+"""
+
+import os
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from apps.api.indexes import (
+    INDEX_PLAN,
+    MANIFEST_COLLECTION,
+    QUERY_SHAPES,
+    IndexSpec,
+    QueryShape,
+    apply_index_plan,
+    index_serves,
+    missing_indexes,
+    plan_version,
+    uncovered_queries,
+    verify_indexes,
+)
+
+MONGODB_TEST_URI = os.getenv("MONGODB_TEST_URI")
+
+
+def test_every_query_shape_is_served_by_a_planned_index():
+    assert [(shape.name, reason) for shape, reason in uncovered_queries()] == []
+
+
+def test_plan_has_no_duplicate_indexes():
+    keys = [(index.collection, index.keys) for index in INDEX_PLAN]
+    assert len(keys) == len(set(keys))
+
+
+def test_sort_after_equality_prefix_is_served():
+    shape = QueryShape("q", "c", {"org": "o", "status": "OPEN"}, (("created_at", -1),))
+    assert index_serves(IndexSpec("c", (("org", 1), ("created_at", 1))), shape)
+    assert not index_serves(IndexSpec("c", (("org", 1), ("updated_at", -1))), shape)
+    assert not index_serves(IndexSpec("c", (("created_at", -1),)), shape)
+
+
+def test_uncovered_shapes_report_the_fallback():
+    shapes = [
+        QueryShape("sorted", "c", {"org": "o"}, (("created_at", -1),)),
+        QueryShape("scanned", "c", {"name": "x"}),
+    ]
+    plan = [IndexSpec("c", (("org", 1),))]
+    assert [(s.name, reason) for s, reason in uncovered_queries(plan, shapes)] == [
+        ("sorted", "in-memory sort"),
+        ("scanned", "collection scan"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_missing_indexes_compares_key_patterns():
+    collection = MagicMock()
+    collection.index_information = AsyncMock(
+        return_value={"_id_": {"key": [("_id", 1)]}, "org_1": {"key": [("org", 1)]}}
+    )
+    database = {"c": collection}
+    plan = [IndexSpec("c", (("org", 1),)), IndexSpec("c", (("org", 1), ("x", -1)))]
+
+    assert await missing_indexes(database, plan) == [plan[1]]
+
+
+def _manifest_db(version=None):
+    collections = {}
+
+    def collection(name):
+        if name not in collections:
+            mock = MagicMock()
+            mock.create_index = AsyncMock()
+            mock.update_one = AsyncMock()
+            mock.index_information = AsyncMock(return_value={})
+            mock.find_one = AsyncMock(
+                return_value={"version": version} if version else None
+            )
+            collections[name] = mock
+        return collections[name]
+
+    database = MagicMock()
+    database.__getitem__.side_effect = collection
+    return database, collection
+
+
+def test_plan_version_changes_with_the_plan():
+    plan = [IndexSpec("c", (("org", 1),))]
+    assert plan_version(plan) == plan_version(list(plan))
+    assert plan_version(plan) != plan_version([IndexSpec("c", (("org", -1),))])
+
+
+@pytest.mark.asyncio
+async def test_apply_creates_indexes_and_records_the_version():
+    database, collection = _manifest_db()
+    plan = [IndexSpec("a", (("x", 1),)), IndexSpec("b", (("y", 1),), unique=True)]
+
+    assert await apply_index_plan(database, plan=plan) is True
+
+    collection("b").create_index.assert_called_once_with([("y", 1)], unique=True)
+    update = collection(MANIFEST_COLLECTION).update_one.call_args
+    assert update.args[1]["$set"]["version"] == plan_version(plan)
+    assert update.kwargs == {"upsert": True}
+
+
+@pytest.mark.asyncio
+async def test_apply_is_skipped_when_the_version_is_already_applied():
+    plan = [IndexSpec("a", (("x", 1),))]
+    database, collection = _manifest_db(version=plan_version(plan))
+
+    assert await apply_index_plan(database, plan=plan) is False
+    collection("a").create_index.assert_not_called()
+
+    assert await apply_index_plan(database, force=True, plan=plan) is True
+    collection("a").create_index.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_verify_is_one_lookup_when_the_plan_is_applied():
+    database, collection = _manifest_db(version=plan_version())
+
+    assert await verify_indexes(database) == []
+    collection("proposals").index_information.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_verify_lists_missing_indexes_for_a_stale_plan():
+    database, _ = _manifest_db(version="old")
+
+    missing = await verify_indexes(database)
+
+    assert len(missing) == len(INDEX_PLAN)
+
+
+def _stages(plan: dict):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+@pytest.fixture(scope="module")
+def explain_db():
+    if not MONGODB_TEST_URI:
+        pytest.skip("MONGODB_TEST_URI is not set")
+    from pymongo import MongoClient
+
+    client = MongoClient(MONGODB_TEST_URI, serverSelectionTimeoutMS=2000)
+    database = client[f"index_plan_{uuid.uuid4().hex[:8]}"]
+    for index in INDEX_PLAN:
+        database[index.collection].create_index(list(index.keys), **index.options())
+    yield database
+    client.drop_database(database.name)
+    client.close()
+
+
+@pytest.mark.parametrize("shape", QUERY_SHAPES, ids=lambda s: s.name)
+def test_query_shape_uses_an_index_without_sorting(explain_db, shape):
+    cursor = explain_db[shape.collection].find(shape.filter)
+    if shape.sort:
+        cursor = cursor.sort(list(shape.sort))
+    stages = set(_stages(cursor.explain()["queryPlanner"]["winningPlan"]))
+
+    assert "COLLSCAN" not in stages
+    assert "SORT" not in stages
@@ -0,0 +1,169 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bson import ObjectId
+
+from apps.api.src.onboarding.imports import (
+    COMPLETED,
+    RUNNING,
+    UPLOADING,
+    append_import_rows,
+    parse_csv_rows,
+    process_import_chunk,
+    submit_import,
+)
+from apps.api.tests.conftest import (
+    create_async_cursor_mock,
+    mock_import_job_rows_collection,
+    mock_import_jobs_collection,
+    mock_outbox_collection,
+)
+
+
+def _job(**overrides):
+    job = {
+        "_id": ObjectId(),
+        "organization_id": "org-1",
+        "organization_name": "Test Condo",
+        "creator_user_id": "user-1",
+        "status": RUNNING,
+        "chunk_size": 2,
+        "total_rows": 3,
+    }
+    job.update(overrides)
+    return job
+
+
+def _rows_cursor(rows):
+    cursor = create_async_cursor_mock(rows)
+    cursor.sort = MagicMock(return_value=cursor)
+    cursor.limit = MagicMock(return_value=cursor)
+    return cursor
+
+
+def test_parse_csv_rows():
+    rows = parse_csv_rows(
+        "Property_Name,phone,email\nApto 101,+584121234567,\nApto 102,,a@b.co\n"
+    )
+
+    assert rows == [
+        {
+            "property_name": "Apto 101",
+            "first_name": None,
+            "last_name": None,
+            "phone": "+584121234567",
+            "email": None,
+            "row_id": None,
+        },
+        {
+            "property_name": "Apto 102",
+            "first_name": None,
+            "last_name": None,
+            "phone": None,
+            "email": "a@b.co",
+            "row_id": None,
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_append_reserves_contiguous_indexes():
+    job = _job(status=UPLOADING, total_rows=5)
+    mock_import_jobs_collection.find_one_and_update.return_value = job
+    rows = [{"property_name": f"Apto {i}"} for i in range(2)]
+
+    await append_import_rows(str(job["_id"]), rows)
+
+    docs = mock_import_job_rows_collection.insert_many.call_args[0][0]
+    assert [d["index"] for d in docs] == [3, 4]
+    assert [d["row_id"] for d in docs] == ["4", "5"]
+    assert all(d["status"] is None for d in docs)
+
+
+@pytest.mark.asyncio
+async def test_append_rejected_after_submit():
+    job = _job(status=RUNNING)
+    mock_import_jobs_collection.find_one.return_value = job
+
+    with pytest.raises(Exception, match="before the import is submitted"):
+        await append_import_rows(str(job["_id"]), [{"property_name": "Apto 1"}])
+
+
+@pytest.mark.asyncio
+async def test_submit_queues_processing():
+    job = _job(status="PENDING")
+    mock_import_jobs_collection.find_one_and_update.return_value = job
+
+    await submit_import(str(job["_id"]))
+
+    queued = mock_outbox_collection.insert_one.call_args[0][0]
+    assert queued["kind"] == "onboarding_import"
+    assert queued["payload"] == {"job_id": str(job["_id"])}
+
+
+@pytest.mark.asyncio
+async def test_process_chunk_checkpoints_results_and_progress():
+    job = _job()
+    job_id = str(job["_id"])
+    mock_import_jobs_collection.find_one_and_update.return_value = job
+    mock_import_job_rows_collection.update_many.return_value = MagicMock(
+        modified_count=0
+    )
+    chunk = [
+        {"_id": ObjectId(), "row_id": "1", "row": {"property_name": "Apto 1"}},
+        {
+            "_id": ObjectId(),
+            "row_id": "2",
+            "row": {"property_name": "Apto 2", "phone": "bad"},
+        },
+    ]
+    mock_import_job_rows_collection.find.return_value = _rows_cursor(chunk)
+    write_rows = AsyncMock(return_value={"total_properties": 1})
+
+    with patch("apps.api.src.onboarding.imports._write_rows", write_rows):
+        assert await process_import_chunk(job_id) is True
+
+    # Only the valid row is written
+    assert len(write_rows.call_args[0][0]) == 1
+    updates = mock_import_job_rows_collection.bulk_write.call_args[0][0]
+    assert [u._doc["$set"]["status"] for u in updates] == ["SUCCESS", "ERROR"]
+    progress = mock_import_jobs_collection.update_one.call_args[0][1]["$inc"]
+    assert progress["processed_rows"] == 2
+    assert progress["error_rows"] == 1
+    assert progress["total_properties"] == 1
+
+
+@pytest.mark.asyncio
+async def test_process_chunk_completes_when_no_rows_remain():
+    job = _job()
+    mock_import_jobs_collection.find_one_and_update.return_value = job
+    mock_import_job_rows_collection.update_many.return_value = MagicMock(
+        modified_count=0
+    )
+    mock_import_job_rows_collection.find.return_value = _rows_cursor([])
+
+    assert await process_import_chunk(str(job["_id"])) is False
+
+    update = mock_import_jobs_collection.update_one.call_args[0][1]["$set"]
+    assert update["status"] == COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_resume_writes_interrupted_rows_again_first():
+    job = _job()
+    mock_import_jobs_collection.find_one_and_update.return_value = job
+    interrupted = [
+        {"_id": ObjectId(), "row_id": "1", "row": {"property_name": "Apto 1"}}
+    ]
+    mock_import_job_rows_collection.find.return_value = _rows_cursor(interrupted)
+    write_rows = AsyncMock(return_value={"total_properties": 1})
+
+    with patch("apps.api.src.onboarding.imports._write_rows", write_rows):
+        assert await process_import_chunk(str(job["_id"])) is True
+
+    query = mock_import_job_rows_collection.find.call_args_list[0][0][0]
+    assert query["status"] == "PROCESSING"
+    written = write_rows.call_args[0][0]
+    assert written[0]["import_row_id"] == interrupted[0]["_id"]
+    updates = mock_import_job_rows_collection.bulk_write.call_args[0][0]
+    assert [u._doc["$set"]["status"] for u in updates] == ["SUCCESS"]
@@ -2,70 +2,142 @@ from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
 
+from apps.api.tests.conftest import create_async_cursor_mock
 
-@pytest.mark.asyncio
-async def test_bulk_setup_creates_org_and_properties():
+
+def _insert_many_mock(prefix):
+    """insert_many mock returning one generated ID per document."""
+
+    async def insert_many(docs, **kwargs):
+        return MagicMock(inserted_ids=[f"{prefix}_{i}" for i in range(len(docs))])
+
+    return AsyncMock(side_effect=insert_many)
+
+
+def _members_mock(collection, members):
+    """
+    Back organization_members with `members`, enforcing the unique
+    (user_id, organization_id) index like an unordered insert_many would.
+    """
+
+    def find(query, projection=None):
+        return create_async_cursor_mock(
+            [
+                m
+                for m in members
+                if m["organization_id"] == query["organization_id"]
+                and m["user_id"] in query["user_id"]["$in"]
+            ]
+        )
+
+    async def insert_many(docs, ordered=True):
+        errors = []
+        for index, doc in enumerate(docs):
+            key = (doc["user_id"], doc["organization_id"])
+            if key in {(m["user_id"], m["organization_id"]) for m in members}:
+                errors.append({"index": index, "code": 11000, "errmsg": "E11000"})
+                if ordered:
+                    break
+                continue
+            members.append(doc)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+        return MagicMock(inserted_ids=[f"member_{i}" for i in range(len(docs))])
+
+    collection.find = MagicMock(side_effect=find)
+    collection.insert_many = AsyncMock(side_effect=insert_many)
+    return members
+
+
+def _unique_ids_mock(collection):
+    """insert_many that rejects documents whose _id was already inserted."""
+    ids = set()
+
+    async def insert_many(docs, ordered=True):
+        errors = []
+        for index, doc in enumerate(docs):
+            doc.setdefault("_id", ObjectId())
+            if doc["_id"] in ids:
+                errors.append({"index": index, "code": 11000, "errmsg": "E11000"})
+                continue
+            ids.add(doc["_id"])
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+        return MagicMock(inserted_ids=[doc["_id"] for doc in docs])
+
+    collection.insert_many = AsyncMock(side_effect=insert_many)
+    return ids
+
+
+def _make_mock_db(existing_users=()):
     mock_db = MagicMock()
     mock_db.is_connected.return_value = True
     mock_db.db = MagicMock()
-    mock_org = {
+    mock_db.db.users.find = MagicMock(
+        return_value=create_async_cursor_mock(list(existing_users))
+    )
+    mock_db.db.users.insert_many = _insert_many_mock("user")
+    mock_db.db.houses.insert_many = _insert_many_mock("house")
+    # create_organization makes the creator the first member
+    mock_db.members = _members_mock(
+        mock_db.db.organization_members,
+        [{"user_id": "user_creator", "organization_id": "org_id_1"}],
+    )
+    mock_db.db.invitations.insert_many = _insert_many_mock("inv")
+    return mock_db
+
+
+def _mock_org(name="Test Condo"):
+    return {
         "_id": "org_id_1",
-        "name": "Test Condo",
+        "name": name,
         "slug": "test-condo",
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
     }
-    mock_db.db.houses.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="house_1")
-    )
-    rows = [
-        {"row_id": "r1", "property_name": "Apto 101"},
-        {"row_id": "r2", "property_name": "Apto 102"},
-    ]
+
+
+async def _run(mock_db, rows, enqueue=None):
     with (
         patch(
             "apps.api.src.onboarding.service.create_organization",
-            new=AsyncMock(return_value=mock_org),
+            new=AsyncMock(return_value=_mock_org()),
         ),
         patch("apps.api.src.onboarding.service.db", mock_db),
+        patch(
+            "apps.api.src.onboarding.service.enqueue_many",
+            enqueue or AsyncMock(),
+        ),
     ):
         from apps.api.src.onboarding.service import bulk_setup_organization
 
-        result = await bulk_setup_organization("Test Condo", rows, "user_creator")
+        return await bulk_setup_organization("Test Condo", rows, "user_creator")
+
+
+@pytest.mark.asyncio
+async def test_bulk_setup_creates_org_and_properties():
+    mock_db = _make_mock_db()
+    rows = [
+        {"row_id": "r1", "property_name": "Apto 101"},
+        {"row_id": "r2", "property_name": "Apto 102"},
+    ]
+
+    result = await _run(mock_db, rows)
+
     assert result["organization"]["name"] == "Test Condo"
     assert result["total_properties"] == 2
     assert result["total_residents"] == 0
     assert len(result["rows"]) == 2
     assert all(r["status"] == "SUCCESS" for r in result["rows"])
+    assert [r["property_id"] for r in result["rows"]] == ["house_0", "house_1"]
 
 
 @pytest.mark.asyncio
 async def test_bulk_setup_creates_local_users_for_phone_rows():
-    mock_db = MagicMock()
-    mock_db.is_connected.return_value = True
-    mock_db.db = MagicMock()
-    mock_org = {
-        "_id": "org_id_1",
-        "name": "Test Condo",
-        "slug": "test-condo",
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
-    }
-    mock_db.db.houses.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="house_1")
-    )
-    mock_db.db.users.find_one = AsyncMock(return_value=None)
-    mock_db.db.users.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="local_user_1")
-    )
-    mock_db.db.organization_members.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="member_1")
-    )
-    mock_db.db.houses.update_one = AsyncMock()
-    mock_db.db.invitations.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="inv_1")
-    )
+    mock_db = _make_mock_db()
     rows = [
         {
             "row_id": "r1",
@@ -75,27 +147,14 @@ async def test_bulk_setup_creates_local_users_for_phone_rows():
             "phone": "+584121234567",
         }
     ]
-    with (
-        patch(
-            "apps.api.src.onboarding.service.create_organization",
-            new=AsyncMock(return_value=mock_org),
-        ),
-        patch("apps.api.src.onboarding.service.db", mock_db),
-        patch(
-            "apps.api.src.onboarding.service.send_whatsapp_invitation",
-            new=AsyncMock(),
-        ),
-        patch(
-            "apps.api.src.onboarding.service.send_email_invitation",
-            new=AsyncMock(),
-        ),
-    ):
-        from apps.api.src.onboarding.service import bulk_setup_organization
 
-        result = await bulk_setup_organization("Test Condo", rows, "user_creator")
+    result = await _run(mock_db, rows)
+
     assert result["total_residents"] == 1
     assert result["rows"][0]["status"] == "SUCCESS"
     assert result["rows"][0]["user_id"] is not None
+    house = mock_db.db.houses.insert_many.call_args[0][0][0]
+    assert house["voter_user_id"] == result["rows"][0]["user_id"]
 
 
 @pytest.mark.asyncio
@@ -109,65 +168,23 @@ async def test_bulk_setup_rejects_over_200_rows():
 
 @pytest.mark.asyncio
 async def test_bulk_setup_invalid_phone_format():
-    mock_db = MagicMock()
-    mock_db.is_connected.return_value = True
-    mock_db.db = MagicMock()
-    mock_org = {
-        "_id": "org_id_1",
-        "name": "Test",
-        "slug": "test",
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
-    }
-    mock_db.db.houses.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="house_1")
-    )
+    mock_db = _make_mock_db()
     rows = [
         {"row_id": "r1", "property_name": "Apto 101", "phone": "not-a-phone"},
     ]
-    with (
-        patch(
-            "apps.api.src.onboarding.service.create_organization",
-            new=AsyncMock(return_value=mock_org),
-        ),
-        patch("apps.api.src.onboarding.service.db", mock_db),
-    ):
-        from apps.api.src.onboarding.service import bulk_setup_organization
 
-        result = await bulk_setup_organization("Test", rows, "user_1")
+    result = await _run(mock_db, rows)
+
     assert result["rows"][0]["status"] == "ERROR"
     assert "Invalid phone format" in result["rows"][0]["error"]
     # Validation happens before house creation — no orphaned houses
-    mock_db.db.houses.insert_one.assert_not_called()
+    mock_db.db.houses.insert_many.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_bulk_setup_normalizes_phone_whitespace():
     """Phone numbers with spaces should be normalized before E164 validation."""
-    mock_db = MagicMock()
-    mock_db.is_connected.return_value = True
-    mock_db.db = MagicMock()
-    mock_org = {
-        "_id": "org_id_1",
-        "name": "Test Condo",
-        "slug": "test-condo",
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
-    }
-    mock_db.db.houses.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="house_1")
-    )
-    mock_db.db.users.find_one = AsyncMock(return_value=None)
-    mock_db.db.users.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="user_1")
-    )
-    mock_db.db.organization_members.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="member_1")
-    )
-    mock_db.db.houses.update_one = AsyncMock()
-    mock_db.db.invitations.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="inv_1")
-    )
+    mock_db = _make_mock_db()
     rows = [
         {
             "row_id": "r1",
@@ -175,58 +192,20 @@ async def test_bulk_setup_normalizes_phone_whitespace():
             "phone": "+58 412 123 4567",
         }
     ]
-    with (
-        patch(
-            "apps.api.src.onboarding.service.create_organization",
-            new=AsyncMock(return_value=mock_org),
-        ),
-        patch("apps.api.src.onboarding.service.db", mock_db),
-        patch(
-            "apps.api.src.onboarding.service.send_whatsapp_invitation",
-            new=AsyncMock(),
-        ),
-        patch(
-            "apps.api.src.onboarding.service.send_email_invitation",
-            new=AsyncMock(),
-        ),
-    ):
-        from apps.api.src.onboarding.service import bulk_setup_organization
 
-        result = await bulk_setup_organization("Test Condo", rows, "user_creator")
+    result = await _run(mock_db, rows)
+
     assert result["rows"][0]["status"] == "SUCCESS"
     assert result["total_residents"] == 1
     # Phone stored without spaces
-    call_args = mock_db.db.users.insert_one.call_args[0][0]
-    assert call_args["phone"] == "+584121234567"
+    user_doc = mock_db.db.users.insert_many.call_args[0][0][0]
+    assert user_doc["phone"] == "+584121234567"
 
 
 @pytest.mark.asyncio
 async def test_bulk_setup_creates_user_for_email_only_row():
     """When a row has email but no phone, a user should be created by email."""
-    mock_db = MagicMock()
-    mock_db.is_connected.return_value = True
-    mock_db.db = MagicMock()
-    mock_org = {
-        "_id": "org_id_1",
-        "name": "Test Condo",
-        "slug": "test-condo",
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
-    }
-    mock_db.db.houses.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="house_1")
-    )
-    mock_db.db.users.find_one = AsyncMock(return_value=None)
-    mock_db.db.users.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="user_1")
-    )
-    mock_db.db.organization_members.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="member_1")
-    )
-    mock_db.db.houses.update_one = AsyncMock()
-    mock_db.db.invitations.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="inv_1")
-    )
+    mock_db = _make_mock_db()
     rows = [
         {
             "row_id": "r1",
@@ -234,52 +213,19 @@ async def test_bulk_setup_creates_user_for_email_only_row():
             "email": "maria@example.com",
         }
     ]
-    with (
-        patch(
-            "apps.api.src.onboarding.service.create_organization",
-            new=AsyncMock(return_value=mock_org),
-        ),
-        patch("apps.api.src.onboarding.service.db", mock_db),
-        patch(
-            "apps.api.src.onboarding.service.send_email_invitation",
-            new=AsyncMock(),
-        ),
-    ):
-        from apps.api.src.onboarding.service import bulk_setup_organization
 
-        result = await bulk_setup_organization("Test Condo", rows, "user_creator")
+    result = await _run(mock_db, rows)
+
     assert result["total_residents"] == 1
-    mock_db.db.users.find_one.assert_called()
-    mock_db.db.users.insert_one.assert_called_once()
+    query = mock_db.db.users.find.call_args[0][0]
+    assert query == {"$or": [{"email": {"$in": ["maria@example.com"]}}]}
+    mock_db.db.users.insert_many.assert_called_once()
 
 
 @pytest.mark.asyncio
 async def test_bulk_setup_sends_dual_channel_invitations():
     """When a row has both phone and email, invitations sent via both channels."""
-    mock_db = MagicMock()
-    mock_db.is_connected.return_value = True
-    mock_db.db = MagicMock()
-    mock_org = {
-        "_id": "org_id_1",
-        "name": "Test Condo",
-        "slug": "test-condo",
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
-    }
-    mock_db.db.houses.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="house_1")
-    )
-    mock_db.db.users.find_one = AsyncMock(return_value=None)
-    mock_db.db.users.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="user_1")
-    )
-    mock_db.db.organization_members.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="member_1")
-    )
-    mock_db.db.houses.update_one = AsyncMock()
-    mock_db.db.invitations.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="inv_1")
-    )
+    mock_db = _make_mock_db()
     rows = [
         {
             "row_id": "r1",
@@ -290,35 +236,22 @@ async def test_bulk_setup_sends_dual_channel_invitations():
             "email": "maria@example.com",
         }
     ]
-    mock_whatsapp = AsyncMock()
-    mock_email = AsyncMock()
-    with (
-        patch(
-            "apps.api.src.onboarding.service.create_organization",
-            new=AsyncMock(return_value=mock_org),
-        ),
-        patch("apps.api.src.onboarding.service.db", mock_db),
-        patch(
-            "apps.api.src.onboarding.service.send_whatsapp_invitation",
-            mock_whatsapp,
-        ),
-        patch("apps.api.src.onboarding.service.send_email_invitation", mock_email),
-    ):
-        from apps.api.src.onboarding.service import bulk_setup_organization
+    mock_enqueue = AsyncMock()
+
+    result = await _run(mock_db, rows, mock_enqueue)
 
-        result = await bulk_setup_organization("Test Condo", rows, "user_creator")
     assert result["whatsapp_invitations_sent"] == 1
     assert result["email_invitations_sent"] == 1
-    mock_whatsapp.assert_called_once()
-    mock_email.assert_called_once()
+    payloads = mock_enqueue.call_args[0][1]
+    assert [p["channel"] for p in payloads] == ["whatsapp", "email"]
     # Two invitation records: one per channel
-    inv_calls = mock_db.db.invitations.insert_one.call_args_list
-    assert len(inv_calls) == 2
-    wa_inv = inv_calls[0][0][0]
+    invitations = mock_db.db.invitations.insert_many.call_args[0][0]
+    assert len(invitations) == 2
+    wa_inv = invitations[0]
     assert wa_inv["channel"] == "whatsapp"
     assert wa_inv["identifier"] == "+584121234567"
     assert wa_inv["status"] == "pending"
-    email_inv = inv_calls[1][0][0]
+    email_inv = invitations[1]
     assert email_inv["channel"] == "email"
     assert email_inv["identifier"] == "maria@example.com"
     assert email_inv["status"] == "pending"
@@ -327,33 +260,212 @@ async def test_bulk_setup_sends_dual_channel_invitations():
 @pytest.mark.asyncio
 async def test_bulk_setup_tracks_properties_without_contact():
     """Rows with no phone and no email are counted as properties_without_contact."""
-    mock_db = MagicMock()
-    mock_db.is_connected.return_value = True
-    mock_db.db = MagicMock()
-    mock_org = {
-        "_id": "org_id_1",
-        "name": "Test Condo",
-        "slug": "test-condo",
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
+    mock_db = _make_mock_db()
+    rows = [
+        {"row_id": "r1", "property_name": "Apto 101"},
+        {"row_id": "r2", "property_name": "Apto 102"},
+    ]
+
+    result = await _run(mock_db, rows)
+
+    assert result["properties_without_contact"] == 2
+    assert result["whatsapp_invitations_sent"] == 0
+    assert result["email_invitations_sent"] == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_setup_batches_writes_per_collection():
+    """A full building is written with one round trip per collection."""
+    mock_db = _make_mock_db(
+        existing_users=[{"_id": "existing_1", "phone": "+584120000000"}]
+    )
+    rows = [
+        {
+            "row_id": f"r{i}",
+            "property_name": f"Apto {i}",
+            "phone": f"+5841200000{i:02d}",
+        }
+        for i in range(50)
+    ]
+    mock_enqueue = AsyncMock()
+
+    result = await _run(mock_db, rows, mock_enqueue)
+
+    assert result["total_properties"] == 50
+    assert result["total_residents"] == 50
+    mock_db.db.users.find.assert_called_once()
+    mock_db.db.users.insert_many.assert_called_once()
+    mock_db.db.houses.insert_many.assert_called_once()
+    mock_db.db.organization_members.insert_many.assert_called_once()
+    mock_db.db.invitations.insert_many.assert_called_once()
+    mock_enqueue.assert_called_once()
+    # The existing user is reused rather than recreated
+    assert len(mock_db.db.users.insert_many.call_args[0][0]) == 49
+    assert result["rows"][0]["user_id"] == "existing_1"
+
+
+@pytest.mark.asyncio
+async def test_bulk_setup_rows_sharing_a_phone_share_one_user():
+    mock_db = _make_mock_db()
+    rows = [
+        {"row_id": "r1", "property_name": "Apto 101", "phone": "+584121234567"},
+        {"row_id": "r2", "property_name": "Local 1", "phone": "+584121234567"},
+    ]
+
+    result = await _run(mock_db, rows)
+
+    assert len(mock_db.db.users.insert_many.call_args[0][0]) == 1
+    assert result["rows"][0]["user_id"] == result["rows"][1]["user_id"]
+    assert [r["status"] for r in result["rows"]] == ["SUCCESS", "SUCCESS"]
+    assert result["total_residents"] == 1
+    assert len(mock_db.members) == 2
+    # One invitation for the shared user, not one per property
+    assert len(mock_db.db.invitations.insert_many.call_args[0][0]) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_setup_skips_membership_for_the_creator():
+    mock_db = _make_mock_db(
+        existing_users=[{"_id": "user_creator", "phone": "+584121234567"}]
+    )
+    rows = [
+        {"row_id": "r1", "property_name": "Apto 101", "phone": "+584121234567"},
+        {"row_id": "r2", "property_name": "Apto 102", "phone": "+584127654321"},
+    ]
+
+    with patch("apps.api.src.onboarding.service.invalidate_user") as invalidate:
+        result = await _run(mock_db, rows)
+
+    assert [r["status"] for r in result["rows"]] == ["SUCCESS", "SUCCESS"]
+    assert result["total_residents"] == 2
+    assert result["whatsapp_invitations_sent"] == 1
+    assert [m["user_id"] for m in mock_db.members] == ["user_creator", "user_0"]
+    # Only the user who just joined has new memberships to reload
+    invalidate.assert_called_once_with("user_0")
+
+
+@pytest.mark.asyncio
+async def test_bulk_setup_failed_membership_only_fails_its_row():
+    mock_db = _make_mock_db()
+    rows = [
+        {"row_id": "r1", "property_name": "Apto 101", "phone": "+584121234567"},
+        {"row_id": "r2", "property_name": "Apto 102", "phone": "+584127654321"},
+    ]
+    mock_db.db.organization_members.insert_many = AsyncMock(
+        side_effect=BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 121, "errmsg": "invalid"}]}
+        )
+    )
+    mock_db.db.houses.update_many = AsyncMock()
+    mock_enqueue = AsyncMock()
+
+    result = await _run(mock_db, rows, mock_enqueue)
+
+    assert [r["status"] for r in result["rows"]] == ["SUCCESS", "ERROR"]
+    assert result["rows"][1]["error"] == "invalid"
+    assert result["total_residents"] == 1
+    assert result["whatsapp_invitations_sent"] == 1
+    update = mock_db.db.houses.update_many.call_args.args
+    assert update == (
+        {"_id": {"$in": ["house_1"]}},
+        {"$set": {"voter_user_id": None}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_setup_failure_reports_the_rows_it_wrote():
+    mock_db = _make_mock_db()
+    houses = _unique_ids_mock(mock_db.db.houses)
+    mock_db.db.organization_members.insert_many = AsyncMock(
+        side_effect=Exception("connection reset")
+    )
+    mock_db.db.houses.update_many = AsyncMock()
+    rows = [
+        {"row_id": "r1", "property_name": "Apto 101", "phone": "+584121234567"},
+        {"row_id": "r2", "property_name": "Apto 102"},
+    ]
+
+    result = await _run(mock_db, rows)
+
+    written, vacant = result["rows"]
+    assert written["status"] == "ERROR"
+    assert written["error"].startswith("Property created")
+    assert vacant["status"] == "SUCCESS"
+    assert {written["property_id"], vacant["property_id"]} == {
+        str(house_id) for house_id in houses
     }
-    mock_db.db.houses.insert_one = AsyncMock(
-        return_value=MagicMock(inserted_id="house_1")
+    assert (result["total_properties"], result["total_residents"]) == (2, 0)
+    assert result["properties_without_contact"] == 1
+    # The property written for the failed row keeps no voter
+    update = mock_db.db.houses.update_many.call_args.args
+    assert update == (
+        {"_id": {"$in": [ObjectId(written["property_id"])]}},
+        {"$set": {"voter_user_id": None}},
     )
+
+
+@pytest.mark.asyncio
+async def test_bulk_setup_fails_only_the_properties_not_written():
+    mock_db = _make_mock_db()
+
+    async def insert_many(docs, ordered=True):
+        for doc in docs:
+            doc["_id"] = ObjectId()
+        raise BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 121, "errmsg": "invalid"}]}
+        )
+
+    mock_db.db.houses.insert_many = AsyncMock(side_effect=insert_many)
     rows = [
         {"row_id": "r1", "property_name": "Apto 101"},
         {"row_id": "r2", "property_name": "Apto 102"},
     ]
+
+    result = await _run(mock_db, rows)
+
+    assert [r["status"] for r in result["rows"]] == ["SUCCESS", "ERROR"]
+    assert result["rows"][0]["property_id"] is not None
+    assert result["rows"][1].get("property_id") is None
+    assert result["total_properties"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rewriting_import_rows_does_not_duplicate_them():
+    """An interrupted import chunk is written again without duplicates."""
+    from apps.api.src.onboarding.service import _validate_rows, _write_rows
+
+    mock_db = _make_mock_db()
+    houses = _unique_ids_mock(mock_db.db.houses)
+    invitations = _unique_ids_mock(mock_db.db.invitations)
+    import_rows = [
+        {
+            "row_id": "1",
+            "import_row_id": ObjectId(),
+            "property_name": "Apto 101",
+            "phone": "+584121234567",
+            "email": "maria@example.com",
+        },
+        {"row_id": "2", "import_row_id": ObjectId(), "property_name": "Apto 102"},
+    ]
+    mock_enqueue = AsyncMock()
+
     with (
-        patch(
-            "apps.api.src.onboarding.service.create_organization",
-            new=AsyncMock(return_value=mock_org),
-        ),
         patch("apps.api.src.onboarding.service.db", mock_db),
+        patch("apps.api.src.onboarding.service.enqueue_many", mock_enqueue),
     ):
-        from apps.api.src.onboarding.service import bulk_setup_organization
+        for _ in range(2):
+            _, valid = _validate_rows(import_rows)
+            await _write_rows(
+                valid, "org_id_1", "Test Condo", "user_creator", datetime.utcnow()
+            )
+            # The retry finds the user the first run created
+            mock_db.db.users.find = MagicMock(
+                return_value=create_async_cursor_mock(
+                    [{"_id": "user_0", "phone": "+584121234567"}]
+                )
+            )
 
-        result = await bulk_setup_organization("Test Condo", rows, "user_creator")
-    assert result["properties_without_contact"] == 2
-    assert result["whatsapp_invitations_sent"] == 0
-    assert result["email_invitations_sent"] == 0
+    assert houses == {row["import_row_id"] for row in import_rows}
+    assert len(invitations) == 2
+    assert len(mock_db.members) == 2
+    assert [len(call.args[1]) for call in mock_enqueue.call_args_list] == [2, 0]
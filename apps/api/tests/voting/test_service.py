@@ -1,11 +1,15 @@
 from datetime import datetime, timezone
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 from bson import ObjectId
 
+from apps.api.graphql_types.voting import RankingInput
+from apps.api.resolvers.voting import resolve_cast_vote
 from apps.api.src.voting.service import (
     cast_vote,
+    check_vote_tally,
+    close_voting_session,
     create_voting_session,
     get_voting_results,
     get_voting_session,
@@ -13,11 +17,14 @@ from apps.api.src.voting.service import (
     open_voting_session,
     update_voting_session_proposals,
 )
+from apps.api.src.voting.vote_cache import vote_cache
 
 from ..conftest import (
     create_async_cursor_mock,
     mock_houses_collection,
+    mock_organization_members_collection,
     mock_proposals_collection,
+    mock_vote_tallies_collection,
     mock_votes_collection,
     mock_voting_sessions_collection,
 )
@@ -45,6 +52,11 @@ def _make_session(
     }
 
 
+def _as_member(role="RESIDENT"):
+    """Make every voter a member of the session's organization."""
+    mock_organization_members_collection.find_one.return_value = {"role": role}
+
+
 def _make_vote(session_id="session-1", house_id="house-1", rankings=None):
     return {
         "_id": ObjectId(),
@@ -193,18 +205,23 @@ class TestCastVote:
             {"proposal_id": pid1, "rank": 1},
             {"proposal_id": pid2, "rank": 2},
         ]
-        vote = _make_vote(session_id=session_id, rankings=rankings)
-
         mock_voting_sessions_collection.find_one.return_value = session
         mock_houses_collection.find_one.return_value = house
-        mock_votes_collection.find_one.return_value = None  # no existing vote
-        mock_votes_collection.insert_one.return_value = MagicMock(
-            inserted_id=vote["_id"]
-        )
-        mock_votes_collection.find_one.side_effect = [None, vote]
+        _as_member()
+        mock_votes_collection.find_one_and_update.return_value = None  # new vote
 
         result = await cast_vote(session_id, house_id, "user-1", rankings)
-        assert result is not None
+
+        assert result["voting_session_id"] == session_id
+        assert result["house_id"] == house_id
+        assert result["rankings"] == rankings
+        # A single upsert, keyed on the unique (session, house) index
+        call = mock_votes_collection.find_one_and_update.call_args
+        assert call.args[0] == {"voting_session_id": session_id, "house_id": house_id}
+        assert call.args[1]["$setOnInsert"]["_id"] == result["_id"]
+        assert call.kwargs["upsert"] is True
+        mock_votes_collection.find_one.assert_not_called()
+        mock_votes_collection.insert_one.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_raises_when_session_not_open(self):
@@ -216,6 +233,49 @@ class TestCastVote:
         with pytest.raises(Exception, match="not open"):
             await cast_vote(session_id, house_id, "user-1", [])
 
+    @pytest.mark.asyncio
+    async def test_raises_for_non_member(self):
+        session = _make_session(status="OPEN")
+        mock_voting_sessions_collection.find_one.return_value = session
+
+        with pytest.raises(Exception, match="not a member"):
+            await cast_vote(str(session["_id"]), str(ObjectId()), "user-1", [])
+
+        mock_houses_collection.find_one.assert_not_called()
+        mock_votes_collection.find_one_and_update.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resolver_reads_the_session_once(self):
+        pid1 = str(ObjectId())
+        session = _make_session(status="OPEN", proposal_ids=[pid1])
+        house = {
+            "_id": ObjectId(),
+            "voter_user_id": "user-1",
+            "organization_id": "org-1",
+        }
+        mock_voting_sessions_collection.find_one.return_value = session
+        mock_houses_collection.find_one.return_value = house
+        mock_organization_members_collection.find.return_value = (
+            create_async_cursor_mock(
+                [{"user_id": "user-1", "organization_id": "org-1", "role": "RESIDENT"}]
+            )
+        )
+        info = MagicMock()
+        info.context = {"user": {"id": "user-1"}}
+
+        await resolve_cast_vote(
+            info,
+            str(session["_id"]),
+            str(house["_id"]),
+            [RankingInput(proposal_id=pid1, rank=1)],
+        )
+
+        assert mock_voting_sessions_collection.find_one.call_count == 1
+        assert mock_houses_collection.find_one.call_count == 1
+        assert mock_organization_members_collection.find.call_count == 1
+        mock_organization_members_collection.find_one.assert_not_called()
+        assert mock_votes_collection.find_one_and_update.call_count == 1
+
     @pytest.mark.asyncio
     async def test_raises_on_incomplete_rankings(self):
         session_id = str(ObjectId())
@@ -231,6 +291,7 @@ class TestCastVote:
 
         mock_voting_sessions_collection.find_one.return_value = session
         mock_houses_collection.find_one.return_value = house
+        _as_member()
 
         with pytest.raises(Exception, match="all proposals"):
             await cast_vote(
@@ -270,6 +331,110 @@ class TestGetVotingResults:
             await get_voting_results(str(ObjectId()))
 
 
+class TestVoteTally:
+    def _setup_open_session(self, proposal_ids):
+        session = _make_session(status="OPEN", proposal_ids=proposal_ids)
+        house = {
+            "_id": ObjectId(),
+            "voter_user_id": "user-1",
+            "organization_id": "org-1",
+        }
+        mock_voting_sessions_collection.find_one.return_value = session
+        mock_houses_collection.find_one.return_value = house
+        _as_member()
+        return session, str(house["_id"])
+
+    @pytest.mark.asyncio
+    async def test_first_vote_increments_tally(self):
+        pid1, pid2 = str(ObjectId()), str(ObjectId())
+        session, house_id = self._setup_open_session([pid1, pid2])
+        rankings = [
+            {"proposal_id": pid1, "rank": 1},
+            {"proposal_id": pid2, "rank": 2},
+        ]
+        mock_votes_collection.find_one_and_update.return_value = None
+
+        await cast_vote(str(session["_id"]), house_id, "user-1", rankings)
+
+        update = mock_vote_tallies_collection.update_one.call_args[0][1]
+        assert update["$inc"] == {
+            f"scores.{pid1}": 2,
+            f"scores.{pid2}": 1,
+            f"top_half_counts.{pid1}": 1,
+            "votes_cast": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_changed_ranking_applies_delta(self):
+        pid1, pid2 = str(ObjectId()), str(ObjectId())
+        session, house_id = self._setup_open_session([pid1, pid2])
+        old_rankings = [
+            {"proposal_id": pid1, "rank": 1},
+            {"proposal_id": pid2, "rank": 2},
+        ]
+        new_rankings = [
+            {"proposal_id": pid1, "rank": 2},
+            {"proposal_id": pid2, "rank": 1},
+        ]
+        existing = _make_vote(rankings=old_rankings)
+        # The upsert returns the ballot it replaced
+        mock_votes_collection.find_one_and_update.return_value = existing
+
+        result = await cast_vote(str(session["_id"]), house_id, "user-1", new_rankings)
+
+        assert result["rankings"] == new_rankings
+        update = mock_vote_tallies_collection.update_one.call_args[0][1]
+        assert update["$inc"] == {
+            f"scores.{pid1}": -1,
+            f"scores.{pid2}": 1,
+            f"top_half_counts.{pid1}": -1,
+            f"top_half_counts.{pid2}": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_results_read_from_tally(self):
+        pid1, pid2 = str(ObjectId()), str(ObjectId())
+        session = _make_session(status="OPEN", proposal_ids=[pid1, pid2])
+        mock_voting_sessions_collection.find_one.return_value = session
+        mock_houses_collection.count_documents.return_value = 3
+        mock_vote_tallies_collection.find_one.return_value = {
+            "votes_cast": 3,
+            "scores": {pid1: 4, pid2: 5},
+            "top_half_counts": {pid1: 1, pid2: 2},
+        }
+
+        result = await get_voting_results(str(session["_id"]))
+
+        mock_votes_collection.find.assert_not_called()
+        assert result["votes_cast"] == 3
+        assert result["participation_rate"] == 100.0
+        top = result["proposal_scores"][0]
+        assert top["proposal_id"] == pid2
+        assert top["score"] == 5
+        assert top["is_approved"] is True
+
+    @pytest.mark.asyncio
+    async def test_check_detects_and_repairs_drift(self):
+        pid1 = str(ObjectId())
+        session = _make_session(status="OPEN", proposal_ids=[pid1])
+        mock_voting_sessions_collection.find_one.return_value = session
+        mock_vote_tallies_collection.find_one.return_value = {
+            "votes_cast": 5,
+            "scores": {pid1: 5},
+            "top_half_counts": {pid1: 5},
+        }
+        mock_votes_collection.find.return_value = create_async_cursor_mock(
+            [_make_vote(rankings=[{"proposal_id": pid1, "rank": 1}])]
+        )
+
+        consistent = await check_vote_tally(str(session["_id"]), repair=True)
+
+        assert consistent is False
+        replaced = mock_vote_tallies_collection.replace_one.call_args[0][1]
+        assert replaced["votes_cast"] == 1
+        assert replaced["scores"] == {pid1: 1}
+
+
 class TestDesignatedVoterEnforcement:
     @pytest.mark.asyncio
     async def test_designated_voter_can_cast_vote(self):
@@ -288,17 +453,13 @@ class TestDesignatedVoterEnforcement:
             {"proposal_id": pid1, "rank": 1},
             {"proposal_id": pid2, "rank": 2},
         ]
-        vote = _make_vote(session_id=session_id, rankings=rankings)
-
         mock_voting_sessions_collection.find_one.return_value = session
         mock_houses_collection.find_one.return_value = house
-        mock_votes_collection.find_one.side_effect = [None, vote]
-        mock_votes_collection.insert_one.return_value = MagicMock(
-            inserted_id=vote["_id"]
-        )
+        _as_member()
+        mock_votes_collection.find_one_and_update.return_value = None
 
         result = await cast_vote(session_id, house_id, "voter-1", rankings)
-        assert result is not None
+        assert result["voter_id"] == "voter-1"
 
     @pytest.mark.asyncio
     async def test_non_designated_resident_cannot_cast_vote(self):
@@ -315,6 +476,7 @@ class TestDesignatedVoterEnforcement:
 
         mock_voting_sessions_collection.find_one.return_value = session
         mock_houses_collection.find_one.return_value = house
+        _as_member()
 
         with pytest.raises(Exception, match="designated voter"):
             await cast_vote(
@@ -339,6 +501,7 @@ class TestDesignatedVoterEnforcement:
 
         mock_voting_sessions_collection.find_one.return_value = session
         mock_houses_collection.find_one.return_value = house
+        _as_member()
 
         with pytest.raises(Exception, match="No designated voter"):
             await cast_vote(
@@ -347,3 +510,52 @@ class TestDesignatedVoterEnforcement:
                 "user-1",
                 [{"proposal_id": pid1, "rank": 1}],
             )
+
+
+class TestVoteContextCache:
+    def _setup(self):
+        pid1 = str(ObjectId())
+        session = _make_session(status="OPEN", proposal_ids=[pid1])
+        house = {
+            "_id": ObjectId(),
+            "voter_user_id": "voter-1",
+            "organization_id": "org-1",
+        }
+        mock_voting_sessions_collection.find_one.return_value = session
+        mock_houses_collection.find_one.return_value = house
+        _as_member()
+        mock_votes_collection.find_one_and_update.return_value = None
+        return str(session["_id"]), str(house["_id"]), pid1
+
+    @pytest.mark.asyncio
+    async def test_repeat_votes_skip_validation_reads(self):
+        session_id, house_id, pid1 = self._setup()
+        rankings = [{"proposal_id": pid1, "rank": 1}]
+
+        with patch.object(vote_cache, "ttl_seconds", 60):
+            try:
+                await cast_vote(session_id, house_id, "voter-1", rankings)
+                await cast_vote(session_id, house_id, "voter-1", rankings)
+            finally:
+                vote_cache.clear()
+
+        assert mock_voting_sessions_collection.find_one.call_count == 1
+        assert mock_houses_collection.find_one.call_count == 1
+        assert mock_votes_collection.find_one_and_update.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_closing_a_session_invalidates_it(self):
+        session_id, house_id, pid1 = self._setup()
+        rankings = [{"proposal_id": pid1, "rank": 1}]
+
+        with patch.object(vote_cache, "ttl_seconds", 60):
+            try:
+                await cast_vote(session_id, house_id, "voter-1", rankings)
+                await close_voting_session(session_id)
+                mock_voting_sessions_collection.find_one.return_value = _make_session(
+                    status="CLOSED"
+                )
+                with pytest.raises(Exception, match="not open"):
+                    await cast_vote(session_id, house_id, "voter-1", rankings)
+            finally:
+                vote_cache.clear()